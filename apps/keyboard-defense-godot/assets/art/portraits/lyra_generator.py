@@ -14,6 +14,7 @@ import math
 import random
 from typing import List, Tuple, Dict, Optional, Callable
 from png_writer import Canvas, hex_to_rgba, lerp_color, blend_colors, Color
+from noise_fields import perlin_noise, perlin_sampler, fractal_sampler
 
 
 # ============================================================================
@@ -142,67 +143,6 @@ PALETTES = {
 }
 
 
-# ============================================================================
-# NOISE AND TEXTURE FUNCTIONS
-# ============================================================================
-
-def simple_noise(x: float, y: float, seed: int = 0) -> float:
-    """Simple pseudo-random noise function."""
-    n = int(x * 73 + y * 179 + seed * 31)
-    n = (n << 13) ^ n
-    return 1.0 - ((n * (n * n * 15731 + 789221) + 1376312589) & 0x7fffffff) / 1073741824.0
-
-
-def smoothstep(t: float) -> float:
-    """Smooth interpolation function."""
-    t = max(0.0, min(1.0, t))
-    return t * t * (3 - 2 * t)
-
-
-def perlin_noise(x: float, y: float, scale: float = 1.0, seed: int = 0) -> float:
-    """Simple Perlin-like noise."""
-    x = x * scale
-    y = y * scale
-
-    x0 = int(math.floor(x))
-    y0 = int(math.floor(y))
-
-    fx = x - x0
-    fy = y - y0
-
-    # Get corner values
-    v00 = simple_noise(x0, y0, seed)
-    v10 = simple_noise(x0 + 1, y0, seed)
-    v01 = simple_noise(x0, y0 + 1, seed)
-    v11 = simple_noise(x0 + 1, y0 + 1, seed)
-
-    # Smooth interpolation
-    fx = smoothstep(fx)
-    fy = smoothstep(fy)
-
-    # Bilinear interpolation
-    v0 = v00 + (v10 - v00) * fx
-    v1 = v01 + (v11 - v01) * fx
-
-    return v0 + (v1 - v0) * fy
-
-
-def fractal_noise(x: float, y: float, octaves: int = 4, persistence: float = 0.5, seed: int = 0) -> float:
-    """Multi-octave fractal noise for more natural textures."""
-    total = 0.0
-    amplitude = 1.0
-    frequency = 1.0
-    max_value = 0.0
-
-    for _ in range(octaves):
-        total += perlin_noise(x * frequency, y * frequency, 1.0, seed) * amplitude
-        max_value += amplitude
-        amplitude *= persistence
-        frequency *= 2.0
-
-    return total / max_value
-
-
 # ============================================================================
 # SHAPE AND DRAWING UTILITIES
 # ============================================================================
@@ -255,6 +195,11 @@ class LyraPortraitGenerator:
 
     def generate(self, expression: str = 'neutral') -> Canvas:
         """Generate a complete portrait with the given expression."""
+        self.render_base()
+        return self.render_expression(expression)
+
+    def render_base(self) -> None:
+        """Draw the expression-independent layers."""
         self.canvas = Canvas(self.size, self.size, PALETTES['background'].get(0))
 
         # Render in layers (back to front)
@@ -264,6 +209,9 @@ class LyraPortraitGenerator:
         self._draw_book()
         self._draw_neck()
         self._draw_face()
+
+    def render_expression(self, expression: str = 'neutral') -> Canvas:
+        """Draw the expression layers and everything on top of them."""
         self._draw_eyes(expression)
         self._draw_eyebrows(expression)
         self._draw_nose()
@@ -290,6 +238,7 @@ class LyraPortraitGenerator:
         """Draw the back layer of hair."""
         cx, cy = self.center_x, self.center_y
         rx, ry = self.head_rx + self.hair_extra, self.head_ry + self.hair_extra // 2
+        hair_noise = fractal_sampler(self.size, 0.1, 0.15, 3, 0.5, self.seed)
 
         for y in range(self.size):
             for x in range(self.size):
@@ -315,7 +264,7 @@ class LyraPortraitGenerator:
                     light_factor = (light_factor + 1) / 2  # Normalize to 0-1
 
                     # Add noise for hair texture
-                    noise = fractal_noise(x * 0.1, y * 0.15, 3, 0.5, self.seed)
+                    noise = hair_noise(x, y)
 
                     # Combine factors
                     shade = 0.3 + light_factor * 0.4 + noise * 0.15
@@ -328,6 +277,8 @@ class LyraPortraitGenerator:
         """Draw shoulders and robe."""
         cx = self.center_x
         shoulder_y = self.center_y + self.head_ry - 5
+        cloth_noise = fractal_sampler(self.size, 0.08, 0.08, 2, 0.5, self.seed + 100)
+        fold_field = perlin_sampler(self.size, 0.15, 0.05, self.seed + 200)
 
         for y in range(shoulder_y, self.size):
             for x in range(self.size):
@@ -338,12 +289,12 @@ class LyraPortraitGenerator:
                 if abs(x - cx) <= width:
                     # Shading
                     light_factor = (cx - x) / width * 0.5 + 0.5
-                    noise = fractal_noise(x * 0.08, y * 0.08, 2, 0.5, self.seed + 100)
+                    noise = cloth_noise(x, y)
 
                     shade = 0.25 + light_factor * 0.35 + noise * 0.1
 
                     # Add fold lines
-                    fold_noise = perlin_noise(x * 0.15, y * 0.05, 1.0, self.seed + 200)
+                    fold_noise = fold_field(x, y)
                     if fold_noise > 0.6:
                         shade += 0.15
                     elif fold_noise < -0.5:
@@ -440,6 +391,7 @@ class LyraPortraitGenerator:
         """Draw the face base."""
         cx, cy = self.center_x, self.center_y
         rx, ry = self.head_rx - 3, self.head_ry - 3
+        skin_noise = perlin_sampler(self.size, 0.1, 0.1, self.seed + 300)
 
         for y in range(self.size):
             for x in range(self.size):
@@ -453,7 +405,7 @@ class LyraPortraitGenerator:
                     light_factor = light_x * 0.3 + light_y * 0.4 + 0.5
 
                     # Subtle variation
-                    noise = perlin_noise(x * 0.1, y * 0.1, 1.0, self.seed + 300) * 0.05
+                    noise = skin_noise(x, y) * 0.05
 
                     shade = 0.2 + light_factor * 0.25 + dist * 0.15 + noise
                     shade = max(0.15, min(0.55, shade))
@@ -74,11 +74,17 @@ class LyraV11:
         self.hair_r = int(32 * self.s)  # Big fluffy hair
 
     def generate(self, expr='neutral'):
+        self.render_base()
+        return self.render_expression(expr)
+
+    def render_base(self):
         self.canvas = Canvas(self.size, self.size, BG)
 
         self._hair_back()
         self._body()
         self._face()
+
+    def render_expression(self, expr='neutral'):
         self._eyes(expr)
         self._details(expr)
         self._hair_front()
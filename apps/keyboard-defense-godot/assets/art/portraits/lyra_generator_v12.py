@@ -76,11 +76,17 @@ class LyraV12:
         self.hair_r = int(32 * self.s)
 
     def generate(self, expr='neutral'):
+        self.render_base()
+        return self.render_expression(expr)
+
+    def render_base(self):
         self.canvas = Canvas(self.size, self.size, BG)
 
         self._hair()
         self._body()
         self._face()
+
+    def render_expression(self, expr='neutral'):
         self._eyes(expr)
         self._details(expr)
         self._hair_front()
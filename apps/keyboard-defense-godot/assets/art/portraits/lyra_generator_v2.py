@@ -223,6 +223,11 @@ class LyraPortraitV2:
 
     def generate(self, expression: str = 'neutral') -> Canvas:
         """Generate complete portrait."""
+        self.render_base()
+        return self.render_expression(expression)
+
+    def render_base(self) -> None:
+        """Draw the expression-independent layers."""
         bg_color = PALETTES['background'].get(0.3)
         self.canvas = Canvas(self.size, self.size, bg_color)
 
@@ -234,6 +239,9 @@ class LyraPortraitV2:
         self._draw_neck()
         self._draw_face()
         self._draw_ears()
+
+    def render_expression(self, expression: str = 'neutral') -> Canvas:
+        """Draw the expression layers and everything on top of them."""
         self._draw_eyes(expression)
         self._draw_nose()
         self._draw_mouth(expression)
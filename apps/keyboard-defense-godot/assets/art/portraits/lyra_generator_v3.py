@@ -123,6 +123,10 @@ class LyraV3:
         self.eye_sep = int(11 * self.s)
 
     def generate(self, expr='neutral'):
+        self.render_base()
+        return self.render_expression(expr)
+
+    def render_base(self):
         self.canvas = Canvas(self.size, self.size, PALETTES['background'].get(0.2))
 
         self._bg()
@@ -131,6 +135,8 @@ class LyraV3:
         self._book()
         self._neck()
         self._face()
+
+    def render_expression(self, expr='neutral'):
         self._eyes(expr)
         self._nose()
         self._mouth(expr)
@@ -145,6 +145,10 @@ class LyraV4:
         self.hair_r = int(35 * self.s)
 
     def generate(self, expr='neutral'):
+        self.render_base()
+        return self.render_expression(expr)
+
+    def render_base(self):
         self.canvas = Canvas(self.size, self.size, PALETTE['bg'].get(0.3))
         self._background()
         self._hair_base()
@@ -152,6 +156,8 @@ class LyraV4:
         self._body()
         self._neck()
         self._face()
+
+    def render_expression(self, expr='neutral'):
         self._eyes(expr)
         self._nose_mouth(expr)
         self._eyebrows(expr)
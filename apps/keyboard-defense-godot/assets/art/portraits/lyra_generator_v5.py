@@ -86,6 +86,10 @@ class LyraV5:
         self.hair_r = int(32 * self.s)
 
     def generate(self, expr='neutral'):
+        self.render_base()
+        return self.render_expression(expr)
+
+    def render_base(self):
         self.canvas = Canvas(self.size, self.size, PAL['bg'].get(0.2))
 
         self._draw_bg()
@@ -93,6 +97,8 @@ class LyraV5:
         self._draw_body()
         self._draw_neck()
         self._draw_face()
+
+    def render_expression(self, expr='neutral'):
         self._draw_eyes(expr)
         self._draw_nose_mouth(expr)
         self._draw_brows(expr)
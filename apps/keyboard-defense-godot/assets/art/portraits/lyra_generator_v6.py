@@ -98,6 +98,10 @@ class LyraV6:
         self.canvas = None
 
     def generate(self, expr='neutral'):
+        self.render_base()
+        return self.render_expression(expr)
+
+    def render_base(self):
         self.canvas = Canvas(self.size, self.size, BG[1])
 
         self._bg()
@@ -108,6 +112,8 @@ class LyraV6:
         self._neck()
         self._face()
         self._cheeks()
+
+    def render_expression(self, expr='neutral'):
         self._eyes(expr)
         self._nose()
         self._mouth(expr)
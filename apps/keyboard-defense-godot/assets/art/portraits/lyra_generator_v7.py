@@ -106,11 +106,17 @@ class LyraV7:
         self.hair_r = int(28 * self.s)
 
     def generate(self, expr='neutral'):
+        self.render_base()
+        return self.render_expression(expr)
+
+    def render_base(self):
         self.canvas = Canvas(self.size, self.size, BG_COLOR)
 
         self._hair()
         self._body()
         self._face()
+
+    def render_expression(self, expr='neutral'):
         self._eyes(expr)
         self._details(expr)
         self._hair_front()
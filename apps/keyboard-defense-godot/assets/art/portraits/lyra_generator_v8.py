@@ -79,12 +79,18 @@ class LyraV8:
         self.hair_r = int(32 * self.s)  # MUCH bigger hair!
 
     def generate(self, expr='neutral'):
+        self.render_base()
+        return self.render_expression(expr)
+
+    def render_base(self):
         self.canvas = Canvas(self.size, self.size, BG_COLOR)
 
         # Layer order matters!
         self._draw_hair_back()
         self._draw_body()
         self._draw_face()
+
+    def render_expression(self, expr='neutral'):
         self._draw_eyes(expr)
         self._draw_details(expr)
         self._draw_hair_front()
@@ -0,0 +1,205 @@
+"""
+Noise Fields - Lattice noise for the Lyra portrait generators
+
+Provides the per-point noise functions (simple_noise, perlin_noise,
+fractal_noise) and whole-canvas fields of the same noise. A field evaluates
+every pixel of a size x size grid at once (lattice hashing and smoothstep
+interpolation vectorized with NumPy when installed) and is cached per
+(size, scale, octaves, seed), so generators sample field[y][x] instead of
+calling noise per pixel. Field values are identical to the per-point calls.
+
+Without NumPy a full field costs more than the masked regions the generators
+actually read, so the samplers (perlin_sampler, fractal_sampler) only build a
+field when NumPy is installed and otherwise evaluate noise per point.
+
+Usage:
+    field = fractal_field(256, 0.1, 0.15, octaves=3, seed=42)
+    field[y][x] == fractal_noise(x * 0.1, y * 0.15, 3, 0.5, 42)
+
+    noise = fractal_sampler(256, 0.1, 0.15, octaves=3, seed=42)
+    noise(x, y) == fractal_noise(x * 0.1, y * 0.15, 3, 0.5, 42)
+"""
+
+import math
+from functools import lru_cache
+from typing import Callable, List
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+Field = List[List[float]]  # field[y][x]
+Sampler = Callable[[int, int], float]  # sampler(x, y)
+
+
+# ============================================================================
+# POINT NOISE
+# ============================================================================
+
+def simple_noise(x: float, y: float, seed: int = 0) -> float:
+    """Simple pseudo-random noise function."""
+    n = int(x * 73 + y * 179 + seed * 31)
+    n = (n << 13) ^ n
+    return 1.0 - ((n * (n * n * 15731 + 789221) + 1376312589) & 0x7fffffff) / 1073741824.0
+
+
+def smoothstep(t: float) -> float:
+    """Smooth interpolation function."""
+    t = max(0.0, min(1.0, t))
+    return t * t * (3 - 2 * t)
+
+
+def perlin_noise(x: float, y: float, scale: float = 1.0, seed: int = 0) -> float:
+    """Simple Perlin-like noise."""
+    x = x * scale
+    y = y * scale
+
+    x0 = int(math.floor(x))
+    y0 = int(math.floor(y))
+
+    fx = x - x0
+    fy = y - y0
+
+    # Get corner values
+    v00 = simple_noise(x0, y0, seed)
+    v10 = simple_noise(x0 + 1, y0, seed)
+    v01 = simple_noise(x0, y0 + 1, seed)
+    v11 = simple_noise(x0 + 1, y0 + 1, seed)
+
+    # Smooth interpolation
+    fx = smoothstep(fx)
+    fy = smoothstep(fy)
+
+    # Bilinear interpolation
+    v0 = v00 + (v10 - v00) * fx
+    v1 = v01 + (v11 - v01) * fx
+
+    return v0 + (v1 - v0) * fy
+
+
+def fractal_noise(x: float, y: float, octaves: int = 4, persistence: float = 0.5, seed: int = 0) -> float:
+    """Multi-octave fractal noise for more natural textures."""
+    total = 0.0
+    amplitude = 1.0
+    frequency = 1.0
+    max_value = 0.0
+
+    for _ in range(octaves):
+        total += perlin_noise(x * frequency, y * frequency, 1.0, seed) * amplitude
+        max_value += amplitude
+        amplitude *= persistence
+        frequency *= 2.0
+
+    return total / max_value
+
+
+# ============================================================================
+# VECTORIZED GRID NOISE
+# ============================================================================
+
+def _lattice(ix, iy, seed: int):
+    """simple_noise at integer lattice points, broadcast over ix and iy.
+
+    The hash only keeps the low 31 bits, so wrapping 64-bit arithmetic gives
+    the same result as Python's unbounded integers.
+    """
+    n = (ix * 73 + iy * 179 + seed * 31).astype(np.uint64)
+    n = (n << np.uint64(13)) ^ n
+    h = (n * (n * n * np.uint64(15731) + np.uint64(789221)) + np.uint64(1376312589)) & np.uint64(0x7fffffff)
+    return 1.0 - h.astype(np.float64) / 1073741824.0
+
+
+def _smoothstep(t):
+    t = np.clip(t, 0.0, 1.0)
+    return t * t * (3 - 2 * t)
+
+
+def _perlin_grid(xs, ys, seed: int):
+    """perlin_noise(x, y, 1.0, seed) for every (x in xs, y in ys); rows follow ys."""
+    x0 = np.floor(xs)
+    y0 = np.floor(ys)
+    fx = _smoothstep(xs - x0)[None, :]
+    fy = _smoothstep(ys - y0)[:, None]
+    ix = x0.astype(np.int64)[None, :]
+    iy = y0.astype(np.int64)[:, None]
+
+    v00 = _lattice(ix, iy, seed)
+    v10 = _lattice(ix + 1, iy, seed)
+    v01 = _lattice(ix, iy + 1, seed)
+    v11 = _lattice(ix + 1, iy + 1, seed)
+
+    v0 = v00 + (v10 - v00) * fx
+    v1 = v01 + (v11 - v01) * fx
+    return v0 + (v1 - v0) * fy
+
+
+# ============================================================================
+# CACHED FIELDS
+# ============================================================================
+
+@lru_cache(maxsize=64)
+def perlin_field(size: int, scale_x: float, scale_y: float, seed: int = 0) -> Field:
+    """perlin_noise(x * scale_x, y * scale_y, 1.0, seed) for every pixel.
+
+    The returned rows are shared through the cache; treat them as read-only.
+    """
+    if not HAS_NUMPY:
+        return [[perlin_noise(x * scale_x, y * scale_y, 1.0, seed) for x in range(size)]
+                for y in range(size)]
+    coords = np.arange(size)
+    return _perlin_grid(coords * scale_x, coords * scale_y, seed).tolist()
+
+
+@lru_cache(maxsize=64)
+def fractal_field(size: int, scale_x: float, scale_y: float, octaves: int = 4,
+                  persistence: float = 0.5, seed: int = 0) -> Field:
+    """fractal_noise(x * scale_x, y * scale_y, octaves, persistence, seed) for every pixel.
+
+    The returned rows are shared through the cache; treat them as read-only.
+    """
+    if not HAS_NUMPY:
+        return [[fractal_noise(x * scale_x, y * scale_y, octaves, persistence, seed)
+                 for x in range(size)] for y in range(size)]
+    coords = np.arange(size)
+    xs = coords * scale_x
+    ys = coords * scale_y
+
+    total = 0.0
+    amplitude = 1.0
+    frequency = 1.0
+    max_value = 0.0
+    for _ in range(octaves):
+        total = total + _perlin_grid(xs * frequency, ys * frequency, seed) * amplitude
+        max_value += amplitude
+        amplitude *= persistence
+        frequency *= 2.0
+    return (total / max_value).tolist()
+
+
+# ============================================================================
+# SAMPLERS
+# ============================================================================
+
+def perlin_sampler(size: int, scale_x: float, scale_y: float, seed: int = 0) -> Sampler:
+    """perlin_noise(x * scale_x, y * scale_y, 1.0, seed) as a function of (x, y).
+
+    Reads a cached perlin_field with NumPy, computes per point without it.
+    """
+    if HAS_NUMPY:
+        field = perlin_field(size, scale_x, scale_y, seed)
+        return lambda x, y: field[y][x]
+    return lambda x, y: perlin_noise(x * scale_x, y * scale_y, 1.0, seed)
+
+
+def fractal_sampler(size: int, scale_x: float, scale_y: float, octaves: int = 4,
+                    persistence: float = 0.5, seed: int = 0) -> Sampler:
+    """fractal_noise(x * scale_x, y * scale_y, octaves, persistence, seed) as a function of (x, y).
+
+    Reads a cached fractal_field with NumPy, computes per point without it.
+    """
+    if HAS_NUMPY:
+        field = fractal_field(size, scale_x, scale_y, octaves, persistence, seed)
+        return lambda x, y: field[y][x]
+    return lambda x, y: fractal_noise(x * scale_x, y * scale_y, octaves, persistence, seed)
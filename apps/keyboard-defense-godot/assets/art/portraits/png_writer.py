@@ -1,62 +1,256 @@
 """
 Pure Python PNG Writer - No Dependencies Required
 Creates valid PNG files using only Python standard library.
+NumPy is used when installed to vectorize drawing and row filtering.
 """
 
 import struct
 import zlib
+from itertools import chain
 from typing import List, Tuple
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 # Type aliases
 Color = Tuple[int, int, int, int]  # RGBA
 
 
-def create_png(width: int, height: int, pixels: List[List[Color]]) -> bytes:
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+IDAT_CHUNK_SIZE = 1 << 16   # Bytes of compressed data per IDAT chunk
+FILTER_BLOCK_ROWS = 64      # Scanlines filtered and fed to zlib per step
+
+
+def _make_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Create a PNG chunk with CRC."""
+    chunk = chunk_type + data
+    crc = zlib.crc32(chunk) & 0xffffffff
+    return struct.pack('>I', len(data)) + chunk + struct.pack('>I', crc)
+
+
+def _rgba_bytes(width: int, height: int, pixels) -> bytes:
+    """Flatten pixels (rows of RGBA tuples, an RGBA buffer or an array) to bytes."""
+    if isinstance(pixels, (bytes, bytearray, memoryview)):
+        data = bytes(pixels)
+    elif HAS_NUMPY and isinstance(pixels, np.ndarray):
+        data = np.ascontiguousarray(pixels, dtype=np.uint8).tobytes()
+    else:
+        data = b''.join(bytes(chain.from_iterable(pixels[y])) for y in range(height))
+    if len(data) != width * height * 4:
+        raise ValueError(f'expected {width}x{height} RGBA pixels, got {len(data)} bytes')
+    return data
+
+
+# Row filtering
+#
+# Every scanline is tried with all five PNG filters (None, Sub, Up, Average,
+# Paeth) and the one whose output has the smallest sum of absolute signed
+# bytes wins, ties going to the lower filter type. Both backends apply the
+# same rule, so they produce identical files.
+
+def _filter_block_numpy(rows, prev, bpp: int):
+    """Filter a block of scanlines; returns rows prefixed with their filter type."""
+    x = rows.astype(np.int16)
+    b = np.vstack([prev[None, :].astype(np.int16), x[:-1]])
+    a = np.zeros_like(x)
+    a[:, bpp:] = x[:, :-bpp]
+    c = np.zeros_like(x)
+    c[:, bpp:] = b[:, :-bpp]
+    p = a + b - c
+    pa = np.abs(p - a)
+    pb = np.abs(p - b)
+    pc = np.abs(p - c)
+    paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+    candidates = (np.stack([x, x - a, x - b, x - ((a + b) >> 1), x - paeth]) & 0xFF).astype(np.uint8)
+    costs = np.abs(candidates.view(np.int8).astype(np.int32)).sum(axis=2)
+    choice = costs.argmin(axis=0)
+    out = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+    out[:, 0] = choice
+    out[:, 1:] = candidates[choice, np.arange(len(rows))]
+    return out.tobytes()
+
+
+def _filter_row_python(row: bytes, prev: bytes, bpp: int) -> bytes:
+    """Filter one scanline; returns it prefixed with its filter type."""
+    n = len(row)
+    sub, up, avg, paeth = bytearray(n), bytearray(n), bytearray(n), bytearray(n)
+    for i in range(n):
+        x = row[i]
+        b = prev[i]
+        if i >= bpp:
+            a = row[i - bpp]
+            c = prev[i - bpp]
+        else:
+            a = c = 0
+        p = a + b - c
+        pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+        pred = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+        sub[i] = (x - a) & 0xFF
+        up[i] = (x - b) & 0xFF
+        avg[i] = (x - ((a + b) >> 1)) & 0xFF
+        paeth[i] = (x - pred) & 0xFF
+    best_type, best, best_cost = 0, row, None
+    for filter_type, filtered in enumerate((row, sub, up, avg, paeth)):
+        cost = sum(v if v < 128 else 256 - v for v in filtered)
+        if best_cost is None or cost < best_cost:
+            best_type, best, best_cost = filter_type, filtered, cost
+    return bytes((best_type,)) + bytes(best)
+
+
+def _unfiltered_blocks(data: bytes, stride: int, height: int):
+    """Yield scanline data with filter type 0 a block of rows at a time."""
+    for y in range(0, height, FILTER_BLOCK_ROWS):
+        yield b''.join(b'\x00' + data[row_y * stride:(row_y + 1) * stride]
+                       for row_y in range(y, min(height, y + FILTER_BLOCK_ROWS)))
+
+
+def _filtered_blocks(data: bytes, stride: int, height: int, bpp: int):
+    """Yield adaptively filtered scanline data a block of rows at a time."""
+    if HAS_NUMPY:
+        image = np.frombuffer(data, dtype=np.uint8).reshape(height, stride)
+        prev = np.zeros(stride, dtype=np.uint8)
+        for y in range(0, height, FILTER_BLOCK_ROWS):
+            rows = image[y:y + FILTER_BLOCK_ROWS]
+            yield _filter_block_numpy(rows, prev, bpp)
+            prev = rows[-1]
+    else:
+        prev = bytes(stride)
+        for y in range(0, height, FILTER_BLOCK_ROWS):
+            block = []
+            for row_y in range(y, min(height, y + FILTER_BLOCK_ROWS)):
+                row = data[row_y * stride:(row_y + 1) * stride]
+                block.append(_filter_row_python(row, prev, bpp))
+                prev = row
+            yield b''.join(block)
+
+
+def _compress_smallest(candidates, level: int) -> bytes:
+    """Stream each candidate's blocks through zlib and keep the smallest result."""
+    best = None
+    for blocks in candidates:
+        compressor = zlib.compressobj(level)
+        compressed = [compressor.compress(block) for block in blocks]
+        compressed.append(compressor.flush())
+        result = b''.join(compressed)
+        if best is None or len(result) < len(best):
+            best = result
+    return best
+
+
+# Indexed color
+
+def _build_palette(data: bytes):
+    """Palette of at most 256 RGBA colors, or None if the image has more.
+
+    Translucent entries come first (ordered by alpha, then value) so the tRNS
+    chunk can stop at the last one.
+    """
+    if HAS_NUMPY:
+        values = np.frombuffer(data, dtype='<u4')
+        unique = np.unique(values)
+        if len(unique) > 256:
+            return None
+        unique = unique[np.argsort(unique >> 24, kind='stable')]
+        colors = [tuple(int(v).to_bytes(4, 'little')) for v in unique]
+    else:
+        seen = set()
+        for i in range(0, len(data), 4):
+            seen.add(data[i:i + 4])
+            if len(seen) > 256:
+                return None
+        colors = sorted((tuple(c) for c in seen),
+                        key=lambda c: (c[3], int.from_bytes(bytes(c), 'little')))
+    return colors
+
+
+def _index_rows(data: bytes, width: int, height: int, palette: List[Color], depth: int) -> bytes:
+    """Map RGBA pixels to palette indices packed at `depth` bits per pixel."""
+    per_byte = 8 // depth
+    stride = (width * depth + 7) // 8
+    if HAS_NUMPY:
+        keys = np.array([int.from_bytes(bytes(c), 'little') for c in palette], dtype='<u4')
+        order = np.argsort(keys)
+        values = np.frombuffer(data, dtype='<u4').reshape(height, width)
+        indices = order[np.searchsorted(keys[order], values)].astype(np.uint8)
+        if per_byte > 1:
+            padded = np.zeros((height, stride * per_byte), dtype=np.uint8)
+            padded[:, :width] = indices
+            groups = padded.reshape(height, stride, per_byte)
+            shifts = np.arange(8 - depth, -1, -depth, dtype=np.uint8)
+            indices = np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+        return indices.tobytes()
+    lookup = {bytes(c): i for i, c in enumerate(palette)}
+    out = bytearray()
+    for y in range(height):
+        row = data[y * width * 4:(y + 1) * width * 4]
+        indices = [lookup[row[x * 4:x * 4 + 4]] for x in range(width)]
+        for start in range(0, width, per_byte):
+            byte = 0
+            for k, index in enumerate(indices[start:start + per_byte]):
+                byte |= index << (8 - depth * (k + 1))
+            out.append(byte)
+    return bytes(out)
+
+
+def _assemble_png(ihdr: bytes, chunks: List[Tuple[bytes, bytes]], candidates, level: int) -> bytes:
+    """Signature, IHDR, extra chunks, the smallest candidate's IDAT stream and IEND."""
+    parts = [PNG_SIGNATURE, _make_chunk(b'IHDR', ihdr)]
+    parts.extend(_make_chunk(chunk_type, data) for chunk_type, data in chunks)
+    compressed = _compress_smallest(candidates, level)
+    for start in range(0, len(compressed), IDAT_CHUNK_SIZE):
+        parts.append(_make_chunk(b'IDAT', compressed[start:start + IDAT_CHUNK_SIZE]))
+    parts.append(_make_chunk(b'IEND', b''))
+    return b''.join(parts)
+
+
+def create_png(width: int, height: int, pixels, indexed: bool = False, level: int = 9) -> bytes:
     """
     Create a PNG file from pixel data.
 
     Args:
         width: Image width in pixels
         height: Image height in pixels
-        pixels: 2D list of RGBA tuples, pixels[y][x] = (r, g, b, a)
+        pixels: 2D list of RGBA tuples (pixels[y][x] = (r, g, b, a)), or a
+            flat RGBA buffer / NumPy array of height * width * 4 bytes
+        indexed: Also encode a palette (color type 3) PNG when the image has
+            at most 256 distinct colors, and return whichever file is smaller
+        level: zlib compression level
 
     Returns:
         PNG file as bytes
     """
-    def make_chunk(chunk_type: bytes, data: bytes) -> bytes:
-        """Create a PNG chunk with CRC."""
-        chunk = chunk_type + data
-        crc = zlib.crc32(chunk) & 0xffffffff
-        return struct.pack('>I', len(data)) + chunk + struct.pack('>I', crc)
-
-    # PNG signature
-    png_data = b'\x89PNG\r\n\x1a\n'
+    data = _rgba_bytes(width, height, pixels)
 
-    # IHDR chunk (image header)
-    ihdr_data = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    # Flat-shaded pixel art often beats every filter when left unfiltered,
+    # so the adaptive stream has to earn its place
     # 8 = bit depth, 6 = RGBA color type, 0 = compression, 0 = filter, 0 = interlace
-    png_data += make_chunk(b'IHDR', ihdr_data)
-
-    # IDAT chunk (image data)
-    raw_data = b''
-    for y in range(height):
-        raw_data += b'\x00'  # Filter type: None
-        for x in range(width):
-            r, g, b, a = pixels[y][x]
-            raw_data += struct.pack('BBBB', r, g, b, a)
-
-    compressed = zlib.compress(raw_data, 9)
-    png_data += make_chunk(b'IDAT', compressed)
-
-    # IEND chunk (image end)
-    png_data += make_chunk(b'IEND', b'')
-
-    return png_data
-
-
-def save_png(filepath: str, width: int, height: int, pixels: List[List[Color]]) -> None:
+    rgba = _assemble_png(struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0), [],
+                         [_unfiltered_blocks(data, width * 4, height),
+                          _filtered_blocks(data, width * 4, height, 4)], level)
+
+    palette = _build_palette(data) if indexed else None
+    if palette is None:
+        return rgba
+
+    depth = next(d for d in (1, 2, 4, 8) if len(palette) <= 1 << d)
+    packed = _index_rows(data, width, height, palette, depth)
+    chunks = [(b'PLTE', b''.join(bytes(c[:3]) for c in palette))]
+    alphas = bytes(c[3] for c in palette).rstrip(b'\xff')
+    if alphas:
+        chunks.append((b'tRNS', alphas))
+    # Palette rows compress best unfiltered (as libpng also does)
+    paletted = _assemble_png(struct.pack('>IIBBBBB', width, height, depth, 3, 0, 0, 0), chunks,
+                             [_unfiltered_blocks(packed, (width * depth + 7) // 8, height)], level)
+    # PLTE/tRNS overhead can outweigh the smaller pixel stream on tiny images
+    return paletted if len(paletted) <= len(rgba) else rgba
+
+
+def save_png(filepath: str, width: int, height: int, pixels, indexed: bool = False) -> None:
     """Save pixel data as a PNG file."""
-    png_bytes = create_png(width, height, pixels)
+    png_bytes = create_png(width, height, pixels, indexed)
     with open(filepath, 'wb') as f:
         f.write(png_bytes)
 
@@ -108,8 +302,8 @@ def hex_to_rgba(hex_color: str, alpha: int = 255) -> Color:
     return (r, g, b, alpha)
 
 
-class Canvas:
-    """Drawing canvas with various shape primitives."""
+class ListCanvas:
+    """Drawing canvas with various shape primitives, stored as rows of RGBA tuples."""
 
     def __init__(self, width: int, height: int, bg_color: Color = (0, 0, 0, 0)):
         self.width = width
@@ -222,9 +416,294 @@ class Canvas:
                     color = lerp_color(center_color, edge_color, t)
                     self.set_pixel(px, py, color)
 
-    def save(self, filepath: str) -> None:
-        """Save canvas to PNG file."""
-        save_png(filepath, self.width, self.height, self.pixels)
+    def save(self, filepath: str, indexed: bool = False) -> None:
+        """Save canvas to PNG file (palette PNG if `indexed` and <= 256 colors)."""
+        save_png(filepath, self.width, self.height, self.pixels, indexed)
+
+
+# Vectorized canvas
+#
+# BufferCanvas keeps every pixel in one contiguous RGBA bytearray. With NumPy,
+# shapes are rasterized as masks over a uint8 view of that buffer and blended
+# in bulk; without it, the ListCanvas per-pixel loops run on the buffer. Both
+# paths reproduce blend_colors/lerp_color bit for bit, so output matches
+# ListCanvas exactly.
+
+_ROOTS = None
+
+
+def _int_roots(limit: int):
+    """d ** 0.5 for d in 0..limit, computed exactly as the scalar code does."""
+    global _ROOTS
+    if _ROOTS is None or len(_ROOTS) <= limit:
+        size = max(limit + 1, 2 * (0 if _ROOTS is None else len(_ROOTS)), 1024)
+        # Python's float pow and NumPy's sqrt differ in the last bit for some
+        # inputs, which would shift lerp_color truncation; use the scalar op.
+        _ROOTS = np.array([d ** 0.5 for d in range(size)], dtype=np.float64)
+    return _ROOTS
+
+
+def _lerp_array(c1: Color, c2: Color, t):
+    """Vectorized lerp_color: one RGBA row per value of t."""
+    t = np.clip(t, 0.0, 1.0)[..., None]
+    c1 = np.array(c1, dtype=np.float64)
+    c2 = np.array(c2, dtype=np.float64)
+    return np.trunc(c1 + (c2 - c1) * t).astype(np.int64)
+
+
+def _blend_color(region, mask, color: Color, times=None) -> None:
+    """Blend one overlay color onto region[mask], `times` times per pixel if given."""
+    oa = color[3]
+    if oa == 0:
+        return
+    if times is not None:
+        for k in range(1, int(times.max(initial=0)) + 1):
+            _blend_color(region, times >= k, color)
+            if oa == 255:
+                break
+        return
+    if oa == 255:
+        region[mask] = color
+        return
+    base = region[mask]
+    if not len(base):
+        return
+    alpha = oa / 255.0
+    inv_alpha = 1.0 - alpha
+    overlay = np.array(color[:3], dtype=np.float64) * alpha
+    base[:, :3] = (overlay + base[:, :3] * inv_alpha).astype(np.uint8)
+    base[:, 3] = np.maximum(base[:, 3], oa)
+    region[mask] = base
+
+
+def _blend_pixels(region, mask, overlay) -> None:
+    """Blend a per-pixel overlay array (same shape as region) onto region[mask]."""
+    oa = overlay[..., 3]
+    full = mask & (oa == 255)
+    region[full] = overlay[full]
+    part = mask & (oa > 0) & (oa < 255)
+    if not part.any():
+        return
+    base = region[part]
+    over = overlay[part]
+    alpha = (over[:, 3] / 255.0)[:, None]
+    inv_alpha = 1.0 - alpha
+    base[:, :3] = (over[:, :3] * alpha + base[:, :3] * inv_alpha).astype(np.uint8)
+    base[:, 3] = np.maximum(base[:, 3], over[:, 3])
+    region[part] = base
+
+
+class _PixelRow:
+    """One row of a BufferCanvas, indexable like a list of RGBA tuples."""
+
+    __slots__ = ('buffer', 'offset', 'width')
+
+    def __init__(self, buffer: bytearray, offset: int, width: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.width = width
+
+    def _index(self, x: int) -> int:
+        if x < 0:
+            x += self.width
+        if not 0 <= x < self.width:
+            raise IndexError('pixel index out of range')
+        return self.offset + x * 4
+
+    def __len__(self) -> int:
+        return self.width
+
+    def __getitem__(self, x: int) -> Color:
+        i = self.offset + x * 4 if 0 <= x < self.width else self._index(x)
+        return tuple(self.buffer[i:i + 4])
+
+    def __setitem__(self, x: int, color: Color) -> None:
+        i = self.offset + x * 4 if 0 <= x < self.width else self._index(x)
+        self.buffer[i:i + 4] = bytes(color)
+
+    def __iter__(self):
+        buf = self.buffer
+        for i in range(self.offset, self.offset + self.width * 4, 4):
+            yield tuple(buf[i:i + 4])
+
+
+class BufferCanvas(ListCanvas):
+    """Canvas backed by a contiguous RGBA buffer with vectorized primitives.
+
+    Drop-in replacement for ListCanvas: same methods, same pixels, and
+    `pixels[y][x]` reads and writes still work through a row view.
+    """
+
+    def __init__(self, width: int, height: int, bg_color: Color = (0, 0, 0, 0)):
+        self.width = width
+        self.height = height
+        self.buffer = bytearray(bytes(bg_color) * (width * height))
+        self.array = None
+        if HAS_NUMPY:
+            self.array = np.frombuffer(self.buffer, dtype=np.uint8).reshape(height, width, 4)
+        # Row views so `canvas.pixels[y][x]` keeps working on the buffer
+        self._rows = [_PixelRow(self.buffer, y * width * 4, width) for y in range(height)]
+
+    @property
+    def pixels(self) -> List[_PixelRow]:
+        return self._rows
+
+    def set_pixel(self, x: int, y: int, color: Color) -> None:
+        """Set a single pixel with alpha blending."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            oa = color[3]
+            if oa == 0:
+                return
+            buf = self.buffer
+            i = (y * self.width + x) * 4
+            if oa == 255:
+                buf[i:i + 4] = bytes(color)
+                return
+            alpha = oa / 255.0
+            inv_alpha = 1.0 - alpha
+            buf[i] = int(color[0] * alpha + buf[i] * inv_alpha)
+            buf[i + 1] = int(color[1] * alpha + buf[i + 1] * inv_alpha)
+            buf[i + 2] = int(color[2] * alpha + buf[i + 2] * inv_alpha)
+            if oa > buf[i + 3]:
+                buf[i + 3] = oa
+
+    def fill_rect(self, x: int, y: int, w: int, h: int, color: Color) -> None:
+        """Fill a rectangle."""
+        if self.array is None:
+            return super().fill_rect(x, y, w, h, color)
+        region = self.array[max(0, y):max(0, min(self.height, y + h)),
+                            max(0, x):max(0, min(self.width, x + w))]
+        _blend_color(region, np.ones(region.shape[:2], dtype=bool), color)
+
+    def fill_ellipse(self, cx: int, cy: int, rx: int, ry: int, color: Color) -> None:
+        """Fill an ellipse centered at (cx, cy) with radii rx, ry."""
+        if self.array is None:
+            return super().fill_ellipse(cx, cy, rx, ry, color)
+        ys = np.arange(max(0, cy - ry), min(self.height, cy + ry + 1))
+        xs = np.arange(max(0, cx - rx), min(self.width, cx + rx + 1))
+        if not len(ys) or not len(xs):
+            return
+        dx = (xs - cx) / max(rx, 0.1)
+        dy = (ys - cy) / max(ry, 0.1)
+        mask = (dx * dx)[None, :] + (dy * dy)[:, None] <= 1.0
+        _blend_color(self.array[ys[0]:ys[-1] + 1, xs[0]:xs[-1] + 1], mask, color)
+
+    def draw_line(self, x1: int, y1: int, x2: int, y2: int, color: Color, thickness: int = 1) -> None:
+        """Draw a line using Bresenham's algorithm with optional thickness."""
+        if self.array is None:
+            return super().draw_line(x1, y1, x2, y2, color, thickness)
+        points = []
+        dx = abs(x2 - x1)
+        dy = abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx - dy
+        while True:
+            points.append((x1, y1))
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 > -dy:
+                err -= dy
+                x1 += sx
+            if e2 < dx:
+                err += dx
+                y1 += sy
+
+        if thickness == 1:
+            px = np.array([p[0] for p in points])
+            py = np.array([p[1] for p in points])
+            inside = (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+            mask = np.zeros((self.height, self.width), dtype=bool)
+            mask[py[inside], px[inside]] = True
+            _blend_color(self.array, mask, color)
+            return
+
+        # Every step stamps a circle; overlapping stamps blend repeatedly, so
+        # count the stamps covering each pixel and blend that many times.
+        r = thickness // 2
+        if r < 0:
+            return
+        offsets = np.arange(-r, r + 1) / max(r, 0.1)
+        stamp = ((offsets * offsets)[None, :] + (offsets * offsets)[:, None] <= 1.0).astype(np.int32)
+        pad = 2 * r
+        counts = np.zeros((self.height + 2 * pad, self.width + 2 * pad), dtype=np.int32)
+        for x, y in points:
+            if -r <= x < self.width + r and -r <= y < self.height + r:
+                counts[y + r:y + 3 * r + 1, x + r:x + 3 * r + 1] += stamp
+        counts = counts[pad:pad + self.height, pad:pad + self.width]
+        _blend_color(self.array, None, color, times=counts)
+
+    def fill_polygon(self, points: List[Tuple[int, int]], color: Color) -> None:
+        """Fill a polygon using scanline algorithm."""
+        if self.array is None:
+            return super().fill_polygon(points, color)
+        if len(points) < 3:
+            return
+
+        min_y = max(0, min(p[1] for p in points))
+        max_y = min(self.height - 1, max(p[1] for p in points))
+        if max_y < min_y:
+            return
+        # Adjacent spans can share an end pixel, which the scanline blends twice
+        counts = np.zeros((max_y - min_y + 1, self.width), dtype=np.int32)
+        n = len(points)
+        for y in range(min_y, max_y + 1):
+            intersections = []
+            for i in range(n):
+                p1 = points[i]
+                p2 = points[(i + 1) % n]
+                if p1[1] == p2[1]:
+                    continue
+                if p1[1] > p2[1]:
+                    p1, p2 = p2, p1
+                if p1[1] <= y < p2[1]:
+                    x = p1[0] + (y - p1[1]) * (p2[0] - p1[0]) / (p2[1] - p1[1])
+                    intersections.append(int(x))
+            intersections.sort()
+            for i in range(0, len(intersections) - 1, 2):
+                x1 = max(0, intersections[i])
+                x2 = min(self.width - 1, intersections[i + 1])
+                if x2 >= x1:
+                    counts[y - min_y, x1:x2 + 1] += 1
+        _blend_color(self.array[min_y:max_y + 1], None, color, times=counts)
+
+    def gradient_fill_vertical(self, x: int, y: int, w: int, h: int,
+                                top_color: Color, bottom_color: Color) -> None:
+        """Fill rectangle with vertical gradient."""
+        if self.array is None:
+            return super().gradient_fill_vertical(x, y, w, h, top_color, bottom_color)
+        y0, y1 = max(0, y), min(self.height, y + h)
+        x0, x1 = max(0, x), min(self.width, x + w)
+        if y1 <= y0 or x1 <= x0:
+            return
+        rows = np.array([lerp_color(top_color, bottom_color, (py - y) / max(h - 1, 1))
+                         for py in range(y0, y1)], dtype=np.int64)
+        region = self.array[y0:y1, x0:x1]
+        overlay = np.broadcast_to(rows[:, None, :], region.shape)
+        _blend_pixels(region, np.ones(region.shape[:2], dtype=bool), overlay)
+
+    def gradient_fill_radial(self, cx: int, cy: int, r: int,
+                              center_color: Color, edge_color: Color) -> None:
+        """Fill circle with radial gradient."""
+        if self.array is None:
+            return super().gradient_fill_radial(cx, cy, r, center_color, edge_color)
+        ys = np.arange(max(0, cy - r), min(self.height, cy + r + 1))
+        xs = np.arange(max(0, cx - r), min(self.width, cx + r + 1))
+        if not len(ys) or not len(xs):
+            return
+        d2 = ((xs - cx) ** 2)[None, :] + ((ys - cy) ** 2)[:, None]
+        dist = _int_roots(int(d2.max()))[d2]
+        mask = dist <= r
+        overlay = _lerp_array(center_color, edge_color, np.where(mask, dist / max(r, 1), 0.0))
+        _blend_pixels(self.array[ys[0]:ys[-1] + 1, xs[0]:xs[-1] + 1], mask, overlay)
+
+    def save(self, filepath: str, indexed: bool = False) -> None:
+        """Save canvas to PNG file (palette PNG if `indexed` and <= 256 colors)."""
+        save_png(filepath, self.width, self.height, self.buffer, indexed)
+
+
+Canvas = BufferCanvas
 
 
 if __name__ == "__main__":
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Lyra Portrait Batch Renderer
+
+Regenerates the portrait set of every Lyra generator version (v1-v12).
+Only eyes, brows and mouth differ between expressions, so each generator's
+expression-independent layers (render_base) are drawn once per
+(version, size, seed) and snapshotted - canvas, generator state and RNG
+state - to Logs/cache/portrait_layers. Every expression then restores the
+snapshot and draws just render_expression, producing the same PNG as a
+fresh generate() call. (version, size) jobs run in a process pool.
+
+Snapshots are keyed by the generator, png_writer and noise_fields sources,
+so editing any of them re-renders the base layers.
+
+Usage:
+    python render_portraits.py                          # Default set, all versions
+    python render_portraits.py --versions v11 v12       # Selected versions
+    python render_portraits.py --sizes 128 256 512      # Every expression per size
+    python render_portraits.py --no-cache --jobs 1      # Cold, serial render
+    python render_portraits.py --output /tmp/lyra --json
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from png_writer import Canvas
+
+# Project paths
+PORTRAITS_DIR = Path(__file__).parent
+PROJECT_ROOT = PORTRAITS_DIR.parents[2]
+CACHE_DIR = PROJECT_ROOT / "Logs" / "cache" / "portrait_layers"
+
+CACHE_VERSION = 1
+DEFAULT_SEED = 42
+EXPRESSIONS = ['neutral', 'encouraging', 'thinking', 'surprised', 'concerned']
+
+# version -> (module, generator class)
+VERSIONS: Dict[str, Tuple[str, str]] = {
+    'v1': ('lyra_generator', 'LyraPortraitGenerator'),
+    'v2': ('lyra_generator_v2', 'LyraPortraitV2'),
+    'v3': ('lyra_generator_v3', 'LyraV3'),
+    'v4': ('lyra_generator_v4', 'LyraV4'),
+    'v5': ('lyra_generator_v5', 'LyraV5'),
+    'v6': ('lyra_generator_v6', 'LyraV6'),
+    'v7': ('lyra_generator_v7', 'LyraV7'),
+    'v8': ('lyra_generator_v8', 'LyraV8'),
+    'v9': ('lyra_generator_v9', 'LyraV9'),
+    'v10': ('lyra_generator_v10', 'LyraV10'),
+    'v11': ('lyra_generator_v11', 'LyraV11'),
+    'v12': ('lyra_generator_v12', 'LyraV12'),
+}
+
+# What each generator's __main__ writes: every expression at 128, neutral at 256
+DEFAULT_PLAN = [(128, EXPRESSIONS), (256, ['neutral'])]
+
+
+# ============================================================================
+# NAMING AND KEYS
+# ============================================================================
+
+def output_name(version: str, expr: str, size: int) -> str:
+    """File name used by the generator scripts for this render."""
+    if version == 'v1':
+        return f'lyra_{expr}_{size}.png'
+    if version == 'v2' or size != 128:
+        return f'lyra_{version}_{expr}_{size}.png'
+    return f'lyra_{version}_{expr}.png'
+
+
+def layer_key(version: str, size: int, seed: int) -> str:
+    """Hash of everything the base layers depend on."""
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{version}:{size}:{seed}".encode("utf-8"))
+    for module in (VERSIONS[version][0], 'png_writer', 'noise_fields'):
+        digest.update((PORTRAITS_DIR / f"{module}.py").read_bytes())
+    return digest.hexdigest()
+
+
+# ============================================================================
+# LAYER SNAPSHOTS
+# ============================================================================
+
+def take_snapshot(generator: Any) -> Dict[str, Any]:
+    """Capture a generator after render_base: pixels, attributes and RNG."""
+    canvas = generator.canvas
+    attrs = {k: v for k, v in vars(generator).items() if k != 'canvas'}
+    return {
+        'width': canvas.width,
+        'height': canvas.height,
+        'pixels': bytes(canvas.buffer),
+        'attrs': pickle.dumps(attrs),
+        'random': random.getstate(),
+    }
+
+
+def restore_snapshot(generator_cls: type, snapshot: Dict[str, Any]) -> Any:
+    """A generator in the exact state render_base left it in."""
+    generator = generator_cls.__new__(generator_cls)
+    generator.__dict__.update(pickle.loads(snapshot['attrs']))
+    canvas = Canvas(snapshot['width'], snapshot['height'])
+    canvas.buffer[:] = snapshot['pixels']
+    generator.canvas = canvas
+    random.setstate(snapshot['random'])
+    return generator
+
+
+def _load_snapshot(path: Path, key: str) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'rb') as f:
+            cached = pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, OSError, AttributeError):
+        return None
+    return cached['snapshot'] if cached.get('key') == key else None
+
+
+def _save_snapshot(path: Path, key: str, snapshot: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump({'key': key, 'snapshot': snapshot}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+# ============================================================================
+# RENDERING
+# ============================================================================
+
+@dataclass
+class JobResult:
+    """Outcome of rendering one (version, size) job."""
+    version: str
+    size: int
+    cached: bool
+    base_ms: float
+    expressions_ms: float
+    files: List[str] = field(default_factory=list)
+
+
+def render_job(version: str, size: int, seed: int, expressions: List[str],
+               out_dir: str, use_cache: bool = True) -> JobResult:
+    """Render the given expressions of one generator at one size."""
+    module_name, class_name = VERSIONS[version]
+    generator_cls = getattr(importlib.import_module(module_name), class_name)
+
+    start = time.perf_counter()
+    key = layer_key(version, size, seed)
+    path = CACHE_DIR / f"{version}_{size}_{seed}.pkl"
+    snapshot = _load_snapshot(path, key) if use_cache else None
+    cached = snapshot is not None
+    if snapshot is None:
+        generator = generator_cls(size, seed)
+        generator.render_base()
+        snapshot = take_snapshot(generator)
+        if use_cache:
+            _save_snapshot(path, key, snapshot)
+    base_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    files = []
+    for expr in expressions:
+        generator = restore_snapshot(generator_cls, snapshot)
+        canvas = generator.render_expression(expr)
+        name = output_name(version, expr, size)
+        canvas.save(os.path.join(out_dir, name))
+        files.append(name)
+    expressions_ms = (time.perf_counter() - start) * 1000
+
+    return JobResult(version, size, cached, round(base_ms, 1), round(expressions_ms, 1), files)
+
+
+def render_all(versions: List[str], plan: List[Tuple[int, List[str]]], seed: int,
+               out_dir: str, use_cache: bool = True, jobs: Optional[int] = None) -> List[JobResult]:
+    """Fan (version, size) jobs across a process pool; results keep job order."""
+    tasks = [(version, size, seed, list(exprs), out_dir, use_cache)
+             for version in versions for size, exprs in plan]
+    if jobs == 1 or len(tasks) == 1:
+        return [render_job(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(render_job, *task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Batch render Lyra portraits with cached base layers")
+    parser.add_argument("--versions", nargs="+", choices=list(VERSIONS), default=list(VERSIONS),
+                        help="Generator versions to render (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int,
+                        help="Render every expression at these sizes (default: the scripts' own set)")
+    parser.add_argument("--expressions", nargs="+", choices=EXPRESSIONS, default=EXPRESSIONS,
+                        help="Expressions to render with --sizes")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Generator seed")
+    parser.add_argument("--output", default=str(PORTRAITS_DIR), help="Output directory")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write layer snapshots")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = parser.parse_args()
+
+    plan = [(size, args.expressions) for size in args.sizes] if args.sizes else DEFAULT_PLAN
+    os.makedirs(args.output, exist_ok=True)
+
+    start = time.perf_counter()
+    results = render_all(args.versions, plan, args.seed, args.output, not args.no_cache, args.jobs)
+    elapsed = time.perf_counter() - start
+    total_files = sum(len(r.files) for r in results)
+
+    if args.json:
+        print(json.dumps({
+            "output": args.output,
+            "files": total_files,
+            "elapsed_s": round(elapsed, 2),
+            "jobs": [asdict(r) for r in results],
+        }, indent=2))
+    else:
+        print("=" * 60)
+        print("LYRA PORTRAIT BATCH RENDER")
+        print("=" * 60)
+        print(f"\nOutput: {args.output}")
+        print(f"\n{'Version':<8} {'Size':>5} {'Base':>10} {'Exprs':>10}  Files")
+        for r in results:
+            base = "cached" if r.cached else f"{r.base_ms:.0f} ms"
+            print(f"{r.version:<8} {r.size:>5} {base:>10} {r.expressions_ms:>7.0f} ms  {len(r.files)}")
+        cached = sum(1 for r in results if r.cached)
+        print(f"\n{total_files} portraits from {len(results)} jobs ({cached} with cached base layers)")
+        print(f"Time: {elapsed:.2f} s")
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
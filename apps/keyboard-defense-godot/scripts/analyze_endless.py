@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Endless Mode Scaling Analyzer
+
+Evaluates the balance recurrences from simulate_balance.py (economy, waves,
+tower DPS) under the endless-mode scaling in sim/endless_mode.gd for
+thousands of days. Instead of building a record per day, it computes whole
+day ranges at once (NumPy when available, closed forms for the capped
+economy) and streams summarized checkpoints.
+
+Reports:
+- Overflow: first day a quantity leaves int32 or exact-float range
+- Stagnation: first day a resource stops changing for the rest of the run
+- Crossover: first day waves outpace towers (TTK limit) or the castle
+
+Usage:
+    python scripts/analyze_endless.py                    # 10,000 days
+    python scripts/analyze_endless.py --days 100000
+    python scripts/analyze_endless.py --checkpoint-every 500
+    python scripts/analyze_endless.py --json
+"""
+
+import json
+import math
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from simulate_balance import BalanceConstants, GameState
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+ENDLESS_MODE_PATH = PROJECT_ROOT / "sim" / "endless_mode.gd"
+
+INT32_MAX = 2**31 - 1
+FLOAT_EXACT_MAX = 2**53
+TTK_LIMIT = 60.0  # Same survivability bound as simulate_combat
+RESOURCES = ["wood", "stone", "food"]
+WAVE_TYPES = ["scout", "raider", "armored"]
+
+
+# ============================================================================
+# ENDLESS CONSTANTS
+# ============================================================================
+
+@dataclass
+class EndlessConstants:
+    """Scaling constants mirrored from sim/endless_mode.gd."""
+    hp_scale: float = 0.08
+    speed_scale: float = 0.02
+    count_scale: float = 0.05
+    damage_scale: float = 0.04
+    veteran_day: int = 8
+    veteran_armor: float = 0.1
+    swarm_day: int = 16
+    swarm_chance: float = 0.2
+    nightmare_day: int = 30
+    nightmare_hp: float = 2.0
+    nightmare_damage: float = 1.5
+
+    @classmethod
+    def from_gdscript(cls, path: Path = ENDLESS_MODE_PATH) -> "EndlessConstants":
+        """Read the constants from endless_mode.gd, keeping defaults for anything missing."""
+        consts = cls()
+        if not path.exists():
+            return consts
+        content = path.read_text(encoding="utf-8")
+
+        def const(name: str) -> Optional[float]:
+            match = re.search(rf"const {name}: float = ([\d.]+)", content)
+            return float(match.group(1)) if match else None
+
+        def modifier(mod_id: str, key: str) -> Optional[float]:
+            block = re.search(rf'"{mod_id}": \{{(.*?)\}}', content, re.DOTALL)
+            if not block:
+                return None
+            match = re.search(rf'"{key}": ([\d.]+)', block.group(1))
+            return float(match.group(1)) if match else None
+
+        for attr, name in (("hp_scale", "HP_SCALE_PER_DAY"), ("speed_scale", "SPEED_SCALE_PER_DAY"),
+                           ("count_scale", "COUNT_SCALE_PER_DAY"), ("damage_scale", "DAMAGE_SCALE_PER_DAY")):
+            value = const(name)
+            if value is not None:
+                setattr(consts, attr, value)
+        for attr, mod_id, key, cast in (
+            ("veteran_day", "veteran_enemies", "start_day", int),
+            ("veteran_armor", "veteran_enemies", "armor_bonus", float),
+            ("swarm_day", "swarm_mode", "start_day", int),
+            ("swarm_chance", "swarm_mode", "swarm_chance", float),
+            ("nightmare_day", "nightmare", "start_day", int),
+            ("nightmare_hp", "nightmare", "hp_mult", float),
+            ("nightmare_damage", "nightmare", "damage_mult", float),
+        ):
+            value = modifier(mod_id, key)
+            if value is not None:
+                setattr(consts, attr, cast(value))
+        return consts
+
+
+@dataclass
+class EndlessReport:
+    """Summary of an endless-mode analysis run."""
+    days: int
+    backend: str
+    checkpoints: List[Dict[str, Any]] = field(default_factory=list)
+    overflow: Dict[str, Dict[str, Optional[int]]] = field(default_factory=dict)
+    stagnation: Dict[str, Optional[int]] = field(default_factory=dict)
+    crossover: Dict[str, Optional[int]] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+
+# ============================================================================
+# CHECKPOINT SCHEDULE
+# ============================================================================
+
+def checkpoint_days(days: int, every: int = 0) -> List[int]:
+    """Checkpoint days: fixed interval, or 1-2-5 log spacing when every <= 0."""
+    if every > 0:
+        marks = set(range(every, days + 1, every))
+    else:
+        marks = set()
+        decade = 1
+        while decade <= days:
+            marks.update(m * decade for m in (1, 2, 5) if m * decade <= days)
+            decade *= 10
+    marks.add(days)
+    return sorted(marks)
+
+
+# ============================================================================
+# ECONOMY (closed form for the capped recurrence)
+# ============================================================================
+
+def _economy_prefix(days: int) -> Dict[str, Any]:
+    """Step the economy while the state-dependent food bonus can still fire.
+
+    Once food starts a day at or above the bonus threshold it cannot drop
+    back below it (production is positive and caps sit above the threshold),
+    so everything after this prefix is a plain capped running sum.
+    """
+    state = GameState()
+    day = 0
+    while day < days and state.resources["food"] < BalanceConstants.MIDGAME_FOOD_BONUS_THRESHOLD:
+        day += 1
+        _step_economy(state, day)
+    return {"day": day, "resources": dict(state.resources)}
+
+
+def _cap_for(resource: str, day: int) -> float:
+    return BalanceConstants.caps_for_day(day).get(resource, math.inf)
+
+
+# ============================================================================
+# VECTORIZED BACKEND
+# ============================================================================
+
+def _numpy_series(days: int, consts: EndlessConstants) -> Dict[str, Any]:
+    """Per-day arrays for every tracked quantity."""
+    d = np.arange(1, days + 1, dtype=np.int64)
+    df = d.astype(np.float64)
+
+    # Endless multipliers (get_scaling) and stacking modifiers
+    hp_mult = 1.0 + (df - 1.0) * consts.hp_scale
+    count_mult = 1.0 + (df - 1.0) * consts.count_scale
+    damage_mult = 1.0 + (df - 1.0) * consts.damage_scale
+    hp_mult *= np.where(d >= consts.veteran_day, 1.0 + consts.veteran_armor, 1.0)
+    hp_mult *= np.where(d >= consts.nightmare_day, consts.nightmare_hp, 1.0)
+    damage_mult *= np.where(d >= consts.nightmare_day, consts.nightmare_damage, 1.0)
+    count_mult *= np.where(d >= consts.swarm_day, 1.0 + consts.swarm_chance, 1.0)
+
+    # Wave composition (BalanceSimulator._generate_wave)
+    counts = {
+        "scout": 2 + d // 2,
+        "raider": np.where(d >= 2, 1 + d // 3, 0),
+        "armored": np.where(d >= 4, d // 4, 0),
+    }
+    base_count = sum(counts.values()).astype(np.float64)
+    base_hp = sum(counts[t] * (BalanceConstants.ENEMY_STATS[t]["hp"] + d * 5) for t in WAVE_TYPES)
+    base_dmg = sum(counts[t] * BalanceConstants.ENEMY_STATS[t]["damage"] for t in WAVE_TYPES)
+    enemy_count = base_count * count_mult
+    wave_hp = base_hp.astype(np.float64) * count_mult * hp_mult
+    wave_damage = base_dmg.astype(np.float64) * count_mult * damage_mult
+
+    # Arrow tower DPS (BalanceSimulator.simulate_combat)
+    tower_dps = ((1 + d // 2) * (5 + d * 2)).astype(np.float64)
+    ttk = wave_hp / tower_dps
+
+    # Economy: r[d] = min(cap[d], r[d-1] + p[d]) has the closed form
+    # r[d] = P[d] + min(r0, min_{k<=d}(cap[k] - P[k])) for cumulative production P.
+    prefix = _economy_prefix(days)
+    start = prefix["day"]
+    snapshots = _prefix_snapshots(start)
+    base = 1 + d // 2
+    production = {"wood": base, "stone": np.maximum(0, base - 1), "food": base}
+    resources = {}
+    for resource in RESOURCES:
+        cap = np.where(d >= 7, _cap_for(resource, 7), np.where(d >= 5, _cap_for(resource, 5), np.inf))
+        values = np.empty(days, dtype=np.float64)
+        values[:start] = [snapshots[day][resource] for day in range(1, start + 1)]
+        tail_p = np.cumsum(production[resource][start:].astype(np.float64))
+        headroom = np.minimum.accumulate(cap[start:] - tail_p)
+        values[start:] = tail_p + np.minimum(prefix["resources"][resource], headroom)
+        resources[resource] = values
+
+    series = {
+        "enemy_count": enemy_count,
+        "wave_hp": wave_hp,
+        "wave_damage": wave_damage,
+        "tower_dps": tower_dps,
+    }
+    return {"series": series, "resources": resources, "ttk": ttk}
+
+
+def _first_day(mask) -> Optional[int]:
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) + 1 if hits.size else None
+
+
+def analyze_numpy(days: int, consts: EndlessConstants, every: int = 0) -> EndlessReport:
+    marks = checkpoint_days(days, every)
+    data = _numpy_series(days, consts)
+    series, resources, ttk = data["series"], data["resources"], data["ttk"]
+
+    report = EndlessReport(days=days, backend="numpy")
+    for day in marks:
+        i = day - 1
+        snapshot = {name: float(values[i]) for name, values in series.items()}
+        snapshot.update({f"res_{r}": int(resources[r][i]) for r in RESOURCES})
+        report.checkpoints.append(_checkpoint(day, snapshot, float(ttk[i])))
+
+    for name, values in series.items():
+        report.overflow[name] = {
+            "int32": _first_day(values > INT32_MAX),
+            "float_exact": _first_day(values > FLOAT_EXACT_MAX),
+            "non_finite": _first_day(~np.isfinite(values)),
+        }
+    for resource in RESOURCES:
+        changes = np.flatnonzero(np.diff(resources[resource]) != 0)
+        last_change = int(changes[-1]) + 2 if changes.size else 1
+        report.stagnation[resource] = last_change if last_change < days else None
+    report.crossover["ttk_limit"] = _first_day(ttk >= TTK_LIMIT)
+    report.crossover["castle_hp"] = _first_day(series["wave_damage"] >= GameState().hp)
+    return report
+
+
+def _prefix_snapshots(prefix_days: int) -> Dict[int, Dict[str, int]]:
+    """Exact resource values for days covered by the stepped prefix."""
+    snapshots = {}
+    state = GameState()
+    for day in range(1, prefix_days + 1):
+        _step_economy(state, day)
+        snapshots[day] = dict(state.resources)
+    return snapshots
+
+
+# ============================================================================
+# STREAMING BACKEND (pure Python)
+# ============================================================================
+
+def _step_economy(state: GameState, day: int) -> None:
+    state.day = day
+    base = 1 + day // 2
+    production = {"wood": base, "stone": max(0, base - 1),
+                  "food": base + BalanceConstants.midgame_food_bonus(state)}
+    caps = BalanceConstants.caps_for_day(day)
+    for resource in RESOURCES:
+        value = state.resources[resource] + production[resource]
+        state.resources[resource] = min(value, caps.get(resource, value))
+
+
+def analyze_streaming(days: int, consts: EndlessConstants, every: int = 0) -> EndlessReport:
+    """Day-by-day evaluation that keeps only running state and checkpoints."""
+    marks = set(checkpoint_days(days, every))
+    report = EndlessReport(days=days, backend="python")
+    names = ["enemy_count", "wave_hp", "wave_damage", "tower_dps"]
+    report.overflow = {n: {"int32": None, "float_exact": None, "non_finite": None} for n in names}
+    report.crossover = {"ttk_limit": None, "castle_hp": None}
+    last_change = {r: 1 for r in RESOURCES}
+    castle_hp = GameState().hp
+    state = GameState()
+
+    for day in range(1, days + 1):
+        before = dict(state.resources)
+        _step_economy(state, day)
+        for resource in RESOURCES:
+            if state.resources[resource] != before[resource]:
+                last_change[resource] = day
+
+        hp_mult = 1.0 + (day - 1) * consts.hp_scale
+        count_mult = 1.0 + (day - 1) * consts.count_scale
+        damage_mult = 1.0 + (day - 1) * consts.damage_scale
+        if day >= consts.veteran_day:
+            hp_mult *= 1.0 + consts.veteran_armor
+        if day >= consts.nightmare_day:
+            hp_mult *= consts.nightmare_hp
+            damage_mult *= consts.nightmare_damage
+        if day >= consts.swarm_day:
+            count_mult *= 1.0 + consts.swarm_chance
+
+        counts = {"scout": 2 + day // 2,
+                  "raider": 1 + day // 3 if day >= 2 else 0,
+                  "armored": day // 4 if day >= 4 else 0}
+        base_hp = sum(counts[t] * (BalanceConstants.ENEMY_STATS[t]["hp"] + day * 5) for t in WAVE_TYPES)
+        base_dmg = sum(counts[t] * BalanceConstants.ENEMY_STATS[t]["damage"] for t in WAVE_TYPES)
+        values = {
+            "enemy_count": float(sum(counts.values())) * count_mult,
+            "wave_hp": float(base_hp) * count_mult * hp_mult,
+            "wave_damage": float(base_dmg) * count_mult * damage_mult,
+            "tower_dps": float((1 + day // 2) * (5 + day * 2)),
+        }
+        ttk = values["wave_hp"] / values["tower_dps"]
+
+        for name, value in values.items():
+            flags = report.overflow[name]
+            if flags["int32"] is None and value > INT32_MAX:
+                flags["int32"] = day
+            if flags["float_exact"] is None and value > FLOAT_EXACT_MAX:
+                flags["float_exact"] = day
+            if flags["non_finite"] is None and not math.isfinite(value):
+                flags["non_finite"] = day
+        if report.crossover["ttk_limit"] is None and ttk >= TTK_LIMIT:
+            report.crossover["ttk_limit"] = day
+        if report.crossover["castle_hp"] is None and values["wave_damage"] >= castle_hp:
+            report.crossover["castle_hp"] = day
+
+        if day in marks:
+            snapshot = dict(values)
+            snapshot.update({f"res_{r}": state.resources[r] for r in RESOURCES})
+            report.checkpoints.append(_checkpoint(day, snapshot, ttk))
+
+    report.stagnation = {r: (last_change[r] if last_change[r] < days else None) for r in RESOURCES}
+    return report
+
+
+def _checkpoint(day: int, snapshot: Dict[str, Any], ttk: float) -> Dict[str, Any]:
+    return {
+        "day": day,
+        "enemy_count": round(snapshot["enemy_count"], 2),
+        "wave_hp": round(snapshot["wave_hp"], 2),
+        "wave_damage": round(snapshot["wave_damage"], 2),
+        "tower_dps": round(snapshot["tower_dps"], 2),
+        "time_to_kill": round(ttk, 3),
+        "resources": {r: snapshot[f"res_{r}"] for r in RESOURCES},
+    }
+
+
+def analyze(days: int, every: int = 0, use_numpy: bool = True) -> EndlessReport:
+    consts = EndlessConstants.from_gdscript()
+    started = time.perf_counter()
+    if use_numpy and HAS_NUMPY:
+        report = analyze_numpy(days, consts, every)
+    else:
+        report = analyze_streaming(days, consts, every)
+    report.elapsed_ms = round((time.perf_counter() - started) * 1000.0, 2)
+    return report
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def _fmt_day(day: Optional[int]) -> str:
+    return f"day {day}" if day is not None else "never"
+
+
+def print_report(report: EndlessReport) -> None:
+    print("=" * 60)
+    print("ENDLESS MODE SCALING ANALYSIS")
+    print("=" * 60)
+    print(f"\nDays: {report.days:,}  Backend: {report.backend}  Time: {report.elapsed_ms:.1f} ms")
+
+    print("\n## CHECKPOINTS")
+    print(f"  {'Day':>7} {'Enemies':>12} {'Wave HP':>16} {'Wave Dmg':>12} {'Tower DPS':>12} {'TTK':>10}  Resources")
+    for cp in report.checkpoints:
+        res = cp["resources"]
+        print(f"  {cp['day']:>7} {cp['enemy_count']:>12,.1f} {cp['wave_hp']:>16,.0f} "
+              f"{cp['wave_damage']:>12,.1f} {cp['tower_dps']:>12,.0f} {cp['time_to_kill']:>10.2f}  "
+              f"W{res['wood']} S{res['stone']} F{res['food']}")
+
+    print("\n## OVERFLOW")
+    for name, flags in report.overflow.items():
+        print(f"  {name:<12} int32: {_fmt_day(flags['int32']):<10} "
+              f"float exact: {_fmt_day(flags['float_exact']):<10} non-finite: {_fmt_day(flags['non_finite'])}")
+
+    print("\n## STAGNATION")
+    for resource, day in report.stagnation.items():
+        print(f"  {resource:<6} flat from {_fmt_day(day)}")
+
+    print("\n## CROSSOVER")
+    print(f"  TTK >= {TTK_LIMIT:.0f}s:        {_fmt_day(report.crossover['ttk_limit'])}")
+    print(f"  Wave damage >= castle: {_fmt_day(report.crossover['castle_hp'])}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analyze endless-mode scaling over many days")
+    parser.add_argument("--days", "-d", type=int, default=10000, help="Days to analyze")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="Checkpoint interval (default: 1-2-5 log spacing)")
+    parser.add_argument("--no-numpy", action="store_true", help="Force the pure-Python streaming backend")
+    parser.add_argument("--json", "-j", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    if args.days < 1:
+        print("ERROR: --days must be at least 1", file=sys.stderr)
+        sys.exit(2)
+
+    report = analyze(args.days, args.checkpoint_every, use_numpy=not args.no_numpy)
+
+    if args.json:
+        print(json.dumps(report.__dict__, indent=2))
+    else:
+        print_report(report)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Build Order Search
+
+Searches for the strongest economic openings over the first days of a run.
+Each day the player spends AP on build / upgrade / kingdom-upgrade actions
+(one action each), then production from buildings.json, building_upgrades.json and
+kingdom_upgrades.json lands on top of the baseline income used by
+simulate_balance.py (production formula, midgame caps). Gold follows the
+game's sources through the same model: kill gold for the day's wave scaled
+by gold_multiplier, treasury gold_income and gold_per_building taxes.
+
+Openings respect the same limits as the game: limit_per_map and requires from
+buildings.json, one structure per buildable tile of the starting discovered
+area, and a worker pool that grows by one per day (SimWorkers) and staffs
+worker_slots for +50% production at one food upkeep each. Resources are
+valued in gold at the SimTrade base sell rates rather than counted 1:1.
+
+States are compact tuples (resources, building counts per level, kingdom
+upgrade mask) so identical states reached through different action orders
+collapse, and day transitions are memoized. A beam search keeps the best
+states per day within a fixed CPU budget; when the budget runs out the
+remaining days are finished greedily.
+
+Usage:
+    python scripts/build_order_search.py                  # 14 days
+    python scripts/build_order_search.py --days 20 --beam-width 128
+    python scripts/build_order_search.py --budget 5 --top 3
+    python scripts/build_order_search.py --no-kingdom --json
+"""
+
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from simulate_balance import BalanceConstants, BalanceSimulator, GameState, GoldEffects
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+DATA_DIR = PROJECT_ROOT / "data"
+
+RESOURCES = ("wood", "stone", "food", "gold")
+DEFAULT_AP = 3  # GameState.ap_max
+DEFAULT_START_GOLD = 10  # DefaultState.create()
+STARTING_DISCOVERY_RADIUS = 5  # DefaultState._discover_starting_area()
+BUILDABLE_TILES = (2 * STARTING_DISCOVERY_RADIUS + 1) ** 2 - 1  # Minus the castle tile
+START_WORKERS = 3  # GameState.total_workers
+MAX_WORKERS = 10  # GameState.max_workers
+WORKER_PRODUCTION_BONUS = 0.5  # SimWorkers, per worker on a building
+WORKER_UPKEEP = 1  # GameState.worker_upkeep, food per assigned worker
+
+# Gold per unit when sold (SimTrade.BASE_RATES *_to_gold)
+RESOURCE_VALUE = (0.33, 0.5, 0.5, 1.0)
+
+# Tuple state layout
+R_WOOD, R_STONE, R_FOOD, R_GOLD = range(4)
+
+
+@dataclass
+class EconomyData:
+    """Economic building and upgrade data."""
+    buildings: List[str]
+    build_cost: Dict[str, Tuple[int, ...]]
+    max_level: Dict[str, int]
+    level_cost: Dict[str, Dict[int, Tuple[int, ...]]]
+    level_production: Dict[str, Dict[int, Tuple[int, ...]]]
+    level_cost_reduction: Dict[str, Dict[int, float]]
+    level_workers: Dict[str, Dict[int, int]]
+    limit: Dict[str, int]
+    requires: Dict[str, List[str]]
+    kingdom: List[Dict[str, Any]]
+
+    @classmethod
+    def load(cls, include_kingdom: bool = True) -> "EconomyData":
+        with open(DATA_DIR / "buildings.json", encoding="utf-8") as f:
+            buildings = json.load(f).get("buildings", {})
+        with open(DATA_DIR / "building_upgrades.json", encoding="utf-8") as f:
+            upgrades = json.load(f).get("upgrades", {})
+        kingdom = []
+        if include_kingdom:
+            with open(DATA_DIR / "kingdom_upgrades.json", encoding="utf-8") as f:
+                kingdom = json.load(f).get("upgrades", [])
+
+        def vec(mapping: Dict[str, Any]) -> Tuple[int, ...]:
+            return tuple(int(mapping.get(r, 0)) for r in RESOURCES)
+
+        names, build_cost, max_level = [], {}, {}
+        level_cost, level_production, level_reduction, level_workers = {}, {}, {}, {}
+        limit, requires = {}, {}
+        for name, config in buildings.items():
+            levels = upgrades.get(name, {}).get("levels", {})
+            effects = config.get("effects", {})
+            produces = bool(config.get("production")) or any(l.get("production") for l in levels.values())
+            reduces = "build_cost_reduction" in effects
+            if not produces and not reduces:
+                continue  # Defense-only buildings do not change the economy
+            names.append(name)
+            build_cost[name] = vec(config.get("cost", {}))
+            max_level[name] = int(upgrades.get(name, {}).get("max_level", 1))
+            level_cost[name] = {int(l): vec(v.get("cost", {})) for l, v in levels.items()}
+            level_production[name] = {1: vec(config.get("production", {}))}
+            level_reduction[name] = {1: float(effects.get("build_cost_reduction", 0.0))}
+            level_workers[name] = {1: int(config.get("worker_slots", 0))}
+            limit[name] = int(config.get("limit_per_map", 0))
+            requires[name] = list(config.get("requires", []))
+            for l, v in levels.items():
+                if v.get("production"):
+                    level_production[name][int(l)] = vec(v["production"])
+                if "build_cost_reduction" in v.get("effects", {}):
+                    level_reduction[name][int(l)] = float(v["effects"]["build_cost_reduction"])
+                if "worker_slots" in v:
+                    level_workers[name][int(l)] = int(v["worker_slots"])
+            for l in range(2, max_level[name] + 1):
+                level_production[name].setdefault(l, level_production[name][l - 1])
+                level_reduction[name].setdefault(l, level_reduction[name][l - 1])
+                level_workers[name].setdefault(l, level_workers[name][l - 1])
+        return cls(names, build_cost, max_level, level_cost, level_production, level_reduction,
+                   level_workers, limit, requires, kingdom)
+
+
+@dataclass
+class Opening:
+    """A build order and its economic outcome."""
+    score: int
+    workers: int
+    actions: List[List[str]]
+    final_resources: Dict[str, int]
+    final_income: Dict[str, int]
+    buildings: Dict[str, List[int]]
+    kingdom_upgrades: List[str] = field(default_factory=list)
+
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+class BuildOrderSearch:
+    """Beam search over per-day build/upgrade action sets."""
+
+    def __init__(self, data: EconomyData, days: int, ap: int = DEFAULT_AP,
+                 adjacency: bool = True, tiles: int = BUILDABLE_TILES):
+        self.data = data
+        self.days = days
+        self.ap = ap
+        self.adjacency = adjacency
+        self.tiles = tiles
+        self.n_buildings = len(data.buildings)
+        self.slot = {name: i for i, name in enumerate(data.buildings)}
+        self.simulator = BalanceSimulator()
+        start = GameState()
+        self.base_income: List[Tuple[int, ...]] = [(0, 0, 0, 0)]
+        for day in range(1, days + 1):
+            start.day = day
+            production = self.simulator._calculate_production(start)
+            self.base_income.append(tuple(production.get(r, 0) for r in RESOURCES))
+        self.start_resources = tuple(GameState().resources.get(r, 0) for r in RESOURCES[:3]) + (DEFAULT_START_GOLD,)
+        self._kingdom_bits = {u.get("id"): 1 << i for i, u in enumerate(data.kingdom)}
+        self._income_memo: Dict[Tuple[Tuple[Tuple[int, ...], ...], int, int], Tuple[int, ...]] = {}
+        self._reduction_memo: Dict[Tuple[Tuple[int, ...], ...], float] = {}
+        self._gold_memo: Dict[Tuple[int, int, int], int] = {}
+        self._expand_memo: Dict[Tuple[Any, ...], List[Tuple[Any, ...]]] = {}
+
+    # --- state helpers -----------------------------------------------------
+
+    def _empty_levels(self) -> Tuple[Tuple[int, ...], ...]:
+        return tuple((0,) * self.data.max_level[name] for name in self.data.buildings)
+
+    @staticmethod
+    def workers_for_day(day: int) -> int:
+        """Worker pool on a given day: one more each completed day, up to the cap."""
+        return min(MAX_WORKERS, START_WORKERS + day - 1)
+
+    @staticmethod
+    def value(amounts: Tuple[int, ...]) -> float:
+        return sum(v * a for v, a in zip(RESOURCE_VALUE, amounts))
+
+    def _kingdom_effects(self, mask: int) -> Tuple[float, GoldEffects]:
+        owned = [u.get("effects", {}) for i, u in enumerate(self.data.kingdom) if mask & (1 << i)]
+        resource_mult = sum(float(effects.get("resource_multiplier", 0.0)) for effects in owned)
+        return resource_mult, GoldEffects.from_effects(owned)
+
+    def gold_income(self, day: int, levels: Tuple[Tuple[int, ...], ...], mask: int) -> int:
+        """Kill, treasury and tax gold for a day (simulate_balance gold model)."""
+        structures = sum(sum(counts) for counts in levels)
+        key = (day, mask, structures)
+        cached = self._gold_memo.get(key)
+        if cached is None:
+            _, effects = self._kingdom_effects(mask)
+            cached = sum(self.simulator._calculate_gold_income(day, effects, structures).values())
+            self._gold_memo[key] = cached
+        return cached
+
+    def _cost_reduction(self, levels: Tuple[Tuple[int, ...], ...]) -> float:
+        cached = self._reduction_memo.get(levels)
+        if cached is not None:
+            return cached
+        best = 0.0
+        for name, counts in zip(self.data.buildings, levels):
+            for level, count in enumerate(counts, 1):
+                if count:
+                    best = max(best, self.data.level_cost_reduction[name].get(level, 0.0))
+        self._reduction_memo[levels] = best
+        return best
+
+    def _staffing(self, levels: Tuple[Tuple[int, ...], ...], workers: int) -> List[int]:
+        """Extra production from the best worker assignments, net of food upkeep."""
+        upkeep = RESOURCE_VALUE[R_FOOD] * WORKER_UPKEEP
+        slots = []
+        for name, counts in zip(self.data.buildings, levels):
+            for level, count in enumerate(counts, 1):
+                if not count:
+                    continue
+                production = self.data.level_production[name][level]
+                for k in range(1, self.data.level_workers[name].get(level, 0) + 1):
+                    # SimWorkers.daily_production_with_workers floors each building's boosted output
+                    gain = tuple(int(p * (1.0 + k * WORKER_PRODUCTION_BONUS))
+                                 - int(p * (1.0 + (k - 1) * WORKER_PRODUCTION_BONUS)) for p in production)
+                    if self.value(gain) > upkeep:
+                        slots.append((self.value(gain), gain, count))
+        slots.sort(key=lambda slot: slot[0], reverse=True)
+        totals = [0, 0, 0, 0]
+        for _, gain, count in slots:
+            if workers <= 0:
+                break
+            staffed = min(count, workers)
+            workers -= staffed
+            for i, amount in enumerate(gain):
+                totals[i] += amount * staffed
+            totals[R_FOOD] -= WORKER_UPKEEP * staffed
+        return totals
+
+    def income(self, levels: Tuple[Tuple[int, ...], ...], mask: int, workers: int = 0) -> Tuple[int, ...]:
+        """Daily production from buildings, workers and kingdom upgrades (excluding baseline and gold_income)."""
+        key = (levels, mask, workers)
+        cached = self._income_memo.get(key)
+        if cached is not None:
+            return cached
+        totals = self._staffing(levels, workers)
+        for name, counts in zip(self.data.buildings, levels):
+            owned = sum(counts)
+            for level, count in enumerate(counts, 1):
+                for i, amount in enumerate(self.data.level_production[name][level]):
+                    totals[i] += amount * count
+            if self.adjacency and owned > 1:
+                # Clustered layout: each extra copy borders one of its own type
+                for i, amount in enumerate(self.data.level_production[name][1]):
+                    if amount and i != R_GOLD:
+                        totals[i] += owned - 1
+        resource_mult, _ = self._kingdom_effects(mask)
+        result = (
+            int(totals[R_WOOD] * (1.0 + resource_mult)),
+            int(totals[R_STONE] * (1.0 + resource_mult)),
+            int(totals[R_FOOD] * (1.0 + resource_mult)),
+            totals[R_GOLD],  # gold_multiplier scales kill gold, not building production
+        )
+        self._income_memo[key] = result
+        return result
+
+    # --- transitions -------------------------------------------------------
+
+    def _actions(self, state: Tuple[Any, ...]) -> List[Tuple[str, Tuple[Any, ...]]]:
+        """Every single affordable action and the state it leads to."""
+        res, levels, mask, ap = state
+        results = []
+        if ap > 0:
+            reduction = self._cost_reduction(levels)
+            free_tiles = self.tiles - sum(sum(counts) for counts in levels)
+            for name in self.data.buildings:
+                cost = tuple(max(1, int(c * (1.0 - reduction))) if c else 0 for c in self.data.build_cost[name])
+                if free_tiles > 0 and self._can_place(name, levels) and all(r >= c for r, c in zip(res, cost)):
+                    new_levels = list(levels)
+                    counts = list(levels[self.slot[name]])
+                    counts[0] += 1
+                    new_levels[self.slot[name]] = tuple(counts)
+                    results.append((f"build {name}",
+                                    (tuple(r - c for r, c in zip(res, cost)), tuple(new_levels), mask, ap - 1)))
+                counts = levels[self.slot[name]]
+                for level in range(1, self.data.max_level[name]):
+                    if not counts[level - 1]:
+                        continue
+                    cost = self.data.level_cost[name].get(level + 1, (0, 0, 0, 0))
+                    if not all(r >= c for r, c in zip(res, cost)):
+                        continue
+                    new_counts = list(counts)
+                    new_counts[level - 1] -= 1
+                    new_counts[level] += 1
+                    new_levels = list(levels)
+                    new_levels[self.slot[name]] = tuple(new_counts)
+                    results.append((f"upgrade {name} {level}->{level + 1}",
+                                    (tuple(r - c for r, c in zip(res, cost)), tuple(new_levels), mask, ap - 1)))
+        for i, upgrade in enumerate(self.data.kingdom):
+            if ap <= 0 or mask & (1 << i):
+                continue
+            cost = int(upgrade.get("cost", 0))
+            if res[R_GOLD] < cost:
+                continue
+            requires = upgrade.get("requires", [])
+            if any(req in self._kingdom_bits and not mask & self._kingdom_bits[req] for req in requires):
+                continue
+            new_res = res[:R_GOLD] + (res[R_GOLD] - cost,)
+            results.append((f"buy {upgrade.get('id')}", (new_res, levels, mask | (1 << i), ap - 1)))
+        return results
+
+    def _can_place(self, name: str, levels: Tuple[Tuple[int, ...], ...]) -> bool:
+        """limit_per_map and requires from buildings.json (SimBuildings)."""
+        limit = self.data.limit[name]
+        if limit and sum(levels[self.slot[name]]) >= limit:
+            return False
+        # Requirements outside the economic set are never built by this search
+        return all(req in self.slot and sum(levels[self.slot[req]]) for req in self.data.requires[name])
+
+    def expand_day(self, res: Tuple[int, ...], levels: Tuple[Tuple[int, ...], ...], mask: int) -> List[Tuple[Any, ...]]:
+        """All distinct end-of-actions states reachable in one day, with one action list each."""
+        key = (res, levels, mask)
+        cached = self._expand_memo.get(key)
+        if cached is not None:
+            return cached
+        start = (res, levels, mask, self.ap)
+        seen: Dict[Tuple[Any, ...], List[str]] = {(res, levels, mask): []}
+        frontier = [(start, [])]
+        while frontier:
+            next_frontier = []
+            for state, path in frontier:
+                for label, new_state in self._actions(state):
+                    compact = new_state[:3]
+                    if compact in seen:
+                        continue
+                    seen[compact] = path + [label]
+                    next_frontier.append((new_state, path + [label]))
+            frontier = next_frontier
+        result = [(compact[0], compact[1], compact[2], actions) for compact, actions in seen.items()]
+        self._expand_memo[key] = result
+        return result
+
+    def end_day(self, day: int, res: Tuple[int, ...], levels, mask: int) -> Tuple[Tuple[int, ...], float]:
+        """Apply production and caps. Returns (resources, gold value banked today)."""
+        income = self.income(levels, mask, self.workers_for_day(day))
+        base = self.base_income[day][:R_GOLD] + (self.gold_income(day, levels, mask),)
+        caps = BalanceConstants.caps_for_day(day)
+        new_res = []
+        gained = 0.0
+        for i, resource in enumerate(RESOURCES):
+            value = max(0, res[i] + income[i] + base[i])
+            cap = caps.get(resource)
+            if cap is not None:
+                value = min(value, max(cap, res[i]))
+            gained += RESOURCE_VALUE[i] * max(0, value - res[i])
+            new_res.append(value)
+        return tuple(new_res), gained
+
+    def _heuristic(self, day: int, entry: Tuple[Any, ...]) -> float:
+        res, levels, mask, banked = entry[:4]
+        rate = self.value(self.income(levels, mask, self.workers_for_day(day + 1)))
+        rate += self.gold_income(min(day + 1, self.days), levels, mask)
+        return banked + rate * (self.days - day)
+
+    def search(self, beam_width: int = 32, budget: float = 10.0, top: int = 1) -> Dict[str, Any]:
+        started = time.perf_counter()
+        # entry: (resources, levels, mask, banked, history)
+        beam = [(self.start_resources, self._empty_levels(), 0, 0.0, ())]
+        width = beam_width
+        truncated_day = None
+        for day in range(1, self.days + 1):
+            if width > 1 and time.perf_counter() - started > budget:
+                width = 1
+                truncated_day = day
+                beam = beam[:1]
+            candidates: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+            for rank, (res, levels, mask, banked, history) in enumerate(beam):
+                # Beam is best-first: past the budget, finish only the states already expanded
+                if rank and time.perf_counter() - started > budget:
+                    break
+                for new_res, new_levels, new_mask, actions in self.expand_day(res, levels, mask):
+                    end_res, gained = self.end_day(day, new_res, new_levels, new_mask)
+                    key = (end_res, new_levels, new_mask)
+                    entry = (end_res, new_levels, new_mask, banked + gained, history + (tuple(actions),))
+                    if key not in candidates or entry[3] > candidates[key][3]:
+                        candidates[key] = entry
+            ranked = sorted(candidates.values(), key=lambda e: self._heuristic(day, e), reverse=True)
+            beam = ranked[:width]
+        openings = [self._to_opening(entry) for entry in sorted(beam, key=lambda e: e[3], reverse=True)[:top]]
+        return {
+            "days": self.days,
+            "ap_per_day": self.ap,
+            "beam_width": beam_width,
+            "tiles": self.tiles,
+            "budget_seconds": budget,
+            "greedy_from_day": truncated_day,
+            "states_memoized": len(self._expand_memo),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
+            "openings": [o.__dict__ for o in openings],
+        }
+
+    def _to_opening(self, entry: Tuple[Any, ...]) -> Opening:
+        res, levels, mask, banked, history = entry
+        workers = self.workers_for_day(self.days)
+        income = self.income(levels, mask, workers)
+        income = income[:R_GOLD] + (income[R_GOLD] + self.gold_income(self.days, levels, mask),)
+        return Opening(
+            score=round(banked),
+            workers=workers,
+            actions=[list(day_actions) for day_actions in history],
+            final_resources=dict(zip(RESOURCES, res)),
+            final_income=dict(zip(RESOURCES, income)),
+            buildings={name: list(counts) for name, counts in zip(self.data.buildings, levels) if sum(counts)},
+            kingdom_upgrades=[u.get("id") for i, u in enumerate(self.data.kingdom) if mask & (1 << i)],
+        )
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search for strong economic build orders")
+    parser.add_argument("--days", "-d", type=int, default=14, help="Days to plan")
+    parser.add_argument("--ap", type=int, default=DEFAULT_AP, help="Build/upgrade actions per day")
+    parser.add_argument("--beam-width", "-b", type=int, default=32, help="States kept per day")
+    parser.add_argument("--budget", type=float, default=10.0, help="CPU budget in seconds")
+    parser.add_argument("--top", type=int, default=1, help="Openings to report")
+    parser.add_argument("--no-kingdom", action="store_true", help="Ignore kingdom upgrades")
+    parser.add_argument("--no-adjacency", action="store_true", help="Ignore same-type adjacency bonuses")
+    parser.add_argument("--tiles", type=int, default=BUILDABLE_TILES,
+                        help="Buildable tiles (default: starting discovered area)")
+    parser.add_argument("--json", "-j", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    data = EconomyData.load(include_kingdom=not args.no_kingdom)
+    searcher = BuildOrderSearch(data, args.days, args.ap, adjacency=not args.no_adjacency, tiles=args.tiles)
+    result = searcher.search(args.beam_width, args.budget, args.top)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        sys.exit(0)
+
+    print("=" * 60)
+    print("BUILD ORDER SEARCH")
+    print("=" * 60)
+    print(f"\nDays: {result['days']}  AP/day: {result['ap_per_day']}  Beam: {result['beam_width']}  "
+          f"Tiles: {result['tiles']}  Time: {result['elapsed_ms']:.0f} ms")
+    if result["greedy_from_day"]:
+        print(f"Budget exhausted: greedy from day {result['greedy_from_day']}")
+
+    for rank, opening in enumerate(result["openings"], 1):
+        print(f"\n## OPENING #{rank} (gold value banked: {opening['score']})")
+        for day, actions in enumerate(opening["actions"], 1):
+            print(f"  Day {day:>2}: {', '.join(actions) if actions else '-'}")
+        print(f"  Buildings: {opening['buildings']}")
+        if opening["kingdom_upgrades"]:
+            print(f"  Kingdom: {', '.join(opening['kingdom_upgrades'])}")
+        print(f"  Income/day: {opening['final_income']} ({opening['workers']} workers)")
+        print(f"  Final: {opening['final_resources']}")
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Lesson Word Pool Builder
+
+Precomputes the enemy word pools of every wordlist lesson so SimWords does not
+filter the lesson wordlist on every spawn or sort it for every boss. Lessons are
+normalized like sim/lessons.gd, and each pool is exactly the list
+SimWords._filter_wordlist() would build for that enemy kind: wordlist order,
+duplicates kept, full list when no word fits the length range. The "boss"
+pool is the wordlist ordered longest first, equal lengths in wordlist order
+(SimWords._sort_longest_first; the runtime sort used to be unstable, so ties
+between equal-length boss words may come out in a different order than
+before). Charset and sentence lessons generate their words at runtime and get
+no pools.
+
+Output is data/lesson_word_pools.json (committed, loaded by SimLessons): one
+sorted, deduplicated string table plus per-lesson index arrays. Each lesson
+records a source hash of its normalized lengths and wordlist
+(SimLessons.word_pool_source_hash computes the same value); SimLessons ignores
+a pool whose hash no longer matches lessons.json and SimWords filters instead.
+Lessons whose source hash is unchanged keep their previous pools; the file is
+only rewritten when something changed. Run --check after editing
+data/lessons.json (precommit.sh does) to catch a stale pool file.
+
+Usage:
+    python scripts/build_word_pools.py               # Build / update pools
+    python scripts/build_word_pools.py --check       # Exit 1 if out of date
+    python scripts/build_word_pools.py --force       # Rebuild every lesson
+    python scripts/build_word_pools.py --json
+"""
+
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from scenario_sim import LESSON_KINDS, load_lessons
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+LESSONS_PATH = PROJECT_ROOT / "data" / "lessons.json"
+POOLS_PATH = PROJECT_ROOT / "data" / "lesson_word_pools.json"
+
+POOLS_VERSION = 3
+POOL_KEYS = LESSON_KINDS + ["boss"]
+
+
+def source_hash(lesson: Dict[str, Any]) -> str:
+    """Hash of a lesson's pool inputs; must match SimLessons.word_pool_source_hash."""
+    lines = [f"{kind}:{lesson['lengths'][kind][0]}-{lesson['lengths'][kind][1]}" for kind in LESSON_KINDS]
+    lines.extend(lesson["wordlist"])
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()[:16]
+
+
+# ============================================================================
+# POOL BUILDING
+# ============================================================================
+
+def lesson_pool(lesson: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Enemy word pools for one wordlist lesson, in SimWords selection order."""
+    wordlist = lesson["wordlist"]
+    pools: Dict[str, List[str]] = {}
+    for kind in LESSON_KINDS:
+        min_len, max_len = lesson["lengths"][kind]
+        # Same fallback as SimWords: the whole list when nothing fits
+        pools[kind] = [w for w in wordlist if min_len <= len(w) <= max_len] or list(wordlist)
+    # Stable: equal lengths keep wordlist order, like SimWords._sort_longest_first
+    pools["boss"] = sorted(wordlist, key=len, reverse=True)
+    return pools
+
+
+def build_pools(force: bool = False) -> Dict[str, Any]:
+    """Build the pool file contents, reusing unchanged lessons from the last build."""
+    lessons = load_lessons(LESSONS_PATH)
+
+    previous: Dict[str, Any] = {}
+    if POOLS_PATH.exists() and not force:
+        try:
+            previous = json.loads(POOLS_PATH.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            previous = {}
+    if previous.get("version") != POOLS_VERSION:
+        previous = {}
+    old_strings = previous.get("strings", [])
+    old_lessons = previous.get("lessons", {})
+
+    resolved: Dict[str, Dict[str, Any]] = {}
+    rebuilt: List[str] = []
+    for lesson_id in lessons["order"]:
+        lesson = lessons["by_id"][lesson_id]
+        if lesson["mode"] != "wordlist" or not lesson["wordlist"]:
+            continue
+        source = source_hash(lesson)
+        old = old_lessons.get(lesson_id)
+        if old and old.get("source") == source:
+            pools = {key: [old_strings[i] for i in old.get(key, [])] for key in POOL_KEYS}
+        else:
+            pools = lesson_pool(lesson)
+            rebuilt.append(lesson_id)
+        resolved[lesson_id] = {"source": source, "pools": pools}
+
+    # Intern every pooled word once; lessons store indices into the table
+    strings = sorted({w for entry in resolved.values() for words in entry["pools"].values() for w in words})
+    string_index = {word: i for i, word in enumerate(strings)}
+    output_lessons = {}
+    for lesson_id, entry in resolved.items():
+        record: Dict[str, Any] = {"source": entry["source"]}
+        for key in POOL_KEYS:
+            record[key] = [string_index[w] for w in entry["pools"][key]]
+        output_lessons[lesson_id] = record
+
+    return {
+        "data": {
+            "version": POOLS_VERSION,
+            "strings": strings,
+            "lessons": output_lessons,
+        },
+        "rebuilt": rebuilt,
+        "reused": len(resolved) - len(rebuilt),
+    }
+
+
+def serialize(data: Dict[str, Any]) -> str:
+    """Compact JSON with one line per lesson so diffs stay readable."""
+    lines = ["{"]
+    lines.append(f'"version":{data["version"]},')
+    lines.append(f'"strings":{json.dumps(data["strings"], separators=(",", ":"))},')
+    lines.append('"lessons":{')
+    entries = [f"{json.dumps(lesson_id)}:{json.dumps(record, separators=(',', ':'))}"
+               for lesson_id, record in data["lessons"].items()]
+    lines.append(",\n".join(entries))
+    lines.append("}")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute enemy word pools for wordlist lessons")
+    parser.add_argument("--check", action="store_true", help="Only report; exit 1 if the pool file is stale")
+    parser.add_argument("--force", action="store_true", help="Rebuild every lesson")
+    parser.add_argument("--json", action="store_true", help="Output summary as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = build_pools(args.force)
+    text = serialize(result["data"])
+    current = POOLS_PATH.read_text(encoding="utf-8") if POOLS_PATH.exists() else ""
+    changed = text != current
+    if changed and not args.check:
+        POOLS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        POOLS_PATH.write_text(text, encoding="utf-8")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    lessons = result["data"]["lessons"]
+    summary = {
+        "path": str(POOLS_PATH.relative_to(PROJECT_ROOT)),
+        "lessons": len(lessons),
+        "strings": len(result["data"]["strings"]),
+        "rebuilt": result["rebuilt"],
+        "reused": result["reused"],
+        "changed": changed,
+        "bytes": len(text.encode("utf-8")),
+        "elapsed_ms": round(elapsed_ms, 1),
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print("=" * 60)
+        print("LESSON WORD POOLS")
+        print("=" * 60)
+        print(f"\nOutput: {summary['path']} ({summary['bytes']:,} bytes)")
+        print(f"Strings: {summary['strings']}")
+        print(f"Lessons: {summary['lessons']} ({len(summary['rebuilt'])} rebuilt, {summary['reused']} reused)")
+        status = "up to date" if not changed else ("STALE" if args.check else "written")
+        print(f"Status: {status}  Time: {elapsed_ms:.0f} ms")
+
+    sys.exit(1 if args.check and changed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+#!/bin/bash
+# Lesson Word Pool Builder
+# Wrapper script for build_word_pools.py
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+
+cd "$PROJECT_ROOT"
+
+# Check for Python
+if ! command -v python3 &> /dev/null; then
+    echo "ERROR: python3 not found"
+    exit 1
+fi
+
+# Build the pools
+python3 scripts/build_word_pools.py "$@"
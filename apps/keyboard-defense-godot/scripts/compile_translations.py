@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Translation Catalog Compiler
+
+Builds one key index over data/translations/*.json (interned dotted keys,
+one column per locale) and reports coverage against English:
+
+- Missing: keys English has that a locale lacks
+- Extra: keys a locale has that English does not
+- Placeholders: translations whose {placeholders} differ from English
+- Unused: keys never referenced from .gd / .tscn files, either literally or
+  under a prefix the code builds keys from (get_category_keys("help"),
+  "help.%s" % command, "help." + command) or passed with --allow-prefix
+- Undefined: keys passed to SimLocale.get_text()/has_key() that do not exist
+
+Key usage is found with one combined regex pass over the code. The index is
+exported as a compact binary catalog (sorted key table plus per-locale offset
+arrays and string blobs) that loads in a single read. Parsed locale columns
+are cached by file hash, so only changed locales are re-read.
+
+The catalog gives no runtime benefit: the game still loads
+data/translations/*.json through SimLocale and nothing reads the catalog.
+It is written to the gitignored Logs/cache/ by default and only serves to
+measure load time against the JSON files.
+
+Usage:
+    python scripts/compile_translations.py                 # Report + export
+    python scripts/compile_translations.py --locale de     # Details for one locale
+    python scripts/compile_translations.py --output build/translations.catalog
+    python scripts/compile_translations.py --allow-prefix tutorial.
+    python scripts/compile_translations.py --json
+"""
+
+import hashlib
+import json
+import re
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+TRANSLATIONS_DIR = PROJECT_ROOT / "data" / "translations"
+CACHE_PATH = PROJECT_ROOT / "Logs" / "cache" / "translations_index.json"
+CATALOG_PATH = PROJECT_ROOT / "Logs" / "cache" / "translations.catalog"
+
+DEFAULT_LOCALE = "en"
+METADATA_KEYS = {"version", "locale", "name"}
+CATALOG_MAGIC = b"KDTC"
+CATALOG_VERSION = 1
+SCAN_PATTERNS = ["*.gd", "*.tscn"]
+SKIP_DIRS = {".godot", ".import", "Logs"}
+
+# One pass over each file finds, as alternatives of a single pattern:
+# - a category lookup, whose keys are built at runtime;
+# - a string literal that looks like a dotted key, and whether it is the first
+#   argument of a lookup call;
+# - a literal prefix completed by a format string or concatenation.
+# Every key under a category or prefix counts as used.
+USAGE_PATTERN = re.compile(
+    r'\bget_category_keys\(\s*"(?P<category>[A-Za-z_][A-Za-z0-9_.]*)"\s*\)'
+    r'|(?P<call>\b(?:get_text|has_key|tr)\(\s*)?"(?P<key>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)+)"'
+    r'|"(?P<prefix>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)*\.)(?:%[sd]"|"\s*\+)'
+)
+PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+
+# ============================================================================
+# KEY INDEX
+# ============================================================================
+
+def flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, str]:
+    """Nested translation dict -> {"ui.save": "Save", ...} (SimLocale dotted lookup)."""
+    flat: Dict[str, str] = {}
+    for key, value in data.items():
+        if not prefix and key in METADATA_KEYS:
+            continue
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, dotted + "."))
+        else:
+            flat[dotted] = str(value)
+    return flat
+
+
+class TranslationIndex:
+    """Interned key table with one value column per locale (None = missing)."""
+
+    def __init__(self, locales: Dict[str, Dict[str, str]]):
+        self.locales = sorted(locales, key=lambda loc: (loc != DEFAULT_LOCALE, loc))
+        self.keys: List[str] = sorted({k for flat in locales.values() for k in flat})
+        self.key_ids = {key: i for i, key in enumerate(self.keys)}
+        self.columns: Dict[str, List[Optional[str]]] = {
+            locale: [locales[locale].get(key) for key in self.keys] for locale in self.locales
+        }
+
+    def reference(self) -> List[Optional[str]]:
+        return self.columns.get(DEFAULT_LOCALE, [None] * len(self.keys))
+
+    def missing(self, locale: str) -> List[str]:
+        ref, col = self.reference(), self.columns[locale]
+        return [self.keys[i] for i in range(len(self.keys)) if ref[i] is not None and col[i] is None]
+
+    def extra(self, locale: str) -> List[str]:
+        ref, col = self.reference(), self.columns[locale]
+        return [self.keys[i] for i in range(len(self.keys)) if ref[i] is None and col[i] is not None]
+
+    def placeholder_mismatches(self, locale: str) -> List[str]:
+        ref, col = self.reference(), self.columns[locale]
+        return [self.keys[i] for i in range(len(self.keys))
+                if ref[i] is not None and col[i] is not None
+                and set(PLACEHOLDER_PATTERN.findall(ref[i])) != set(PLACEHOLDER_PATTERN.findall(col[i]))]
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def load_locales(use_cache: bool = True) -> Tuple[Dict[str, Dict[str, str]], List[str]]:
+    """Flattened locales, re-parsing only files whose hash changed."""
+    cache: Dict[str, Any] = {}
+    if use_cache and CACHE_PATH.exists():
+        try:
+            cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            cache = {}
+    locales: Dict[str, Dict[str, str]] = {}
+    parsed: List[str] = []
+    fresh_cache: Dict[str, Any] = {}
+    for path in sorted(TRANSLATIONS_DIR.glob("*.json")):
+        locale = path.stem
+        digest = _file_hash(path)
+        entry = cache.get(locale)
+        if entry and entry.get("hash") == digest:
+            flat = entry["entries"]
+        else:
+            with open(path, encoding="utf-8") as f:
+                flat = flatten(json.load(f))
+            parsed.append(locale)
+        locales[locale] = flat
+        fresh_cache[locale] = {"hash": digest, "entries": flat}
+    if use_cache and (parsed or set(cache) != set(fresh_cache)):
+        try:
+            CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            CACHE_PATH.write_text(json.dumps(fresh_cache, ensure_ascii=False), encoding="utf-8")
+        except OSError:
+            pass
+    return locales, parsed
+
+
+# ============================================================================
+# USAGE SCAN
+# ============================================================================
+
+def scan_usage(root: Path = PROJECT_ROOT) -> Tuple[Dict[str, int], Dict[str, List[str]], Dict[str, int]]:
+    """Dotted-key string literals per key, lookup-call keys per file, and dynamic key prefixes."""
+    counts: Dict[str, int] = {}
+    calls: Dict[str, List[str]] = {}
+    prefixes: Dict[str, int] = {}
+    for pattern in SCAN_PATTERNS:
+        for path in root.rglob(pattern):
+            if SKIP_DIRS.intersection(path.relative_to(root).parts):
+                continue
+            try:
+                text = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+            for match in USAGE_PATTERN.finditer(text):
+                key = match.group("key")
+                if key is None:
+                    category = match.group("category")
+                    prefix = match.group("prefix") or category + "."
+                    prefixes[prefix] = prefixes.get(prefix, 0) + 1
+                    if category is None or "." not in category:
+                        continue
+                    key = category  # A dotted category is also a dotted-key literal
+                counts[key] = counts.get(key, 0) + 1
+                if match.group("call"):
+                    calls.setdefault(key, []).append(str(path.relative_to(root)))
+    return counts, calls, prefixes
+
+
+def is_used(key: str, counts: Dict[str, int], prefixes: List[str]) -> bool:
+    return key in counts or any(key.startswith(prefix) for prefix in prefixes)
+
+
+# ============================================================================
+# CATALOG EXPORT
+# ============================================================================
+
+def _pack_strings(values: List[Optional[str]]) -> bytes:
+    """Presence bitmap, offsets (n + 1 x u32) and one NUL-terminated UTF-8 blob.
+
+    Offsets give random access to entry i (offsets[i] .. offsets[i + 1] - 1);
+    the terminators let a full load split the blob in one call.
+    """
+    blob = bytearray()
+    offsets = array("I", [0])
+    bitmap = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is not None:
+            bitmap[i // 8] |= 1 << (i % 8)
+            blob += value.encode("utf-8")
+        blob += b"\0"
+        offsets.append(len(blob))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    return bytes(bitmap) + offsets.tobytes() + struct.pack("<I", len(blob)) + bytes(blob)
+
+
+def write_catalog(index: TranslationIndex, path: Path) -> int:
+    """Write the binary catalog; returns its size in bytes."""
+    parts = [CATALOG_MAGIC, struct.pack("<HHI", CATALOG_VERSION, len(index.locales), len(index.keys))]
+    for locale in index.locales:
+        code = locale.encode("utf-8")
+        parts.append(struct.pack("<B", len(code)) + code)
+    parts.append(_pack_strings(list(index.keys)))
+    for locale in index.locales:
+        parts.append(_pack_strings(index.columns[locale]))
+    data = b"".join(parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return len(data)
+
+
+def read_catalog(path: Path) -> Tuple[List[str], Dict[str, List[Optional[str]]]]:
+    """Load a catalog written by write_catalog() (keys, columns per locale)."""
+    data = path.read_bytes()
+    if data[:4] != CATALOG_MAGIC:
+        raise ValueError(f"{path} is not a translation catalog")
+    version, locale_count, key_count = struct.unpack_from("<HHI", data, 4)
+    if version != CATALOG_VERSION:
+        raise ValueError(f"Unsupported catalog version {version}")
+    pos = 12
+    locales = []
+    for _ in range(locale_count):
+        size = data[pos]
+        locales.append(data[pos + 1:pos + 1 + size].decode("utf-8"))
+        pos += 1 + size
+
+    def unpack(pos: int) -> Tuple[List[Optional[str]], int]:
+        bitmap = data[pos:pos + (key_count + 7) // 8]
+        pos += len(bitmap) + 4 * (key_count + 1)  # Offsets are only needed for random access
+        (blob_size,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        values: List[Optional[str]] = data[pos:pos + blob_size].decode("utf-8").split("\0")[:key_count]
+        if bitmap.count(0xFF) * 8 < key_count:
+            for i in range(key_count):
+                if not bitmap[i // 8] & (1 << (i % 8)):
+                    values[i] = None
+        return values, pos + blob_size
+
+    keys, pos = unpack(pos)
+    columns = {}
+    for locale in locales:
+        columns[locale], pos = unpack(pos)
+    return [k for k in keys if k is not None], columns
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile translations and report key coverage")
+    parser.add_argument("--locale", type=str, help="List missing/extra keys for one locale")
+    parser.add_argument("--output", "-o", type=str, help=f"Catalog path (default: {CATALOG_PATH.relative_to(PROJECT_ROOT)})")
+    parser.add_argument("--no-export", action="store_true", help="Skip writing the catalog")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every locale")
+    parser.add_argument("--allow-prefix", action="append", default=[], metavar="PREFIX",
+                        help="Treat every key under this prefix as used (repeatable)")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 on missing keys or undefined usages")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    locales, parsed = load_locales(not args.no_cache)
+    if not locales:
+        print(f"Error: No translation files in {TRANSLATIONS_DIR}")
+        sys.exit(1)
+    index = TranslationIndex(locales)
+    counts, calls, dynamic = scan_usage()
+    prefixes = sorted(set(dynamic) | {p if p.endswith(".") else p + "." for p in args.allow_prefix})
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    reference = index.reference()
+    defined = {k for i, k in enumerate(index.keys) if reference[i] is not None}
+    # Keep only prefixes that reach a key ("Lv." + level is UI text, not a lookup)
+    prefixes = [p for p in prefixes if any(k.startswith(p) for k in index.keys)]
+    unused = sorted(k for k in defined if not is_used(k, counts, prefixes))
+    undefined = {k: files for k, files in calls.items() if k not in index.key_ids}
+    per_locale = {
+        locale: {
+            "keys": sum(1 for v in index.columns[locale] if v is not None),
+            "missing": index.missing(locale),
+            "extra": index.extra(locale),
+            "placeholder_mismatch": index.placeholder_mismatches(locale),
+        }
+        for locale in index.locales
+    }
+
+    catalog: Dict[str, Any] = {}
+    if not args.no_export:
+        out_path = Path(args.output) if args.output else CATALOG_PATH
+        size = write_catalog(index, out_path)
+        t0 = time.perf_counter()
+        read_catalog(out_path)
+        catalog_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        for path in sorted(TRANSLATIONS_DIR.glob("*.json")):
+            json.loads(path.read_text(encoding="utf-8"))
+        json_ms = (time.perf_counter() - t0) * 1000
+        catalog = {"path": str(out_path), "bytes": size,
+                   "load_ms": round(catalog_ms, 3), "json_load_ms": round(json_ms, 3)}
+
+    missing_total = sum(len(info["missing"]) for info in per_locale.values())
+    failed = args.strict and (missing_total > 0 or bool(undefined))
+
+    if args.json:
+        print(json.dumps({
+            "keys": len(index.keys),
+            "locales": per_locale,
+            "parsed": parsed,
+            "used_keys": len(defined) - len(unused),
+            "unused": unused,
+            "dynamic_prefixes": prefixes,
+            "undefined": undefined,
+            "catalog": catalog,
+            "elapsed_ms": round(elapsed_ms, 1),
+        }, indent=2, ensure_ascii=False))
+        sys.exit(1 if failed else 0)
+
+    print("=" * 60)
+    print("TRANSLATION CATALOG")
+    print("=" * 60)
+    print(f"\nKeys: {len(index.keys)}  Locales: {', '.join(index.locales)}  "
+          f"Re-parsed: {', '.join(parsed) or 'none'}  Time: {elapsed_ms:.0f} ms")
+
+    print("\n## COVERAGE")
+    print(f"  {'Locale':<8} {'Keys':>6} {'Cover':>7} {'Missing':>8} {'Extra':>6} {'{}':>4}")
+    for locale, info in per_locale.items():
+        cover = (len(defined) - len(info["missing"])) / max(1, len(defined))
+        print(f"  {locale:<8} {info['keys']:>6} {cover:>7.1%} {len(info['missing']):>8} "
+              f"{len(info['extra']):>6} {len(info['placeholder_mismatch']):>4}")
+
+    print("\n## USAGE")
+    print(f"  Referenced keys: {len(defined) - len(unused)} / {len(defined)}")
+    print(f"  Dynamic prefixes: {', '.join(prefixes) or 'none'}")
+    print(f"  Unused keys: {len(unused)}")
+    print(f"  Undefined lookups: {len(undefined)}")
+    for key, files in sorted(undefined.items()):
+        print(f"    {key}  ({', '.join(sorted(set(files)))})")
+
+    if args.locale:
+        info = per_locale.get(args.locale)
+        if info is None:
+            print(f"\nError: Unknown locale '{args.locale}'")
+            sys.exit(1)
+        print(f"\n## {args.locale.upper()}")
+        for label, keys in (("Missing", info["missing"]), ("Extra", info["extra"]),
+                            ("Placeholder mismatch", info["placeholder_mismatch"])):
+            print(f"  {label}: {len(keys)}")
+            for key in keys:
+                print(f"    {key}")
+
+    if catalog:
+        print("\n## CATALOG")
+        print(f"  {catalog['path']} ({catalog['bytes']:,} bytes)")
+        print(f"  Load: {catalog['load_ms']:.2f} ms (vs {catalog['json_load_ms']:.2f} ms for "
+              f"{len(index.locales)} JSON parses)")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
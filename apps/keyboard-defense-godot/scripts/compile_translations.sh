@@ -0,0 +1,17 @@
+#!/bin/bash
+# Translation Catalog Compiler
+# Wrapper script for compile_translations.py
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+
+cd "$PROJECT_ROOT"
+
+# Check for Python
+if ! command -v python3 &> /dev/null; then
+    echo "ERROR: python3 not found"
+    exit 1
+fi
+
+# Run the compiler
+python3 scripts/compile_translations.py "$@"
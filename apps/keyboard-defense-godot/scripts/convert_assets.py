@@ -3,7 +3,10 @@
 Asset Pipeline - SVG to PNG Converter
 
 Converts SVG source files to PNG sprites based on assets_manifest.json.
-Supports multiple conversion backends: cairosvg (Python), Inkscape, or rsvg-convert.
+Supports multiple conversion backends: the built-in rasterizer (svg_to_png.py),
+cairosvg (Python), Inkscape, or rsvg-convert. The built-in rasterizer covers the
+pixel-art SVG subset without spawning processes; other SVGs fall back to the
+next available backend.
 
 Usage:
     python scripts/convert_assets.py              # Convert all missing PNGs
@@ -12,14 +15,19 @@ Usage:
     python scripts/convert_assets.py --dry-run    # Show what would be converted
 """
 
+import io
 import json
 import os
+import re
 import sys
 import subprocess
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+from svg_to_png import UnsupportedSVG, convert_svg_to_png, rasterize, write_png
+
 # Project paths
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -27,6 +35,9 @@ MANIFEST_PATH = PROJECT_ROOT / "data" / "assets_manifest.json"
 SVG_ROOT = PROJECT_ROOT / "assets" / "art" / "src-svg"
 PNG_ROOT = PROJECT_ROOT / "assets" / "sprites"
 
+# Animations with at least this many frames rasterize them in a process pool
+PARALLEL_FRAME_THRESHOLD = 8
+
 
 class ConversionBackend:
     """Base class for SVG to PNG conversion backends."""
@@ -41,6 +52,71 @@ class ConversionBackend:
     def convert(cls, svg_path: Path, png_path: Path, width: int, height: int) -> bool:
         raise NotImplementedError
 
+    @classmethod
+    def render_png(cls, svg_path: Path, width: int, height: int) -> Optional[bytes]:
+        """PNG bytes for the SVG without touching disk, or None if unsupported."""
+        return None
+
+    @classmethod
+    def render(cls, svg_path: Path, width: int, height: int) -> Optional[bytes]:
+        """Rasterize the SVG in memory to width x height RGBA bytes."""
+        png = cls.render_png(svg_path, width, height)
+        if png is None:
+            return None
+        try:
+            from PIL import Image
+        except ImportError:
+            print(f"  {cls.name} error: Pillow is needed to decode in-memory renders")
+            return None
+        image = Image.open(io.BytesIO(png)).convert("RGBA")
+        if image.size != (width, height):
+            image = image.resize((width, height))
+        return image.tobytes()
+
+
+class NativeBackend(ConversionBackend):
+    """Built-in pure-Python rasterizer for the pixel-art SVG subset."""
+
+    name = "native"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @classmethod
+    def convert(cls, svg_path: Path, png_path: Path, width: int, height: int) -> bool:
+        try:
+            convert_svg_to_png(svg_path, png_path, width, height)
+            return True
+        except UnsupportedSVG as e:
+            # Hand SVGs outside the subset to the next available backend
+            fallback = next((b for b in BACKENDS if b is not cls and b.is_available()), None)
+            if fallback is None:
+                print(f"  native error: {e}")
+                return False
+            return fallback.convert(svg_path, png_path, width, height)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            # Unreadable or non-SVG content fails this file only
+            print(f"  native error for {svg_path.name}: {e}")
+            return False
+
+    @classmethod
+    def render(cls, svg_path: Path, width: int, height: int) -> Optional[bytes]:
+        try:
+            with open(svg_path, "r", encoding="utf-8") as f:
+                return bytes(rasterize(f.read(), width, height)[2])
+        except UnsupportedSVG as e:
+            for fallback in BACKENDS:
+                if fallback is not cls and fallback.is_available():
+                    pixels = fallback.render(svg_path, width, height)
+                    if pixels is not None:
+                        return pixels
+            print(f"  native error: {e}")
+            return None
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            print(f"  native error for {svg_path.name}: {e}")
+            return None
+
 
 class CairoSVGBackend(ConversionBackend):
     """Python cairosvg library backend."""
@@ -70,6 +146,15 @@ class CairoSVGBackend(ConversionBackend):
             print(f"  cairosvg error: {e}")
             return False
 
+    @classmethod
+    def render_png(cls, svg_path: Path, width: int, height: int) -> Optional[bytes]:
+        try:
+            import cairosvg
+            return cairosvg.svg2png(url=str(svg_path), output_width=width, output_height=height)
+        except Exception as e:
+            print(f"  cairosvg error: {e}")
+            return None
+
 
 class InkscapeBackend(ConversionBackend):
     """Inkscape command-line backend."""
@@ -96,6 +181,17 @@ class InkscapeBackend(ConversionBackend):
             print(f"  inkscape error: {e}")
             return False
 
+    @classmethod
+    def render_png(cls, svg_path: Path, width: int, height: int) -> Optional[bytes]:
+        return _png_from_stdout("inkscape", [
+            "inkscape",
+            str(svg_path),
+            "--export-type=png",
+            "--export-filename=-",
+            f"--export-width={width}",
+            f"--export-height={height}"
+        ])
+
 
 class RsvgConvertBackend(ConversionBackend):
     """rsvg-convert command-line backend (from librsvg)."""
@@ -121,6 +217,15 @@ class RsvgConvertBackend(ConversionBackend):
             print(f"  rsvg-convert error: {e}")
             return False
 
+    @classmethod
+    def render_png(cls, svg_path: Path, width: int, height: int) -> Optional[bytes]:
+        return _png_from_stdout("rsvg-convert", [
+            "rsvg-convert",
+            str(svg_path),
+            "-w", str(width),
+            "-h", str(height)
+        ])
+
 
 class ImageMagickBackend(ConversionBackend):
     """ImageMagick convert backend."""
@@ -148,9 +253,32 @@ class ImageMagickBackend(ConversionBackend):
             print(f"  imagemagick error: {e}")
             return False
 
+    @classmethod
+    def render_png(cls, svg_path: Path, width: int, height: int) -> Optional[bytes]:
+        cmd = "magick" if shutil.which("magick") else "convert"
+        return _png_from_stdout("imagemagick", [
+            cmd,
+            "-background", "none",
+            "-resize", f"{width}x{height}",
+            str(svg_path),
+            "png:-"
+        ])
+
+
+def _png_from_stdout(name: str, command: List[str]) -> Optional[bytes]:
+    """Run a converter that writes PNG to stdout and return the bytes."""
+    try:
+        result = subprocess.run(command, capture_output=True, timeout=30)
+        if result.returncode == 0 and result.stdout:
+            return result.stdout
+        print(f"  {name} error: {result.stderr.decode('utf-8', 'replace').strip()}")
+    except Exception as e:
+        print(f"  {name} error: {e}")
+    return None
+
 
 # Available backends in preference order
-BACKENDS = [CairoSVGBackend, InkscapeBackend, RsvgConvertBackend, ImageMagickBackend]
+BACKENDS = [NativeBackend, CairoSVGBackend, InkscapeBackend, RsvgConvertBackend, ImageMagickBackend]
 
 
 def get_backend() -> Optional[ConversionBackend]:
@@ -249,114 +377,101 @@ def convert_texture(texture: Dict[str, Any], backend: ConversionBackend, dry_run
     return success
 
 
-def convert_animation_frames(texture: Dict[str, Any], backend: ConversionBackend, dry_run: bool = False) -> int:
-    """Convert animation frames from SVG to PNG sprite sheet or individual frames."""
-    texture_id = texture.get("id", "unknown")
-    source_svg_frames = texture.get("source_svg_frames")
+def _natural_key(path: Path) -> List[Any]:
+    """Sort key that orders frame_2 before frame_10."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", path.name)]
 
-    if not source_svg_frames:
-        return 0
 
-    # Handle both string (pattern) and array (list of files)
-    if isinstance(source_svg_frames, str):
-        # Pattern like "res://assets/art/src-svg/sprites/anim/enemy_walk_{frame}.svg"
-        # Need to find matching files
-        pattern_path = source_svg_frames
-        if pattern_path.startswith("res://"):
-            pattern_path = pattern_path[6:]
+def expand_frame_sources(source_svg_frames: Any) -> List[Path]:
+    """Resolve source_svg_frames - a list of files or one glob pattern - to paths.
 
-        # For now, skip pattern-based (would need glob expansion)
-        return 0
+    Patterns may use glob wildcards or a {frame} placeholder, e.g.
+    "res://assets/art/src-svg/sprites/anim/enemy_walk_{frame}.svg".
+    """
+    if isinstance(source_svg_frames, list):
+        return [PROJECT_ROOT / f[6:] if f.startswith("res://") else Path(f) for f in source_svg_frames]
+    if not isinstance(source_svg_frames, str):
+        return []
 
-    elif isinstance(source_svg_frames, list):
-        # Get frame dimensions from animation config or texture dimensions
-        animation_config = texture.get("animation", {})
-        frame_width = animation_config.get("frame_width", texture.get("expected_width", 32) // len(source_svg_frames))
-        frame_height = animation_config.get("frame_height", texture.get("expected_height", 32))
+    pattern = source_svg_frames.replace("{frame}", "*")
+    if pattern.startswith("res://"):
+        matches = PROJECT_ROOT.glob(pattern[6:])
+    elif Path(pattern).is_absolute():
+        matches = Path(pattern).parent.glob(Path(pattern).name)
+    else:
+        matches = Path.cwd().glob(pattern)
+    return sorted((m for m in matches if m.is_file()), key=_natural_key)
 
-        png_path = resolve_png_path(texture)
-        temp_frames = []
 
-        if dry_run:
-            print(f"  Would create spritesheet: {texture_id} ({len(source_svg_frames)} frames, {frame_width}x{frame_height} each)")
-            return 1
+def _render_frame(backend: ConversionBackend, svg_path: Path, width: int, height: int) -> Optional[bytes]:
+    """Process-pool worker: one frame as RGBA bytes."""
+    return backend.render(svg_path, width, height)
 
-        print(f"  Creating spritesheet: {texture_id} ({len(source_svg_frames)} frames)...")
 
-        # Convert each frame to temp PNG
-        for i, frame_svg in enumerate(source_svg_frames):
-            if frame_svg.startswith("res://"):
-                svg_path = PROJECT_ROOT / frame_svg[6:]
-            else:
-                svg_path = Path(frame_svg)
+def convert_animation_frames(texture: Dict[str, Any], backend: ConversionBackend, dry_run: bool = False,
+                             jobs: Optional[int] = None) -> int:
+    """Rasterize animation frames straight into a horizontal PNG sprite sheet."""
+    texture_id = texture.get("id", "unknown")
+    source_svg_frames = texture.get("source_svg_frames")
 
-            if not svg_path.exists():
-                print(f"    Frame {i} not found: {svg_path}")
-                continue
+    if not source_svg_frames:
+        return 0
 
-            frame_png = png_path.parent / f"{png_path.stem}_temp_frame{i}.png"
+    frames = expand_frame_sources(source_svg_frames)
+    if not frames:
+        print(f"  No frames found for {texture_id}: {source_svg_frames}")
+        return 0
 
-            print(f"    Converting frame {i}...", end=" ")
-            if backend.convert(svg_path, frame_png, frame_width, frame_height):
-                print("OK")
-                temp_frames.append(frame_png)
-            else:
-                print("FAILED")
+    # Get frame dimensions from animation config or texture dimensions
+    animation_config = texture.get("animation", {})
+    frame_width = animation_config.get("frame_width", texture.get("expected_width", 32) // len(frames))
+    frame_height = animation_config.get("frame_height", texture.get("expected_height", 32))
 
-        if not temp_frames:
-            print("  No frames converted!")
-            return 0
+    png_path = resolve_png_path(texture)
 
-        # Combine frames into horizontal spritesheet
-        print(f"    Combining {len(temp_frames)} frames into spritesheet...", end=" ")
-        try:
-            # Try using ImageMagick's convert command
-            import subprocess
-            result = subprocess.run(
-                ["convert", "+append"] + [str(f) for f in temp_frames] + [str(png_path)],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                print("OK")
-                # Clean up temp files
-                for f in temp_frames:
-                    f.unlink()
-                return 1
-            else:
-                print(f"FAILED: {result.stderr}")
-        except FileNotFoundError:
-            print("FAILED (ImageMagick not found)")
+    if dry_run:
+        print(f"  Would create spritesheet: {texture_id} ({len(frames)} frames, {frame_width}x{frame_height} each)")
+        return 1
 
-        # Fallback: Try using PIL/Pillow
-        try:
-            from PIL import Image
-            images = [Image.open(f) for f in temp_frames]
-            total_width = sum(img.width for img in images)
-            max_height = max(img.height for img in images)
-            spritesheet = Image.new('RGBA', (total_width, max_height), (0, 0, 0, 0))
-            x_offset = 0
-            for img in images:
-                spritesheet.paste(img, (x_offset, 0))
-                x_offset += img.width
-            spritesheet.save(str(png_path))
-            print("OK (Pillow)")
-            # Clean up temp files
-            for f in temp_frames:
-                f.unlink()
-            return 1
-        except ImportError:
-            print("FAILED (Pillow not available)")
-        except Exception as e:
-            print(f"FAILED: {e}")
+    print(f"  Creating spritesheet: {texture_id} ({len(frames)} frames)...")
 
-        # Clean up temp files even on failure
-        for f in temp_frames:
-            if f.exists():
-                f.unlink()
+    present = [(i, svg_path) for i, svg_path in enumerate(frames) if svg_path.exists()]
+    for i, svg_path in enumerate(frames):
+        if not svg_path.exists():
+            print(f"    Frame {i} not found: {svg_path}")
 
+    if len(present) >= PARALLEL_FRAME_THRESHOLD and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rendered = list(pool.map(_render_frame, [backend] * len(present), [p for _, p in present],
+                                     [frame_width] * len(present), [frame_height] * len(present)))
+    else:
+        rendered = [_render_frame(backend, svg_path, frame_width, frame_height) for _, svg_path in present]
+
+    # Blit every frame into its cell of one preallocated sheet buffer; missing
+    # or failed frames stay transparent so later frames keep their positions
+    sheet_width = frame_width * len(frames)
+    sheet = bytearray(sheet_width * frame_height * 4)
+    frame_stride = frame_width * 4
+    sheet_stride = sheet_width * 4
+    converted = 0
+    for (i, svg_path), pixels in zip(present, rendered):
+        if pixels is None:
+            print(f"    Frame {i} FAILED: {svg_path.name}")
+            continue
+        offset = i * frame_stride
+        for y in range(frame_height):
+            row = offset + y * sheet_stride
+            sheet[row:row + frame_stride] = pixels[y * frame_stride:(y + 1) * frame_stride]
+        converted += 1
+
+    if not converted:
+        print("  No frames converted!")
         return 0
 
-    return 0
+    png_path.parent.mkdir(parents=True, exist_ok=True)
+    write_png(png_path, sheet_width, frame_height, sheet)
+    print(f"    Wrote {png_path.name} ({converted}/{len(frames)} frames, {sheet_width}x{frame_height})")
+    return 1
 
 
 def main():
@@ -366,8 +481,10 @@ def main():
     parser.add_argument("--all", action="store_true", help="Reconvert all assets, not just missing")
     parser.add_argument("--id", type=str, help="Convert specific asset by ID")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be converted")
-    parser.add_argument("--backend", type=str, choices=["cairosvg", "inkscape", "rsvg-convert", "imagemagick"],
+    parser.add_argument("--backend", type=str, choices=[b.name for b in BACKENDS],
                         help="Force specific backend")
+    parser.add_argument("--jobs", type=int,
+                        help="Worker processes for large animations (default: CPU count)")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -438,7 +555,7 @@ def main():
 
         # Convert animation frames if present
         if has_animation_frames:
-            frame_count = convert_animation_frames(texture, backend, args.dry_run)
+            frame_count = convert_animation_frames(texture, backend, args.dry_run, args.jobs)
             converted += frame_count
 
     # Summary
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Drill Expansion Engine
+
+Materializes the effective drill of every map node the way Battlefield.gd
+does (_build_drill_plan / _apply_drill_overrides): inline drill_plan, else
+the drill template from data/drills.json, else the default plan, followed by
+replace / steps / remove / prepend / append overrides.
+
+Templates are resolved once and shared; overrides build new plan lists that
+reuse every untouched step instead of deep-copying, and identical
+(template, overrides) pairs are expanded only once.
+
+Checks:
+- Unknown templates, lessons and step modes
+- Override indices outside the base plan
+- Lesson steps with non-positive word counts
+- Empty targets and targets using keys outside the node's lesson charset
+- Intermissions without a positive duration
+
+Usage:
+    python scripts/expand_drills.py                  # Validate the whole map
+    python scripts/expand_drills.py --node forest-gate
+    python scripts/expand_drills.py --json
+"""
+
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from scenario_sim import load_lessons
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+DRILLS_PATH = PROJECT_ROOT / "data" / "drills.json"
+MAP_PATH = PROJECT_ROOT / "data" / "map.json"
+LESSONS_PATH = PROJECT_ROOT / "data" / "lessons.json"
+BATTLEFIELD_PATH = PROJECT_ROOT / "scripts" / "Battlefield.gd"
+
+STEP_MODES = {"lesson", "targets", "intermission"}
+FALLBACK_RUNE_TARGETS = ["1-2-3", "x^2", "go!", "rune+1", "shield+2"]
+
+Plan = Tuple[Mapping[str, Any], ...]
+
+
+# ============================================================================
+# EXPANSION
+# ============================================================================
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of JSON data so shared steps cannot be mutated."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def default_rune_targets() -> List[str]:
+    """DEFAULT_RUNE_TARGETS from Battlefield.gd."""
+    if BATTLEFIELD_PATH.exists():
+        match = re.search(r"const DEFAULT_RUNE_TARGETS := \[(.*?)\]", BATTLEFIELD_PATH.read_text(encoding="utf-8"))
+        if match:
+            return re.findall(r'"([^"]*)"', match.group(1))
+    return list(FALLBACK_RUNE_TARGETS)
+
+
+@dataclass
+class DrillIssue:
+    node: str
+    severity: str  # "error" or "warning"
+    message: str
+    step: Optional[int] = None
+
+
+@dataclass
+class ExpandedDrill:
+    node: str
+    lesson_id: str
+    source: str  # "inline", "template:<id>" or "default"
+    plan: Plan
+    issues: List[DrillIssue] = field(default_factory=list)
+
+
+class DrillExpander:
+    """Expands map nodes into effective drill plans with shared steps."""
+
+    def __init__(self, templates: Dict[str, Any], lessons: Dict[str, Any], rune_targets: List[str],
+                 lesson_entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.templates = {str(t.get("id", "")): t for t in templates.get("templates", []) if isinstance(t, dict)}
+        self.lessons = lessons
+        # Raw lessons.json entries by id, as ProgressionState.get_lesson() returns them
+        self.lesson_entries = lesson_entries or {}
+        self.rune_targets = _freeze(rune_targets)
+        self._template_memo: Dict[str, Optional[Plan]] = {}
+        self._override_memo: Dict[Tuple[str, str], Tuple[Plan, Tuple[str, ...]]] = {}
+        self.override_hits = 0
+
+    def template_plan(self, template_id: str) -> Optional[Plan]:
+        """Frozen template plan, resolved once per template."""
+        if template_id not in self._template_memo:
+            template = self.templates.get(template_id)
+            plan = template.get("plan", []) if template else []
+            self._template_memo[template_id] = _freeze(plan) if isinstance(plan, list) and plan else None
+        return self._template_memo[template_id]
+
+    def default_plan(self, node: Dict[str, Any]) -> Plan:
+        """_build_default_drill_plan(); word counts assume a full lesson pool."""
+        lesson = self.lesson_entries.get(str(node.get("lesson_id", "")), {})
+        targets = node.get("rune_targets")
+        return (
+            MappingProxyType({"mode": "lesson", "label": "Warmup Runes", "word_count": 4, "shuffle": True}),
+            MappingProxyType({"mode": "intermission", "label": "Scouts Regroup", "duration": 2.5,
+                              "message": "Scouts regroup and the ward recharges."}),
+            MappingProxyType({"mode": "targets", "label": "Rune Marks",
+                              "targets": _freeze(targets) if isinstance(targets, list) else self.rune_targets}),
+            MappingProxyType({"mode": "lesson", "label": str(lesson.get("label", "Defense Drill")),
+                              "word_count": 6, "shuffle": True}),
+        )
+
+    def apply_overrides(self, base_key: str, base: Plan, overrides: Dict[str, Any]) -> Tuple[Plan, Tuple[str, ...]]:
+        """Apply overrides in Battlefield.gd order; untouched steps are shared."""
+        if not overrides:
+            return base, ()
+        memo_key = (base_key, json.dumps(overrides, sort_keys=True))
+        cached = self._override_memo.get(memo_key)
+        if cached is not None:
+            self.override_hits += 1
+            return cached
+
+        plan = list(base)
+        problems: List[str] = []
+        for entry in overrides.get("replace", []) or []:
+            index = int(entry.get("index", -1)) if isinstance(entry, dict) else -1
+            if 0 <= index < len(plan) and isinstance(entry.get("step"), dict):
+                plan[index] = _freeze(entry["step"])
+            else:
+                problems.append(f"replace index {index} outside plan of {len(base)} steps")
+        for entry in overrides.get("steps", []) or []:
+            index = int(entry.get("index", -1)) if isinstance(entry, dict) else -1
+            if not 0 <= index < len(plan):
+                problems.append(f"step override index {index} outside plan of {len(base)} steps")
+                continue
+            data = entry.get("data", {})
+            if isinstance(data, dict) and isinstance(plan[index], Mapping):
+                merged = dict(plan[index])
+                merged.update({k: _freeze(v) for k, v in data.items()})
+                plan[index] = MappingProxyType(merged)
+        removals = sorted((int(i) for i in overrides.get("remove", []) or []), reverse=True)
+        for index in removals:
+            if 0 <= index < len(plan):
+                del plan[index]
+            else:
+                problems.append(f"remove index {index} outside plan of {len(base)} steps")
+        prepend = [_freeze(s) for s in overrides.get("prepend", []) or []]
+        append = [_freeze(s) for s in overrides.get("append", []) or []]
+        result = (tuple(prepend + plan + append), tuple(problems))
+        self._override_memo[memo_key] = result
+        return result
+
+    def expand(self, node: Dict[str, Any]) -> ExpandedDrill:
+        node_id = str(node.get("id", "?"))
+        lesson_id = str(node.get("lesson_id", ""))
+        issues: List[DrillIssue] = []
+        inline = node.get("drill_plan", [])
+        template_id = str(node.get("drill_template", ""))
+        if isinstance(inline, list) and inline:
+            base, source, base_key = _freeze(inline), "inline", f"inline:{node_id}"
+        else:
+            base = self.template_plan(template_id) if template_id else None
+            if template_id and base is None:
+                issues.append(DrillIssue(node_id, "error", f"unknown drill template '{template_id}'"))
+            if base is not None:
+                source = base_key = f"template:{template_id}"
+            else:
+                base, source, base_key = self.default_plan(node), "default", f"default:{node_id}"
+        overrides = node.get("drill_overrides", {})
+        if not isinstance(overrides, dict):
+            issues.append(DrillIssue(node_id, "error", "drill_overrides is not a dictionary"))
+            overrides = {}
+        plan, problems = self.apply_overrides(base_key, base, overrides)
+        issues.extend(DrillIssue(node_id, "error", message) for message in problems)
+        drill = ExpandedDrill(node_id, lesson_id, source, plan, issues)
+        self.validate(drill)
+        return drill
+
+    def validate(self, drill: ExpandedDrill) -> None:
+        lesson = self.lessons["by_id"].get(drill.lesson_id)
+        if lesson is None:
+            drill.issues.append(DrillIssue(drill.node, "error", f"unknown lesson '{drill.lesson_id}'"))
+        charset = set(lesson["charset"]) if lesson and lesson["mode"] == "charset" and lesson["charset"] else None
+
+        for i, step in enumerate(drill.plan):
+            if not isinstance(step, Mapping):
+                drill.issues.append(DrillIssue(drill.node, "error", "step is not a dictionary", i))
+                continue
+            mode = str(step.get("mode", ""))
+            if mode not in STEP_MODES:
+                drill.issues.append(DrillIssue(drill.node, "error", f"unknown step mode '{mode}'", i))
+            elif mode == "lesson" and "word_count" in step and int(step.get("word_count", 0)) <= 0:
+                drill.issues.append(DrillIssue(drill.node, "error", "lesson word_count must be positive", i))
+            elif mode == "targets":
+                targets = step.get("targets", ())
+                if not targets:
+                    drill.issues.append(DrillIssue(drill.node, "error", "targets step has no targets", i))
+                if any(not str(target) for target in targets):
+                    drill.issues.append(DrillIssue(drill.node, "error", "empty target", i))
+                if charset is not None:
+                    offending = [str(t) for t in targets if set(str(t).lower()) - charset]
+                    if offending:
+                        keys = "".join(sorted(set("".join(offending).lower()) - charset))
+                        drill.issues.append(DrillIssue(
+                            drill.node, "warning",
+                            f"{len(offending)} targets use keys outside lesson charset ({keys}): "
+                            f"{', '.join(offending)}", i))
+            elif mode == "intermission" and float(step.get("duration", 0.0)) <= 0.0:
+                drill.issues.append(DrillIssue(drill.node, "error", "intermission duration must be positive", i))
+
+    def expand_map(self, nodes: List[Dict[str, Any]]) -> List[ExpandedDrill]:
+        return [self.expand(node) for node in nodes if isinstance(node, dict)]
+
+
+def load_expander() -> Tuple[DrillExpander, List[Dict[str, Any]]]:
+    with open(DRILLS_PATH, encoding="utf-8") as f:
+        templates = json.load(f)
+    with open(MAP_PATH, encoding="utf-8") as f:
+        nodes = json.load(f).get("nodes", [])
+    with open(LESSONS_PATH, encoding="utf-8") as f:
+        entries = {str(e.get("id", "")): e for e in json.load(f).get("lessons", []) if isinstance(e, dict)}
+    entries.pop("", None)
+    expander = DrillExpander(templates, load_lessons(LESSONS_PATH), default_rune_targets(), entries)
+    return expander, nodes
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Expand and validate map drills")
+    parser.add_argument("--node", type=str, help="Print the expanded drill for one map node")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as failures")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    expander, nodes = load_expander()
+    if args.node:
+        nodes = [n for n in nodes if n.get("id") == args.node]
+        if not nodes:
+            print(f"Error: Unknown map node '{args.node}'")
+            sys.exit(1)
+    drills = expander.expand_map(nodes)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    issues = [issue for drill in drills for issue in drill.issues]
+    errors = [i for i in issues if i.severity == "error"]
+    warnings = [i for i in issues if i.severity == "warning"]
+    failed = bool(errors) or (args.strict and bool(warnings))
+
+    if args.json:
+        print(json.dumps({
+            "nodes": len(drills),
+            "templates_resolved": len(expander._template_memo),
+            "override_memo_hits": expander.override_hits,
+            "drills": [{
+                "node": d.node,
+                "lesson_id": d.lesson_id,
+                "source": d.source,
+                "plan": _thaw(d.plan),
+            } for d in drills],
+            "issues": [issue.__dict__ for issue in issues],
+            "elapsed_ms": round(elapsed_ms, 2),
+        }, indent=2))
+        sys.exit(1 if failed else 0)
+
+    print("=" * 60)
+    print("DRILL EXPANSION")
+    print("=" * 60)
+    print(f"\nNodes: {len(drills)}  Templates resolved: {len(expander._template_memo)}  "
+          f"Time: {elapsed_ms:.1f} ms")
+
+    if args.node:
+        drill = drills[0]
+        print(f"\n## {drill.node} ({drill.source}, lesson {drill.lesson_id})")
+        for i, step in enumerate(drill.plan):
+            detail = ""
+            if step.get("mode") == "targets":
+                detail = ", ".join(step.get("targets", ()))
+            elif step.get("mode") == "lesson":
+                detail = f"{step.get('word_count', '?')} words"
+            elif step.get("mode") == "intermission":
+                detail = f"{step.get('duration', 0)} s"
+            print(f"  {i}. [{step.get('mode', '?')}] {step.get('label', '')}: {detail}")
+
+    if issues:
+        print(f"\n## ISSUES ({len(errors)} errors, {len(warnings)} warnings)")
+        for issue in issues:
+            where = f" step {issue.step}" if issue.step is not None else ""
+            print(f"  [{issue.severity.upper()}] {issue.node}{where}: {issue.message}")
+    else:
+        print("\nAll drills valid.")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,18 @@ Usage:
     python scripts/generate_words.py --theme coding --min-length 4 --max-length 8
     python scripts/generate_words.py --charset "asdfghjkl" --count 30
     python scripts/generate_words.py --theme nature --json
+    python scripts/generate_words.py --prefix dr --filter-charset "abcdeghinorstw"
+    python scripts/generate_words.py --all-lessons --count 40 --output pools.json
 """
 
 import argparse
 import json
 import random
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set, Dict, Any
+from typing import List, Set, Dict, Any, Optional, Tuple
 
 # Project paths
 SCRIPT_DIR = Path(__file__).parent
@@ -211,43 +215,218 @@ THEME_WORDS: Dict[str, List[str]] = {
 }
 
 
+# ============================================================================
+# WORD INDEX
+# ============================================================================
+
+class WordIndex:
+    """Letter-bitmask index over a word corpus, bucketed by length.
+
+    Each word is reduced to a bitmask of the characters it uses, and words
+    sharing a length and mask are grouped together, so a charset/length query
+    only tests each distinct mask once. An optional trie answers prefix queries
+    while pruning branches that leave the charset.
+    """
+
+    def __init__(self, words: List[str], with_trie: bool = False):
+        self._bits: Dict[str, int] = {}
+        self._buckets: Dict[int, Dict[int, List[str]]] = {}
+        self._trie: Optional[Dict[str, Any]] = {} if with_trie else None
+        self.size = 0
+        for word in deduplicate(words):
+            self.add(word)
+
+    def _bit(self, char: str) -> int:
+        bit = self._bits.get(char)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[char] = bit
+        return bit
+
+    def mask(self, text: str) -> int:
+        """Bitmask of the characters in text (unknown characters are registered)."""
+        mask = 0
+        for char in text:
+            mask |= self._bit(char)
+        return mask
+
+    def add(self, word: str) -> None:
+        by_mask = self._buckets.setdefault(len(word), {})
+        by_mask.setdefault(self.mask(word), []).append(word)
+        self.size += 1
+        if self._trie is not None:
+            node = self._trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = word
+
+    def query(self, charset: Optional[str] = None, min_len: int = 1, max_len: int = 99) -> List[str]:
+        """All words typeable with charset whose length is within [min_len, max_len]."""
+        allowed = self.mask(charset.lower()) if charset else -1
+        result: List[str] = []
+        for length in sorted(self._buckets):
+            if min_len <= length <= max_len:
+                for mask, words in self._buckets[length].items():
+                    if mask & ~allowed == 0:
+                        result.extend(words)
+        return result
+
+    def with_prefix(self, prefix: str, charset: Optional[str] = None) -> List[str]:
+        """Words starting with prefix, optionally restricted to charset."""
+        if self._trie is None:
+            raise ValueError("WordIndex was built without a trie")
+        allowed = set(charset.lower()) if charset else None
+        node = self._trie
+        for char in prefix.lower():
+            if char not in node or (allowed is not None and char not in allowed):
+                return []
+            node = node[char]
+        result: List[str] = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char == "":
+                    result.append(child)
+                elif allowed is None or char in allowed:
+                    stack.append(child)
+        return sorted(result)
+
+
+def build_theme_index(themes: Optional[List[str]] = None, with_trie: bool = False) -> WordIndex:
+    """Index the words of the given themes (all themes by default)."""
+    words: List[str] = []
+    for theme in themes or THEME_WORDS:
+        words.extend(THEME_WORDS[theme])
+    return WordIndex(words, with_trie)
+
+
 # ============================================================================
 # CHARSET-BASED GENERATION
 # ============================================================================
 
+class PseudoWordSpace:
+    """The finite space of pseudo-words a charset can spell.
+
+    Words alternate vowels and consonants (starting with either) when the
+    charset has both; otherwise any sequence of charset characters is allowed.
+    Every word of a given length maps to a unique index, so sampling indices
+    without replacement yields distinct words at bounded cost, and a space
+    smaller than the request is simply enumerated.
+    """
+
+    VOWELS = "aeiou"
+
+    def __init__(self, charset: str):
+        chars = sorted(set(charset))
+        self.vowels = [c for c in chars if c.lower() in self.VOWELS]
+        self.consonants = [c for c in chars if c.lower() not in self.VOWELS]
+        if self.vowels and self.consonants:
+            self.patterns = [(self.vowels, self.consonants), (self.consonants, self.vowels)]
+        else:
+            self.patterns = [(chars, chars)]
+
+    def _pattern_size(self, pattern, length: int) -> int:
+        first, second = pattern
+        return len(first) ** ((length + 1) // 2) * len(second) ** (length // 2)
+
+    def size(self, length: int) -> int:
+        """Number of distinct pseudo-words of the given length."""
+        return sum(self._pattern_size(p, length) for p in self.patterns)
+
+    def word(self, length: int, index: int) -> str:
+        """Decode an index in [0, size(length)) into its word."""
+        for pattern in self.patterns:
+            count = self._pattern_size(pattern, length)
+            if index < count:
+                chars = []
+                for pos in range(length):
+                    alphabet = pattern[pos % 2]
+                    index, digit = divmod(index, len(alphabet))
+                    chars.append(alphabet[digit])
+                return "".join(chars)
+            index -= count
+        raise IndexError("pseudo-word index out of range")
+
+    def sample(self, count: int, min_len: int, max_len: int,
+               rng: Optional[random.Random] = None) -> List[str]:
+        """Up to count distinct words, spread evenly across lengths.
+
+        Lengths whose space is exhausted hand their share to the others, so
+        the result is short only when the whole space is smaller than count.
+        """
+        rng = rng or random.Random(random.random())
+        lengths = list(range(max(1, min_len), max_len + 1))
+        capacity = {length: self.size(length) for length in lengths}
+        quota = {length: 0 for length in lengths}
+        remaining = count
+        open_lengths = [length for length in lengths if capacity[length] > 0]
+        while remaining > 0 and open_lengths:
+            share, extra = divmod(remaining, len(open_lengths))
+            for i, length in enumerate(open_lengths):
+                take = min(share + (1 if i < extra else 0), capacity[length] - quota[length])
+                quota[length] += take
+                remaining -= take
+            open_lengths = [length for length in open_lengths if quota[length] < capacity[length]]
+        words: List[str] = []
+        for length in lengths:
+            if quota[length]:
+                indices = _sample_indices(capacity[length], quota[length], rng)
+                words.extend(self.word(length, i) for i in indices)
+        return words
+
+
+def _sample_indices(population: int, count: int, rng: random.Random) -> List[int]:
+    """Distinct indices in [0, population) without materializing the range."""
+    if population <= sys.maxsize:
+        return rng.sample(range(population), count)
+    # range() cannot report a length this large; with count far below the
+    # population a rejection loop finishes almost immediately.
+    picked: Set[int] = set()
+    while len(picked) < count:
+        picked.add(rng.randrange(population))
+    return list(picked)
+
+
 def generate_from_charset(charset: str, count: int, min_len: int, max_len: int) -> List[str]:
-    """Generate pseudo-words from a character set."""
-    words = set()
-    charset = charset.lower()
-    vowels = set("aeiou") & set(charset)
-    consonants = set(charset) - vowels
-
-    # If no vowels, just generate random strings
-    if not vowels:
-        while len(words) < count:
-            length = random.randint(min_len, max_len)
-            word = "".join(random.choice(charset) for _ in range(length))
-            words.add(word)
-        return list(words)
-
-    # Generate pronounceable-ish words
-    while len(words) < count:
-        length = random.randint(min_len, max_len)
-        word = []
-        use_vowel = random.choice([True, False])
-
-        for _ in range(length):
-            if use_vowel and vowels:
-                word.append(random.choice(list(vowels)))
-            elif consonants:
-                word.append(random.choice(list(consonants)))
-            else:
-                word.append(random.choice(charset))
-            use_vowel = not use_vowel
-
-        words.add("".join(word))
-
-    return list(words)
+    """Generate pseudo-words from a character set.
+
+    Returns fewer than count words when the charset cannot spell that many.
+    """
+    return PseudoWordSpace(charset.lower()).sample(count, min_len, max_len)
+
+
+# ============================================================================
+# LESSON POOLS
+# ============================================================================
+
+def lesson_length_range(lesson: Dict[str, Any]) -> tuple:
+    """Overall (min, max) word length across a lesson's enemy length ranges."""
+    ranges = list(lesson.get("lengths", {}).values()) or [[3, 10]]
+    return min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+
+def generate_lesson_pools(lessons_path: Path, count: int, index: WordIndex,
+                          seed: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Build real-word and pseudo-word pools for every charset lesson."""
+    rng = random.Random(seed)
+    with open(lessons_path) as f:
+        lessons = json.load(f).get("lessons", [])
+    pools: Dict[str, Dict[str, Any]] = {}
+    for lesson in lessons:
+        if lesson.get("mode") != "charset":
+            continue
+        charset = lesson.get("charset", "")
+        min_len, max_len = lesson_length_range(lesson)
+        real = index.query(charset, min_len, max_len)
+        pseudo = PseudoWordSpace(charset).sample(count, min_len, max_len, rng)
+        pools[lesson["id"]] = {
+            "charset": charset,
+            "lengths": [min_len, max_len],
+            "real_words": sorted(real),
+            "pseudo_words": sorted(pseudo),
+        }
+    return pools
 
 
 # ============================================================================
@@ -265,6 +444,20 @@ def filter_by_charset(words: List[str], charset: str) -> List[str]:
     return [w for w in words if all(c in charset_set for c in w.lower())]
 
 
+@lru_cache(maxsize=8)
+def _cached_index(words: Tuple[str, ...]) -> WordIndex:
+    return WordIndex(list(words))
+
+
+def filter_words(words: List[str], charset: Optional[str], min_len: int, max_len: int) -> List[str]:
+    """Charset and length filter in one indexed pass.
+
+    The index is cached per word list, so repeated filters over the same
+    corpus only build it once.
+    """
+    return _cached_index(tuple(words)).query(charset, min_len, max_len)
+
+
 def deduplicate(words: List[str]) -> List[str]:
     """Remove duplicates while preserving order."""
     seen = set()
@@ -338,6 +531,12 @@ def main():
                         help="List available themes and exit")
     parser.add_argument("--seed", type=int,
                         help="Random seed for reproducibility")
+    parser.add_argument("--prefix", type=str,
+                        help="List theme words starting with this prefix")
+    parser.add_argument("--all-lessons", action="store_true",
+                        help="Regenerate word pools for every charset lesson in data/lessons.json")
+    parser.add_argument("--output", "-o", type=str,
+                        help="Write lesson pools to file (used with --all-lessons)")
 
     args = parser.parse_args()
 
@@ -350,10 +549,29 @@ def main():
     if args.seed is not None:
         random.seed(args.seed)
 
+    if args.all_lessons:
+        start = time.perf_counter()
+        index = build_theme_index()
+        pools = generate_lesson_pools(PROJECT_ROOT / "data" / "lessons.json",
+                                      args.count, index, args.seed)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        output = json.dumps(pools, indent=2)
+        if args.output:
+            Path(args.output).write_text(output + "\n")
+            print(f"Wrote {len(pools)} lesson pools to {args.output} ({elapsed_ms:.0f} ms)")
+        else:
+            print(output)
+        sys.exit(0)
+
     # Generate or select words
     words: List[str] = []
 
-    if args.charset:
+    if args.prefix:
+        index = build_theme_index([args.theme] if args.theme else None, with_trie=True)
+        words = index.with_prefix(args.prefix, args.filter_charset)
+        words = filter_by_length(words, args.min_length, args.max_length)[:args.count]
+        theme_name = f"prefix_{args.prefix}"
+    elif args.charset:
         words = generate_from_charset(
             args.charset,
             args.count,
@@ -365,18 +583,14 @@ def main():
         words = THEME_WORDS[args.theme].copy()
         theme_name = args.theme
 
-        # Apply charset filter if specified
-        if args.filter_charset:
-            words = filter_by_charset(words, args.filter_charset)
-
-        # Apply length filter
-        words = filter_by_length(words, args.min_length, args.max_length)
+        # Apply charset and length filters
+        words = filter_words(words, args.filter_charset, args.min_length, args.max_length)
 
         # Shuffle and limit
         random.shuffle(words)
         words = words[:args.count]
     else:
-        print("Error: Specify either --theme or --charset")
+        print("Error: Specify --theme, --charset, --prefix or --all-lessons")
         sys.exit(1)
 
     # Deduplicate
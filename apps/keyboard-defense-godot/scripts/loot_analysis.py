@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Loot Table Analyzer
+
+Computes the economic impact of data/loot_tables.json. Mirrors the rules in
+sim/loot.gd (guaranteed rewards, independent chance drops rolled as
+roll_range(0, 1000) / 1000 <= chance, quality multiplier with int truncation,
+perfect bonus at the perfect tier) to derive:
+
+- Exact per-enemy reward distributions, expected values and variances
+- Expected values and variances for a generated wave composition
+- Sampled reward distributions over many waves (alias method)
+
+The game never grants these drops (SimLoot.roll_loot() and queue_loot() have
+no callers), so the numbers are hypothetical. simulate_balance.py adds
+LootTables.wave_expected() to the economy only with --loot.
+
+Usage:
+    python scripts/loot_analysis.py                     # Per-enemy EV table
+    python scripts/loot_analysis.py --quality perfect   # At a quality tier
+    python scripts/loot_analysis.py --waves 10000 --days 7
+    python scripts/loot_analysis.py --json
+"""
+
+import json
+import math
+import random
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+LOOT_TABLES_PATH = PROJECT_ROOT / "data" / "loot_tables.json"
+
+LOOT_RESOURCES = ["gold", "wood", "stone", "food"]
+
+# Quality tiers (sim/loot.gd QUALITY_TIERS)
+QUALITY_MULTIPLIERS = {
+    "poor": 0.5,
+    "normal": 1.0,
+    "good": 1.25,
+    "excellent": 1.5,
+    "perfect": 2.0,
+}
+
+ROLL_MAX = 1000  # SimRng.roll_range(state, 0, 1000)
+
+
+def drop_probability(chance: float) -> float:
+    """Exact hit probability of `roll_range(0, 1000) / 1000.0 <= chance`."""
+    hits = sum(1 for roll in range(ROLL_MAX + 1) if roll / float(ROLL_MAX) <= chance)
+    return hits / float(ROLL_MAX + 1)
+
+
+# ============================================================================
+# REWARD DISTRIBUTIONS
+# ============================================================================
+
+@dataclass
+class RewardDistribution:
+    """Exact discrete distribution of one kill's reward vector."""
+    outcomes: List[Tuple[int, ...]]
+    probabilities: List[float]
+    resources: List[str] = field(default_factory=lambda: list(LOOT_RESOURCES))
+
+    def expected(self) -> Dict[str, float]:
+        return {
+            res: sum(p * o[i] for o, p in zip(self.outcomes, self.probabilities))
+            for i, res in enumerate(self.resources)
+        }
+
+    def variance(self) -> Dict[str, float]:
+        mean = self.expected()
+        return {
+            res: sum(p * (o[i] - mean[res]) ** 2 for o, p in zip(self.outcomes, self.probabilities))
+            for i, res in enumerate(self.resources)
+        }
+
+
+class AliasSampler:
+    """Walker/Vose alias table for O(1) draws from a discrete distribution."""
+
+    def __init__(self, probabilities: List[float]):
+        n = len(probabilities)
+        total = sum(probabilities)
+        scaled = [p * n / total for p in probabilities]
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+        self.n = n
+
+    def sample(self, count: int, rng) -> Any:
+        """Draw `count` outcome indices. `rng` is a numpy Generator or random.Random."""
+        if HAS_NUMPY and isinstance(rng, np.random.Generator):
+            columns = rng.integers(0, self.n, size=count)
+            accept = rng.random(count) < np.asarray(self.prob)[columns]
+            return np.where(accept, columns, np.asarray(self.alias)[columns])
+        picks = []
+        for _ in range(count):
+            column = rng.randrange(self.n)
+            picks.append(column if rng.random() < self.prob[column] else self.alias[column])
+        return picks
+
+
+# ============================================================================
+# LOOT TABLES
+# ============================================================================
+
+class LootTables:
+    """Loot tables with exact per-kill reward statistics."""
+
+    def __init__(self, path: Path = LOOT_TABLES_PATH):
+        self.enemy_drops: Dict[str, Dict[str, Any]] = {}
+        self.boss_drops: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.enemy_drops = data.get("enemy_drops", {})
+            self.boss_drops = data.get("boss_drops", {})
+        self._cache: Dict[Tuple[str, bool, float], RewardDistribution] = {}
+
+    def table(self, kind: str, is_boss: bool = False) -> Dict[str, Any]:
+        return (self.boss_drops if is_boss else self.enemy_drops).get(kind, {})
+
+    def distribution(self, kind: str, is_boss: bool = False, quality: float = 1.0) -> RewardDistribution:
+        """Enumerate every drop combination for one kill (SimLoot.roll_loot)."""
+        key = (kind, is_boss, quality)
+        if key in self._cache:
+            return self._cache[key]
+        table = self.table(kind, is_boss)
+        index = {res: i for i, res in enumerate(LOOT_RESOURCES)}
+        base = [0] * len(LOOT_RESOURCES)
+        for res, amount in table.get("guaranteed", {}).items():
+            if res in index:
+                base[index[res]] += max(0, int(float(amount) * quality))
+        if quality >= 2.0:
+            for res, amount in table.get("perfect_bonus", {}).items():
+                if res in index:
+                    base[index[res]] += max(0, int(amount))
+
+        outcomes: Dict[Tuple[int, ...], float] = {tuple(base): 1.0}
+        for drop in table.get("drops", []):
+            res = str(drop.get("resource", ""))
+            amount = int(float(drop.get("amount", 0)) * quality)
+            p = drop_probability(float(drop.get("chance", 0.0)))
+            if res not in index or amount <= 0 or p <= 0.0:
+                continue
+            merged: Dict[Tuple[int, ...], float] = {}
+            for outcome, weight in outcomes.items():
+                hit = list(outcome)
+                hit[index[res]] += amount
+                merged[tuple(hit)] = merged.get(tuple(hit), 0.0) + weight * p
+                if p < 1.0:
+                    merged[outcome] = merged.get(outcome, 0.0) + weight * (1.0 - p)
+            outcomes = merged
+
+        ordered = sorted(outcomes.items())
+        dist = RewardDistribution([o for o, _ in ordered], [p for _, p in ordered])
+        self._cache[key] = dist
+        return dist
+
+    def wave_expected(self, composition: Dict[str, int], quality: float = 1.0) -> Dict[str, Dict[str, float]]:
+        """Exact mean/variance of a wave's total loot (kills are independent)."""
+        mean = {res: 0.0 for res in LOOT_RESOURCES}
+        var = {res: 0.0 for res in LOOT_RESOURCES}
+        for kind, count in composition.items():
+            dist = self.distribution(kind, quality=quality)
+            kind_mean, kind_var = dist.expected(), dist.variance()
+            for res in LOOT_RESOURCES:
+                mean[res] += count * kind_mean[res]
+                var[res] += count * kind_var[res]
+        return {"mean": mean, "variance": var}
+
+    def sample_waves(self, composition: Dict[str, int], waves: int, quality: float = 1.0,
+                     seed: int = 0) -> Dict[str, Dict[str, float]]:
+        """Sample total wave loot `waves` times and summarize the distribution."""
+        totals = {res: [0] * waves for res in LOOT_RESOURCES}
+        if HAS_NUMPY:
+            rng = np.random.default_rng(seed)
+            totals = {res: np.zeros(waves, dtype=np.int64) for res in LOOT_RESOURCES}
+        else:
+            rng = random.Random(seed)
+        for kind, count in composition.items():
+            if count <= 0:
+                continue
+            dist = self.distribution(kind, quality=quality)
+            sampler = AliasSampler(dist.probabilities)
+            picks = sampler.sample(waves * count, rng)
+            if HAS_NUMPY:
+                values = np.asarray(dist.outcomes, dtype=np.int64)[picks].reshape(waves, count, -1).sum(axis=1)
+                for i, res in enumerate(LOOT_RESOURCES):
+                    totals[res] += values[:, i]
+            else:
+                for n, pick in enumerate(picks):
+                    outcome = dist.outcomes[pick]
+                    for i, res in enumerate(LOOT_RESOURCES):
+                        totals[res][n // count] += outcome[i]
+        return {res: _summarize(values) for res, values in totals.items()}
+
+
+def _summarize(values) -> Dict[str, float]:
+    if HAS_NUMPY:
+        array = np.sort(np.asarray(values))
+        mean, var = float(array.mean()), float(array.var())
+        ordered = array.tolist()
+    else:
+        ordered = sorted(int(v) for v in values)
+        mean = sum(ordered) / len(ordered)
+        var = sum((v - mean) ** 2 for v in ordered) / len(ordered)
+    n = len(ordered)
+
+    def quantile(q: float) -> int:
+        return ordered[min(n - 1, int(q * (n - 1) + 0.5))]
+
+    return {
+        "mean": round(mean, 3),
+        "std": round(math.sqrt(var), 3),
+        "min": ordered[0],
+        "p05": quantile(0.05),
+        "p50": quantile(0.5),
+        "p95": quantile(0.95),
+        "max": ordered[-1],
+    }
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+    from simulate_balance import BalanceSimulator
+
+    parser = argparse.ArgumentParser(description="Analyze loot table expected values and variance")
+    parser.add_argument("--quality", "-q", default="normal", choices=list(QUALITY_MULTIPLIERS.keys()),
+                        help="Typing quality tier")
+    parser.add_argument("--days", "-d", type=int, default=7, help="Days of generated waves to analyze")
+    parser.add_argument("--waves", "-w", type=int, default=0, help="Sample this many waves per day")
+    parser.add_argument("--seed", type=int, default=0, help="Sampler seed")
+    parser.add_argument("--json", "-j", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    quality = QUALITY_MULTIPLIERS[args.quality]
+    tables = LootTables()
+    simulator = BalanceSimulator()
+
+    enemies = {}
+    for kind in tables.enemy_drops:
+        dist = tables.distribution(kind, quality=quality)
+        enemies[kind] = {"mean": dist.expected(), "variance": dist.variance(), "outcomes": len(dist.outcomes)}
+    bosses = {}
+    for kind in tables.boss_drops:
+        dist = tables.distribution(kind, is_boss=True, quality=quality)
+        bosses[kind] = {"mean": dist.expected(), "variance": dist.variance(), "outcomes": len(dist.outcomes)}
+
+    waves = []
+    for day in range(1, args.days + 1):
+        composition = simulator._generate_wave(day)["composition"]
+        entry = {"day": day, "composition": composition, **tables.wave_expected(composition, quality)}
+        if args.waves > 0:
+            entry["sampled"] = tables.sample_waves(composition, args.waves, quality, args.seed + day)
+        waves.append(entry)
+
+    if args.json:
+        print(json.dumps({"quality": args.quality, "enemies": enemies, "bosses": bosses, "waves": waves}, indent=2))
+        sys.exit(0)
+
+    print("=" * 60)
+    print(f"LOOT TABLE ANALYSIS (quality: {args.quality})")
+    print("=" * 60)
+
+    for title, rows in (("ENEMY DROPS", enemies), ("BOSS DROPS", bosses)):
+        print(f"\n## {title} (mean ± std per kill)")
+        for kind, stats in rows.items():
+            parts = [f"{res} {stats['mean'][res]:.2f}±{math.sqrt(stats['variance'][res]):.2f}"
+                     for res in LOOT_RESOURCES if stats["mean"][res] > 0]
+            print(f"  {kind:<16} {', '.join(parts) or '-'}")
+
+    print("\n## GENERATED WAVES (mean ± std per wave)")
+    for entry in waves:
+        parts = [f"{res} {entry['mean'][res]:.1f}±{math.sqrt(entry['variance'][res]):.1f}"
+                 for res in LOOT_RESOURCES if entry["mean"][res] > 0]
+        print(f"  Day {entry['day']:>3}: {', '.join(parts)}")
+        for res, summary in entry.get("sampled", {}).items():
+            if summary["max"] > 0:
+                print(f"           {res:<5} p05 {summary['p05']:>5}  p50 {summary['p50']:>5}  "
+                      f"p95 {summary['p95']:>5}  (sampled mean {summary['mean']:.1f})")
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
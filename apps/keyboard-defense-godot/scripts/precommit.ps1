@@ -199,6 +199,25 @@ if ($todoCount -gt 0) {
 
 Write-Result "pass" "Common mistake check complete"
 
+# ─────────────────────────────────────────────────────────────
+# Check 7: Lesson Word Pools
+# ─────────────────────────────────────────────────────────────
+Write-Header "CHECK 7: Lesson Word Pools"
+
+if ($pythonAvailable) {
+    $result = python scripts/build_word_pools.py --check 2>&1
+    if ($LASTEXITCODE -eq 0) {
+        Write-Result "pass" "data/lesson_word_pools.json matches data/lessons.json"
+    }
+    else {
+        Write-Result "fail" "Word pools are stale - run python scripts/build_word_pools.py"
+        $result | ForEach-Object { Write-Host "    $_" }
+    }
+}
+else {
+    Write-Result "skip" "Python not available"
+}
+
 # ─────────────────────────────────────────────────────────────
 # Summary
 # ─────────────────────────────────────────────────────────────
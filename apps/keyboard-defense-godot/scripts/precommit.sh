@@ -222,6 +222,22 @@ fi
 
 print_result "pass" "Common mistake check complete"
 
+# ─────────────────────────────────────────────────────────────
+# Check 7: Lesson Word Pools
+# ─────────────────────────────────────────────────────────────
+print_header "CHECK 7: Lesson Word Pools"
+
+if command -v python3 &> /dev/null; then
+    if python3 scripts/build_word_pools.py --check > /tmp/word_pools.log 2>&1; then
+        print_result "pass" "data/lesson_word_pools.json matches data/lessons.json"
+    else
+        print_result "fail" "Word pools are stale - run ./scripts/build_word_pools.sh"
+        cat /tmp/word_pools.log
+    fi
+else
+    print_result "skip" "Python 3 not available"
+fi
+
 # ─────────────────────────────────────────────────────────────
 # Summary
 # ─────────────────────────────────────────────────────────────
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Research Path Solver
+
+Answers "what is the cheapest / fastest way to unlock X" for the research
+tree in data/research.json, following the rules in sim/research.gd:
+one research at a time, gold paid up front, one progress step per wave.
+
+Gold income per day uses the same sources as the game, shared with
+simulate_balance.py: kill gold for the day's wave (SimEnemies.gold_reward
+scaled by gold_multiplier), treasury gold_income at wave end and taxes
+(gold_per_building per structure at day advance). Effects come from owned
+kingdom upgrades and completed research; gold_production_bonus scales the
+optional flat income, which stands in for building gold production.
+
+- Minimum cost: sum over the prerequisite closure, in topological order
+- Minimum time: exact search over completed-sets with memoized Pareto
+  fronts of (day, gold); falls back to beam search for large queries
+- Results are cached per research.json hash, so repeated queries are instant
+
+Usage:
+    python scripts/research_solver.py --target engineering
+    python scripts/research_solver.py --target prosperity --by-day 20
+    python scripts/research_solver.py --target war_mastery --target prosperity
+    python scripts/research_solver.py --all --beam-width 32
+    python scripts/research_solver.py --list
+    python scripts/research_solver.py --target engineering --json
+    python scripts/research_solver.py --target prosperity --upgrade treasury --buildings 8
+"""
+
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from simulate_balance import BalanceSimulator, GoldEffects
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+RESEARCH_PATH = PROJECT_ROOT / "data" / "research.json"
+KINGDOM_UPGRADES_PATH = PROJECT_ROOT / "data" / "kingdom_upgrades.json"
+CACHE_PATH = PROJECT_ROOT / "Logs" / "cache" / "research_solver.json"
+
+DEFAULT_START_GOLD = 10  # DefaultState.create()
+EXACT_LIMIT = 18  # Largest prerequisite closure solved exactly
+MAX_DAYS = 500
+
+
+@dataclass
+class ResearchNode:
+    """A research entry from research.json."""
+    id: str
+    cost: int
+    waves: int
+    requires: List[str]
+    effects: Dict[str, Any]
+
+
+@dataclass
+class IncomeModel:
+    """Daily gold income assumptions."""
+    start_gold: int = DEFAULT_START_GOLD
+    flat_per_day: int = 0
+    buildings: int = 0
+    upgrades: List[str] = field(default_factory=list)
+
+    def key(self) -> str:
+        return f"{self.start_gold}|{self.flat_per_day}|{self.buildings}|{','.join(sorted(self.upgrades))}"
+
+
+@dataclass
+class SolverResult:
+    """Outcome of a research query."""
+    targets: List[str]
+    method: str
+    order: List[str]
+    total_cost: int
+    finish_day: int
+    timeline: List[Dict[str, Any]] = field(default_factory=list)
+    by_day: Optional[int] = None
+    feasible: Optional[bool] = None
+    cached: bool = False
+
+
+# ============================================================================
+# RESEARCH TREE
+# ============================================================================
+
+class ResearchTree:
+    """Research DAG with prerequisite closures."""
+
+    def __init__(self, path: Path = RESEARCH_PATH):
+        raw = path.read_bytes()
+        self.data_hash = hashlib.sha256(raw).hexdigest()[:16]
+        data = json.loads(raw)
+        self.nodes: Dict[str, ResearchNode] = {}
+        for item in data.get("research", []):
+            node_id = str(item.get("id", ""))
+            if not node_id:
+                continue
+            self.nodes[node_id] = ResearchNode(
+                id=node_id,
+                cost=int(item.get("cost", {}).get("gold", 0)),
+                waves=max(1, int(item.get("waves_to_complete", 1))),
+                requires=[str(r) for r in item.get("requires", [])],
+                effects=item.get("effects", {}),
+            )
+
+    def closure(self, targets: List[str]) -> List[str]:
+        """Targets plus all transitive prerequisites, in topological order."""
+        order: List[str] = []
+        seen = set()
+
+        def visit(node_id: str, stack: Tuple[str, ...]) -> None:
+            if node_id in seen:
+                return
+            if node_id in stack:
+                raise ValueError(f"Research cycle: {' -> '.join(stack + (node_id,))}")
+            node = self.nodes.get(node_id)
+            if node is None:
+                raise KeyError(f"Unknown research: {node_id}")
+            for req in node.requires:
+                visit(req, stack + (node_id,))
+            seen.add(node_id)
+            order.append(node_id)
+
+        for target in targets:
+            visit(target, ())
+        return order
+
+
+# ============================================================================
+# SOLVER
+# ============================================================================
+
+class ResearchSolver:
+    """Minimum-cost and minimum-time research orders."""
+
+    def __init__(self, tree: ResearchTree, income: IncomeModel):
+        self.tree = tree
+        self.income = income
+        self._simulator = BalanceSimulator()
+        self._upgrade_effects = load_upgrade_effects(income.upgrades)
+        self._income_memo: Dict[Tuple[int, Tuple[Any, ...]], int] = {}
+
+    def _income(self, day: int, bonus: float, gold: GoldEffects) -> int:
+        key = (day, (bonus, gold.gold_multiplier, gold.gold_income, gold.gold_per_building))
+        cached = self._income_memo.get(key)
+        if cached is None:
+            sources = self._simulator._calculate_gold_income(day, gold, self.income.buildings)
+            cached = sum(sources.values()) + int(self.income.flat_per_day * (1.0 + bonus))
+            self._income_memo[key] = cached
+        return cached
+
+    def _effects(self, ids: List[str], mask: int) -> Tuple[float, GoldEffects]:
+        completed = [self.tree.nodes[node_id].effects for i, node_id in enumerate(ids) if mask & (1 << i)]
+        bonus = sum(float(effects.get("gold_production_bonus", 0.0)) for effects in completed)
+        return bonus, GoldEffects.from_effects(self._upgrade_effects + completed)
+
+    def _advance(self, ids: List[str], mask: int, day: int, gold: int, index: int) -> Optional[Tuple[int, int, int]]:
+        """Wait for gold, research ids[index]; return (start_day, finish_day, gold)."""
+        node = self.tree.nodes[ids[index]]
+        bonus, gold_effects = self._effects(ids, mask)
+        while gold < node.cost:
+            day += 1
+            if day > MAX_DAYS:
+                return None
+            gold += self._income(day, bonus, gold_effects)
+        start = day
+        gold -= node.cost
+        for _ in range(node.waves):
+            day += 1
+            gold += self._income(day, bonus, gold_effects)
+        return start, day, gold
+
+    def _available(self, ids: List[str], req_masks: List[int], mask: int) -> List[int]:
+        return [i for i in range(len(ids)) if not mask & (1 << i) and req_masks[i] & mask == req_masks[i]]
+
+    def _setup(self, targets: List[str]) -> Tuple[List[str], List[int]]:
+        ids = self.tree.closure(targets)
+        position = {node_id: i for i, node_id in enumerate(ids)}
+        req_masks = []
+        for node_id in ids:
+            req_mask = 0
+            for req in self.tree.nodes[node_id].requires:
+                req_mask |= 1 << position[req]
+            req_masks.append(req_mask)
+        return ids, req_masks
+
+    def min_cost(self, targets: List[str]) -> SolverResult:
+        ids, _ = self._setup(targets)
+        order, timeline, finish = self._replay(ids, list(range(len(ids))))
+        return SolverResult(targets=targets, method="closure", order=order,
+                            total_cost=sum(self.tree.nodes[i].cost for i in ids),
+                            finish_day=finish, timeline=timeline)
+
+    def min_time(self, targets: List[str], beam_width: int = 0) -> SolverResult:
+        ids, req_masks = self._setup(targets)
+        if beam_width <= 0 and len(ids) <= EXACT_LIMIT:
+            picks, method = self._exact(ids, req_masks), "exact"
+        else:
+            picks, method = self._beam(ids, req_masks, beam_width or 64), "beam"
+        order, timeline, finish = self._replay(ids, picks)
+        return SolverResult(targets=targets, method=method, order=order,
+                            total_cost=sum(self.tree.nodes[i].cost for i in ids),
+                            finish_day=finish, timeline=timeline)
+
+    def _exact(self, ids: List[str], req_masks: List[int]) -> List[int]:
+        """Best-first over completed-sets, keeping a Pareto front of (day, -gold) per mask."""
+        full = (1 << len(ids)) - 1
+        fronts: Dict[int, List[Tuple[int, int, Tuple[int, ...]]]] = {0: [(0, self.income.start_gold, ())]}
+        # Process masks in popcount order; every transition adds exactly one bit.
+        layer = [0]
+        for _ in range(len(ids)):
+            next_layer: Dict[int, None] = {}
+            for mask in layer:
+                for day, gold, picks in fronts.pop(mask):
+                    for i in self._available(ids, req_masks, mask):
+                        step = self._advance(ids, mask, day, gold, i)
+                        if step is None:
+                            continue
+                        new_mask = mask | (1 << i)
+                        _insert_pareto(fronts.setdefault(new_mask, []), (step[1], step[2], picks + (i,)))
+                        next_layer[new_mask] = None
+            layer = list(next_layer)
+        best = min(fronts.get(full, [(MAX_DAYS + 1, 0, ())]), key=lambda s: (s[0], -s[1]))
+        return list(best[2])
+
+    def _beam(self, ids: List[str], req_masks: List[int], width: int) -> List[int]:
+        beam = [(0, -self.income.start_gold, 0, ())]
+        for _ in range(len(ids)):
+            candidates: Dict[int, Tuple[int, int, int, Tuple[int, ...]]] = {}
+            for day, neg_gold, mask, picks in beam:
+                for i in self._available(ids, req_masks, mask):
+                    step = self._advance(ids, mask, day, -neg_gold, i)
+                    if step is None:
+                        continue
+                    entry = (step[1], -step[2], mask | (1 << i), picks + (i,))
+                    # Memoized on the completed-set: keep the best state per mask.
+                    if entry[2] not in candidates or entry[:2] < candidates[entry[2]][:2]:
+                        candidates[entry[2]] = entry
+            beam = sorted(candidates.values())[:width]
+            if not beam:
+                return []
+        return list(beam[0][3])
+
+    def _replay(self, ids: List[str], picks: List[int]) -> Tuple[List[str], List[Dict[str, Any]], int]:
+        mask, day, gold = 0, 0, self.income.start_gold
+        timeline = []
+        for i in picks:
+            step = self._advance(ids, mask, day, gold, i)
+            if step is None:
+                return [ids[p] for p in picks], timeline, MAX_DAYS + 1
+            start, day, gold = step
+            mask |= 1 << i
+            timeline.append({"research": ids[i], "start_day": start, "finish_day": day, "gold_after": gold})
+        return [ids[p] for p in picks], timeline, day
+
+
+def _insert_pareto(front: List[Tuple[int, int, Tuple[int, ...]]], entry: Tuple[int, int, Tuple[int, ...]]) -> None:
+    day, gold, _ = entry
+    for other_day, other_gold, _ in front:
+        if other_day <= day and other_gold >= gold:
+            return
+    front[:] = [s for s in front if not (day <= s[0] and gold >= s[1])]
+    front.append(entry)
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _load_cache() -> Dict[str, Any]:
+    if CACHE_PATH.exists():
+        try:
+            return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+    return {}
+
+
+def load_upgrade_effects(upgrade_ids: List[str], path: Path = KINGDOM_UPGRADES_PATH) -> List[Dict[str, Any]]:
+    """Effects of owned kingdom upgrades from kingdom_upgrades.json."""
+    if not upgrade_ids:
+        return []
+    upgrades = {u.get("id"): u for u in json.loads(path.read_text(encoding="utf-8")).get("upgrades", [])}
+    missing = [u for u in upgrade_ids if u not in upgrades]
+    if missing:
+        raise KeyError(f"Unknown kingdom upgrade: {', '.join(missing)}")
+    return [upgrades[u].get("effects", {}) for u in upgrade_ids]
+
+
+def _save_cache(cache: Dict[str, Any]) -> None:
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PATH.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def solve(targets: List[str], mode: str, income: IncomeModel, beam_width: int = 0,
+          use_cache: bool = True, tree: Optional[ResearchTree] = None) -> SolverResult:
+    """Solve a query, reusing cached answers for the same research.json contents."""
+    tree = tree or ResearchTree()
+    key = f"{tree.data_hash}|{mode}|{','.join(sorted(targets))}|{income.key()}|{beam_width}"
+    cache = _load_cache() if use_cache else {}
+    if key in cache:
+        result = SolverResult(**cache[key])
+        result.cached = True
+        return result
+
+    solver = ResearchSolver(tree, income)
+    result = solver.min_cost(targets) if mode == "cost" else solver.min_time(targets, beam_width)
+    if use_cache:
+        # Drop entries for older data files
+        cache = {k: v for k, v in cache.items() if k.startswith(tree.data_hash)}
+        cache[key] = asdict(result)
+        _save_cache(cache)
+    return result
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find cheapest and fastest research unlock orders")
+    parser.add_argument("--target", "-t", action="append", default=[], help="Research id to unlock (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Unlock the whole tree")
+    parser.add_argument("--mode", choices=["time", "cost"], default="time", help="Optimize for time or cost")
+    parser.add_argument("--by-day", type=int, default=None, help="Check the unlock is possible by this day")
+    parser.add_argument("--start-gold", type=int, default=DEFAULT_START_GOLD, help="Starting gold")
+    parser.add_argument("--gold-per-day", type=int, default=0, help="Building gold production per day")
+    parser.add_argument("--buildings", type=int, default=0, help="Structures owned (for gold_per_building taxes)")
+    parser.add_argument("--upgrade", action="append", default=[], help="Owned kingdom upgrade id (repeatable)")
+    parser.add_argument("--beam-width", type=int, default=0, help="Force beam search with this width")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and skip the result cache")
+    parser.add_argument("--list", action="store_true", help="List research ids")
+    parser.add_argument("--json", "-j", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    tree = ResearchTree()
+    if args.list:
+        for node in tree.nodes.values():
+            reqs = ", ".join(node.requires) or "-"
+            print(f"{node.id:<20} {node.cost:>4}g {node.waves} waves  requires: {reqs}")
+        sys.exit(0)
+
+    targets = list(tree.nodes) if args.all else args.target
+    if not targets:
+        print("ERROR: pass --target <id> or --all", file=sys.stderr)
+        sys.exit(2)
+
+    income = IncomeModel(start_gold=args.start_gold, flat_per_day=args.gold_per_day,
+                         buildings=args.buildings, upgrades=args.upgrade)
+    try:
+        result = solve(targets, args.mode, income, args.beam_width, not args.no_cache, tree)
+    except (KeyError, ValueError) as e:
+        print(f"ERROR: {e.args[0]}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.by_day is not None:
+        result.by_day = args.by_day
+        result.feasible = result.finish_day <= args.by_day
+
+    if args.json:
+        print(json.dumps(asdict(result), indent=2))
+    else:
+        print("=" * 60)
+        print("RESEARCH PATH SOLVER")
+        print("=" * 60)
+        print(f"\nTargets: {', '.join(result.targets)}")
+        print(f"Method: {result.method}{' (cached)' if result.cached else ''}")
+        print(f"Total cost: {result.total_cost} gold")
+        print(f"Finished: day {result.finish_day}" if result.finish_day <= MAX_DAYS else "Finished: never")
+        print("\n## ORDER")
+        for step in result.timeline:
+            print(f"  Day {step['start_day']:>3}-{step['finish_day']:<3} {step['research']:<20} "
+                  f"(gold after: {step['gold_after']})")
+        if result.feasible is not None:
+            verdict = "YES" if result.feasible else "NO"
+            print(f"\nUnlock by day {result.by_day}: {verdict}")
+
+    sys.exit(0 if result.feasible is not False else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Scenario Runner - Python harness for data/scenarios.json
+
+Runs the scenario suite against the Python sim model (scenario_sim.py) without
+a Godot binary. Mirrors tools/run_scenarios.gd: same filters, same metrics,
+same report shape and summary lines, so reports can be diffed directly.
+
+Scenarios are independent, so they run in parallel across worker processes.
+Each result records its wall time in `elapsed_ms`.
+
+Scenarios listed in KNOWN_FAILURES are reported as XFAIL with their reason.
+They still fail the run unless --allow-known-failures is passed, in which case
+only new failures do. The summary line always shows the XFAIL count.
+
+Usage:
+    python run_scenarios.py                      # Run all scenarios
+    python run_scenarios.py --priority P0        # Run P0 scenarios only
+    python run_scenarios.py --tag economy        # Filter by tag
+    python run_scenarios.py --scenario day1_baseline
+    python run_scenarios.py --jobs 4 --out-dir Logs/ScenarioReports
+    python run_scenarios.py --targets --print-metrics
+    python run_scenarios.py --allow-known-failures  # Only new failures fail the run
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from scenario_sim import apply_intent, create_state, parse_command
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+SCENARIOS_PATH = PROJECT_ROOT / "data" / "scenarios.json"
+DEFAULT_OUT_DIR = PROJECT_ROOT / "Logs" / "ScenarioReports"
+
+VALID_STOP_TYPES = ["after_commands", "until_day", "until_phase"]
+VALID_PRIORITIES = ["P0", "P1"]
+DEFAULT_MAX_STEPS = 5000
+REQUIRED_KEYS = ["id", "seed", "description", "tags", "priority", "script", "stop"]
+
+# Tracked regressions: failing scenarios that are reported as XFAIL and only
+# pass the run with --allow-known-failures. Every entry names why the scenario
+# fails and what brings it back.
+#
+# The scenarios below were written for the earlier small map (base near (8,5),
+# only the base tile discovered). GameState now starts on a 64x64 map with the
+# base at (32,32) and a radius-5 discovered area, so their explored counts,
+# build coordinates and night lengths are stale in both harnesses. Their
+# expectations are shared Godot reference data, so they are re-baselined from
+# the GDScript harness, never from this approximate Python model.
+_REBASELINE = "re-baseline against tools/run_scenarios.gd"
+KNOWN_FAILURES: Dict[str, Dict[str, str]] = {
+    "day1_baseline": {"reason": "121 tiles explored at start; (8,6) is undiscovered",
+                     "recovery": _REBASELINE},
+    "day3_pacing": {"reason": "(8,4) and (7,5) are undiscovered; resources and hp drift",
+                   "recovery": _REBASELINE},
+    "explore_forward": {"reason": "121 tiles explored at start",
+                       "recovery": _REBASELINE},
+    "tower_upgrade_day2": {"reason": "121 tiles explored at start; wave size and kills drift",
+                          "recovery": _REBASELINE},
+    "wall_build_day2": {"reason": "build target is undiscovered; night outlasts the scripted waits",
+                       "recovery": _REBASELINE},
+    "map_inspect_smoke": {"reason": "expects no explored tiles",
+                         "recovery": _REBASELINE},
+    "lumber_build_day2": {"reason": "build target is undiscovered; night outlasts the scripted waits",
+                         "recovery": _REBASELINE},
+    "day5_pacing_basic": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 2",
+                         "recovery": _REBASELINE},
+    "day5_explore_focus": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 2",
+                          "recovery": _REBASELINE},
+    "day5_economy_focus": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 2",
+                          "recovery": _REBASELINE},
+    "day6_pacing_basic": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 3",
+                         "recovery": _REBASELINE},
+    "day6_explore_focus": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 3",
+                          "recovery": _REBASELINE},
+    "day6_economy_focus": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 3",
+                          "recovery": _REBASELINE},
+    "day7_pacing_basic": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 3",
+                         "recovery": _REBASELINE},
+    "day7_explore_focus": {"reason": "towers at (7-9,4-6) are undiscovered; game over on day 3",
+                          "recovery": _REBASELINE},
+    "day7_economy_focus": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 3",
+                          "recovery": _REBASELINE},
+    "day7_defense_smoke": {"reason": "towers at (7-9,4-6) are undiscovered; run stalls on day 3",
+                          "recovery": _REBASELINE},
+}
+
+
+# ============================================================================
+# LOADING AND FILTERING (scenario_loader.gd, scenario_types.gd)
+# ============================================================================
+
+def validate_scenario(scenario: Dict[str, Any]) -> List[str]:
+    errors = [f"missing key: {key}" for key in REQUIRED_KEYS if key not in scenario]
+    if "script" in scenario and not isinstance(scenario["script"], list):
+        errors.append("script must be an array")
+    if "stop" in scenario and not isinstance(scenario["stop"], dict):
+        errors.append("stop must be an object")
+    if "tags" in scenario and not isinstance(scenario["tags"], list):
+        errors.append("tags must be an array")
+    if "priority" in scenario and str(scenario["priority"]).upper() not in VALID_PRIORITIES:
+        errors.append(f"priority must be one of: {', '.join(VALID_PRIORITIES)}")
+    stop = scenario.get("stop")
+    if isinstance(stop, dict):
+        stop_type = str(stop.get("type", "after_commands")).lower()
+        if stop_type not in VALID_STOP_TYPES:
+            errors.append(f"unsupported stop type: {stop_type}")
+        if stop_type == "until_day" and "day" not in stop:
+            errors.append("until_day requires day")
+        if stop_type == "until_phase" and "phase" not in stop:
+            errors.append("until_phase requires phase")
+    return errors
+
+
+def load_scenarios(path: Path = SCENARIOS_PATH) -> Dict[str, Any]:
+    if not path.exists():
+        return {"ok": False, "error": f"Scenario file not found: {path}"}
+    raw_text = path.read_text(encoding="utf-8")
+    if not raw_text.strip():
+        return {"ok": False, "error": f"Scenario file is empty: {path}"}
+    try:
+        data = json.loads(raw_text)
+    except json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        return {"ok": False, "error": f"Scenario file must be a JSON object: {path}"}
+    if not isinstance(data.get("scenarios"), list):
+        return {"ok": False, "error": f"Scenario file missing scenarios array: {path}"}
+    errors = []
+    for scenario in data["scenarios"]:
+        if not isinstance(scenario, dict):
+            errors.append("scenario entry must be an object")
+            continue
+        for err in validate_scenario(scenario):
+            errors.append(f"{err} ({scenario.get('id', 'unknown')})")
+    if errors:
+        return {"ok": False, "error": "Scenario validation failed", "errors": errors}
+    return {"ok": True, "data": data}
+
+
+def normalize_stop(stop: Dict[str, Any]) -> Dict[str, Any]:
+    normalized = dict(stop)
+    normalized["type"] = str(normalized.get("type", "after_commands")).lower()
+    max_steps = int(normalized.get("max_steps", DEFAULT_MAX_STEPS))
+    normalized["max_steps"] = max_steps if max_steps > 0 else DEFAULT_MAX_STEPS
+    return normalized
+
+
+def matches_filters(scenario: Dict[str, Any], tags: List[str], exclude_tags: List[str], priority: str) -> bool:
+    if priority and str(scenario.get("priority", "")).upper() != priority.upper():
+        return False
+    scenario_tags = [str(tag).lower() for tag in scenario.get("tags", [])]
+    if any(tag.lower() not in scenario_tags for tag in tags):
+        return False
+    if any(tag.lower() in scenario_tags for tag in exclude_tags):
+        return False
+    return True
+
+
+def filter_scenarios(scenarios: List[Any], tags: List[str], exclude_tags: List[str], priority: str) -> List[Dict[str, Any]]:
+    return [s for s in scenarios if isinstance(s, dict) and matches_filters(s, tags, exclude_tags, priority)]
+
+
+# ============================================================================
+# EVALUATION (scenario_eval.gd)
+# ============================================================================
+
+def _gd_str(value: Any) -> str:
+    """Format a value the way GDScript str() does for report messages."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_expect(metric_name: str, actual: Any, spec: Any) -> str:
+    if isinstance(spec, dict):
+        if "eq" in spec:
+            if actual != spec["eq"]:
+                return f"expect {metric_name} eq {_gd_str(spec['eq'])} (got {_gd_str(actual)})"
+            return ""
+        has_min, has_max = "min" in spec, "max" in spec
+        if has_min or has_max:
+            if not _is_number(actual):
+                return f"expect {metric_name} range requires numeric actual (got {_gd_str(actual)})"
+            if has_min and float(actual) < float(spec["min"]):
+                return f"expect {metric_name} >= {_gd_str(spec['min'])} (got {_gd_str(actual)})"
+            if has_max and float(actual) > float(spec["max"]):
+                return f"expect {metric_name} <= {_gd_str(spec['max'])} (got {_gd_str(actual)})"
+            return ""
+        return f"expect {metric_name} missing eq/min/max"
+    if actual != spec:
+        return f"expect {metric_name} eq {_gd_str(spec)} (got {_gd_str(actual)})"
+    return ""
+
+
+def lookup_metric(metrics: Dict[str, Any], key: str) -> Dict[str, Any]:
+    if key in metrics:
+        return {"ok": True, "value": metrics[key]}
+    if "." not in key:
+        return {"ok": False}
+    current: Any = metrics
+    for part in key.split("."):
+        if not isinstance(current, dict) or part not in current:
+            return {"ok": False}
+        current = current[part]
+    return {"ok": True, "value": current}
+
+
+def evaluate(metrics: Dict[str, Any], expect: Dict[str, Any]) -> List[str]:
+    failures = []
+    for key, spec in expect.items():
+        lookup = lookup_metric(metrics, str(key))
+        if not lookup["ok"]:
+            failures.append(f"missing metric: {key}")
+            continue
+        check = check_expect(str(key), lookup["value"], spec)
+        if check:
+            failures.append(check)
+    return failures
+
+
+# ============================================================================
+# TYPING STATS (sim/typing_stats.gd subset used by the harness)
+# ============================================================================
+
+def edit_distance(a: str, b: str) -> int:
+    if a == b:
+        return 0
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class TypingStats:
+    """Defend-attempt bookkeeping; the harness never feeds keystrokes."""
+
+    def __init__(self):
+        self.defend_attempts = 0
+        self.night_steps = 0
+        self.hits = 0
+        self.misses = 0
+        self.current_combo = 0
+        self.max_combo = 0
+        self.sum_accuracy = 0.0
+        self.accuracy_attempts = 0
+        self.sum_edit_distance = 0
+        self.edit_distance_attempts = 0
+
+    def record_defend_attempt(self, typed_raw: str, enemies: List[Dict[str, Any]]) -> None:
+        self.defend_attempts += 1
+        self.night_steps += 1
+        typed = typed_raw.strip().lower()
+        words = [(int(e.get("id", 0)), str(e.get("word", "")).strip().lower()) for e in enemies]
+        if any(word and typed == word for _, word in words):
+            self.hits += 1
+            self.current_combo += 1
+            self.max_combo = max(self.max_combo, self.current_combo)
+        else:
+            self.misses += 1
+            self.current_combo = 0
+        best = None
+        for enemy_id, word in words:
+            if not word:
+                continue
+            candidate = (edit_distance(typed, word), enemy_id, len(word))
+            if best is None or candidate[:2] < best[:2]:
+                best = candidate
+        if best is not None:
+            self.sum_edit_distance += best[0]
+            self.edit_distance_attempts += 1
+            max_len = max(best[2], len(typed), 1)
+            self.sum_accuracy += min(1.0, max(0.0, 1.0 - best[0] / max_len))
+            self.accuracy_attempts += 1
+
+    def to_report_dict(self) -> Dict[str, Any]:
+        return {
+            "night_day": 0,
+            "wave_total": 0,
+            "night_steps": self.night_steps,
+            "enter_presses": 0,
+            "incomplete_enters": 0,
+            "command_enters": 0,
+            "defend_attempts": self.defend_attempts,
+            "wait_steps": 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "typed_chars": 0,
+            "deleted_chars": 0,
+            "current_combo": self.current_combo,
+            "max_combo": self.max_combo,
+            "hit_rate": self.hits / max(self.defend_attempts, 1),
+            "backspace_rate": 0.0,
+            "incomplete_rate": 0.0,
+            "avg_accuracy": self.sum_accuracy / max(self.accuracy_attempts, 1),
+            "avg_edit_distance": self.sum_edit_distance / max(self.edit_distance_attempts, 1),
+        }
+
+
+# ============================================================================
+# RUNNER (scenario_runner.gd)
+# ============================================================================
+
+def _stop_condition_met(stop: Dict[str, Any], state) -> bool:
+    if stop["type"] == "until_day":
+        return state.day >= int(stop.get("day", 0))
+    if stop["type"] == "until_phase":
+        return state.phase == str(stop.get("phase", ""))
+    return False
+
+
+def extract_metrics(state, typing_stats: TypingStats) -> Dict[str, Any]:
+    spawned = max(0, state.enemy_next_id - 1)
+    typing_report = typing_stats.to_report_dict()
+    return {
+        "day": state.day,
+        "phase": state.phase,
+        "hp": state.hp,
+        "ap": state.ap,
+        "ap_max": state.ap_max,
+        "threat": state.threat,
+        "lesson_id": state.lesson_id,
+        "night_wave_total": state.night_wave_total,
+        "resources": dict(state.resources),
+        "resources_wood": state.resources.get("wood", 0),
+        "resources_stone": state.resources.get("stone", 0),
+        "resources_food": state.resources.get("food", 0),
+        "buildings_count": sum(state.buildings.values()),
+        "buildings_by_type": dict(state.buildings),
+        "structures_count": len(state.structures),
+        "explored_count": max(0, len(state.discovered) - 1),
+        "enemies_alive": len(state.enemies),
+        "enemies_spawned": spawned,
+        "enemies_killed": max(0, spawned - len(state.enemies)),
+        "typing": typing_report,
+        "typing_hit_rate": typing_report["hit_rate"],
+        "typing_accuracy": typing_report["avg_accuracy"],
+        "typing_backspace_rate": typing_report["backspace_rate"],
+        "typing_incomplete_rate": typing_report["incomplete_rate"],
+    }
+
+
+def run_scenario(scenario: Dict[str, Any], enforce_targets: bool = False) -> Dict[str, Any]:
+    """Run one scenario and return a result dict shaped like ScenarioRunner.run()."""
+    started = time.perf_counter()
+    scenario_id = str(scenario.get("id", "unknown"))
+    failures = validate_scenario(scenario)
+    if failures:
+        return {
+            "id": scenario_id,
+            "pass": False,
+            "failures": failures,
+            "metrics": {},
+            "events": [],
+            "baseline_failures": [],
+            "target_failures": [],
+            "baseline_expected": False,
+            "target_expected": False,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 2),
+        }
+
+    state = create_state(str(scenario.get("seed", "default")))
+    typing_stats = TypingStats()
+    events: List[str] = []
+    stop = normalize_stop(scenario.get("stop", {}))
+    stop_type = stop["type"]
+    max_steps = stop["max_steps"]
+    stop_met = False
+    stop_reason = ""
+    command_index = 0
+    step_count = 0
+
+    script = [str(line).strip() for line in scenario.get("script", [])]
+    commands = [line for line in script if line and not line.startswith("#")]
+
+    # Non-after_commands stops loop the script until the condition holds.
+    while commands:
+        for command in commands:
+            if step_count >= max_steps:
+                failures.append("Stop condition not reached (cap hit)")
+                stop_reason = "cap_hit"
+                break
+            step_count += 1
+            command_index += 1
+            parsed = parse_command(command)
+            if parsed["ok"]:
+                intent = parsed["intent"]
+            elif state.phase == "night":
+                intent = {"kind": "defend_input", "text": command}
+            else:
+                failures.append(f"parse failed: {parsed.get('error', 'unknown')}")
+                stop_reason = "parse_failed"
+                break
+            kind = str(intent.get("kind", ""))
+            if kind.startswith("ui_"):
+                events.append(f"ui intent skipped: {kind}")
+            else:
+                if kind == "defend_input":
+                    typing_stats.record_defend_attempt(str(intent.get("text", "")), state.enemies)
+                events.extend(apply_intent(state, intent))
+            if _stop_condition_met(stop, state):
+                stop_met = True
+                stop_reason = stop_type
+                break
+        if stop_reason or stop_type == "after_commands":
+            break
+    if stop_reason == "parse_failed":
+        stop_reason = ""
+
+    if not commands:
+        failures.append("script contains no executable commands")
+    elif stop_type == "after_commands":
+        stop_met = True
+        stop_reason = "after_commands"
+    elif not stop_met and stop_reason == "":
+        failures.append("stop condition not reached (cap hit)")
+        stop_reason = "cap_hit"
+
+    metrics = extract_metrics(state, typing_stats)
+    baseline_expect = scenario.get("expect_baseline")
+    if not isinstance(baseline_expect, dict):
+        baseline_expect = scenario.get("expect") if isinstance(scenario.get("expect"), dict) else {}
+    target_expect = scenario.get("expect_target") if isinstance(scenario.get("expect_target"), dict) else {}
+    baseline_failures = evaluate(metrics, baseline_expect)
+    target_failures = evaluate(metrics, target_expect)
+    failures.extend(baseline_failures)
+    if enforce_targets and target_expect:
+        failures.extend(f"target: {failure}" for failure in target_failures)
+
+    return {
+        "id": scenario_id,
+        "pass": not failures,
+        "failures": failures,
+        "metrics": metrics,
+        "events": events,
+        "baseline_failures": baseline_failures,
+        "target_failures": target_failures,
+        "baseline_expected": bool(baseline_expect),
+        "target_expected": bool(target_expect),
+        "stop": {
+            "type": stop_type,
+            "met": stop_met,
+            "reason": stop_reason,
+            "commands": command_index,
+            "steps": step_count,
+            "max_steps": max_steps,
+        },
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 2),
+    }
+
+
+def _run_scenario_job(job: tuple) -> Dict[str, Any]:
+    scenario, enforce_targets = job
+    return run_scenario(scenario, enforce_targets)
+
+
+def run_all(scenarios: List[Dict[str, Any]], enforce_targets: bool = False, jobs: int = 0) -> List[Dict[str, Any]]:
+    """Run scenarios, in parallel when jobs != 1. Results keep input order."""
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(scenarios))
+    work = [(scenario, enforce_targets) for scenario in scenarios]
+    if jobs <= 1:
+        return [_run_scenario_job(job) for job in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_run_scenario_job, work))
+
+
+# ============================================================================
+# REPORTING (scenario_report.gd)
+# ============================================================================
+
+def build_report(results: List[Dict[str, Any]], meta: Dict[str, Any],
+                 known_failures: Dict[str, Dict[str, str]] = KNOWN_FAILURES) -> Dict[str, Any]:
+    failed_ids = [str(r.get("id", "unknown")) for r in results if not r.get("pass", False)]
+    passed_ids = [str(r.get("id", "unknown")) for r in results if r.get("pass", False)]
+    baseline_pass = sum(1 for r in results if not r.get("baseline_failures", r.get("failures", [])))
+    target_results = [r for r in results if r.get("target_expected", False)]
+    return {
+        "meta": meta,
+        "summary": {
+            "total": len(results),
+            "ok": len(results) - len(failed_ids),
+            "fail": len(failed_ids),
+            "failed_ids": failed_ids,
+            "known_failure_ids": [i for i in failed_ids if i in known_failures],
+            "new_failure_ids": [i for i in failed_ids if i not in known_failures],
+            "fixed_ids": [i for i in passed_ids if i in known_failures],
+            "baseline_pass_count": baseline_pass,
+            "target_met_count": sum(1 for r in target_results if not r.get("target_failures")),
+            "target_total_count": len(target_results),
+            "elapsed_ms": round(sum(r.get("elapsed_ms", 0.0) for r in results), 2),
+        },
+        "results": results,
+    }
+
+
+def resolve_output_path(out_path: str, out_dir: str) -> Path:
+    if out_path:
+        path = Path(out_path)
+        return path if path.is_absolute() else PROJECT_ROOT / path
+    directory = Path(out_dir) if out_dir else DEFAULT_OUT_DIR
+    if not directory.is_absolute():
+        directory = PROJECT_ROOT / directory
+    return directory / f"{int(time.time())}.json"
+
+
+def summary_path(out_dir: str) -> Path:
+    directory = Path(out_dir) if out_dir else DEFAULT_OUT_DIR
+    if not directory.is_absolute():
+        directory = PROJECT_ROOT / directory
+    return directory / "last_summary.txt"
+
+
+def format_metrics_line(result: Dict[str, Any]) -> str:
+    metrics = result.get("metrics", {})
+    if not metrics:
+        return ""
+    parts = [
+        f"id={result.get('id', 'unknown')}",
+        f"day={int(metrics.get('day', 0))}",
+        f"phase={metrics.get('phase', '')}",
+        f"buildings={int(metrics.get('buildings_count', 0))}",
+        f"explored={int(metrics.get('explored_count', 0))}",
+        f"res.wood={int(metrics.get('resources_wood', 0))}",
+        f"res.stone={int(metrics.get('resources_stone', 0))}",
+        f"res.food={int(metrics.get('resources_food', 0))}",
+    ]
+    if "typing_accuracy" in metrics:
+        parts.append(f"typing.acc={float(metrics['typing_accuracy']):.2f}")
+    parts.append(f"ms={float(result.get('elapsed_ms', 0.0)):.1f}")
+    return " ".join(parts)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Run data/scenarios.json against the Python sim model")
+    parser.add_argument("--list", action="store_true", help="List scenario ids")
+    parser.add_argument("--all", action="store_true", help="Run all scenarios (default)")
+    parser.add_argument("--scenario", default="", help="Run a single scenario")
+    parser.add_argument("--tag", action="append", default=[], help="Filter by tag (repeatable)")
+    parser.add_argument("--exclude-tag", action="append", default=[], help="Exclude scenarios with a tag (repeatable)")
+    parser.add_argument("--priority", default="", help="Filter by priority (P0|P1)")
+    parser.add_argument("--out", default="", help="Write report JSON to path")
+    parser.add_argument("--out-dir", default="", help="Write report + summary to directory")
+    parser.add_argument("--enforce-targets", action="store_true", help="Treat target expectations as failures")
+    parser.add_argument("--targets", action="store_true", help="Evaluate targets and print target summary")
+    parser.add_argument("--print-metrics", action="store_true", help="Print compact per-scenario metrics")
+    parser.add_argument("--jobs", "-j", type=int, default=0, help="Worker processes (default: CPU count, 1 = serial)")
+    parser.add_argument("--scenarios-file", type=Path, default=SCENARIOS_PATH, help="Scenario JSON file")
+    parser.add_argument("--allow-known-failures", action="store_true",
+                        help="Do not fail the run on scenarios in KNOWN_FAILURES")
+
+    args = parser.parse_args()
+
+    load_result = load_scenarios(args.scenarios_file)
+    if not load_result["ok"]:
+        print(load_result["error"], file=sys.stderr)
+        for err in load_result.get("errors", []):
+            print(err, file=sys.stderr)
+        print("[scenarios] ERROR load_failed")
+        sys.exit(2)
+
+    scenarios = load_result["data"]["scenarios"]
+    tags = [t.lower() for t in args.tag]
+    exclude_tags = [t.lower() for t in args.exclude_tag]
+    filtered = filter_scenarios(scenarios, tags, exclude_tags, args.priority.upper())
+
+    if args.list:
+        for scenario in filtered:
+            print(scenario.get("id", "unknown"))
+        sys.exit(0)
+
+    if args.scenario:
+        selected = [s for s in scenarios if str(s.get("id", "")) == args.scenario][:1]
+        if not selected:
+            print(f"Scenario not found: {args.scenario}", file=sys.stderr)
+            print("[scenarios] ERROR missing_scenario")
+            sys.exit(2)
+    else:
+        selected = filtered
+    if not selected:
+        print("No scenarios matched filters.", file=sys.stderr)
+        print("[scenarios] ERROR empty_selection")
+        sys.exit(2)
+
+    results = run_all(selected, args.enforce_targets, args.jobs)
+
+    meta = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "engine_version": "python-sim",
+        "scenario_ids": [str(s.get("id", "unknown")) for s in selected],
+        "out_path": args.out,
+        "out_dir": args.out_dir,
+        "filters": {"tags": tags, "exclude_tags": exclude_tags, "priority": args.priority.upper()},
+        "jobs": args.jobs,
+        "allow_known_failures": args.allow_known_failures,
+    }
+    report = build_report(results, meta)
+    report_path = resolve_output_path(args.out, args.out_dir)
+    report["report_path"] = str(report_path)
+    try:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        print(f"Failed to open report path: {report_path} ({e})", file=sys.stderr)
+        print("[scenarios] ERROR write_failed")
+        sys.exit(2)
+
+    summary = report["summary"]
+    lines = [f"[scenarios] report {report_path}"]
+    if (args.targets or args.enforce_targets) and summary["target_total_count"] > 0:
+        lines.append(f"[targets] MET {summary['target_met_count']}/{summary['target_total_count']}")
+    if args.print_metrics:
+        lines.extend(line for line in (format_metrics_line(r) for r in results) if line)
+    for scenario_id in summary["known_failure_ids"]:
+        entry = KNOWN_FAILURES.get(scenario_id, {})
+        lines.append(f"[scenarios] XFAIL {scenario_id}: {entry.get('reason', '')}"
+                     f" (recovery: {entry.get('recovery', '')})")
+    if summary["fixed_ids"]:
+        lines.append(f"[scenarios] XPASS {', '.join(summary['fixed_ids'])} (remove from KNOWN_FAILURES)")
+    failing_ids = summary["new_failure_ids"] if args.allow_known_failures else summary["failed_ids"]
+    xfail = f" ({len(summary['known_failure_ids'])} XFAIL)" if summary["known_failure_ids"] else ""
+    if failing_ids:
+        lines.append(f"[scenarios] FAIL {', '.join(failing_ids)}{xfail}")
+    else:
+        lines.append(f"[scenarios] OK {summary['ok']}/{summary['total']}{xfail}")
+    for line in lines:
+        print(line)
+
+    last_summary = summary_path(args.out_dir)
+    last_summary.parent.mkdir(parents=True, exist_ok=True)
+    last_summary.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    sys.exit(0 if not failing_ids else 1)
+
+
+if __name__ == "__main__":
+    main()
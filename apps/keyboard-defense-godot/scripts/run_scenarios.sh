@@ -0,0 +1,17 @@
+#!/bin/bash
+# Scenario Runner
+# Wrapper script for run_scenarios.py (Python sim model, no Godot required)
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+
+cd "$PROJECT_ROOT"
+
+# Check for Python
+if ! command -v python3 &> /dev/null; then
+    echo "ERROR: python3 not found"
+    exit 1
+fi
+
+# Run the scenarios
+python3 scripts/run_scenarios.py "$@"
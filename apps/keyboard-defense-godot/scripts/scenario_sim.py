@@ -0,0 +1,1349 @@
+#!/usr/bin/env python3
+"""
+Scenario Sim Model - Python port of the headless sim
+
+A compact Python model of the command-driven sim used by the scenario harness
+(sim/default_state.gd, sim/parse_command.gd, sim/apply_intent.gd and friends).
+It covers the command vocabulary used in data/scenarios.json so scenarios can
+be evaluated without a Godot binary.
+
+Determinism matches the GDScript sim where it matters:
+  - String.hash() is djb2 (seeds, word selection)
+  - RandomNumberGenerator is PCG32 with Godot's default stream
+
+Known gaps (documented so report diffs are explainable):
+  - Terrain is generated by FastNoiseLite in Godot; this model treats every
+    tile as plains unless a terrain override is supplied.
+  - Kingdom/unit upgrades, research, POIs, affix abilities and the new enemy
+    type system are not modelled (all upgrade multipliers are neutral).
+
+Usage:
+    from scenario_sim import create_state, parse_command, apply_intent
+"""
+
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+LESSONS_PATH = PROJECT_ROOT / "data" / "lessons.json"
+
+
+# ============================================================================
+# GODOT-COMPATIBLE HASHING AND RNG
+# ============================================================================
+
+MASK_32 = 0xFFFFFFFF
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+PCG_MULTIPLIER = 6364136223846793005
+# RandomPCG::DEFAULT_INC, expanded the way pcg32_srandom_r stores it.
+PCG_INC = ((1442695040888963407 << 1) | 1) & MASK_64
+
+
+def godot_string_hash(text: str) -> int:
+    """Godot String.hash(): djb2 over code points, as a uint32."""
+    hashv = 5381
+    for ch in text:
+        hashv = ((hashv << 5) + hashv + ord(ch)) & MASK_32
+    return hashv
+
+
+def _pcg32_next(state: int) -> Tuple[int, int]:
+    """Advance a PCG32 state. Returns (new_state, output)."""
+    new_state = (state * PCG_MULTIPLIER + PCG_INC) & MASK_64
+    xorshifted = (((state >> 18) ^ state) >> 27) & MASK_32
+    rot = state >> 59
+    output = ((xorshifted >> rot) | (xorshifted << ((-rot) & 31))) & MASK_32
+    return new_state, output
+
+
+def roll_range(state: "SimState", min_value: int, max_value: int) -> int:
+    """SimRng.roll_range(): RandomNumberGenerator.randi_range on state.rng_state."""
+    if min_value == max_value:
+        return min_value
+    bound = abs(max_value - min_value) + 1
+    threshold = (-bound) % bound
+    rng_state = state.rng_state
+    while True:
+        rng_state, value = _pcg32_next(rng_state)
+        if value >= threshold:
+            state.rng_state = rng_state
+            return value % bound + min(min_value, max_value)
+
+
+def choose(state: "SimState", items: List[Any]) -> Any:
+    """SimRng.choose()."""
+    if not items:
+        return None
+    return items[roll_range(state, 0, len(items) - 1)]
+
+
+def _hash_index(key: str, modulo: int) -> int:
+    if modulo <= 0:
+        return 0
+    return godot_string_hash(key) % modulo
+
+
+# ============================================================================
+# STATIC GAME DATA (mirrors sim/*.gd constants)
+# ============================================================================
+
+RESOURCE_KEYS = ["wood", "stone", "food"]
+BUILDING_KEYS = ["farm", "lumber", "quarry", "wall", "tower", "market", "barracks", "temple", "workshop"]
+
+TERRAIN_PLAINS = "plains"
+TERRAIN_FOREST = "forest"
+TERRAIN_MOUNTAIN = "mountain"
+TERRAIN_WATER = "water"
+
+BUILDINGS: Dict[str, Dict[str, Any]] = {
+    "farm": {"cost": {"wood": 10}, "production": {"food": 3}, "defense": 0},
+    "lumber": {"cost": {"wood": 5, "food": 2}, "production": {"wood": 3}, "defense": 0},
+    "quarry": {"cost": {"wood": 5, "food": 2}, "production": {"stone": 3}, "defense": 0},
+    "wall": {"cost": {"wood": 4, "stone": 4}, "production": {}, "defense": 1},
+    "tower": {"cost": {"wood": 4, "stone": 8}, "production": {}, "defense": 2},
+    "market": {"cost": {"wood": 8, "stone": 5}, "production": {"gold": 5}, "defense": 0},
+    "barracks": {"cost": {"wood": 10, "stone": 8}, "production": {}, "defense": 1},
+    "temple": {"cost": {"stone": 15, "gold": 20}, "production": {}, "defense": 0},
+    "workshop": {"cost": {"wood": 12, "stone": 6}, "production": {}, "defense": 0},
+}
+
+TOWER_STATS = {
+    1: {"range": 3, "damage": 1, "shots": 1},
+    2: {"range": 4, "damage": 2, "shots": 2},
+    3: {"range": 5, "damage": 3, "shots": 2},
+}
+TOWER_UPGRADE_COSTS = {
+    1: {"wood": 4, "stone": 8},
+    2: {"wood": 8, "stone": 12},
+}
+TOWER_MAX_LEVEL = 3
+
+NIGHT_WAVE_BASE_BY_DAY = {1: 2, 2: 3, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7}
+
+MIDGAME_STONE_CATCHUP_DAY = 4
+MIDGAME_STONE_CATCHUP_MIN = 10
+MIDGAME_FOOD_BONUS_DAY = 4
+MIDGAME_FOOD_BONUS_THRESHOLD = 12
+MIDGAME_FOOD_BONUS_AMOUNT = 2
+MIDGAME_CAPS_DAY5 = {"wood": 40, "stone": 20, "food": 25}
+MIDGAME_CAPS_DAY7 = {"wood": 50, "stone": 35, "food": 35}
+
+ENEMY_KINDS: Dict[str, Dict[str, Any]] = {
+    "raider": {"speed": 1, "armor": 0, "hp_bonus": 0},
+    "scout": {"speed": 2, "armor": 0, "hp_bonus": -1},
+    "armored": {"speed": 1, "armor": 1, "hp_bonus": 1},
+    "swarm": {"speed": 3, "armor": 0, "hp_bonus": -2},
+    "tank": {"speed": 1, "armor": 2, "hp_bonus": 3},
+    "berserker": {"speed": 2, "armor": 0, "hp_bonus": 1},
+    "phantom": {"speed": 1, "armor": 0, "hp_bonus": 0, "evasion": 0.5},
+    "champion": {"speed": 1, "armor": 1, "hp_bonus": 2},
+    "healer": {"speed": 1, "armor": 0, "hp_bonus": 0, "heal_rate": 1},
+    "elite": {"speed": 1, "armor": 1, "hp_bonus": 1, "has_affix": True},
+}
+BOSS_KINDS: Dict[str, Dict[str, Any]] = {
+    "forest_guardian": {"speed": 1, "armor": 1, "hp_bonus": 8, "regen_rate": 2},
+    "stone_golem": {"speed": 1, "armor": 4, "hp_bonus": 12},
+    "fen_seer": {"speed": 1, "armor": 1, "hp_bonus": 10, "evasion": 0.3},
+    "sunlord": {"speed": 2, "armor": 2, "hp_bonus": 15, "enraged": True},
+}
+BOSS_DAYS = {5: "forest_guardian", 10: "stone_golem", 15: "fen_seer", 20: "sunlord"}
+
+ENEMY_HP_BONUS_BY_DAY = {
+    "armored": [1, 1, 1, 2, 2, 3, 4],
+    "raider": [0, 0, 0, 0, 1, 1, 2],
+    "scout": [-1, -1, -1, 0, 0, 0, 1],
+    "swarm": [-2, -2, -2, -1, -1, 0, 0],
+    "tank": [3, 3, 4, 4, 5, 5, 6],
+    "berserker": [1, 1, 1, 2, 2, 2, 3],
+    "phantom": [0, 0, 0, 0, 1, 1, 2],
+    "champion": [2, 2, 2, 3, 3, 4, 5],
+    "healer": [0, 0, 0, 1, 1, 1, 2],
+    "elite": [1, 1, 2, 2, 3, 3, 4],
+}
+ENEMY_ARMOR_BY_DAY = {
+    "armored": [1, 1, 1, 1, 1, 2, 2],
+    "raider": [0, 0, 0, 0, 0, 0, 1],
+    "scout": [0, 0, 0, 0, 0, 0, 1],
+    "swarm": [0, 0, 0, 0, 0, 0, 0],
+    "tank": [2, 2, 2, 2, 3, 3, 3],
+    "berserker": [0, 0, 0, 0, 0, 1, 1],
+    "phantom": [0, 0, 0, 0, 0, 0, 0],
+    "champion": [1, 1, 1, 1, 2, 2, 2],
+    "healer": [0, 0, 0, 0, 0, 0, 1],
+    "elite": [1, 1, 1, 1, 1, 2, 2],
+}
+ENEMY_SPEED_BY_DAY = {
+    "raider": [1, 1, 1, 1, 1, 1, 2],
+    "scout": [2, 2, 2, 2, 2, 2, 3],
+    "armored": [1, 1, 1, 1, 1, 1, 2],
+    "swarm": [3, 3, 3, 3, 3, 3, 4],
+    "tank": [1, 1, 1, 1, 1, 1, 1],
+    "berserker": [2, 2, 2, 2, 2, 2, 3],
+    "phantom": [1, 1, 1, 1, 1, 2, 2],
+    "champion": [1, 1, 1, 1, 1, 1, 2],
+    "healer": [1, 1, 1, 1, 1, 1, 1],
+    "elite": [1, 1, 1, 1, 1, 2, 2],
+}
+GOLD_REWARDS = {
+    "scout": 1, "raider": 2, "armored": 3, "swarm": 1, "tank": 4,
+    "berserker": 3, "phantom": 3, "champion": 5, "healer": 4, "elite": 6,
+    "forest_guardian": 25, "stone_golem": 40, "fen_seer": 55, "sunlord": 75,
+}
+
+SHORT_WORDS = ["mist", "fern", "glow", "bolt", "rift", "lark", "reed", "moth", "brim", "palm", "rust", "quill"]
+MEDIUM_WORDS = ["harvest", "harbor", "citron", "amber", "copper", "stone", "forest", "meadow",
+                "candle", "shield", "vector", "echoes", "market", "bridge"]
+LONG_WORDS = ["sentinel", "fortress", "vanguard", "monolith", "stronghold", "cathedral",
+              "archivist", "lighthouse", "riverstone", "everglade", "moonlight", "wildgrowth"]
+
+RESERVED_WORDS = frozenset([
+    "help", "version", "status", "balance", "gather", "build", "explore", "interact",
+    "choice", "skip", "buy", "upgrades", "end", "seed", "defend", "wait", "save", "load",
+    "new", "restart", "cursor", "inspect", "map", "overlay", "preview", "upgrade",
+    "demolish", "enemies", "goal", "lesson", "lessons", "settings", "bind", "report",
+    "history", "trend", "tutorial",
+])
+
+LESSON_KINDS = ["scout", "raider", "armored"]
+DEFAULT_LESSON_ID = "full_alpha"
+DEFAULT_LESSON_LENGTHS = {"scout": [3, 4], "raider": [4, 6], "armored": [6, 8]}
+
+
+# ============================================================================
+# LESSON DATA
+# ============================================================================
+
+_LESSON_CACHE: Dict[str, Any] = {}
+
+
+def _normalize_charset(raw: str) -> str:
+    seen = set()
+    output = []
+    for ch in raw.lower():
+        if ch in " \t\n\r" or ch in seen:
+            continue
+        seen.add(ch)
+        output.append(ch)
+    return "".join(output)
+
+
+def _normalize_lengths(raw: Any) -> Dict[str, List[int]]:
+    output = {}
+    for kind in LESSON_KINDS:
+        min_len, max_len = DEFAULT_LESSON_LENGTHS[kind]
+        value = raw.get(kind) if isinstance(raw, dict) and kind in raw else None
+        if isinstance(value, list) and len(value) >= 2:
+            min_len, max_len = int(value[0]), int(value[1])
+        min_len = max(1, min_len)
+        max_len = max(min_len, max_len)
+        output[kind] = [min_len, max_len]
+    return output
+
+
+def load_lessons(path: Path = LESSONS_PATH) -> Dict[str, Any]:
+    """Load and normalize lessons.json the way SimLessons._normalize_data does."""
+    key = str(path)
+    if key in _LESSON_CACHE:
+        return _LESSON_CACHE[key]
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    by_id: Dict[str, Dict[str, Any]] = {}
+    order: List[str] = []
+    for entry in raw.get("lessons", []):
+        if not isinstance(entry, dict):
+            continue
+        lesson_id = str(entry.get("id", "")).strip().lower()
+        if not lesson_id:
+            continue
+        by_id[lesson_id] = {
+            "id": lesson_id,
+            "name": str(entry.get("name", lesson_id)),
+            "mode": str(entry.get("mode", "charset")),
+            "charset": _normalize_charset(str(entry.get("charset", ""))),
+            "lengths": _normalize_lengths(entry.get("lengths", {})),
+            "wordlist": [str(w).strip().lower() for w in entry.get("wordlist", []) if str(w).strip()],
+            "sentences": [str(s).strip() for s in entry.get("sentences", []) if str(s).strip()],
+        }
+        order.append(lesson_id)
+    default_id = str(raw.get("default_lesson", "")).strip().lower()
+    if default_id not in by_id:
+        default_id = order[0] if order else DEFAULT_LESSON_ID
+    data = {"default_lesson": default_id, "by_id": by_id, "order": order}
+    _LESSON_CACHE[key] = data
+    return data
+
+
+def normalize_lesson_id(lesson_id: str) -> str:
+    data = load_lessons()
+    cleaned = lesson_id.strip().lower()
+    if cleaned and cleaned in data["by_id"]:
+        return cleaned
+    return data["default_lesson"]
+
+
+# ============================================================================
+# WORD SELECTION (sim/words.gd)
+# ============================================================================
+
+def _make_word(base_key: str, charset: str, min_len: int, max_len: int, attempt: int) -> str:
+    span = max(1, max_len - min_len + 1)
+    length = min_len + _hash_index(f"{base_key}|len|{attempt}", span)
+    return "".join(
+        charset[_hash_index(f"{base_key}|{attempt}|{i}", len(charset))]
+        for i in range(length)
+    )
+
+
+def _word_from_lesson(seed: str, day: int, kind: str, enemy_id: int, lesson_id: str,
+                      lesson: Dict[str, Any], used: set) -> str:
+    charset = lesson["charset"]
+    if not charset:
+        return ""
+    min_len, max_len = 3, 5
+    lengths = lesson["lengths"].get(kind)
+    if lengths:
+        min_len, max_len = lengths
+    base_key = f"{seed}|{day}|{kind}|{enemy_id}|{lesson_id}"
+    for attempt in range(max(16, len(charset) * 2)):
+        word = _make_word(base_key, charset, min_len, max_len, attempt)
+        if word and word not in RESERVED_WORDS and word not in used:
+            return word
+    return ""
+
+
+def _word_from_wordlist(seed: str, day: int, kind: str, enemy_id: int,
+                        lesson: Dict[str, Any], used: set) -> str:
+    wordlist = lesson["wordlist"]
+    if not wordlist:
+        return ""
+    min_len, max_len = lesson["lengths"].get(kind, [3, 6])
+    filtered = [w for w in wordlist if min_len <= len(w) <= max_len] or wordlist
+    index = _hash_index(f"{seed}|{day}|{kind}|{enemy_id}", len(filtered))
+    for _ in range(len(filtered)):
+        word = filtered[index].lower()
+        if word not in RESERVED_WORDS and word not in used:
+            return word
+        index = (index + 1) % len(filtered)
+    return ""
+
+
+def _sentence_from_lesson(seed: str, day: int, enemy_id: int, lesson: Dict[str, Any], used: set) -> str:
+    sentences = lesson["sentences"]
+    if not sentences:
+        return ""
+    index = _hash_index(f"{seed}|{day}|{enemy_id}", len(sentences))
+    for _ in range(len(sentences)):
+        sentence = sentences[index]
+        if sentence.lower() not in used:
+            return sentence
+        index = (index + 1) % len(sentences)
+    return ""
+
+
+def _fallback_word(seed: str, day: int, kind: str, enemy_id: int, used: set) -> str:
+    words = SHORT_WORDS if kind == "scout" else LONG_WORDS if kind == "armored" else MEDIUM_WORDS
+    index = _hash_index(f"{seed}|{day}|{kind}|{enemy_id}", len(words))
+    for _ in range(len(words)):
+        word = words[index]
+        if word not in RESERVED_WORDS and word not in used:
+            return word
+        index = (index + 1) % len(words)
+    return f"foe{enemy_id}"
+
+
+def word_for_enemy(seed: str, day: int, kind: str, enemy_id: int, used: set, lesson_id: str = "") -> str:
+    """SimWords.word_for_enemy()."""
+    resolved = normalize_lesson_id(lesson_id)
+    lesson = load_lessons()["by_id"].get(resolved)
+    if not lesson:
+        return _fallback_word(seed, day, kind, enemy_id, used)
+    mode = lesson["mode"]
+    word = ""
+    if mode == "wordlist":
+        word = _word_from_wordlist(seed, day, kind, enemy_id, lesson, used)
+    elif mode == "sentence":
+        word = _sentence_from_lesson(seed, day, enemy_id, lesson, used)
+    else:
+        word = _word_from_lesson(seed, day, kind, enemy_id, resolved, lesson, used)
+    return word or _fallback_word(seed, day, kind, enemy_id, used)
+
+
+# ============================================================================
+# STATE
+# ============================================================================
+
+@dataclass
+class SimState:
+    """Subset of GameState (sim/types.gd) needed by scenario scripts."""
+    day: int = 1
+    phase: str = "day"
+    ap_max: int = 3
+    ap: int = 3
+    hp: int = 10
+    threat: int = 0
+    gold: int = 0
+    map_w: int = 64
+    map_h: int = 64
+    base_pos: Tuple[int, int] = (32, 32)
+    cursor_pos: Tuple[int, int] = (32, 32)
+    resources: Dict[str, int] = field(default_factory=lambda: {k: 0 for k in RESOURCE_KEYS})
+    buildings: Dict[str, int] = field(default_factory=lambda: {k: 0 for k in BUILDING_KEYS})
+    structures: Dict[int, str] = field(default_factory=dict)
+    structure_levels: Dict[int, int] = field(default_factory=dict)
+    discovered: Dict[int, bool] = field(default_factory=dict)
+    terrain: Dict[int, str] = field(default_factory=dict)
+    night_spawn_remaining: int = 0
+    night_wave_total: int = 0
+    enemies: List[Dict[str, Any]] = field(default_factory=list)
+    enemy_next_id: int = 1
+    last_path_open: bool = True
+    rng_seed: str = "default"
+    rng_state: int = 0
+    lesson_id: str = DEFAULT_LESSON_ID
+    practice_mode: bool = False
+    speed_multiplier: float = 1.0
+    # Bumped whenever blocking structures change; keys the distance-field cache.
+    layout_rev: int = 0
+    _dist_cache: Optional[Tuple[int, List[int]]] = field(default=None, repr=False)
+    _spawn_cache: Optional[Tuple[int, List[int]]] = field(default=None, repr=False)
+
+
+def idx(x: int, y: int, w: int) -> int:
+    return y * w + x
+
+
+def in_bounds(x: int, y: int, w: int, h: int) -> bool:
+    return 0 <= x < w and 0 <= y < h
+
+
+def get_terrain(state: SimState, x: int, y: int) -> str:
+    if not in_bounds(x, y, state.map_w, state.map_h):
+        return ""
+    return state.terrain.get(idx(x, y, state.map_w), TERRAIN_PLAINS)
+
+
+def create_state(seed: str = "default", terrain: Optional[Dict[int, str]] = None) -> SimState:
+    """DefaultState.create(): seed the RNG and discover the starting area."""
+    state = SimState()
+    state.rng_seed = seed
+    state.rng_state = godot_string_hash(seed)
+    state.lesson_id = load_lessons()["default_lesson"]
+    if terrain:
+        state.terrain = dict(terrain)
+    bx, by = state.base_pos
+    state.terrain[idx(bx, by, state.map_w)] = TERRAIN_PLAINS
+    for dy in range(-5, 6):
+        for dx in range(-5, 6):
+            x, y = bx + dx, by + dy
+            if in_bounds(x, y, state.map_w, state.map_h):
+                state.discovered[idx(x, y, state.map_w)] = True
+    state.gold = 10
+    return state
+
+
+# ============================================================================
+# MAP HELPERS (sim/map.gd)
+# ============================================================================
+
+def _is_passable(state: SimState, index: int) -> bool:
+    if state.structures.get(index) in ("wall", "tower"):
+        return False
+    return state.terrain.get(index, TERRAIN_PLAINS) != TERRAIN_WATER
+
+
+def compute_dist_to_base(state: SimState) -> List[int]:
+    """BFS distance field to the base, cached until the layout changes."""
+    if state._dist_cache is not None and state._dist_cache[0] == state.layout_rev:
+        return state._dist_cache[1]
+    w, h = state.map_w, state.map_h
+    dist = [-1] * (w * h)
+    base_index = idx(state.base_pos[0], state.base_pos[1], w)
+    dist[base_index] = 0
+    queue = deque([base_index])
+    while queue:
+        current = queue.popleft()
+        cx, cy = current % w, current // w
+        next_dist = dist[current] + 1
+        for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+            if not (0 <= nx < w and 0 <= ny < h):
+                continue
+            neighbor = ny * w + nx
+            if dist[neighbor] >= 0:
+                continue
+            if neighbor != base_index and not _is_passable(state, neighbor):
+                continue
+            dist[neighbor] = next_dist
+            queue.append(neighbor)
+    state._dist_cache = (state.layout_rev, dist)
+    return dist
+
+
+def path_open_to_base(state: SimState) -> bool:
+    dist = compute_dist_to_base(state)
+    w, h = state.map_w, state.map_h
+    for x in range(w):
+        if dist[idx(x, 0, w)] >= 0 or dist[idx(x, h - 1, w)] >= 0:
+            return True
+    for y in range(h):
+        if dist[idx(0, y, w)] >= 0 or dist[idx(w - 1, y, w)] >= 0:
+            return True
+    return False
+
+
+def _spawn_candidates(state: SimState) -> List[int]:
+    if state._spawn_cache is not None and state._spawn_cache[0] == state.layout_rev:
+        return state._spawn_cache[1]
+    w, h = state.map_w, state.map_h
+    base_index = idx(state.base_pos[0], state.base_pos[1], w)
+    seen = set()
+    candidates = []
+    edge = [(x, 0) for x in range(w)] + [(x, h - 1) for x in range(w)]
+    edge += [(0, y) for y in range(h)] + [(w - 1, y) for y in range(h)]
+    for x, y in edge:
+        index = idx(x, y, w)
+        if index == base_index or index in seen:
+            continue
+        seen.add(index)
+        if _is_passable(state, index):
+            candidates.append(index)
+    candidates.sort()
+    state._spawn_cache = (state.layout_rev, candidates)
+    return candidates
+
+
+def _adjacent_structure(state: SimState, index: int, building_type: str) -> bool:
+    w, h = state.map_w, state.map_h
+    x, y = index % w, index // w
+    for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+        if in_bounds(nx, ny, w, h) and state.structures.get(idx(nx, ny, w)) == building_type:
+            return True
+    return False
+
+
+def _adjacent_terrain(state: SimState, index: int, terrain: str) -> bool:
+    w, h = state.map_w, state.map_h
+    x, y = index % w, index // w
+    for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+        if in_bounds(nx, ny, w, h) and get_terrain(state, nx, ny) == terrain:
+            return True
+    return False
+
+
+# ============================================================================
+# ECONOMY (sim/buildings.gd, sim/tick.gd, sim/balance.gd)
+# ============================================================================
+
+def daily_production(state: SimState) -> Dict[str, int]:
+    totals = {"wood": 0, "stone": 0, "food": 1}
+    for index, building_type in state.structures.items():
+        config = BUILDINGS.get(building_type)
+        if config is None:
+            continue
+        for key, amount in config["production"].items():
+            totals[key] = totals.get(key, 0) + amount
+        if building_type == "farm" and _adjacent_terrain(state, index, TERRAIN_WATER):
+            totals["food"] += 1
+        elif building_type == "lumber" and _adjacent_terrain(state, index, TERRAIN_FOREST):
+            totals["wood"] += 1
+        elif building_type == "quarry" and _adjacent_terrain(state, index, TERRAIN_MOUNTAIN):
+            totals["stone"] += 1
+    return totals
+
+
+def total_defense(state: SimState) -> int:
+    defense = 0
+    for index, building_type in state.structures.items():
+        base_defense = BUILDINGS.get(building_type, {}).get("defense", 0)
+        if base_defense <= 0:
+            continue
+        defense += base_defense
+        if building_type == "tower" and _adjacent_structure(state, index, "wall"):
+            defense += 1
+    return defense
+
+
+def caps_for_day(day: int) -> Dict[str, int]:
+    if day >= 7:
+        return MIDGAME_CAPS_DAY7
+    if day >= 5:
+        return MIDGAME_CAPS_DAY5
+    return {}
+
+
+def advance_day(state: SimState, events: List[str]) -> None:
+    state.day += 1
+    production = daily_production(state)
+    summary = []
+    for key in RESOURCE_KEYS:
+        amount = int(production.get(key, 0))
+        if amount > 0:
+            state.resources[key] = state.resources.get(key, 0) + amount
+            summary.append(f"{amount} {key}")
+    events.append(f"Day advanced to {state.day}.")
+    events.append("Production: none." if not summary else f"Production: +{', '.join(summary)}.")
+    if state.day >= MIDGAME_FOOD_BONUS_DAY and state.resources.get("food", 0) < MIDGAME_FOOD_BONUS_THRESHOLD:
+        state.resources["food"] = state.resources.get("food", 0) + MIDGAME_FOOD_BONUS_AMOUNT
+        events.append(f"Midgame supply: +{MIDGAME_FOOD_BONUS_AMOUNT} food.")
+    trimmed = []
+    for key, cap in caps_for_day(state.day).items():
+        value = state.resources.get(key, 0)
+        if value > cap:
+            state.resources[key] = cap
+            trimmed.append(f"{key} {value - cap}")
+    if trimmed:
+        events.append(f"Storage limits: -{', '.join(trimmed)}.")
+
+
+def compute_night_wave_total(state: SimState, defense: int) -> int:
+    base = NIGHT_WAVE_BASE_BY_DAY.get(state.day, 2 + state.day // 2)
+    return max(1, base + state.threat - defense)
+
+
+# ============================================================================
+# ENEMIES (sim/enemies.gd)
+# ============================================================================
+
+def _by_day(table: Dict[str, List[int]], kind: str, day: int, fallback_key: str) -> int:
+    values = table.get(kind)
+    if not values:
+        return int(ENEMY_KINDS.get(kind, ENEMY_KINDS["raider"]).get(fallback_key, 0))
+    return int(values[max(0, min(day - 1, len(values) - 1))])
+
+
+def _used_words(enemies: List[Dict[str, Any]]) -> set:
+    return {str(e.get("word", "")).lower() for e in enemies if e.get("word")}
+
+
+def _assign_word(state: SimState, enemy: Dict[str, Any]) -> Dict[str, Any]:
+    word = word_for_enemy(state.rng_seed, state.day, enemy["kind"], enemy["id"],
+                          _used_words(state.enemies), state.lesson_id)
+    enemy["word"] = word.lower()
+    return enemy
+
+
+def _roll_affix(state: SimState) -> str:
+    affixes = ["swift", "armored", "resilient", "shielded"]
+    if state.day >= 6:
+        affixes.append("thorny")
+    if state.day >= 7:
+        affixes.append("ghostly")
+    if state.day >= 8:
+        affixes.append("splitting")
+    if state.day >= 9:
+        affixes.extend(["regenerating", "commanding"])
+    return str(choose(state, affixes))
+
+
+def make_enemy(state: SimState, kind: str, pos: Tuple[int, int]) -> Dict[str, Any]:
+    base_hp = 2 + state.day // 3 + state.threat // 4
+    config = ENEMY_KINDS.get(kind, ENEMY_KINDS["raider"])
+    enemy: Dict[str, Any] = {
+        "id": state.enemy_next_id,
+        "kind": kind,
+        "pos": pos,
+        "hp": max(1, base_hp + _by_day(ENEMY_HP_BONUS_BY_DAY, kind, state.day, "hp_bonus")),
+        "armor": _by_day(ENEMY_ARMOR_BY_DAY, kind, state.day, "armor"),
+        "speed": _by_day(ENEMY_SPEED_BY_DAY, kind, state.day, "speed"),
+        "word": "",
+    }
+    if "evasion" in config:
+        enemy["evasion"] = float(config["evasion"])
+        enemy["evade_ready"] = True
+    if "heal_rate" in config:
+        enemy["heal_rate"] = int(config["heal_rate"])
+    if config.get("has_affix"):
+        enemy["affix"] = _roll_affix(state)
+    return _assign_word(state, enemy)
+
+
+def make_boss(state: SimState, kind: str, pos: Tuple[int, int]) -> Dict[str, Any]:
+    config = BOSS_KINDS[kind]
+    hp = 10 + state.day // 2 + state.threat // 3 + int(config.get("hp_bonus", 0))
+    boss: Dict[str, Any] = {
+        "id": state.enemy_next_id,
+        "kind": kind,
+        "pos": pos,
+        "hp": hp,
+        "hp_max": hp,
+        "armor": int(config.get("armor", 0)),
+        "speed": int(config.get("speed", 1)),
+        "word": "",
+        "is_boss": True,
+    }
+    if "regen_rate" in config:
+        boss["regen_rate"] = int(config["regen_rate"])
+    if "evasion" in config:
+        boss["evasion"] = float(config["evasion"])
+        boss["evade_ready"] = True
+    if config.get("enraged"):
+        boss["enraged"] = True
+    return _assign_word(state, boss)
+
+
+def _apply_affix_on_spawn(enemy: Dict[str, Any]) -> None:
+    affix = enemy.get("affix", "")
+    if affix == "swift":
+        enemy["speed"] += 1
+    elif affix == "armored":
+        enemy["armor"] += 1
+    elif affix == "resilient":
+        enemy["hp"] += 2
+    elif affix == "shielded":
+        enemy["shield_active"] = True
+    elif affix in ("thorny", "ghostly", "enraged", "vampiric", "explosive"):
+        enemy[affix] = True
+
+
+def choose_spawn_kind(state: SimState) -> str:
+    day, threat = state.day, state.threat
+    kinds = ["raider"]
+    if day >= 3 or threat >= 2:
+        kinds.append("scout")
+    if day >= 4 or threat >= 3:
+        kinds.append("swarm")
+    if day >= 5 or threat >= 4:
+        kinds.append("armored")
+    if day >= 5 or threat >= 5:
+        kinds.append("berserker")
+    if day >= 6 or threat >= 6:
+        kinds.append("tank")
+    if day >= 6 or threat >= 5:
+        kinds.append("phantom")
+    if day >= 7 or threat >= 7:
+        kinds.append("champion")
+    if day >= 7 or threat >= 6:
+        kinds.append("healer")
+    if day >= 8 or threat >= 8:
+        kinds.append("elite")
+    weights = {
+        "raider": 6,
+        "scout": 2 + day // 3,
+        "swarm": max(0, day // 2),
+        "armored": max(0, day // 2 - 1),
+        "berserker": max(0, day // 3),
+        "tank": max(0, day // 3 - 1),
+        "phantom": max(0, day // 3),
+        "champion": max(0, day // 4),
+        "healer": max(0, day // 4),
+        "elite": max(0, day // 5),
+    }
+    total = sum(weights[k] for k in kinds)
+    if total <= 0:
+        return "raider"
+    roll = roll_range(state, 1, total)
+    running = 0
+    for kind in kinds:
+        running += weights[kind]
+        if roll <= running:
+            return kind
+    return "raider"
+
+
+def _apply_damage(state: SimState, enemy: Dict[str, Any], dmg: int) -> None:
+    if enemy.get("evade_ready") and enemy.get("evasion", 0.0) > 0.0:
+        roll = roll_range(state, 1, 100) / 100.0
+        enemy["evade_ready"] = False
+        if roll <= enemy["evasion"]:
+            return
+    if enemy.get("shield_active"):
+        enemy["shield_active"] = False
+        return
+    effective = max(0, dmg - int(enemy.get("armor", 0)))
+    if enemy.get("ghostly"):
+        effective = max(1, effective // 2)
+    enemy["hp"] = int(enemy.get("hp", 0)) - effective
+
+
+def _pick_target_index(state: SimState, dist: List[int], origin: Tuple[int, int], max_range: int) -> int:
+    best_index, best_dist, best_id = -1, 999999, 999999
+    for i, enemy in enumerate(state.enemies):
+        ex, ey = enemy["pos"]
+        if max_range >= 0 and abs(origin[0] - ex) + abs(origin[1] - ey) > max_range:
+            continue
+        d = dist[idx(ex, ey, state.map_w)]
+        if d < 0:
+            continue
+        if d < best_dist or (d == best_dist and enemy["id"] < best_id):
+            best_index, best_dist, best_id = i, d, enemy["id"]
+    return best_index
+
+
+# ============================================================================
+# NIGHT STEP (sim/apply_intent.gd)
+# ============================================================================
+
+def _spawn_enemy_step(state: SimState, events: List[str]) -> None:
+    if state.night_spawn_remaining <= 0:
+        return
+    candidates = _spawn_candidates(state)
+    spawn_index = int(choose(state, candidates)) if candidates else -1
+    state.night_spawn_remaining -= 1
+    if spawn_index < 0:
+        events.append("No valid spawn points.")
+        return
+    pos = (spawn_index % state.map_w, spawn_index // state.map_w)
+    kind = choose_spawn_kind(state)
+    enemy = make_enemy(state, kind, pos)
+    _apply_affix_on_spawn(enemy)
+    state.enemy_next_id += 1
+    state.enemies.append(enemy)
+    events.append(f"Enemy spawned: {kind}#{enemy['id']} at ({pos[0]},{pos[1]}) "
+                  f"[hp {enemy['hp']}] word={enemy['word']}.")
+    if kind == "swarm" and state.night_spawn_remaining > 0:
+        for _ in range(roll_range(state, 1, 2)):
+            if state.night_spawn_remaining <= 0:
+                break
+            extra_index = int(choose(state, candidates)) if candidates else -1
+            if extra_index < 0:
+                break
+            state.night_spawn_remaining -= 1
+            extra_pos = (extra_index % state.map_w, extra_index // state.map_w)
+            extra = make_enemy(state, "swarm", extra_pos)
+            state.enemy_next_id += 1
+            state.enemies.append(extra)
+            events.append(f"Swarm pack: swarm#{extra['id']} at ({extra_pos[0]},{extra_pos[1]}) word={extra['word']}.")
+
+
+def _tower_attack_step(state: SimState, dist: List[int], events: List[str]) -> None:
+    if not state.enemies:
+        return
+    towers = sorted(i for i, t in state.structures.items() if t.startswith("tower"))
+    for index in towers:
+        level = state.structure_levels.get(index, 1)
+        stats = TOWER_STATS.get(level, TOWER_STATS[1])
+        range_val = stats["range"] + int((level - 1) * 0.5)
+        origin = (index % state.map_w, index // state.map_w)
+        for _ in range(stats["shots"]):
+            if not state.enemies:
+                return
+            target = _pick_target_index(state, dist, origin, range_val)
+            if target < 0:
+                break
+            enemy = state.enemies[target]
+            enemy["hp"] -= stats["damage"]
+            events.append(f"Tower hits {enemy['kind']}#{enemy['id']} for {stats['damage']}.")
+            if enemy["hp"] <= 0:
+                state.enemies.pop(target)
+                events.append(f"Enemy {enemy['kind']}#{enemy['id']} destroyed by tower.")
+
+
+def _hit_base(state: SimState, enemy: Dict[str, Any], events: List[str]) -> None:
+    base_dmg = 2 if enemy.get("enraged") or enemy.get("affix") == "enraged" else 1
+    if state.practice_mode:
+        events.append(f"Enemy {enemy['kind']}#{enemy['id']} reaches base. (practice mode - no damage)")
+        return
+    state.hp -= base_dmg
+    events.append(f"Enemy {enemy['kind']}#{enemy['id']} hits the base for {base_dmg}.")
+
+
+def _enemy_move_step(state: SimState, dist: List[int], events: List[str]) -> None:
+    if not state.enemies:
+        return
+    w, h = state.map_w, state.map_h
+    offsets = ((0, -1), (1, 0), (0, 1), (-1, 0))
+    multiplier = state.speed_multiplier if state.speed_multiplier > 0.0 else 1.0
+    for enemy_id in sorted(e["id"] for e in state.enemies):
+        enemy = next((e for e in state.enemies if e["id"] == enemy_id), None)
+        if enemy is None:
+            continue
+        speed = max(1, int(float(enemy.get("speed", 1)) * multiplier))
+        for _ in range(speed):
+            pos = enemy["pos"]
+            if pos == state.base_pos:
+                _hit_base(state, enemy, events)
+                state.enemies.remove(enemy)
+                break
+            current = dist[idx(pos[0], pos[1], w)]
+            if current < 0:
+                break
+            next_pos = pos
+            for ox, oy in offsets:
+                cx, cy = pos[0] + ox, pos[1] + oy
+                if not in_bounds(cx, cy, w, h):
+                    continue
+                candidate = dist[idx(cx, cy, w)]
+                if 0 <= candidate < current:
+                    next_pos = (cx, cy)
+                    break
+            if next_pos != pos:
+                enemy["pos"] = next_pos
+                if next_pos == state.base_pos:
+                    _hit_base(state, enemy, events)
+                    state.enemies.remove(enemy)
+                    break
+
+
+def _enemy_ability_tick(state: SimState, events: List[str]) -> None:
+    for enemy in state.enemies:
+        regen = int(enemy.get("regen_rate", 0))
+        if regen > 0 and enemy.get("is_boss"):
+            old_hp = enemy["hp"]
+            enemy["hp"] = min(int(enemy.get("hp_max", old_hp)), old_hp + regen)
+            if enemy["hp"] > old_hp:
+                events.append(f"{enemy['kind']} regenerates {enemy['hp'] - old_hp} HP.")
+
+
+def _player_attack(state: SimState, target_index: int, hit_word: str, events: List[str]) -> None:
+    enemy = state.enemies[target_index]
+    damage = 2
+    _apply_damage(state, enemy, damage)
+    effective = max(1, damage - int(enemy.get("armor", 0)))
+    events.append(f"Hit {enemy['kind']}#{enemy['id']} word={hit_word or enemy['word']} dmg={effective}.")
+    if enemy["hp"] > 0 and enemy["kind"] == "berserker" and not enemy.get("enraged"):
+        enemy["enraged"] = True
+        enemy["speed"] += 1
+        events.append(f"Berserker#{enemy['id']} enters a rage! Speed +1.")
+    if enemy.get("thorny") and not state.practice_mode:
+        state.hp -= 1
+        events.append("Thorns deal 1 damage!")
+    if enemy["hp"] <= 0:
+        if enemy.get("explosive") and not state.practice_mode:
+            state.hp -= 2
+            events.append("Enemy explodes! Castle takes 2 damage.")
+        state.enemies.pop(target_index)
+        reward = GOLD_REWARDS.get(enemy["kind"], 2)
+        state.gold += reward
+        events.append(f"Enemy {enemy['kind']}#{enemy['id']} defeated. +{reward} gold")
+
+
+def _advance_night_step(state: SimState, hit_index: int, miss_penalty: bool,
+                        events: List[str], hit_word: str) -> None:
+    dist = compute_dist_to_base(state)
+    if hit_index >= 0:
+        _player_attack(state, hit_index, hit_word, events)
+    elif miss_penalty:
+        if state.practice_mode:
+            events.append("Miss. (practice mode - no damage)")
+        else:
+            state.hp -= 1
+            events.append("Miss. No matching enemy word.")
+    else:
+        events.append("Waited.")
+
+    _spawn_enemy_step(state, events)
+    _tower_attack_step(state, dist, events)
+    _enemy_move_step(state, dist, events)
+    _enemy_ability_tick(state, events)
+
+    if state.hp <= 0:
+        state.phase = "game_over"
+        events.append("Game Over.")
+        return
+    if state.night_spawn_remaining <= 0 and not state.enemies:
+        state.phase = "day"
+        state.ap = state.ap_max
+        state.night_wave_total = 0
+        state.threat = max(0, state.threat - 1)
+        if state.day >= 21:
+            state.phase = "victory"
+            events.append("VICTORY! The kingdom is saved!")
+            return
+        events.append("Dawn breaks.")
+
+
+# ============================================================================
+# COMMAND PARSING (sim/parse_command.gd subset)
+# ============================================================================
+
+def _is_int(text: str) -> bool:
+    body = text[1:] if text[:1] in "+-" else text
+    return body.isdigit()
+
+
+def parse_command(command: str) -> Dict[str, Any]:
+    """Parse a command line into an intent. Mirrors CommandParser.parse()."""
+    trimmed = command.strip()
+    if not trimmed:
+        return {"ok": False, "error": "Enter a command. Type 'help' for options."}
+    tokens = trimmed.split()
+    verb = tokens[0].lower()
+    args = tokens[1:]
+
+    def intent(kind: str, **payload: Any) -> Dict[str, Any]:
+        return {"ok": True, "intent": {"kind": kind, **payload}}
+
+    def coords(kind: str, usage: str) -> Dict[str, Any]:
+        if not args:
+            return intent(kind)
+        if len(args) != 2:
+            return {"ok": False, "error": usage}
+        if not _is_int(args[0]) or not _is_int(args[1]):
+            return {"ok": False, "error": f"{kind.capitalize()} coordinates must be integers."}
+        return intent(kind, x=int(args[0]), y=int(args[1]))
+
+    if verb in ("status", "end", "explore", "map", "wait", "enemies"):
+        if args:
+            return {"ok": False, "error": f"'{verb}' takes no arguments."}
+        return intent(verb)
+    if verb == "gather":
+        if len(args) != 2:
+            return {"ok": False, "error": "Usage: gather <resource> <amount>"}
+        resource = args[0].lower()
+        if resource not in RESOURCE_KEYS:
+            return {"ok": False, "error": f"Unknown resource: {resource}"}
+        if not _is_int(args[1]) or int(args[1]) <= 0:
+            return {"ok": False, "error": "Amount must be a positive integer."}
+        return intent("gather", resource=resource, amount=int(args[1]))
+    if verb == "build":
+        if len(args) not in (1, 3):
+            return {"ok": False, "error": "Usage: build <type> [x y]"}
+        building = args[0].lower()
+        if building not in BUILDINGS:
+            return {"ok": False, "error": f"Unknown build type: {building}"}
+        if len(args) == 3:
+            if not _is_int(args[1]) or not _is_int(args[2]):
+                return {"ok": False, "error": "Build coordinates must be integers."}
+            return intent("build", building=building, x=int(args[1]), y=int(args[2]))
+        return intent("build", building=building)
+    if verb == "inspect":
+        return coords("inspect", "Usage: inspect [x y]")
+    if verb == "demolish":
+        return coords("demolish", "Usage: demolish [x y]")
+    if verb == "upgrade":
+        return coords("upgrade", "Usage: upgrade [x y]")
+    if verb == "seed":
+        seed_value = trimmed[len(verb):].strip()
+        if not seed_value:
+            return {"ok": False, "error": "Usage: seed <string>"}
+        return intent("seed", seed=seed_value)
+    if verb == "lesson":
+        if not args:
+            return intent("lesson_show")
+        if len(args) == 1:
+            arg = args[0].lower()
+            if arg in ("next", "prev"):
+                return intent(f"lesson_{arg}")
+            if arg == "sample":
+                return intent("lesson_sample", count=3)
+            return intent("lesson_set", lesson_id=arg)
+        return {"ok": False, "error": "Usage: lesson [id|next|prev|sample [n]]"}
+    if verb == "goal":
+        if not args:
+            return intent("ui_goal_show")
+        if len(args) == 1:
+            goal_id = args[0].lower()
+            if goal_id == "next":
+                return intent("ui_goal_next")
+            return intent("ui_goal_set", goal_id=goal_id)
+        return {"ok": False, "error": "Usage: goal [id|next]"}
+    if verb in ("help", "version", "settings", "report", "history", "trend", "lessons",
+                "overlay", "preview", "tutorial", "bind"):
+        return intent(f"ui_{verb}")
+    return {"ok": False, "error": f"Unknown command: {verb}"}
+
+
+# ============================================================================
+# INTENT APPLICATION (sim/apply_intent.gd subset)
+# ============================================================================
+
+def _require_day(state: SimState, events: List[str]) -> bool:
+    if state.phase != "day":
+        events.append("That action is only available during the day.")
+        return False
+    return True
+
+
+def _consume_ap(state: SimState, events: List[str]) -> bool:
+    if state.ap <= 0:
+        events.append("No AP left.")
+        return False
+    state.ap -= 1
+    return True
+
+
+def _has_resources(state: SimState, cost: Dict[str, int]) -> bool:
+    return all(state.resources.get(k, 0) >= v for k, v in cost.items())
+
+
+def _apply_cost(state: SimState, cost: Dict[str, int]) -> None:
+    for key, value in cost.items():
+        state.resources[key] = state.resources.get(key, 0) - value
+
+
+def _intent_position(state: SimState, intent: Dict[str, Any]) -> Tuple[int, int]:
+    if "x" in intent and "y" in intent:
+        return int(intent["x"]), int(intent["y"])
+    return state.cursor_pos
+
+
+def _apply_gather(state: SimState, intent: Dict[str, Any], events: List[str]) -> None:
+    if not _require_day(state, events) or not _consume_ap(state, events):
+        return
+    resource = intent.get("resource", "")
+    base_amount = int(intent.get("amount", 0))
+    if resource not in state.resources or base_amount <= 0:
+        events.append("Invalid gather request.")
+        return
+    # resource multiplier is 1.0 with no upgrades; gather applies (1.0 + mult)
+    amount = int(float(base_amount) * 2.0)
+    state.resources[resource] += amount
+    events.append(f"Gathered {amount} {resource}.")
+
+
+def _apply_build(state: SimState, intent: Dict[str, Any], events: List[str]) -> None:
+    if not _require_day(state, events):
+        return
+    building = intent.get("building", "")
+    if building not in BUILDINGS:
+        events.append(f"Unknown build type: {building}")
+        return
+    x, y = _intent_position(state, intent)
+    if not in_bounds(x, y, state.map_w, state.map_h):
+        events.append("Build location out of bounds.")
+        return
+    index = idx(x, y, state.map_w)
+    if index not in state.discovered:
+        events.append("That tile is not discovered yet.")
+        return
+    if (x, y) == state.base_pos:
+        events.append("Cannot build on the base tile.")
+        return
+    if index in state.structures:
+        events.append("That tile is already occupied.")
+        return
+    if get_terrain(state, x, y) == TERRAIN_WATER:
+        events.append("Cannot build on water.")
+        return
+    cost = {k: max(1, v) for k, v in BUILDINGS[building]["cost"].items()}
+    if not _has_resources(state, cost):
+        events.append(f"Not enough resources to build {building}.")
+        return
+    if not _consume_ap(state, events):
+        return
+    _apply_cost(state, cost)
+    state.structures[index] = building
+    state.structure_levels[index] = 1
+    state.buildings[building] = state.buildings.get(building, 0) + 1
+    state.layout_rev += 1
+    events.append(f"Built {building} at ({x},{y}).")
+
+
+def _adjacent_undiscovered(state: SimState) -> List[int]:
+    w, h = state.map_w, state.map_h
+    results = set()
+    for index in state.discovered:
+        x, y = index % w, index // w
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < w and 0 <= ny < h:
+                neighbor = ny * w + nx
+                if neighbor not in state.discovered:
+                    results.add(neighbor)
+    return sorted(results)
+
+
+def _explore_reward(state: SimState, terrain: str) -> Tuple[str, int]:
+    amount = 8
+    if terrain == TERRAIN_FOREST:
+        choices = ["wood", "wood", "wood", "food", "stone"]
+    elif terrain == TERRAIN_MOUNTAIN:
+        choices = ["stone", "stone", "stone", "wood", "food"]
+    elif terrain == TERRAIN_PLAINS:
+        choices = ["food", "food", "food", "wood", "stone"]
+    elif terrain == TERRAIN_WATER:
+        choices = ["food", "food", "wood"]
+        amount = 5
+    else:
+        choices = ["food", "wood", "stone"]
+    resource = str(choose(state, choices) or "food")
+    if state.day >= MIDGAME_STONE_CATCHUP_DAY and state.resources.get("stone", 0) < MIDGAME_STONE_CATCHUP_MIN:
+        if resource != "stone" and amount < 8:
+            amount = 8
+        resource = "stone"
+    return resource, amount
+
+
+def _apply_explore(state: SimState, events: List[str]) -> None:
+    if not _require_day(state, events) or not _consume_ap(state, events):
+        return
+    candidates = _adjacent_undiscovered(state)
+    if not candidates:
+        candidates = [i for i in range(state.map_w * state.map_h) if i not in state.discovered]
+    if not candidates:
+        events.append("No new tiles to discover.")
+        return
+    tile_index = int(choose(state, candidates))
+    state.discovered[tile_index] = True
+    x, y = tile_index % state.map_w, tile_index // state.map_w
+    terrain = get_terrain(state, x, y)
+    resource, base_reward = _explore_reward(state, terrain)
+    reward = int(float(base_reward) * 2.0) if base_reward > 0 else 0
+    if reward > 0:
+        state.resources[resource] = state.resources.get(resource, 0) + reward
+    state.threat += 2
+    events.append(f"Discovered tile ({x},{y}): {terrain}. Found +{reward} {resource}.")
+
+
+def _apply_end(state: SimState, events: List[str]) -> None:
+    if not _require_day(state, events):
+        return
+    advance_day(state, events)
+    defense = total_defense(state)
+    state.phase = "night"
+    state.ap = 0
+    state.last_path_open = path_open_to_base(state)
+    state.night_wave_total = compute_night_wave_total(state, defense)
+    if not state.last_path_open:
+        state.night_wave_total = max(1, state.night_wave_total - 2)
+    state.night_spawn_remaining = state.night_wave_total
+    state.enemies = []
+    if state.day in BOSS_DAYS:
+        boss = make_boss(state, BOSS_DAYS[state.day], (state.map_w - 1, state.map_h // 2))
+        state.enemies.append(boss)
+        state.enemy_next_id += 1
+        events.append(f"BOSS ENCOUNTER: {boss['kind']} appears!")
+    events.append(f"Night falls. Enemy wave: {state.night_wave_total}.")
+
+
+def _apply_defend_input(state: SimState, intent: Dict[str, Any], events: List[str]) -> None:
+    if state.phase != "night":
+        events.append("No threats to defend right now.")
+        return
+    normalized = str(intent.get("text", "")).strip().lower()
+    if not normalized:
+        events.append("Type an enemy word to defend.")
+        return
+    target, best_id = -1, 999999
+    for i, enemy in enumerate(state.enemies):
+        if str(enemy.get("word", "")).lower() == normalized and enemy["id"] < best_id:
+            target, best_id = i, enemy["id"]
+    if target >= 0:
+        _advance_night_step(state, target, True, events, normalized)
+    elif not state.enemies:
+        events.append("No enemies yet; wait or defend after spawn.")
+        _advance_night_step(state, -1, False, events, "")
+    else:
+        _advance_night_step(state, -1, True, events, "")
+
+
+def _refund_for(building: str, level: int) -> Dict[str, int]:
+    total = dict(BUILDINGS.get(building, {}).get("cost", {}))
+    if building == "tower":
+        for upgrade_level in range(1, level):
+            for key, value in TOWER_UPGRADE_COSTS.get(upgrade_level, {}).items():
+                total[key] = total.get(key, 0) + value
+    return {k: int(v * 0.5) for k, v in total.items()}
+
+
+def _apply_demolish(state: SimState, intent: Dict[str, Any], events: List[str]) -> None:
+    if not _require_day(state, events):
+        return
+    x, y = _intent_position(state, intent)
+    if not in_bounds(x, y, state.map_w, state.map_h):
+        events.append("Demolish out of bounds.")
+        return
+    if (x, y) == state.base_pos:
+        events.append("Cannot demolish the base tile.")
+        return
+    index = idx(x, y, state.map_w)
+    if index not in state.structures:
+        events.append("No structure to demolish.")
+        return
+    if not _consume_ap(state, events):
+        return
+    building = state.structures.pop(index)
+    level = state.structure_levels.pop(index, 1)
+    if building in state.buildings:
+        state.buildings[building] = max(0, state.buildings[building] - 1)
+    for key, amount in _refund_for(building, level).items():
+        if amount > 0:
+            state.resources[key] = state.resources.get(key, 0) + amount
+    state.layout_rev += 1
+    events.append(f"Demolished {building} at ({x},{y}).")
+
+
+def _apply_upgrade(state: SimState, intent: Dict[str, Any], events: List[str]) -> None:
+    if not _require_day(state, events):
+        return
+    x, y = _intent_position(state, intent)
+    if not in_bounds(x, y, state.map_w, state.map_h):
+        events.append("Upgrade out of bounds.")
+        return
+    index = idx(x, y, state.map_w)
+    if index not in state.structures:
+        events.append("No structure to upgrade.")
+        return
+    if state.structures[index] != "tower":
+        events.append("Only towers and auto-towers can be upgraded.")
+        return
+    level = state.structure_levels.get(index, 1)
+    if level >= TOWER_MAX_LEVEL:
+        events.append("Tower is already max level.")
+        return
+    cost = {k: max(1, v) for k, v in TOWER_UPGRADE_COSTS.get(level, {}).items()}
+    if not _has_resources(state, cost):
+        events.append("Not enough resources to upgrade tower.")
+        return
+    if not _consume_ap(state, events):
+        return
+    _apply_cost(state, cost)
+    state.structure_levels[index] = level + 1
+    events.append(f"Upgraded tower at ({x},{y}) to level {level + 1}.")
+
+
+def _apply_lesson_set(state: SimState, intent: Dict[str, Any], events: List[str]) -> None:
+    if state.phase not in ("day", "game_over"):
+        events.append("Lesson changes are only available during the day or after game over.")
+        return
+    lesson_id = str(intent.get("lesson_id", "")).strip().lower()
+    if lesson_id not in load_lessons()["by_id"]:
+        events.append(f"Unknown lesson: {lesson_id}.")
+        return
+    state.lesson_id = lesson_id
+    events.append(f"Lesson set to {lesson_id}.")
+
+
+def _apply_lesson_cycle(state: SimState, delta: int, events: List[str]) -> None:
+    if state.phase not in ("day", "game_over"):
+        events.append("Lesson changes are only available during the day or after game over.")
+        return
+    order = load_lessons()["order"]
+    if not order:
+        return
+    current = order.index(state.lesson_id) if state.lesson_id in order else 0
+    state.lesson_id = order[(current + delta) % len(order)]
+    events.append(f"Lesson set to {state.lesson_id}.")
+
+
+def apply_intent(state: SimState, intent: Dict[str, Any]) -> List[str]:
+    """Apply an intent to the state in place and return the event log."""
+    events: List[str] = []
+    kind = str(intent.get("kind", ""))
+    if kind == "status":
+        events.append(f"Day {state.day} ({state.phase}) AP {state.ap}/{state.ap_max} HP {state.hp}")
+    elif kind == "seed":
+        state.rng_seed = str(intent.get("seed", ""))
+        state.rng_state = godot_string_hash(state.rng_seed)
+        events.append(f"Seed set to '{state.rng_seed}'.")
+    elif kind == "gather":
+        _apply_gather(state, intent, events)
+    elif kind == "build":
+        _apply_build(state, intent, events)
+    elif kind == "explore":
+        _apply_explore(state, events)
+    elif kind == "demolish":
+        _apply_demolish(state, intent, events)
+    elif kind == "upgrade":
+        _apply_upgrade(state, intent, events)
+    elif kind == "end":
+        _apply_end(state, events)
+    elif kind == "defend_input":
+        _apply_defend_input(state, intent, events)
+    elif kind == "wait":
+        if state.phase != "night":
+            events.append("Wait is only available at night.")
+        else:
+            _advance_night_step(state, -1, False, events, "")
+    elif kind == "lesson_set":
+        _apply_lesson_set(state, intent, events)
+    elif kind in ("lesson_next", "lesson_prev"):
+        _apply_lesson_cycle(state, 1 if kind == "lesson_next" else -1, events)
+    elif kind in ("inspect", "map", "enemies", "lesson_show", "lesson_sample"):
+        events.append(f"{kind}: (read-only)")
+    else:
+        events.append(f"Unknown intent: {kind}")
+    return events
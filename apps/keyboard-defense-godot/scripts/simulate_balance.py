@@ -11,6 +11,18 @@ Usage:
     python scripts/simulate_balance.py --days 10
     python scripts/simulate_balance.py --verify
     python scripts/simulate_balance.py --json
+    python scripts/simulate_balance.py --loot       # Add hypothetical loot-table drops
+
+Gold income follows the sources the game actually pays: kill gold
+(SimEnemies.gold_reward x SimUpgrades.get_gold_multiplier, sim/apply_intent.gd),
+treasury gold_income at wave end (apply_intent.gd) and taxation
+gold_per_building at day advance (sim/tick.gd). research_solver.py and
+build_order_search.py share this model through GoldEffects and
+BalanceSimulator._calculate_gold_income().
+
+Loot-table drops (data/loot_tables.json) are hypothetical: SimLoot.roll_loot()
+and queue_loot() have no callers, so the game never grants them. They are only
+added to the economy with --loot.
 """
 
 import json
@@ -18,7 +30,10 @@ import re
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
+
+from loot_analysis import LootTables
+from scenario_sim import GOLD_REWARDS
 
 # Project paths
 SCRIPT_DIR = Path(__file__).parent
@@ -46,6 +61,28 @@ class SimulationResult:
     errors: List[str] = field(default_factory=list)
 
 
+@dataclass
+class GoldEffects:
+    """Gold effects summed over purchased upgrades and completed research.
+
+    Same keys as SimUpgrades.get_total_effect(): gold_multiplier scales kill
+    gold, gold_income is paid by the treasury at wave end, gold_per_building
+    is taxed per structure at day advance.
+    """
+    gold_multiplier: float = 0.0
+    gold_income: int = 0
+    gold_per_building: int = 0
+
+    @classmethod
+    def from_effects(cls, effects: Iterable[Dict[str, Any]]) -> "GoldEffects":
+        total = cls()
+        for entry in effects:
+            total.gold_multiplier += float(entry.get("gold_multiplier", 0.0))
+            total.gold_income += int(entry.get("gold_income", 0))
+            total.gold_per_building += int(entry.get("gold_per_building", 0))
+        return total
+
+
 class BalanceConstants:
     """Balance constants extracted from GDScript files."""
 
@@ -92,10 +129,11 @@ class BalanceConstants:
 class BalanceSimulator:
     """Main balance simulation engine."""
 
-    def __init__(self):
+    def __init__(self, include_loot: bool = False):
         self.warnings: List[str] = []
         self.errors: List[str] = []
         self.results: Dict[str, Any] = {}
+        self.loot_tables: Optional[LootTables] = LootTables() if include_loot else None
 
     def simulate_economy(self, days: int, verbose: bool = False) -> SimulationResult:
         """Simulate resource economy over multiple days."""
@@ -117,6 +155,20 @@ class BalanceSimulator:
             for resource, amount in production.items():
                 state.resources[resource] = state.resources.get(resource, 0) + amount
 
+            # Gold the game pays for the day (kills, treasury, taxes)
+            gold = self._calculate_gold_income(day)
+            day_start["gold"] = gold
+            state.gold += sum(gold.values())
+
+            # Hypothetical loot-table drops (opt-in, never granted by the game)
+            loot = self._calculate_loot(day)
+            day_start["loot"] = loot
+            for resource, amount in loot.items():
+                if resource == "gold":
+                    state.gold += amount
+                else:
+                    state.resources[resource] = state.resources.get(resource, 0) + amount
+
             # Apply caps
             caps = BalanceConstants.caps_for_day(day)
             trimmed = {}
@@ -129,12 +181,13 @@ class BalanceSimulator:
             day_start["caps"] = caps
             day_start["trimmed"] = trimmed
             day_start["resources_end"] = state.resources.copy()
+            day_start["gold_end"] = state.gold
 
             result.data.append(day_start)
 
             if verbose:
                 print(f"Day {day}: {day_start['resources_start']} -> {day_start['resources_end']} "
-                      f"(prod: {production}, caps: {caps})")
+                      f"(prod: {production}, gold: {gold}, loot: {loot}, caps: {caps})")
 
         # Validate
         final = result.data[-1]["resources_end"]
@@ -154,6 +207,39 @@ class BalanceSimulator:
         }
         return production
 
+    def _calculate_kill_gold(self, day: int, gold_multiplier: float = 0.0) -> int:
+        """Gold for killing the day's wave.
+
+        Each kill pays int(SimEnemies.gold_reward(kind) * gold multiplier), as
+        typed kills do in apply_intent.gd. Tower kills (tower_combat.gd) skip
+        the multiplier, so with gold_multiplier > 0 this is an upper bound.
+        """
+        composition = self._generate_wave(day)["composition"]
+        return sum(count * int(GOLD_REWARDS.get(kind, 2) * (1.0 + gold_multiplier))
+                   for kind, count in composition.items())
+
+    def _calculate_gold_income(self, day: int, effects: Optional[GoldEffects] = None,
+                               buildings: int = 0) -> Dict[str, int]:
+        """Gold paid over one day by source: wave kills, treasury and taxes."""
+        effects = effects or GoldEffects()
+        return {
+            "kills": self._calculate_kill_gold(day, effects.gold_multiplier),
+            "treasury": effects.gold_income,
+            "tax": effects.gold_per_building * buildings,
+        }
+
+    def _calculate_loot(self, day: int) -> Dict[str, int]:
+        """Expected loot-table drops for the day's wave, rounded to whole units.
+
+        Hypothetical: the game never rolls loot tables, so this is empty
+        unless the simulator was built with include_loot=True.
+        """
+        if self.loot_tables is None:
+            return {}
+        composition = self._generate_wave(day)["composition"]
+        mean = self.loot_tables.wave_expected(composition)["mean"]
+        return {resource: int(round(amount)) for resource, amount in mean.items() if amount > 0}
+
     def simulate_waves(self, days: int, verbose: bool = False) -> SimulationResult:
         """Simulate wave compositions over multiple days."""
         result = SimulationResult(scenario="waves", days=days, data=[])
@@ -321,6 +407,8 @@ def main():
     parser.add_argument("--verify", "-v", action="store_true", help="Run verification only")
     parser.add_argument("--json", "-j", action="store_true", help="JSON output")
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
+    parser.add_argument("--loot", action="store_true",
+                        help="Add hypothetical loot-table drops (never granted by the game) to the economy")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -328,7 +416,7 @@ def main():
     print("=" * 60)
     print("")
 
-    simulator = BalanceSimulator()
+    simulator = BalanceSimulator(include_loot=args.loot)
     all_results = []
     all_warnings = []
     all_errors = []
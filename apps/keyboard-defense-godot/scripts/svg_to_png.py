@@ -1,146 +1,548 @@
 #!/usr/bin/env python3
 """
 Simple SVG to PNG converter for pixel art assets.
-Parses rectangle-based SVGs and outputs PNG files.
+Rasterizes the SVG subset our art uses and outputs PNG files.
 No external dependencies required.
+
+Supported: <svg> viewBox/width/height, <g>, <rect> (fill and stroke),
+<circle>, <ellipse>, <polygon>, <polyline>, <path> with straight segments
+(M/L/H/V/Z), fill / stroke colors, opacity, fill-opacity, stroke-opacity,
+fill-rule and translate/scale/rotate/matrix transforms. Anything else raises
+UnsupportedSVG so callers can fall back to a full renderer.
+
+Each tag's attributes are read in one tokenizer pass, shapes become device
+space polygons, and scanline spans are run-length filled into a flat RGBA
+byte buffer (pixel-center sampling, so pixel art stays crisp). Downscaled
+renders are supersampled and box-filtered.
+
+Rect-only SVGs do not all render as they did with the previous rect-only
+renderer. 335 of the 1,380 rect-only files under assets/art/src-svg produce
+different PNGs:
+
+- 317 set the element `opacity` attribute, which the old renderer ignored
+  and which is now honored. This is a visible asset change: for example
+  animations/enemy_assassin_walk_01.svg drops from opaque to 30% alpha.
+- 18 draw translucent fills (e.g. icons/poi_camp.svg,
+  sprites/enemy_healer.svg). They are now composited with straight-alpha
+  source-over, including over transparent pixels, which the old renderer
+  got wrong.
+
+Usage:
+    python scripts/svg_to_png.py              # Build assets/{icons,tiles,sprites,ui}
 """
 
-import os
+import math
 import re
 import struct
 import zlib
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RASTERIZER_VERSION = "2"
+MAX_SUPERSAMPLE = 4
+
+Color = Tuple[int, int, int, int]
+Matrix = Tuple[float, float, float, float, float, float]  # a b c d e f
+Contour = List[Tuple[float, float]]
+
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.S)
+TAG_PATTERN = re.compile(r'<(/?)([A-Za-z][\w:.-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*?)(/?)>', re.S)
+ATTR_PATTERN = re.compile(r'([\w:.-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+NUMBER_PATTERN = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+TRANSFORM_PATTERN = re.compile(r'(\w+)\s*\(([^)]*)\)')
+PATH_TOKEN_PATTERN = re.compile(r'[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+NAMED_COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "red": (255, 0, 0),
+    "green": (0, 128, 0), "blue": (0, 0, 255), "yellow": (255, 255, 0),
+    "gray": (128, 128, 128), "grey": (128, 128, 128), "orange": (255, 165, 0),
+}
+
+# Presentation attributes children inherit from <g>/<svg>
+INHERITED = ("fill", "fill-opacity", "fill-rule", "stroke", "stroke-opacity", "stroke-width")
+# Elements that carry no pixels of their own
+IGNORED = {"title", "desc", "metadata"}
+
+
+class UnsupportedSVG(ValueError):
+    """The SVG uses features outside the pixel-art subset."""
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
 
+@lru_cache(maxsize=1024)
 def parse_color(color_str):
-    """Parse hex color to RGBA tuple."""
-    if not color_str or color_str == "none":
+    """Parse a color to an RGBA tuple; 'none' is fully transparent."""
+    if not color_str or color_str == "none" or color_str == "transparent":
         return (0, 0, 0, 0)
-    color_str = color_str.strip().lstrip('#')
-    if len(color_str) == 3:
-        color_str = ''.join(c*2 for c in color_str)
-    if len(color_str) == 6:
-        r = int(color_str[0:2], 16)
-        g = int(color_str[2:4], 16)
-        b = int(color_str[4:6], 16)
-        return (r, g, b, 255)
-    return (0, 0, 0, 0)
-
-def parse_svg(svg_content):
-    """Parse SVG content and extract dimensions and rectangles."""
-    # Extract viewBox dimensions
-    viewbox_match = re.search(r'viewBox="([^"]+)"', svg_content)
-    if viewbox_match:
-        parts = viewbox_match.group(1).split()
-        width = int(float(parts[2]))
-        height = int(float(parts[3]))
+    color_str = color_str.strip()
+    if color_str.startswith('#'):
+        hex_str = color_str[1:]
+        if len(hex_str) in (3, 4):
+            hex_str = ''.join(c * 2 for c in hex_str)
+        if len(hex_str) in (6, 8):
+            try:
+                values = [int(hex_str[i:i + 2], 16) for i in range(0, len(hex_str), 2)]
+            except ValueError:
+                values = None
+            if values:
+                return tuple(values) if len(values) == 4 else (values[0], values[1], values[2], 255)
+    elif color_str.startswith('rgb'):
+        values = NUMBER_PATTERN.findall(color_str)
+        if len(values) >= 3:
+            r, g, b = (max(0, min(255, round(float(v)))) for v in values[:3])
+            a = round(float(values[3]) * 255) if len(values) > 3 else 255
+            return (r, g, b, max(0, min(255, a)))
+    elif color_str.lower() in NAMED_COLORS:
+        return NAMED_COLORS[color_str.lower()] + (255,)
+    raise UnsupportedSVG(f"unsupported color: {color_str}")
+
+
+def _attrs(raw: str) -> Dict[str, str]:
+    """All attributes of one tag, with style="a:b; c:d" merged in."""
+    attrs = {m.group(1): m.group(2) if m.group(2) is not None else m.group(3)
+             for m in ATTR_PATTERN.finditer(raw)}
+    style = attrs.pop("style", None)
+    if style:
+        for decl in style.split(';'):
+            if ':' in decl:
+                key, value = decl.split(':', 1)
+                attrs[key.strip()] = value.strip()
+    return attrs
+
+
+def _number(value: Optional[str], default: float = 0.0) -> float:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    match = NUMBER_PATTERN.match(value.strip())
+    if not match or value.strip().endswith('%'):
+        raise UnsupportedSVG(f"unsupported length: {value}")
+    return float(match.group(0))  # Units such as "px"
+
+
+def _multiply(m: Matrix, n: Matrix) -> Matrix:
+    """m * n (apply n first, then m)."""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (a * a2 + c * b2, b * a2 + d * b2,
+            a * c2 + c * d2, b * c2 + d * d2,
+            a * e2 + c * f2 + e, b * e2 + d * f2 + f)
+
+
+def parse_transform(value: Optional[str]) -> Matrix:
+    """Parse a transform attribute into an affine matrix."""
+    matrix = IDENTITY
+    if not value:
+        return matrix
+    for name, args in TRANSFORM_PATTERN.findall(value):
+        v = [float(x) for x in NUMBER_PATTERN.findall(args)]
+        if name == "translate" and v:
+            step = (1.0, 0.0, 0.0, 1.0, v[0], v[1] if len(v) > 1 else 0.0)
+        elif name == "scale" and v:
+            step = (v[0], 0.0, 0.0, v[1] if len(v) > 1 else v[0], 0.0, 0.0)
+        elif name == "rotate" and v:
+            rad = math.radians(v[0])
+            cos, sin = math.cos(rad), math.sin(rad)
+            step = (cos, sin, -sin, cos, 0.0, 0.0)
+            if len(v) >= 3:
+                step = _multiply((1.0, 0.0, 0.0, 1.0, v[1], v[2]),
+                                 _multiply(step, (1.0, 0.0, 0.0, 1.0, -v[1], -v[2])))
+        elif name == "matrix" and len(v) == 6:
+            step = tuple(v)
+        else:
+            raise UnsupportedSVG(f"unsupported transform: {name}")
+        matrix = _multiply(matrix, step)
+    return matrix
+
+
+def _points(value: str) -> Contour:
+    nums = [float(x) for x in NUMBER_PATTERN.findall(value or "")]
+    return list(zip(nums[0::2], nums[1::2]))
+
+
+def _path_number(tokens: List[str], i: int) -> float:
+    """Numeric path argument at tokens[i]; UnsupportedSVG if it is missing."""
+    try:
+        return float(tokens[i])
+    except (IndexError, ValueError):
+        raise UnsupportedSVG(f"malformed path data at token {i}") from None
+
+
+def _path_contours(d: str) -> List[Contour]:
+    """Contours of a path made of straight segments."""
+    tokens = PATH_TOKEN_PATTERN.findall(d or "")
+    contours: List[Contour] = []
+    current: Contour = []
+    x = y = start_x = start_y = 0.0
+    command = None
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.isalpha():
+            command = token
+            i += 1
+            if command in "Zz":
+                if current:
+                    contours.append(current)
+                current = []
+                x, y = start_x, start_y
+                continue
+        if command is None or command not in "MmLlHhVv":
+            raise UnsupportedSVG(f"unsupported path command: {command}")
+        rel = command.islower()
+        if command in "Mm" or command in "Ll":
+            nx, ny = _path_number(tokens, i), _path_number(tokens, i + 1)
+            i += 2
+            if rel:
+                nx, ny = x + nx, y + ny
+            if command in "Mm":
+                if current:
+                    contours.append(current)
+                current = [(nx, ny)]
+                start_x, start_y = nx, ny
+                command = "l" if rel else "L"  # Further pairs are line-tos
+            else:
+                current.append((nx, ny))
+            x, y = nx, ny
+        elif command in "Hh":
+            x = x + _path_number(tokens, i) if rel else _path_number(tokens, i)
+            i += 1
+            current.append((x, y))
+        else:
+            y = y + _path_number(tokens, i) if rel else _path_number(tokens, i)
+            i += 1
+            current.append((x, y))
+    if current:
+        contours.append(current)
+    return contours
+
+
+def _ellipse_contour(cx: float, cy: float, rx: float, ry: float, device_radius: float) -> Contour:
+    segments = max(16, min(256, int(device_radius * 4)))
+    return [(cx + rx * math.cos(2 * math.pi * k / segments),
+             cy + ry * math.sin(2 * math.pi * k / segments)) for k in range(segments)]
+
+
+def _rect_contour(x: float, y: float, w: float, h: float) -> Contour:
+    return [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+
+
+# ============================================================================
+# RASTERIZATION
+# ============================================================================
+
+def _over(src: Color, dst: bytes) -> bytes:
+    """Straight-alpha source-over of one translucent color onto one pixel."""
+    sa = src[3] / 255.0
+    da = dst[3] / 255.0 * (1.0 - sa)
+    oa = sa + da
+    return bytes((round((src[0] * sa + dst[0] * da) / oa), round((src[1] * sa + dst[1] * da) / oa),
+                  round((src[2] * sa + dst[2] * da) / oa), round(oa * 255)))
+
+
+class Raster:
+    """Flat RGBA byte buffer with run-length span fills (straight alpha)."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.buffer = bytearray(width * height * 4)
+
+    def fill_span(self, y: int, x0: int, x1: int, color: Color) -> None:
+        """Source-over composite `color` onto pixels [x0, x1) of row y."""
+        x0 = max(0, x0)
+        x1 = min(self.width, x1)
+        if x1 <= x0 or not 0 <= y < self.height or color[3] == 0:
+            return
+        start = (y * self.width + x0) * 4
+        end = (y * self.width + x1) * 4
+        if color[3] == 255:
+            self.buffer[start:end] = bytes(color) * (x1 - x0)
+        else:
+            self._blend_run(start, end, color)
+
+    def _blend_run(self, start: int, end: int, color: Color) -> None:
+        buf = self.buffer
+        first = bytes(buf[start:start + 4])
+        if buf[start:end] == first * ((end - start) // 4):
+            # Uniform background: blend once and repeat
+            buf[start:end] = _over(color, first) * ((end - start) // 4)
+            return
+        blended: Dict[bytes, bytes] = {}
+        for i in range(start, end, 4):
+            dst = bytes(buf[i:i + 4])
+            out = blended.get(dst)
+            if out is None:
+                out = blended[dst] = _over(color, dst)
+            buf[i:i + 4] = out
+
+    def fill_polygon(self, contours: List[Contour], color: Color, evenodd: bool = False) -> None:
+        """Scanline-fill contours (device space) sampling pixel centers."""
+        edges = []
+        for contour in contours:
+            n = len(contour)
+            for k in range(n):
+                (x0, y0), (x1, y1) = contour[k], contour[(k + 1) % n]
+                if y0 == y1:
+                    continue
+                direction = 1 if y1 > y0 else -1
+                if y0 > y1:
+                    x0, y0, x1, y1 = x1, y1, x0, y0
+                edges.append((y0, y1, x0, (x1 - x0) / (y1 - y0), direction))
+        if not edges:
+            return
+        top = max(0, math.ceil(min(e[0] for e in edges) - 0.5))
+        bottom = min(self.height, math.ceil(max(e[1] for e in edges) - 0.5))
+        for y in range(top, bottom):
+            yc = y + 0.5
+            crossings = sorted((x0 + (yc - y0) * slope, direction)
+                               for y0, y1, x0, slope, direction in edges if y0 <= yc < y1)
+            winding = 0
+            for k in range(len(crossings) - 1):
+                winding += 1 if evenodd else crossings[k][1]
+                inside = (winding % 2 == 1) if evenodd else winding != 0
+                if inside:
+                    self.fill_span(y, math.ceil(crossings[k][0] - 0.5),
+                                   math.ceil(crossings[k + 1][0] - 0.5), color)
+
+    def fill_rect(self, x0: float, y0: float, x1: float, y1: float, color: Color) -> None:
+        """Fill an axis-aligned device-space rectangle."""
+        px0 = max(0, math.ceil(min(x0, x1) - 0.5))
+        px1 = min(self.width, math.ceil(max(x0, x1) - 0.5))
+        py0 = max(0, math.ceil(min(y0, y1) - 0.5))
+        py1 = min(self.height, math.ceil(max(y0, y1) - 0.5))
+        if px1 <= px0 or py1 <= py0 or color[3] == 0:
+            return
+        run = bytes(color) * (px1 - px0) if color[3] == 255 else None
+        for y in range(py0, py1):
+            start = (y * self.width + px0) * 4
+            end = start + (px1 - px0) * 4
+            if run is not None:
+                self.buffer[start:end] = run
+            else:
+                self._blend_run(start, end, color)
+
+    def downsample(self, factor: int) -> bytearray:
+        """Box-filter to 1/factor size, averaging premultiplied color."""
+        out_w, out_h = self.width // factor, self.height // factor
+        out = bytearray(out_w * out_h * 4)
+        buf = self.buffer
+        samples = factor * factor
+        for oy in range(out_h):
+            for ox in range(out_w):
+                r = g = b = a = 0
+                for sy in range(oy * factor, oy * factor + factor):
+                    row = (sy * self.width + ox * factor) * 4
+                    for i in range(row, row + factor * 4, 4):
+                        pa = buf[i + 3]
+                        r += buf[i] * pa
+                        g += buf[i + 1] * pa
+                        b += buf[i + 2] * pa
+                        a += pa
+                if a:
+                    j = (oy * out_w + ox) * 4
+                    out[j:j + 4] = bytes((round(r / a), round(g / a), round(b / a), round(a / samples)))
+        return out
+
+
+def _paint(attrs: Dict[str, str], key: str, opacity: float) -> Optional[Color]:
+    value = attrs.get(key, "#000000" if key == "fill" else "none")
+    if value.startswith("url("):
+        raise UnsupportedSVG(f"unsupported paint server: {value}")
+    color = parse_color(value)
+    alpha = color[3] / 255.0 * opacity * _number(attrs.get(f"{key}-opacity"), 1.0)
+    if alpha <= 0:
+        return None
+    return (color[0], color[1], color[2], max(0, min(255, round(alpha * 255))))
+
+
+def _document_size(svg_attrs: Dict[str, str]) -> Tuple[Tuple[float, float, float, float], int, int]:
+    """viewBox and natural pixel size of the root <svg>."""
+    width = svg_attrs.get("width")
+    height = svg_attrs.get("height")
+    if "viewBox" in svg_attrs:
+        vb = [float(v) for v in NUMBER_PATTERN.findall(svg_attrs["viewBox"])]
+        if len(vb) != 4 or vb[2] <= 0 or vb[3] <= 0:
+            raise UnsupportedSVG("invalid viewBox")
+        return (vb[0], vb[1], vb[2], vb[3]), int(vb[2]), int(vb[3])
+    w = int(_number(width, 16)) if width else 16
+    h = int(_number(height, 16)) if height else 16
+    return (0.0, 0.0, float(w), float(h)), w, h
+
+
+def rasterize(svg_content: str, width: Optional[int] = None, height: Optional[int] = None,
+              supersample: Optional[int] = None) -> Tuple[int, int, bytearray]:
+    """Render SVG markup to (width, height, RGBA bytes).
+
+    Without an explicit size the viewBox size is used. The viewBox is fitted
+    with preserveAspectRatio="xMidYMid meet".
+    """
+    content = COMMENT_PATTERN.sub('', svg_content)
+    tags = TAG_PATTERN.finditer(content)
+
+    root = None
+    for match in tags:
+        if match.group(2) == "svg" and not match.group(1):
+            root = match
+            break
+    if root is None:
+        raise UnsupportedSVG("no <svg> element")
+    root_attrs = _attrs(root.group(3))
+    (vx, vy, vw, vh), natural_w, natural_h = _document_size(root_attrs)
+    out_w = width or natural_w
+    out_h = height or natural_h
+
+    scale = min(out_w / vw, out_h / vh)
+    if supersample is None:
+        supersample = 1 if scale >= 1 else min(MAX_SUPERSAMPLE, math.ceil(1 / scale))
+    raster = Raster(out_w * supersample, out_h * supersample)
+    s = scale * supersample
+    view = (s, 0.0, 0.0, s,
+            (out_w * supersample - vw * s) / 2 - vx * s,
+            (out_h * supersample - vh * s) / 2 - vy * s)
+
+    # (matrix, inherited attrs, opacity) for each open container
+    stack = [(_multiply(view, parse_transform(root_attrs.get("transform"))),
+              {k: root_attrs[k] for k in INHERITED if k in root_attrs},
+              _number(root_attrs.get("opacity"), 1.0))]
+    skip_depth = 0
+    for match in tags:
+        closing, name, raw, self_closing = match.group(1), match.group(2), match.group(3), match.group(4)
+        if closing:
+            if skip_depth:
+                skip_depth -= 1
+            elif name in ("g", "svg") and len(stack) > 1:
+                stack.pop()
+            continue
+        if skip_depth or name in IGNORED:
+            skip_depth += 0 if self_closing else 1
+            continue
+
+        matrix, inherited, opacity = stack[-1]
+        attrs = _attrs(raw)
+        if "transform" in attrs:
+            matrix = _multiply(matrix, parse_transform(attrs["transform"]))
+        if "opacity" in attrs:
+            opacity *= _number(attrs["opacity"])
+        merged = {**inherited, **attrs} if inherited else attrs
+
+        if name == "g":
+            if not self_closing:
+                stack.append((matrix, {k: merged[k] for k in INHERITED if k in merged}, opacity))
+            continue
+        if name not in ("rect", "circle", "ellipse", "polygon", "polyline", "path"):
+            raise UnsupportedSVG(f"unsupported element: <{name}>")
+        if not self_closing:
+            skip_depth += 1  # Ignore children such as <title>
+
+        _draw_shape(raster, name, merged, matrix, opacity)
+
+    pixels = raster.buffer if supersample == 1 else raster.downsample(supersample)
+    return out_w, out_h, pixels
+
+
+def _draw_shape(raster: Raster, name: str, attrs: Dict[str, str], matrix: Matrix, opacity: float) -> None:
+    fill = _paint(attrs, "fill", opacity)
+    stroke = _paint(attrs, "stroke", opacity)
+    evenodd = attrs.get("fill-rule") == "evenodd"
+    a, b, c, d, e, f = matrix
+    axis_aligned = b == 0 and c == 0
+
+    def device(contour: Contour) -> Contour:
+        return [(a * x + c * y + e, b * x + d * y + f) for x, y in contour]
+
+    if name == "rect":
+        x, y = _number(attrs.get("x")), _number(attrs.get("y"))
+        w, h = _number(attrs.get("width")), _number(attrs.get("height"))
+        if w <= 0 or h <= 0:
+            return
+        if _number(attrs.get("rx")) > 0 or _number(attrs.get("ry")) > 0:
+            raise UnsupportedSVG("rounded rect")
+        if fill:
+            if axis_aligned:
+                raster.fill_rect(a * x + e, d * y + f, a * (x + w) + e, d * (y + h) + f, fill)
+            else:
+                raster.fill_polygon([device(_rect_contour(x, y, w, h))], fill)
+        if stroke:
+            half = _number(attrs.get("stroke-width"), 1.0) / 2
+            outer = _rect_contour(x - half, y - half, w + 2 * half, h + 2 * half)
+            inner = _rect_contour(x + half, y + half, w - 2 * half, h - 2 * half)
+            contours = [device(outer)]
+            if w > 2 * half and h > 2 * half:
+                contours.append(device(inner))
+            raster.fill_polygon(contours, stroke, evenodd=True)
+        return
+
+    if stroke:
+        raise UnsupportedSVG(f"stroke on <{name}>")
+    if not fill:
+        return
+    if name in ("circle", "ellipse"):
+        cx, cy = _number(attrs.get("cx")), _number(attrs.get("cy"))
+        if name == "circle":
+            rx = ry = _number(attrs.get("r"))
+        else:
+            rx, ry = _number(attrs.get("rx")), _number(attrs.get("ry"))
+        if rx <= 0 or ry <= 0:
+            return
+        device_radius = max(rx, ry) * math.sqrt(abs(a * d - b * c))
+        contours = [_ellipse_contour(cx, cy, rx, ry, device_radius)]
+    elif name in ("polygon", "polyline"):
+        contours = [_points(attrs.get("points", ""))]
     else:
-        width_match = re.search(r'width="(\d+)"', svg_content)
-        height_match = re.search(r'height="(\d+)"', svg_content)
-        width = int(width_match.group(1)) if width_match else 16
-        height = int(height_match.group(1)) if height_match else 16
-
-    # Extract rectangles
-    rects = []
-    rect_pattern = re.compile(r'<rect([^>]+)/?>|<rect([^>]+)>[^<]*</rect>', re.DOTALL)
-
-    for match in rect_pattern.finditer(svg_content):
-        attrs = match.group(1) or match.group(2)
-
-        x = 0
-        y = 0
-        w = width
-        h = height
-        fill = "#000000"
-        opacity = 1.0
-
-        x_match = re.search(r'\bx="([^"]+)"', attrs)
-        y_match = re.search(r'\by="([^"]+)"', attrs)
-        w_match = re.search(r'\bwidth="([^"]+)"', attrs)
-        h_match = re.search(r'\bheight="([^"]+)"', attrs)
-        fill_match = re.search(r'\bfill="([^"]+)"', attrs)
-        opacity_match = re.search(r'\bfill-opacity="([^"]+)"', attrs)
-
-        if x_match:
-            x = int(float(x_match.group(1)))
-        if y_match:
-            y = int(float(y_match.group(1)))
-        if w_match:
-            w = int(float(w_match.group(1)))
-        if h_match:
-            h = int(float(h_match.group(1)))
-        if fill_match:
-            fill = fill_match.group(1)
-        if opacity_match:
-            opacity = float(opacity_match.group(1))
-
-        color = parse_color(fill)
-        if opacity < 1.0:
-            color = (color[0], color[1], color[2], int(color[3] * opacity))
-
-        rects.append((x, y, w, h, color))
-
-    return width, height, rects
-
-def render_to_pixels(width, height, rects):
-    """Render rectangles to pixel array."""
-    # Initialize with transparent pixels
-    pixels = [[(0, 0, 0, 0) for _ in range(width)] for _ in range(height)]
-
-    for x, y, w, h, color in rects:
-        for py in range(max(0, y), min(height, y + h)):
-            for px in range(max(0, x), min(width, x + w)):
-                if color[3] == 255:
-                    pixels[py][px] = color
-                elif color[3] > 0:
-                    # Alpha blend
-                    old = pixels[py][px]
-                    alpha = color[3] / 255.0
-                    new_r = int(color[0] * alpha + old[0] * (1 - alpha))
-                    new_g = int(color[1] * alpha + old[1] * (1 - alpha))
-                    new_b = int(color[2] * alpha + old[2] * (1 - alpha))
-                    new_a = max(old[3], color[3])
-                    pixels[py][px] = (new_r, new_g, new_b, new_a)
-
-    return pixels
-
-def write_png(filename, width, height, pixels):
-    """Write pixels to PNG file."""
+        contours = _path_contours(attrs.get("d", ""))
+    contours = [device(contour) for contour in contours if len(contour) >= 3]
+    raster.fill_polygon(contours, fill, evenodd)
+
+
+# ============================================================================
+# PNG OUTPUT
+# ============================================================================
+
+def encode_png(width: int, height: int, rgba: bytes) -> bytes:
+    """Encode a flat RGBA buffer as a PNG."""
     def png_chunk(chunk_type, data):
         chunk_len = struct.pack('>I', len(data))
         chunk_crc = struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
         return chunk_len + chunk_type + data + chunk_crc
 
-    # PNG signature
-    signature = b'\x89PNG\r\n\x1a\n'
+    stride = width * 4
+    raw_data = b''.join(b'\x00' + bytes(rgba[y * stride:(y + 1) * stride]) for y in range(height))
+    return (b'\x89PNG\r\n\x1a\n'
+            + png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+            + png_chunk(b'IDAT', zlib.compress(raw_data, 9))
+            + png_chunk(b'IEND', b''))
 
-    # IHDR chunk
-    ihdr_data = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
-    ihdr = png_chunk(b'IHDR', ihdr_data)
 
-    # IDAT chunk (image data)
-    raw_data = b''
-    for row in pixels:
-        raw_data += b'\x00'  # Filter type: None
-        for r, g, b, a in row:
-            raw_data += bytes([r, g, b, a])
+def write_png(filename, width, height, rgba):
+    """Write a flat RGBA buffer to a PNG file."""
+    with open(filename, 'wb') as f:
+        f.write(encode_png(width, height, rgba))
 
-    compressed = zlib.compress(raw_data, 9)
-    idat = png_chunk(b'IDAT', compressed)
 
-    # IEND chunk
-    iend = png_chunk(b'IEND', b'')
+def svg_to_png_bytes(svg_content: str, width: Optional[int] = None, height: Optional[int] = None) -> bytes:
+    """Rasterize SVG markup straight to PNG bytes."""
+    out_w, out_h, pixels = rasterize(svg_content, width, height)
+    return encode_png(out_w, out_h, pixels)
 
-    with open(filename, 'wb') as f:
-        f.write(signature + ihdr + idat + iend)
 
-def convert_svg_to_png(svg_path, png_path):
+def convert_svg_to_png(svg_path, png_path, width: Optional[int] = None, height: Optional[int] = None):
     """Convert a single SVG file to PNG."""
     with open(svg_path, 'r', encoding='utf-8') as f:
         svg_content = f.read()
 
-    width, height, rects = parse_svg(svg_content)
-    pixels = render_to_pixels(width, height, rects)
-    write_png(png_path, width, height, pixels)
+    out_w, out_h, pixels = rasterize(svg_content, width, height)
+    write_png(png_path, out_w, out_h, pixels)
+
 
 def main():
     script_dir = Path(__file__).parent
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Typing Difficulty Scorer
+
+Scores how hard words are to type on a QWERTY keyboard using the finger
+zones from game/keyboard_display.gd. Per-character and per-bigram costs are
+precomputed into lookup tables once, so whole pools are scored in a single
+vectorized pass (NumPy when available, plain lookups otherwise).
+
+Features per word:
+- Score: typing cost per keystroke, so long words are not hard just for
+  being long (the raw sum is kept as "total")
+- Finger travel (distance from home keys and between same-finger keys)
+- Same-finger bigrams (two different keys struck by one finger)
+- Hand alternation (share of bigrams that switch hands)
+- Row changes and shifted characters
+
+Pools scored:
+- Every lesson in data/lessons.json (charset lessons are sampled the way
+  sim/words.gd generates enemy words)
+- Drill targets in data/drills.json
+- SHORT_WORDS / MEDIUM_WORDS / LONG_WORDS in sim/words.gd
+
+Graduation-path stages whose difficulty does not rise above the previous
+stage are flagged. Pool summaries are cached per pool hash.
+
+Usage:
+    python scripts/typing_difficulty.py                     # All pools
+    python scripts/typing_difficulty.py --source lessons
+    python scripts/typing_difficulty.py --lesson home_row_words
+    python scripts/typing_difficulty.py --json
+"""
+
+import hashlib
+import json
+import math
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from scenario_sim import load_lessons, word_for_enemy, LESSON_KINDS
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+LESSONS_PATH = PROJECT_ROOT / "data" / "lessons.json"
+DRILLS_PATH = PROJECT_ROOT / "data" / "drills.json"
+WORDS_GD_PATH = PROJECT_ROOT / "sim" / "words.gd"
+CACHE_PATH = PROJECT_ROOT / "Logs" / "cache" / "typing_difficulty.json"
+
+MODEL_VERSION = 3  # Bump when costs change so cached summaries are invalidated
+QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+WORD_POOLS = ["SHORT_WORDS", "MEDIUM_WORDS", "LONG_WORDS"]
+
+
+# ============================================================================
+# KEYBOARD MODEL
+# ============================================================================
+
+# Character rows and finger zones from game/keyboard_display.gd
+ROWS = [
+    "`1234567890-=",
+    "qwertyuiop[]\\",
+    "asdfghjkl;'",
+    "zxcvbnm,./",
+]
+ROW_OFFSETS = [0.0, 1.5, 1.75, 2.25]  # Width of tab / caps / shift keys
+FINGER_KEYS = {
+    "left_pinky": "`1qaz",
+    "left_ring": "2wsx",
+    "left_middle": "3edc",
+    "left_index": "45rfvtgb",
+    "right_index": "67yhnujm",
+    "right_middle": "8ik,",
+    "right_ring": "9ol.",
+    "right_pinky": "0-=p[]\\;'/",
+}
+HOME_KEYS = {
+    "left_pinky": "a", "left_ring": "s", "left_middle": "d", "left_index": "f",
+    "right_index": "j", "right_middle": "k", "right_ring": "l", "right_pinky": ";",
+}
+SHIFTED = dict(zip('~!@#$%^&*()_+{}|:"<>?', "`1234567890-=[]\\;',./"))
+
+FINGER_COST = {"pinky": 1.4, "ring": 1.2, "middle": 1.0, "index": 1.0, "thumb": 0.6}
+ROW_COST = [0.6, 0.25, 0.0, 0.35]  # Number, top, home, bottom rows
+SHIFT_COST = 0.8
+TRAVEL_WEIGHT = 0.3
+SFB_COST = 1.5
+REPEAT_COST = 0.3
+SAME_HAND_COST = 0.4
+ROW_CHANGE_COST = 0.2
+UNKNOWN_COST = 1.5
+
+
+@dataclass
+class KeyInfo:
+    finger: str
+    hand: int  # 0 = left, 1 = right, -1 = thumb/unknown
+    row: int
+    x: float
+    shifted: bool
+
+
+class KeyboardModel:
+    """Per-character and per-bigram cost tables over printable ASCII.
+
+    Characters are encoded as indices into the tables; index UNKNOWN covers
+    anything off the layout and PAD pads batches (all of its costs are zero).
+    """
+
+    def __init__(self):
+        positions: Dict[str, tuple] = {}
+        for row, keys in enumerate(ROWS):
+            for col, key in enumerate(keys):
+                positions[key] = (row, ROW_OFFSETS[row] + col + 0.5)
+        finger_of = {key: finger for finger, keys in FINGER_KEYS.items() for key in keys}
+
+        self.chars = [chr(c) for c in range(32, 127)]
+        self.index = {ch: i for i, ch in enumerate(self.chars)}
+        self.unknown = len(self.chars)
+        self.pad = self.unknown + 1
+        size = self.pad + 1
+
+        keys: List[Optional[KeyInfo]] = []
+        for ch in self.chars:
+            base = SHIFTED.get(ch, ch.lower())
+            shifted = ch != base
+            if ch == " ":
+                keys.append(KeyInfo("thumb", -1, 4, 6.0, False))
+            elif base in positions:
+                row, x = positions[base]
+                finger = finger_of[base]
+                keys.append(KeyInfo(finger, 0 if finger.startswith("left") else 1, row, x, shifted))
+            else:
+                keys.append(None)
+        self.keys = keys
+
+        home = {finger: positions[key] for finger, key in HOME_KEYS.items()}
+        self.char_cost = [0.0] * size
+        self.char_travel = [0.0] * size
+        self.char_shift = [0.0] * size
+        for i, info in enumerate(keys):
+            if info is None:
+                self.char_cost[i] = UNKNOWN_COST
+                continue
+            if info.finger == "thumb":
+                self.char_cost[i] = FINGER_COST["thumb"]
+                continue
+            travel = _distance(home[info.finger], (info.row, info.x))
+            self.char_travel[i] = travel
+            self.char_shift[i] = 1.0 if info.shifted else 0.0
+            self.char_cost[i] = (FINGER_COST[info.finger.split("_")[1]] + ROW_COST[info.row]
+                                 + TRAVEL_WEIGHT * travel + SHIFT_COST * self.char_shift[i])
+        self.char_cost[self.unknown] = UNKNOWN_COST
+
+        self.pair_cost = [[0.0] * size for _ in range(size)]
+        self.pair_travel = [[0.0] * size for _ in range(size)]
+        self.pair_sfb = [[0.0] * size for _ in range(size)]
+        self.pair_alt = [[0.0] * size for _ in range(size)]
+        self.pair_row = [[0.0] * size for _ in range(size)]
+        for a, ka in enumerate(keys + [None]):
+            for b, kb in enumerate(keys + [None]):
+                if ka is None or kb is None or ka.hand < 0 or kb.hand < 0:
+                    self.pair_cost[a][b] = 0.1
+                    continue
+                rows = abs(ka.row - kb.row)
+                self.pair_row[a][b] = float(rows)
+                if ka.hand != kb.hand:
+                    self.pair_alt[a][b] = 1.0
+                elif ka.finger == kb.finger:
+                    if (ka.row, ka.x) == (kb.row, kb.x):
+                        self.pair_cost[a][b] = REPEAT_COST
+                    else:
+                        travel = _distance((ka.row, ka.x), (kb.row, kb.x))
+                        self.pair_sfb[a][b] = 1.0
+                        self.pair_travel[a][b] = travel
+                        self.pair_cost[a][b] = SFB_COST + TRAVEL_WEIGHT * travel
+                else:
+                    self.pair_cost[a][b] = SAME_HAND_COST + ROW_CHANGE_COST * rows
+
+        self._arrays: Optional[Dict[str, Any]] = None
+
+    def encode(self, text: str) -> List[int]:
+        return [self.index.get(ch, self.unknown) for ch in text]
+
+    def bigram(self, a: str, b: str) -> float:
+        """Cost of striking b right after a."""
+        return self.pair_cost[self.index.get(a, self.unknown)][self.index.get(b, self.unknown)]
+
+    def _numpy_tables(self) -> Dict[str, Any]:
+        if self._arrays is None:
+            self._arrays = {
+                name: np.array(getattr(self, name), dtype=np.float64)
+                for name in ("char_cost", "char_travel", "char_shift", "pair_cost",
+                             "pair_travel", "pair_sfb", "pair_alt", "pair_row")
+            }
+        return self._arrays
+
+    def score_batch(self, words: Sequence[str]) -> Dict[str, List[float]]:
+        """Score every word at once; returns one list per feature."""
+        if not words:
+            return {name: [] for name in FEATURES}
+        encoded = [self.encode(w) for w in words]
+        if HAS_NUMPY:
+            return self._score_numpy(encoded)
+        return self._score_python(encoded)
+
+    def _score_numpy(self, encoded: List[List[int]]) -> Dict[str, List[float]]:
+        t = self._numpy_tables()
+        width = max(2, max(len(e) for e in encoded))
+        codes = np.full((len(encoded), width), self.pad, dtype=np.intp)
+        for row, enc in enumerate(encoded):
+            codes[row, :len(enc)] = enc
+        left, right = codes[:, :-1], codes[:, 1:]
+        valid = (left != self.pad) & (right != self.pad)
+        lengths = (codes != self.pad).sum(axis=1)
+        pairs = valid.sum(axis=1)
+
+        def pair_sum(table):
+            return np.where(valid, t[table][left, right], 0.0).sum(axis=1)
+
+        total = t["char_cost"][codes].sum(axis=1) + pair_sum("pair_cost")
+        result = {
+            "score": total / np.maximum(lengths, 1),
+            "total": total,
+            "length": lengths.astype(np.float64),
+            "travel": t["char_travel"][codes].sum(axis=1) + pair_sum("pair_travel"),
+            "sfb": pair_sum("pair_sfb"),
+            "alternation": pair_sum("pair_alt") / np.maximum(pairs, 1),
+            "row_changes": pair_sum("pair_row"),
+            "shifts": t["char_shift"][codes].sum(axis=1),
+        }
+        return {name: values.tolist() for name, values in result.items()}
+
+    def _score_python(self, encoded: List[List[int]]) -> Dict[str, List[float]]:
+        result: Dict[str, List[float]] = {name: [] for name in FEATURES}
+        for enc in encoded:
+            pairs = list(zip(enc, enc[1:]))
+            total = sum(self.char_cost[c] for c in enc) + sum(self.pair_cost[a][b] for a, b in pairs)
+            result["score"].append(total / max(1, len(enc)))
+            result["total"].append(total)
+            result["length"].append(float(len(enc)))
+            result["travel"].append(sum(self.char_travel[c] for c in enc)
+                                    + sum(self.pair_travel[a][b] for a, b in pairs))
+            result["sfb"].append(sum(self.pair_sfb[a][b] for a, b in pairs))
+            result["alternation"].append(sum(self.pair_alt[a][b] for a, b in pairs) / max(1, len(pairs)))
+            result["row_changes"].append(sum(self.pair_row[a][b] for a, b in pairs))
+            result["shifts"].append(sum(self.char_shift[c] for c in enc))
+        return result
+
+
+FEATURES = ["score", "total", "length", "travel", "sfb", "alternation", "row_changes", "shifts"]
+
+
+def _distance(a: tuple, b: tuple) -> float:
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+# ============================================================================
+# POOLS
+# ============================================================================
+
+class Pool:
+    """A named list of typing targets.
+
+    The hash covers whatever determines the contents (the targets themselves,
+    or a charset lesson's definition), so cached pools are never generated.
+    """
+
+    def __init__(self, id: str, kind: str, items: Optional[List[str]] = None,
+                 source: Optional[str] = None, build: Optional[Callable[[], List[str]]] = None,
+                 meta: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.kind = kind
+        self._items = items
+        self._build = build
+        self.source = source if source is not None else "\n".join(items or [])
+        self.meta = meta or {}
+
+    @property
+    def items(self) -> List[str]:
+        if self._items is None:
+            self._items = self._build() if self._build else []
+        return self._items
+
+    @property
+    def hash(self) -> str:
+        digest = hashlib.sha256(f"v{MODEL_VERSION}|{self.kind}\n".encode())
+        digest.update(self.source.encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+
+def _sample_lesson_words(lesson_id: str, samples: int) -> List[str]:
+    """Enemy words for a lesson as sim/words.gd would pick them."""
+    return [word_for_enemy("difficulty", 1, kind, enemy_id, set(), lesson_id)
+            for kind in LESSON_KINDS for enemy_id in range(1, samples + 1)]
+
+
+def lesson_pools(samples: int = 32) -> List[Pool]:
+    """One pool per lesson; charset lessons sample enemy words per kind."""
+    data = load_lessons(LESSONS_PATH)
+    pools = []
+    for lesson_id in data["order"]:
+        lesson = data["by_id"][lesson_id]
+        mode = lesson["mode"]
+        meta = {"mode": mode}
+        if mode == "wordlist" and lesson["wordlist"]:
+            pools.append(Pool(lesson_id, "lesson", list(lesson["wordlist"]), meta=meta))
+        elif mode == "sentence" and lesson["sentences"]:
+            pools.append(Pool(lesson_id, "lesson", list(lesson["sentences"]), meta=meta))
+        else:
+            source = json.dumps([lesson_id, lesson["charset"], lesson["lengths"], samples])
+            pools.append(Pool(lesson_id, "lesson", source=source, meta=meta,
+                              build=lambda lid=lesson_id: _sample_lesson_words(lid, samples)))
+    return pools
+
+
+def drill_pools() -> List[Pool]:
+    """One pool per drill template with all of its target steps."""
+    with open(DRILLS_PATH, encoding="utf-8") as f:
+        templates = json.load(f).get("templates", [])
+    pools = []
+    for template in templates:
+        targets = [str(t) for step in template.get("plan", []) if step.get("mode") == "targets"
+                   for t in step.get("targets", [])]
+        if targets:
+            pools.append(Pool(template.get("id", "?"), "drill", targets))
+    return pools
+
+
+def word_pools() -> List[Pool]:
+    """The fallback enemy word lists declared in sim/words.gd."""
+    source = WORDS_GD_PATH.read_text(encoding="utf-8")
+    pools = []
+    for name in WORD_POOLS:
+        match = re.search(rf"const {name}[^=]*=\s*\[(.*?)\]", source, re.S)
+        if match:
+            pools.append(Pool(name, "words", re.findall(r'"([^"]*)"', match.group(1))))
+    return pools
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+
+def _quantile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    pos = q * (len(sorted_values) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def summarize(pool: Pool, features: Dict[str, List[float]]) -> Dict[str, Any]:
+    """Per-keystroke difficulty curve and mean features for one pool."""
+    scores = features["score"]
+    ranked = sorted(range(len(scores)), key=lambda i: scores[i])
+    curve = [round(_quantile([scores[i] for i in ranked], q), 2) for q in QUANTILES]
+    count = max(1, len(scores))
+    return {
+        "count": len(scores),
+        "curve": curve,
+        "mean": {name: round(sum(values) / count, 3) for name, values in features.items()},
+        # Pools repeat words, so dedupe before taking the top three
+        "hardest": list(dict.fromkeys(pool.items[i] for i in reversed(ranked)))[:3],
+    }
+
+
+def score_pools(pools: List[Pool], model: KeyboardModel, use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Summaries per pool, scoring only pools whose hash is not cached."""
+    cache = _load_cache() if use_cache else {}
+    todo = [p for p in pools if p.hash not in cache]
+    fresh = {p.hash for p in todo}
+    if todo:
+        # Score each distinct word of the uncached pools once, then gather per pool
+        unique = list(dict.fromkeys(item for p in todo for item in p.items))
+        position = {item: i for i, item in enumerate(unique)}
+        features = model.score_batch(unique)
+        for pool in todo:
+            rows = [position[item] for item in pool.items]
+            cache[pool.hash] = summarize(pool, {k: [v[i] for i in rows] for k, v in features.items()})
+    results = {}
+    for pool in pools:
+        summary = dict(cache[pool.hash])
+        summary["cached"] = pool.hash not in fresh
+        results[f"{pool.kind}:{pool.id}"] = summary
+    if use_cache:
+        _save_cache({p.hash: cache[p.hash] for p in pools})
+    return results
+
+
+def check_graduation_paths(results: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Median per-keystroke difficulty per stage; flags stages that do not get harder."""
+    with open(LESSONS_PATH, encoding="utf-8") as f:
+        paths = json.load(f).get("graduation_paths", {})
+    report = []
+    for path_id, path in paths.items():
+        stages = []
+        previous = None
+        for stage in path.get("stages", []):
+            medians = [results[f"lesson:{lid}"]["curve"][2] for lid in stage.get("lessons", [])
+                       if f"lesson:{lid}" in results]
+            difficulty = round(sum(medians) / len(medians), 2) if medians else 0.0
+            flagged = previous is not None and difficulty <= previous
+            stages.append({
+                "stage": stage.get("stage"),
+                "name": stage.get("name", ""),
+                "difficulty": difficulty,
+                "flagged": flagged,
+            })
+            previous = difficulty
+        report.append({"path": path_id, "name": path.get("name", path_id), "stages": stages})
+    return report
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _load_cache() -> Dict[str, Any]:
+    if CACHE_PATH.exists():
+        try:
+            return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+    return {}
+
+
+def _save_cache(cache: Dict[str, Any]) -> None:
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PATH.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+    except OSError:
+        pass
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_pools(title: str, results: Dict[str, Dict[str, Any]], kind: str) -> None:
+    rows = [(key.split(":", 1)[1], r) for key, r in results.items() if key.startswith(kind + ":")]
+    if not rows:
+        return
+    print(f"\n## {title}")
+    print(f"  {'Pool':<28} {'N':>4} {'p10':>7} {'p50':>7} {'p90':>7} {'Total':>7} {'SFB':>5} {'Alt':>5}")
+    for name, r in rows:
+        curve = r["curve"]
+        print(f"  {name:<28} {r['count']:>4} {curve[0]:>7.2f} {curve[2]:>7.2f} {curve[4]:>7.2f} "
+              f"{r['mean']['total']:>7.2f} {r['mean']['sfb']:>5.2f} {r['mean']['alternation']:>5.2f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score typing difficulty of lessons, drills and word pools")
+    parser.add_argument("--source", choices=["all", "lessons", "drills", "words"], default="all",
+                        help="Which pools to score")
+    parser.add_argument("--lesson", type=str, help="Show the full curve and features for one lesson")
+    parser.add_argument("--samples", type=int, default=32,
+                        help="Words sampled per enemy kind for charset lessons")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and skip the result cache")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit with status 1 when a graduation stage does not get harder")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model = KeyboardModel()
+    pools: List[Pool] = []
+    if args.source in ("all", "lessons") or args.lesson:
+        pools.extend(lesson_pools(args.samples))
+    if args.source in ("all", "drills"):
+        pools.extend(drill_pools())
+    if args.source in ("all", "words"):
+        pools.extend(word_pools())
+    results = score_pools(pools, model, not args.no_cache)
+    paths = check_graduation_paths(results) if any(p.kind == "lesson" for p in pools) else []
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    flagged = [(p["path"], s) for p in paths for s in p["stages"] if s["flagged"]]
+
+    if args.lesson:
+        key = f"lesson:{args.lesson}"
+        if key not in results:
+            print(f"Error: Unknown lesson '{args.lesson}'")
+            sys.exit(1)
+        results = {key: results[key]}
+        paths = []
+
+    if args.json:
+        print(json.dumps({
+            "model_version": MODEL_VERSION,
+            "backend": "numpy" if HAS_NUMPY else "python",
+            "quantiles": QUANTILES,
+            "pools": results,
+            "graduation_paths": paths,
+            "elapsed_ms": round(elapsed_ms, 1),
+        }, indent=2))
+        sys.exit(1 if args.strict and flagged else 0)
+
+    print("=" * 60)
+    print("TYPING DIFFICULTY")
+    print("=" * 60)
+    cached = sum(1 for r in results.values() if r["cached"])
+    print(f"\nPools: {len(results)} ({cached} cached)  Backend: {'numpy' if HAS_NUMPY else 'python'}  "
+          f"Time: {elapsed_ms:.0f} ms")
+
+    if args.lesson:
+        r = next(iter(results.values()))
+        print(f"\n## LESSON {args.lesson}")
+        print("  Curve: " + "  ".join(f"p{int(q * 100)}={v:.2f}" for q, v in zip(QUANTILES, r["curve"])))
+        for name, value in r["mean"].items():
+            print(f"  {name:<12} {value:>8.3f}")
+        print(f"  Hardest: {', '.join(r['hardest'])}")
+        sys.exit(0)
+
+    print_pools("LESSONS", results, "lesson")
+    print_pools("DRILLS", results, "drill")
+    print_pools("WORD POOLS", results, "words")
+
+    if paths:
+        print("\n## GRADUATION PATHS")
+        for path in paths:
+            print(f"  {path['name']}:")
+            for stage in path["stages"]:
+                mark = "  <- not harder than previous stage" if stage["flagged"] else ""
+                print(f"    {stage['stage']:>2}. {stage['name']:<28} {stage['difficulty']:>7.2f}{mark}")
+        print(f"\n  Flagged stages: {len(flagged)}")
+
+    sys.exit(1 if args.strict and flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
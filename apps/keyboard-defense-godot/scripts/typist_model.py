@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Synthetic Typist Model
+
+Simulates a population of virtual players typing lesson word pools and
+night-wave word loads. Each player draws a target WPM and accuracy from
+log-normal skill distributions; every keystroke's latency and error chance
+are scaled by the bigram costs from typing_difficulty.py. The keystroke
+interval is calibrated so a player achieves their target WPM, mistakes and
+word switches included, on common English words; harder or easier workloads
+come out slower or faster than the target. Damage follows
+calculate_typing_damage() in sim/balance.gd with the combo and rolling-WPM
+rules of sim/typing_metrics.gd.
+
+The whole population is simulated as player x keystroke matrices (NumPy
+when available, one player at a time otherwise) and summarized per skill
+percentile: completion time, achieved WPM/accuracy, combos and damage.
+
+Usage:
+    python scripts/typist_model.py                          # Default lesson, days 1/5/10
+    python scripts/typist_model.py --players 20000 --wpm 55
+    python scripts/typist_model.py --lessons home_row_words,full_alpha --days 3,8
+    python scripts/typist_model.py --json
+"""
+
+import json
+import math
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+from generate_words import THEME_WORDS
+from scenario_sim import load_lessons, word_for_enemy
+from simulate_balance import BalanceSimulator
+from typing_difficulty import KeyboardModel, lesson_pools
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Project paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+BALANCE_PATH = PROJECT_ROOT / "sim" / "balance.gd"
+TYPING_METRICS_PATH = PROJECT_ROOT / "sim" / "typing_metrics.gd"
+LESSONS_PATH = PROJECT_ROOT / "data" / "lessons.json"
+
+PERCENTILES = [10, 25, 50, 75, 90]
+BATCH_SIZE = 2048  # Players per matrix batch; bounds memory on long loads
+LATENCY_SENSITIVITY = 0.6  # How strongly bigram cost slows a keystroke
+ERROR_SENSITIVITY = 1.0  # How strongly bigram cost raises the error chance
+JITTER_SIGMA = 0.25  # Log-normal spread of individual keystroke latencies
+ERROR_RECOVERY_MS = 350.0  # Noticing a mistake before retyping the key
+WORD_GAP_KEYS = 1.0  # Switching targets costs about one keystroke (like a space)
+MIN_INTERVAL_SHARE = 0.25  # Floor on the calibrated interval, as a share of 12000 / WPM
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+@dataclass
+class TypingConstants:
+    """Damage and metric constants mirrored from balance.gd and typing_metrics.gd."""
+    base_damage: int = 1
+    wpm_threshold: float = 60.0
+    wpm_bonus: int = 1
+    accuracy_threshold: float = 0.95
+    accuracy_bonus: int = 1
+    combo_multiplier: float = 0.1
+    wpm_window_ms: float = 10000.0
+
+    @classmethod
+    def from_gdscript(cls) -> "TypingConstants":
+        """Read the constants from the sim scripts, keeping defaults for anything missing."""
+        consts = cls()
+        sources = ""
+        for path in (BALANCE_PATH, TYPING_METRICS_PATH):
+            if path.exists():
+                sources += path.read_text(encoding="utf-8")
+        for attr, name in (("base_damage", "TYPING_BASE_DAMAGE"),
+                           ("wpm_threshold", "TYPING_WPM_BONUS_THRESHOLD"),
+                           ("wpm_bonus", "TYPING_WPM_BONUS_DAMAGE"),
+                           ("accuracy_threshold", "TYPING_ACCURACY_BONUS_THRESHOLD"),
+                           ("accuracy_bonus", "TYPING_ACCURACY_BONUS_DAMAGE"),
+                           ("combo_multiplier", "TYPING_COMBO_BONUS_MULTIPLIER"),
+                           ("wpm_window_ms", "WPM_WINDOW_MS")):
+            match = re.search(rf"const {name} := ([\d.]+)", sources)
+            if match:
+                setattr(consts, attr, type(getattr(consts, attr))(float(match.group(1))))
+        return consts
+
+    def damage(self, wpm: float, accuracy: float, combo: int) -> int:
+        """SimBalance.calculate_typing_damage()."""
+        damage = self.base_damage
+        if wpm >= self.wpm_threshold:
+            damage += self.wpm_bonus
+        if accuracy >= self.accuracy_threshold:
+            damage += self.accuracy_bonus
+        damage = int(damage * (1.0 + (combo // 10) * self.combo_multiplier))
+        return max(1, damage)
+
+
+@dataclass
+class SkillDistribution:
+    """Log-normal population of target WPM and error rate.
+
+    Faster typists tend to make fewer mistakes, so the log error rate is
+    negatively correlated with log WPM.
+    """
+    wpm_median: float = 40.0
+    wpm_sigma: float = 0.45
+    accuracy_median: float = 0.93
+    error_sigma: float = 0.6
+    correlation: float = -0.5
+    min_wpm: float = 5.0
+    max_wpm: float = 200.0
+    max_error: float = 0.5
+
+
+# ============================================================================
+# WORKLOADS
+# ============================================================================
+
+@dataclass
+class Workload:
+    """An ordered list of words with per-keystroke cost factors."""
+    name: str
+    words: List[str]
+    codes: List[int] = field(default_factory=list)
+    latency: List[float] = field(default_factory=list)
+    error: List[float] = field(default_factory=list)
+    word_end: List[int] = field(default_factory=list)
+
+    def prepare(self, model: KeyboardModel, reference: float) -> None:
+        """Flatten words into keystrokes and derive relative latency/error factors."""
+        self.codes, self.latency, self.error, self.word_end = [], [], [], []
+        for word in self.words:
+            prev = model.unknown
+            for code in model.encode(word):
+                cost = model.char_cost[code] + model.pair_cost[prev][code]
+                relative = cost / reference - 1.0
+                self.codes.append(code)
+                self.latency.append(max(0.4, 1.0 + LATENCY_SENSITIVITY * relative))
+                self.error.append(max(0.2, 1.0 + ERROR_SENSITIVITY * relative))
+                prev = code
+            self.word_end.append(len(self.codes) - 1)
+
+    @property
+    def chars(self) -> int:
+        return len(self.codes)
+
+
+def reference_cost(model: KeyboardModel) -> float:
+    """Average keystroke cost over common English words (factor 1.0)."""
+    total, count = 0.0, 0
+    for word in THEME_WORDS["common"]:
+        prev = model.unknown
+        for code in model.encode(word):
+            total += model.char_cost[code] + model.pair_cost[prev][code]
+            count += 1
+            prev = code
+    return total / max(1, count)
+
+
+@dataclass
+class Calibration:
+    """Per-character cost factors of the reference workload (common English words)."""
+    latency: float = 1.0
+    gap: float = 0.0
+    error: float = 1.0
+
+    @classmethod
+    def from_workload(cls, workload: Workload) -> "Calibration":
+        chars = max(1, workload.chars)
+        return cls(latency=sum(workload.latency) / chars,
+                   gap=WORD_GAP_KEYS * (len(workload.words) - 1) / chars,
+                   error=sum(workload.error) / chars)
+
+    def interval(self, wpm, error_rate):
+        """Base ms per keystroke so the reference workload averages the target WPM.
+
+        A reference character costs interval * (latency + gap) plus, with
+        chance p, ERROR_RECOVERY_MS + interval; solve that for 12000 / wpm.
+        Works on floats and NumPy arrays alike.
+        """
+        lower, upper = (np.maximum, np.minimum) if HAS_NUMPY else (max, min)
+        per_char = 12000.0 / wpm
+        p = upper(error_rate * self.error, 0.95)
+        interval = (per_char - p * ERROR_RECOVERY_MS) / (self.latency + self.gap + p)
+        return lower(interval, MIN_INTERVAL_SHARE * per_char)
+
+
+def reference_workload(model: KeyboardModel, reference: float) -> Workload:
+    workload = Workload("reference", list(THEME_WORDS["common"]))
+    workload.prepare(model, reference)
+    return workload
+
+
+def lesson_workload(lesson_id: str, samples: int) -> Workload:
+    pools = {p.id: p for p in lesson_pools(samples) if p.kind == "lesson"}
+    if lesson_id not in pools:
+        raise ValueError(f"Unknown lesson '{lesson_id}'")
+    return Workload(f"lesson:{lesson_id}", list(pools[lesson_id].items))
+
+
+def wave_workload(day: int, lesson_id: str) -> Workload:
+    """Words for every enemy of a night wave, as sim/words.gd assigns them."""
+    composition = BalanceSimulator(include_loot=False)._generate_wave(day)["composition"]
+    used: set = set()
+    words = []
+    enemy_id = 1
+    for kind, count in composition.items():
+        for _ in range(count):
+            word = word_for_enemy("typist", day, kind, enemy_id, used, lesson_id)
+            used.add(word)
+            words.append(word)
+            enemy_id += 1
+    return Workload(f"wave:day{day}", words)
+
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+class TypistPopulation:
+    """Samples virtual players and runs them through workloads."""
+
+    def __init__(self, players: int, skills: SkillDistribution, constants: TypingConstants,
+                 calibration: Calibration, seed: int = 0):
+        self.players = players
+        self.skills = skills
+        self.constants = constants
+        self.calibration = calibration
+        self.seed = seed
+        self.wpm, self.error_rate = self._sample_skills()
+
+    def _sample_skills(self):
+        s = self.skills
+        err_median = 1.0 - s.accuracy_median
+        rho = s.correlation
+        spread = math.sqrt(max(0.0, 1.0 - rho * rho))
+        if HAS_NUMPY:
+            rng = np.random.default_rng(self.seed)
+            z_wpm = rng.standard_normal(self.players)
+            z_err = rho * z_wpm + spread * rng.standard_normal(self.players)
+            wpm = np.clip(s.wpm_median * np.exp(s.wpm_sigma * z_wpm), s.min_wpm, s.max_wpm)
+            err = np.clip(err_median * np.exp(s.error_sigma * z_err), 0.0, s.max_error)
+            return wpm, err
+        rng = random.Random(self.seed)
+        wpm, err = [], []
+        for _ in range(self.players):
+            z_wpm = rng.gauss(0.0, 1.0)
+            z_err = rho * z_wpm + spread * rng.gauss(0.0, 1.0)
+            wpm.append(min(s.max_wpm, max(s.min_wpm, s.wpm_median * math.exp(s.wpm_sigma * z_wpm))))
+            err.append(min(s.max_error, err_median * math.exp(s.error_sigma * z_err)))
+        return wpm, err
+
+    def run(self, workload: Workload) -> Dict[str, Any]:
+        """Per-player metrics for one workload, summarized by skill percentile."""
+        if HAS_NUMPY:
+            metrics = self._run_numpy(workload)
+        else:
+            metrics = self._run_python(workload)
+        return summarize(workload, list(self.wpm), metrics)
+
+    def _run_numpy(self, workload: Workload) -> Dict[str, List[float]]:
+        c = self.constants
+        rng = np.random.default_rng(self.seed + 1)
+        latency = np.array(workload.latency)
+        error = np.array(workload.error)
+        ends = np.array(workload.word_end)
+        gap = np.zeros(workload.chars)
+        gap[ends[:-1] + 1] = WORD_GAP_KEYS
+        keys = np.arange(workload.chars)
+        out: Dict[str, List[float]] = {name: [] for name in METRICS}
+
+        for start in range(0, self.players, BATCH_SIZE):
+            wpm = np.asarray(self.wpm[start:start + BATCH_SIZE])
+            err = np.asarray(self.error_rate[start:start + BATCH_SIZE])
+            n = len(wpm)
+            interval = self.calibration.interval(wpm, err)
+            jitter = rng.lognormal(-0.5 * JITTER_SIGMA ** 2, JITTER_SIGMA, (n, workload.chars))
+            mistakes = rng.random((n, workload.chars)) < np.minimum(err[:, None] * error, 0.95)
+            step = interval[:, None] * (latency * jitter + gap)
+            step += mistakes * (ERROR_RECOVERY_MS + interval[:, None])
+            clock = np.cumsum(step, axis=1)
+
+            # Combo after keystroke k counts correct keys since the last mistake
+            last_error = np.maximum.accumulate(np.where(mistakes, keys, 0), axis=1)
+            combo = keys - last_error + 1
+            errors_so_far = np.cumsum(mistakes, axis=1)
+            accuracy = (keys + 1) / (keys + 1 + errors_so_far)
+
+            # Rolling WPM at each word end: keystrokes inside the window
+            end_clock = clock[:, ends]
+            window_start = np.empty_like(end_clock, dtype=np.intp)
+            for row in range(n):
+                window_start[row] = np.searchsorted(clock[row], end_clock[row] - c.wpm_window_ms)
+            oldest = np.take_along_axis(clock, window_start, axis=1)
+            span = np.maximum(end_clock - oldest, 1.0)
+            in_window = ends[None, :] - window_start + 1
+            rolling_wpm = np.where(end_clock - oldest >= 100.0,
+                                   (in_window / 5.0) / (span / 60000.0), 0.0)
+
+            word_combo = combo[:, ends]
+            damage = (c.base_damage + c.wpm_bonus * (rolling_wpm >= c.wpm_threshold)
+                      + c.accuracy_bonus * (accuracy[:, ends] >= c.accuracy_threshold))
+            damage = np.maximum(1, (damage * (1.0 + (word_combo // 10) * c.combo_multiplier)).astype(int))
+
+            total_ms = clock[:, -1]
+            out["completion_s"].extend((total_ms / 1000.0).tolist())
+            out["wpm"].extend(((workload.chars / 5.0) / (total_ms / 60000.0)).tolist())
+            out["accuracy"].extend(accuracy[:, -1].tolist())
+            out["max_combo"].extend(combo.max(axis=1).tolist())
+            out["word_combo"].extend(word_combo.mean(axis=1).tolist())
+            out["damage"].extend(damage.sum(axis=1).tolist())
+            out["dps"].extend((damage.sum(axis=1) / (total_ms / 1000.0)).tolist())
+        return out
+
+    def _run_python(self, workload: Workload) -> Dict[str, List[float]]:
+        c = self.constants
+        rng = random.Random(self.seed + 1)
+        ends = set(workload.word_end)
+        starts = {e + 1 for e in workload.word_end[:-1]}
+        out: Dict[str, List[float]] = {name: [] for name in METRICS}
+        mu = -0.5 * JITTER_SIGMA ** 2
+
+        for wpm, err in zip(self.wpm, self.error_rate):
+            interval = self.calibration.interval(wpm, err)
+            clock = 0.0
+            times: List[float] = []
+            errors = combo = max_combo = 0
+            word_combos: List[int] = []
+            damage = 0
+            window_start = 0
+            for k in range(workload.chars):
+                step = workload.latency[k] * rng.lognormvariate(mu, JITTER_SIGMA)
+                if k in starts:
+                    step += WORD_GAP_KEYS
+                clock += interval * step
+                if rng.random() < min(err * workload.error[k], 0.95):
+                    errors += 1
+                    combo = 0
+                    clock += ERROR_RECOVERY_MS + interval
+                combo += 1
+                max_combo = max(max_combo, combo)
+                times.append(clock)
+                if k in ends:
+                    while times[window_start] < clock - c.wpm_window_ms:
+                        window_start += 1
+                    span = clock - times[window_start]
+                    rolling = ((k - window_start + 1) / 5.0) / (max(span, 1.0) / 60000.0) if span >= 100.0 else 0.0
+                    damage += c.damage(rolling, (k + 1) / (k + 1 + errors), combo)
+                    word_combos.append(combo)
+            out["completion_s"].append(clock / 1000.0)
+            out["wpm"].append((workload.chars / 5.0) / (clock / 60000.0))
+            out["accuracy"].append(workload.chars / (workload.chars + errors))
+            out["max_combo"].append(max_combo)
+            out["word_combo"].append(sum(word_combos) / max(1, len(word_combos)))
+            out["damage"].append(damage)
+            out["dps"].append(damage / (clock / 1000.0))
+        return out
+
+
+METRICS = ["completion_s", "wpm", "accuracy", "max_combo", "word_combo", "damage", "dps"]
+
+
+def summarize(workload: Workload, skill: List[float], metrics: Dict[str, List[float]]) -> Dict[str, Any]:
+    """Mean metrics for players around each skill percentile (ranked by target WPM)."""
+    order = sorted(range(len(skill)), key=lambda i: skill[i])
+    n = len(order)
+    half_band = max(1, n // 20)  # +/- 5 percentile ranks
+    rows = []
+    for pct in PERCENTILES:
+        center = min(n - 1, int(pct / 100.0 * n))
+        band = order[max(0, center - half_band):min(n, center + half_band + 1)]
+        row = {"percentile": pct, "target_wpm": round(skill[order[center]], 1)}
+        for name in METRICS:
+            row[name] = round(sum(metrics[name][i] for i in band) / len(band), 3)
+        rows.append(row)
+    return {
+        "workload": workload.name,
+        "words": len(workload.words),
+        "chars": workload.chars,
+        "percentiles": rows,
+    }
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate a population of typists on lessons and waves")
+    parser.add_argument("--players", "-p", type=int, default=5000, help="Virtual players (default: 5000)")
+    parser.add_argument("--wpm", type=float, default=40.0, help="Median target WPM")
+    parser.add_argument("--wpm-sigma", type=float, default=0.45, help="Log-normal spread of WPM")
+    parser.add_argument("--accuracy", type=float, default=0.93, help="Median accuracy")
+    parser.add_argument("--lessons", type=str, help="Comma-separated lesson IDs (default: default lesson)")
+    parser.add_argument("--days", type=str, default="1,5,10", help="Comma-separated wave days")
+    parser.add_argument("--samples", type=int, default=32,
+                        help="Words sampled per enemy kind for charset lessons")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model = KeyboardModel()
+    reference = reference_cost(model)
+    default_lesson = load_lessons(LESSONS_PATH)["default_lesson"]
+    lesson_ids = [s.strip() for s in (args.lessons or default_lesson).split(",") if s.strip()]
+    days = [int(d) for d in args.days.split(",") if d.strip()]
+
+    try:
+        workloads = [lesson_workload(lid, args.samples) for lid in lesson_ids]
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    workloads += [wave_workload(day, lesson_ids[0]) for day in days]
+    for workload in workloads:
+        workload.prepare(model, reference)
+
+    skills = SkillDistribution(wpm_median=args.wpm, wpm_sigma=args.wpm_sigma, accuracy_median=args.accuracy)
+    calibration = Calibration.from_workload(reference_workload(model, reference))
+    population = TypistPopulation(args.players, skills, TypingConstants.from_gdscript(), calibration, args.seed)
+    results = [population.run(w) for w in workloads]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps({
+            "players": args.players,
+            "backend": "numpy" if HAS_NUMPY else "python",
+            "skills": skills.__dict__,
+            "results": results,
+            "elapsed_ms": round(elapsed_ms, 1),
+        }, indent=2))
+        sys.exit(0)
+
+    print("=" * 60)
+    print("SYNTHETIC TYPIST MODEL")
+    print("=" * 60)
+    print(f"\nPlayers: {args.players}  Median WPM: {args.wpm}  Median accuracy: {args.accuracy:.0%}  "
+          f"Backend: {'numpy' if HAS_NUMPY else 'python'}  Time: {elapsed_ms:.0f} ms")
+
+    for result in results:
+        print(f"\n## {result['workload'].upper()} ({result['words']} words, {result['chars']} chars)")
+        print(f"  {'Pct':>4} {'Target':>7} {'WPM':>6} {'Acc':>6} {'Time s':>8} "
+              f"{'MaxCombo':>9} {'Combo':>6} {'Damage':>7} {'DPS':>6}")
+        for row in result["percentiles"]:
+            print(f"  {row['percentile']:>4} {row['target_wpm']:>7.1f} {row['wpm']:>6.1f} "
+                  f"{row['accuracy']:>6.1%} {row['completion_s']:>8.1f} {row['max_combo']:>9.1f} "
+                  f"{row['word_combo']:>6.1f} {row['damage']:>7.1f} {row['dps']:>6.2f}")
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
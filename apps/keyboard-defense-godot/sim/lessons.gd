@@ -2,9 +2,12 @@ class_name SimLessons
 extends RefCounted
 
 const LESSONS_PATH := "res://data/lessons.json"
+const WORD_POOLS_PATH := "res://data/lesson_word_pools.json"
 const DEFAULT_LESSON_ID := "full_alpha"
 const KINDS := ["scout", "raider", "armored"]
 static var _cache: Dictionary = {}
+static var _word_pools: Dictionary = {}
+static var _resolved_pools: Dictionary = {}
 
 static func load_data() -> Dictionary:
     if not _cache.is_empty():
@@ -79,6 +82,60 @@ static func lesson_description(lesson_id: String) -> String:
         return ""
     return str(lesson.get("description", ""))
 
+## Precomputed enemy words of a wordlist lesson for an enemy kind, or "boss"
+## for the wordlist ordered longest first (built by scripts/build_word_pools.py).
+## Empty when the lesson has no pool or its pool is stale (its source hash no
+## longer matches the lesson's lengths and wordlist); callers filter then.
+static func word_pool(lesson_id: String, key: String) -> Array:
+    var resolved: String = normalize_lesson_id(lesson_id)
+    var cache_key: String = "%s|%s" % [resolved, key]
+    if _resolved_pools.has(cache_key):
+        return _resolved_pools[cache_key]
+    var output: Array = []
+    var pools: Dictionary = _load_word_pools()
+    var record: Variant = pools.get("lessons", {}).get(resolved, {})
+    if typeof(record) == TYPE_DICTIONARY and str(record.get("source", "")) == word_pool_source_hash(get_lesson(resolved)):
+        var strings: PackedStringArray = pools.get("strings", PackedStringArray())
+        for index in record.get(key, []):
+            var i: int = int(index)
+            if i < 0 or i >= strings.size():
+                output.clear()
+                break
+            output.append(strings[i])
+    _resolved_pools[cache_key] = output
+    return output
+
+## Hash of the normalized inputs a lesson's word pools are built from: one
+## "kind:min-max" line per enemy kind, then one line per wordlist word.
+## Must match source_hash() in scripts/build_word_pools.py.
+static func word_pool_source_hash(lesson: Dictionary) -> String:
+    var lines: PackedStringArray = PackedStringArray()
+    var lengths: Dictionary = lesson.get("lengths", {})
+    for kind in KINDS:
+        var range_value: Array = lengths.get(kind, [0, 0])
+        lines.append("%s:%d-%d" % [kind, int(range_value[0]), int(range_value[1])])
+    for word in lesson.get("wordlist", []):
+        lines.append(str(word))
+    return "\n".join(lines).sha256_text().substr(0, 16)
+
+static func _load_word_pools() -> Dictionary:
+    if not _word_pools.is_empty():
+        return _word_pools
+    _word_pools = {"strings": PackedStringArray(), "lessons": {}}
+    if not FileAccess.file_exists(WORD_POOLS_PATH):
+        return _word_pools
+    var file: FileAccess = FileAccess.open(WORD_POOLS_PATH, FileAccess.READ)
+    if file == null:
+        return _word_pools
+    var parsed: Variant = JSON.parse_string(file.get_as_text())
+    if typeof(parsed) != TYPE_DICTIONARY:
+        return _word_pools
+    _word_pools["strings"] = PackedStringArray(parsed.get("strings", []))
+    var lessons: Variant = parsed.get("lessons", {})
+    if typeof(lessons) == TYPE_DICTIONARY:
+        _word_pools["lessons"] = lessons
+    return _word_pools
+
 static func _normalize_data(raw: Dictionary) -> Dictionary:
     var lessons_raw: Variant = raw.get("lessons", [])
     var lessons: Array = []
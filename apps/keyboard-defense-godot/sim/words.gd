@@ -156,6 +156,24 @@ static func _word_from_wordlist(seed: String, day: int, kind: String, enemy_id:
 	if wordlist.is_empty():
 		return ""
 
+	# Precomputed pool, same words and order as _filter_wordlist()
+	var filtered: Array = SimLessons.word_pool(str(lesson.get("id", "")), kind)
+	if filtered.is_empty():
+		filtered = _filter_wordlist(lesson, kind)
+
+	# Select from filtered list
+	var key: String = "%s|%d|%s|%d" % [seed, day, kind, enemy_id]
+	var index: int = _hash_index(key, filtered.size())
+	for _i in range(filtered.size()):
+		var word: String = str(filtered[index]).to_lower()
+		if not _reserved_words().has(word) and not already_used.has(word):
+			return word
+		index = (index + 1) % filtered.size()
+	return ""
+
+static func _filter_wordlist(lesson: Dictionary, kind: String) -> Array:
+	var wordlist: Array = lesson.get("wordlist", [])
+
 	# Filter by length based on enemy kind
 	var lengths: Dictionary = lesson.get("lengths", {})
 	var range_value: Variant = lengths.get(kind, [3, 6])
@@ -175,16 +193,20 @@ static func _word_from_wordlist(seed: String, day: int, kind: String, enemy_id:
 	# Fall back to full list if filter is too restrictive
 	if filtered.is_empty():
 		filtered = wordlist
+	return filtered
 
-	# Select from filtered list
-	var key: String = "%s|%d|%s|%d" % [seed, day, kind, enemy_id]
-	var index: int = _hash_index(key, filtered.size())
-	for _i in range(filtered.size()):
-		var word: String = str(filtered[index]).to_lower()
-		if not _reserved_words().has(word) and not already_used.has(word):
-			return word
-		index = (index + 1) % filtered.size()
-	return ""
+## Wordlist ordered longest first, equal lengths kept in wordlist order (a
+## stable sort, matching the "boss" pool from scripts/build_word_pools.py).
+static func _sort_longest_first(wordlist: Array) -> Array:
+	var order: Array = range(wordlist.size())
+	var lengths: Array = []
+	for word in wordlist:
+		lengths.append(str(word).length())
+	order.sort_custom(func(a, b): return lengths[a] > lengths[b] or (lengths[a] == lengths[b] and a < b))
+	var sorted_words: Array = []
+	for i in order:
+		sorted_words.append(wordlist[i])
+	return sorted_words
 
 static func _sentence_from_lesson(seed: String, day: int, enemy_id: int, lesson: Dictionary, already_used: Dictionary) -> String:
 	var sentences: Array = lesson.get("sentences", [])
@@ -216,9 +238,10 @@ static func get_boss_word(lesson_id: String, already_used: Dictionary) -> String
 	if mode == "wordlist":
 		var wordlist: Array = lesson.get("wordlist", [])
 		if not wordlist.is_empty():
-			# Sort by length and pick a long unused word
-			var sorted_words: Array = wordlist.duplicate()
-			sorted_words.sort_custom(func(a, b): return str(a).length() > str(b).length())
+			# Longest words first: precomputed pool, else sort a copy
+			var sorted_words: Array = SimLessons.word_pool(resolved_lesson, "boss")
+			if sorted_words.is_empty():
+				sorted_words = _sort_longest_first(wordlist)
 			for word in sorted_words:
 				var w: String = str(word).to_lower()
 				if not _reserved_words().has(w) and not already_used.has(w):
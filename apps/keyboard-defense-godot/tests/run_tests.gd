@@ -8392,6 +8392,7 @@ func _run_words_tests() -> void:
     _test_words_word_determinism()
     _test_words_scramble_word()
     _test_words_get_boss_word()
+    _test_words_lesson_pools()
     _test_words_random_functions()
 
 func _test_words_constants() -> void:
@@ -8571,6 +8572,26 @@ func _test_words_get_boss_word() -> void:
     var boss_word3: String = SimWords.get_boss_word("home_row", {})
     _assert_true(boss_word3.length() > 0, "Boss word with lesson generated")
 
+func _test_words_lesson_pools() -> void:
+    # Precomputed pools must match the runtime filter (run scripts/build_word_pools.py)
+    var checked: int = 0
+    for lesson_id in SimLessons.lesson_ids():
+        var lesson: Dictionary = SimLessons.get_lesson(lesson_id)
+        if str(lesson.get("mode", "")) != "wordlist" or lesson.get("wordlist", []).is_empty():
+            continue
+        for kind in SimLessons.KINDS:
+            var pool: Array = SimLessons.word_pool(lesson_id, kind)
+            _assert_equal(pool, SimWords._filter_wordlist(lesson, kind), "Word pool matches filter: %s %s" % [lesson_id, kind])
+        var boss_pool: Array = SimLessons.word_pool(lesson_id, "boss")
+        _assert_equal(boss_pool, SimWords._sort_longest_first(lesson.get("wordlist", [])), "Boss pool matches stable sort: %s" % lesson_id)
+        # Editing a word without changing the word count still invalidates the pool
+        var edited: Dictionary = lesson.duplicate(true)
+        edited["wordlist"][0] = str(edited["wordlist"][0]) + "x"
+        _assert_true(SimLessons.word_pool_source_hash(edited) != SimLessons.word_pool_source_hash(lesson), "Pool source hash tracks words: %s" % lesson_id)
+        checked += 1
+    _assert_true(checked > 0, "Wordlist lessons have word pools")
+    _assert_true(SimLessons.word_pool("full_alpha", "scout").is_empty(), "Charset lessons have no word pool")
+
 func _test_words_random_functions() -> void:
     # Test random_common_word
     var common: String = SimWords.random_common_word(null)
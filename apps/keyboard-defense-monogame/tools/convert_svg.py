@@ -9,17 +9,25 @@ Usage:
 Default paths (run from apps/keyboard-defense-monogame/):
     python tools/convert_svg.py
 
-Requires one of:
+Unchanged SVGs are skipped: a build cache (obj/convert_svg_cache.json) maps
+each SVG's content hash, target size and backend versions to the hash of the
+PNG it produced. Remaining files convert in parallel (--jobs).
+
+Pixel-art SVGs are rasterized in-process by the Godot project's built-in
+rasterizer (apps/keyboard-defense-godot/scripts/svg_to_png.py); anything
+outside its SVG subset falls back to one of:
     pip install cairosvg   (preferred, high quality)
     pip install Pillow     (fallback, basic rasterization)
     inkscape on PATH       (external process)
 """
 
 import argparse
+import hashlib
 import json
 import subprocess
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # ---------------------------------------------------------------------------
@@ -45,10 +53,27 @@ MANIFEST_CATEGORIES = {"enemies", "buildings", "tiles", "effects", "icons"}
 # Conversion backends
 # ---------------------------------------------------------------------------
 
+# The built-in rasterizer lives with the Godot project's asset scripts.
+GODOT_SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "keyboard-defense-godot" / "scripts"
+
+_native_available: bool | None = None
 _cairosvg_available: bool | None = None
 _pillow_available: bool | None = None
 
 
+def _check_native() -> bool:
+    global _native_available
+    if _native_available is None:
+        if str(GODOT_SCRIPTS_DIR) not in sys.path:
+            sys.path.insert(0, str(GODOT_SCRIPTS_DIR))
+        try:
+            import svg_to_png  # noqa: F401
+            _native_available = True
+        except ImportError:
+            _native_available = False
+    return _native_available
+
+
 def _check_cairosvg() -> bool:
     global _cairosvg_available
     if _cairosvg_available is None:
@@ -71,6 +96,21 @@ def _check_pillow() -> bool:
     return _pillow_available
 
 
+def convert_with_native(svg_path: Path, png_path: Path, width: int, height: int) -> bool:
+    """In-process SVG->PNG for the pixel-art subset; False for other SVGs."""
+    if not _check_native():
+        return False
+    import svg_to_png
+    try:
+        svg_to_png.convert_svg_to_png(svg_path, png_path, width, height)
+        return True
+    except svg_to_png.UnsupportedSVG:
+        return False
+    except (OSError, UnicodeDecodeError) as exc:
+        print(f"  native error for {svg_path.name}: {exc}")
+        return False
+
+
 def convert_with_cairosvg(svg_path: Path, png_path: Path, width: int, height: int) -> bool:
     """High-quality SVG->PNG via cairosvg."""
     if not _check_cairosvg():
@@ -130,17 +170,78 @@ def convert_with_inkscape(svg_path: Path, png_path: Path, width: int, height: in
         return False
 
 
-def convert_svg(svg_path: Path, png_path: Path, width: int, height: int) -> bool:
-    """Try converters in preference order: cairosvg -> Pillow -> Inkscape."""
+def convert_svg(svg_path: Path, png_path: Path, width: int, height: int) -> str | None:
+    """Try converters in preference order: native -> cairosvg -> Pillow -> Inkscape.
+
+    Returns the name of the backend that wrote the PNG, or None on failure.
+    """
     png_path.parent.mkdir(parents=True, exist_ok=True)
 
+    if convert_with_native(svg_path, png_path, width, height):
+        return "native"
     if convert_with_cairosvg(svg_path, png_path, width, height):
-        return True
+        return "cairosvg"
     if convert_with_pillow(svg_path, png_path, width, height):
-        return True
+        return "Pillow"
     if convert_with_inkscape(svg_path, png_path, width, height):
-        return True
-    return False
+        return "Inkscape"
+    return None
+
+
+def _convert_job(svg_path: Path, png_path: Path, width: int, height: int) -> tuple[str | None, float, str | None]:
+    """Process-pool worker: (backend, seconds, output PNG hash)."""
+    start = time.perf_counter()
+    backend = convert_svg(svg_path, png_path, width, height)
+    elapsed = time.perf_counter() - start
+    return backend, elapsed, _file_hash(png_path) if backend else None
+
+
+# ---------------------------------------------------------------------------
+# Build cache
+# ---------------------------------------------------------------------------
+
+CACHE_VERSION = 1
+
+
+def _file_hash(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_build_cache(path: Path, backends: dict[str, str]) -> dict[str, dict]:
+    """Cached entries by SVG path, or {} if the cache is missing or stale.
+
+    Any change in backend availability or version invalidates everything.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("backends") != backends:
+        return {}
+    return cache.get("entries", {})
+
+
+def save_build_cache(path: Path, backends: dict[str, str], entries: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "backends": backends, "entries": entries},
+                  f, indent=1, sort_keys=True)
+
+
+def is_up_to_date(entry: dict | None, svg_hash: str, size: tuple[int, int], png_path: Path) -> bool:
+    """True if the cached PNG was built from this SVG at this size and is untouched."""
+    return (
+        entry is not None
+        and entry.get("svg") == svg_hash
+        and tuple(entry.get("size", ())) == size
+        and entry.get("png_path") == str(png_path)
+        and entry.get("png") is not None
+        and entry.get("png") == _file_hash(png_path)
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -234,16 +335,26 @@ def resolve_size(category: str, override: int | None, default: int) -> tuple[int
 
 def detect_backends() -> list[str]:
     """Return list of available converter names."""
-    available = []
+    return list(backend_versions())
+
+
+def backend_versions() -> dict[str, str]:
+    """Available converter names mapped to their versions."""
+    available = {}
+    if _check_native():
+        import svg_to_png
+        available["native"] = svg_to_png.RASTERIZER_VERSION
     if _check_cairosvg():
-        available.append("cairosvg")
+        import cairosvg
+        available["cairosvg"] = getattr(cairosvg, "__version__", "unknown")
     if _check_pillow():
-        available.append("Pillow")
+        import PIL
+        available["Pillow"] = getattr(PIL, "__version__", "unknown")
     try:
         r = subprocess.run(["inkscape", "--version"], capture_output=True, timeout=5)
         if r.returncode == 0:
-            available.append("Inkscape")
-    except (FileNotFoundError, subprocess.TimeoutExpired):
+            available["Inkscape"] = r.stdout.decode("utf-8", "replace").strip().splitlines()[0]
+    except (FileNotFoundError, subprocess.TimeoutExpired, IndexError):
         pass
     return available
 
@@ -291,6 +402,18 @@ Examples:
         "--dry-run", action="store_true",
         help="List files that would be converted without writing anything.",
     )
+    parser.add_argument(
+        "--jobs", type=int, default=None,
+        help="Parallel conversion processes (default: CPU count).",
+    )
+    parser.add_argument(
+        "--cache", default=None,
+        help="Build cache path (default: obj/convert_svg_cache.json)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Ignore the build cache and convert every SVG.",
+    )
     args = parser.parse_args()
 
     # ------------------------------------------------------------------
@@ -316,6 +439,11 @@ Examples:
         if args.manifest
         else output_dir / "assets_manifest.json"
     )
+    cache_path = (
+        Path(args.cache).resolve()
+        if args.cache
+        else monogame_root / "obj" / "convert_svg_cache.json"
+    )
 
     # ------------------------------------------------------------------
     # Validate input
@@ -327,7 +455,8 @@ Examples:
     # ------------------------------------------------------------------
     # Check converter availability
     # ------------------------------------------------------------------
-    backends = detect_backends()
+    versions = backend_versions()
+    backends = list(versions)
     if not backends and not args.dry_run:
         print("ERROR: No SVG conversion backend available.")
         print()
@@ -367,45 +496,93 @@ Examples:
     default_size = 32
     converted: list[dict] = []
     failed: list[str] = []
+    skipped = 0
+    cache = {} if args.force or args.dry_run else load_build_cache(cache_path, versions)
+    new_cache: dict[str, dict] = {}
+    pending: list[tuple[Path, Path, Path, dict, str, tuple[int, int]]] = []
+
+    # Subdirectories are flattened into the category folder
+    # (e.g. tiles/desert/tile_sand.svg -> tiles/tile_sand.png), so several
+    # SVGs can share one PNG. The last one in sorted order wins, as in the
+    # old serial loop; the others are skipped before any work is fanned out.
+    def flat_png_rel(svg_file: Path) -> Path:
+        return Path(resolve_category(svg_file.relative_to(input_dir))) / (svg_file.stem + ".png")
+
+    destinations = {flat_png_rel(f): f for f in svg_files}
+    shadowed = [f for f in svg_files if destinations[flat_png_rel(f)] != f]
+    if shadowed:
+        print(f"WARNING: {len(shadowed)} SVGs share an output PNG with another SVG and are skipped:")
+        for svg_file in shadowed:
+            winner = destinations[flat_png_rel(svg_file)]
+            print(f"  {svg_file.relative_to(input_dir)}  (shadowed by {winner.relative_to(input_dir)})")
+        print()
+    shadowed_set = set(shadowed)
 
     for svg_file in svg_files:
+        if svg_file in shadowed_set:
+            continue
         rel = svg_file.relative_to(input_dir)
         category = resolve_category(rel)
         w, h = resolve_size(category, args.size, default_size)
 
-        png_name = svg_file.stem + ".png"
-        # Flatten subdirectories into the category folder.
-        # e.g. tiles/desert/tile_sand.svg -> tiles/tile_sand.png
-        png_rel = Path(category) / png_name
+        png_rel = flat_png_rel(svg_file)
         png_path = output_dir / png_rel
+        entry = {
+            "id": svg_file.stem,
+            "path": str(png_rel).replace("\\", "/"),
+            "category": category,
+            "width": w,
+            "height": h,
+            "source_svg": str(rel).replace("\\", "/"),
+        }
 
         if args.dry_run:
             print(f"  [dry-run] {rel}  ->  {png_rel}  ({w}x{h})")
-            converted.append({
-                "id": svg_file.stem,
-                "path": str(png_rel).replace("\\", "/"),
-                "category": category,
-                "width": w,
-                "height": h,
-                "source_svg": str(rel).replace("\\", "/"),
-            })
+            converted.append(entry)
             continue
 
-        # Actual conversion
-        ok = convert_svg(svg_file, png_path, w, h)
-        if ok:
-            print(f"  OK   {rel}  ->  {png_rel}  ({w}x{h})")
-            converted.append({
-                "id": svg_file.stem,
-                "path": str(png_rel).replace("\\", "/"),
-                "category": category,
-                "width": w,
-                "height": h,
-                "source_svg": str(rel).replace("\\", "/"),
-            })
+        key = entry["source_svg"]
+        svg_hash = _file_hash(svg_file)
+        if is_up_to_date(cache.get(key), svg_hash, (w, h), png_path):
+            new_cache[key] = cache[key]
+            converted.append(entry)
+            skipped += 1
+            continue
+        pending.append((svg_file, png_path, png_rel, entry, svg_hash, (w, h)))
+
+    # Actual conversion, fanned out across processes
+    backend_times: dict[str, list[float]] = {}
+    if pending:
+        jobs = [(svg_file, png_path, w, h) for svg_file, png_path, _, _, _, (w, h) in pending]
+        if args.jobs == 1 or len(jobs) == 1:
+            results = [_convert_job(*job) for job in jobs]
         else:
-            print(f"  FAIL {rel}")
-            failed.append(str(rel))
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                results = list(pool.map(_convert_job, *zip(*jobs), chunksize=8))
+
+        for (svg_file, png_path, png_rel, entry, svg_hash, size), (backend, elapsed, png_hash) in zip(pending, results):
+            rel = svg_file.relative_to(input_dir)
+            w, h = size
+            if backend:
+                print(f"  OK   {rel}  ->  {png_rel}  ({w}x{h}, {backend})")
+                converted.append(entry)
+                backend_times.setdefault(backend, []).append(elapsed)
+                new_cache[entry["source_svg"]] = {
+                    "svg": svg_hash,
+                    "size": [w, h],
+                    "png": png_hash,
+                    "png_path": str(png_path),
+                    "backend": backend,
+                }
+            else:
+                print(f"  FAIL {rel}")
+                failed.append(str(rel))
+
+    if not args.dry_run:
+        save_build_cache(cache_path, versions, new_cache)
+    # Keep manifest order independent of which files were skipped
+    svg_order = {str(f.relative_to(input_dir)).replace("\\", "/"): i for i, f in enumerate(svg_files)}
+    converted.sort(key=lambda e: svg_order[e["source_svg"]])
 
     # ------------------------------------------------------------------
     # Write manifests
@@ -432,8 +609,13 @@ Examples:
     print()
     print("=" * 60)
     print(f"  Total SVGs found:  {len(svg_files)}")
-    print(f"  Converted:         {len(converted)}")
+    print(f"  Converted:         {len(converted) - skipped}")
+    print(f"  Up to date:        {skipped}")
+    print(f"  Shadowed:          {len(shadowed)}")
     print(f"  Failed:            {len(failed)}")
+    for backend, times in sorted(backend_times.items()):
+        print(f"  {backend + ':':<19}{len(times)} files, {sum(times):.2f}s total, "
+              f"{sum(times) / len(times) * 1000:.0f} ms avg")
     if not args.dry_run and converted:
         print(f"  texture_manifest:  {output_dir / 'texture_manifest.json'}")
         print(f"  assets_manifest:   {manifest_path}")
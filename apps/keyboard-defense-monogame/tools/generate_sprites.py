@@ -5,16 +5,29 @@ Generate procedural pixel-art PNG sprites for Keyboard Defense MonoGame.
 Uses Pillow to create simple but recognizable sprites for enemies, buildings,
 terrain tiles, and icons. No SVG conversion needed.
 
+Each sprite is keyed on a hash of its draw function's source, the shared
+rendering helpers and its size/frame parameters (cached in
+obj/generate_sprites_cache.json). Only sprites whose key changed are rendered,
+on a process pool, and PNGs and texture_manifest.json are rewritten only when
+their bytes change, so file mtimes stay stable for the content pipeline.
+
 Usage:
-    python tools/generate_sprites.py [--output DIR]
+    python tools/generate_sprites.py [--output DIR] [--jobs N] [--force]
 """
 
 import argparse
+import hashlib
+import inspect
+import io
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from PIL import Image, ImageDraw
 
+GENERATOR_VERSION = 1
+CACHE_VERSION = 1
+
 
 def make_pixel_image(size, draw_fn):
     """Create a pixel-art image at the given size."""
@@ -64,24 +77,70 @@ def make_sprite_sheet(size, draw_fn, frame_count=2, row_count=2):
     return sheet, animations
 
 
-def save_sprite(img, output_dir, category, name, animations=None):
-    """Save sprite and return manifest entry."""
-    cat_dir = output_dir / category
-    cat_dir.mkdir(parents=True, exist_ok=True)
-    path = cat_dir / f"{name}.png"
-    img.save(path, "PNG")
+def manifest_entry(category, name, width, height, animations=None):
+    """Return the texture_manifest entry for a sprite."""
     entry = {
         "id": name,
         "path": f"{category}/{name}.png",
         "category": category,
-        "width": img.width,
-        "height": img.height,
+        "width": width,
+        "height": height,
     }
     if animations:
         entry["animations"] = animations
     return entry
 
 
+def write_if_changed(path, data):
+    """Write bytes unless the file already holds them; returns True if written."""
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def sprite_key(draw_fn, size, frame_count, row_count):
+    """Hash of everything that determines a sprite's pixels."""
+    h = hashlib.sha256()
+    h.update(f"v{GENERATOR_VERSION}|{size}|{frame_count}|{row_count}\n".encode())
+    helpers = [make_pixel_image] if frame_count is None else [make_pixel_image, make_sprite_sheet]
+    for fn in [draw_fn, *helpers]:
+        h.update(inspect.getsource(fn).encode())
+    return h.hexdigest()
+
+
+def render_sprite(draw_fn, size, frame_count, row_count):
+    """Render one sprite (process pool worker); returns (png_bytes, w, h, animations)."""
+    if frame_count is None:
+        img, animations = make_pixel_image(size, draw_fn), None
+    else:
+        img, animations = make_sprite_sheet(size, draw_fn, frame_count=frame_count, row_count=row_count)
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue(), img.width, img.height, animations
+
+
+def load_cache(path):
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("sprites", {})
+
+
+def save_cache(path, sprites):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"version": CACHE_VERSION, "sprites": sprites}, f, indent=1)
+
+
 # =====================================================================
 # ENEMY SPRITES (32x32)
 # =====================================================================
@@ -593,67 +652,83 @@ ICONS = {
 }
 
 
+# (label, category, sprites, size, frame_count, row_count); frame_count None = single image
+SPRITE_GROUPS = [
+    # Enemies as 2-frame sprite sheets (64x64: 2 cols x 2 rows of 32x32)
+    ("Enemies", "sprites", ENEMIES, 32, 2, 2),
+    # Buildings as 2-frame sprite sheets (96x48: 2 cols x 1 row of 48x48)
+    ("Buildings", "sprites", BUILDINGS, 48, 2, 1),
+    # Terrain tiles (32x32)
+    ("Tiles", "tiles", TILES, 32, None, None),
+    # Icons (16x16)
+    ("Icons", "icons", ICONS, 16, None, None),
+]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate procedural sprites")
     parser.add_argument("--output", default=None, help="Output directory")
+    parser.add_argument("--jobs", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Render every sprite, ignoring the cache")
     args = parser.parse_args()
 
     # Script lives at apps/keyboard-defense-monogame/tools/generate_sprites.py
     # so parent.parent is already the monogame project root
     monogame_root = Path(__file__).parent.parent
     output_dir = Path(args.output) if args.output else monogame_root / "Content" / "Textures"
+    cache_path = monogame_root / "obj" / "generate_sprites_cache.json"
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    manifest_entries = []
-
-    # Generate enemies as 2-frame sprite sheets (64x64: 2 cols x 2 rows of 32x32)
-    print("Generating enemy sprite sheets...")
-    for name, draw_fn in ENEMIES.items():
-        sheet, anims = make_sprite_sheet(32, draw_fn, frame_count=2, row_count=2)
-        entry = save_sprite(sheet, output_dir, "sprites", name, animations=anims)
-        manifest_entries.append(entry)
-        print(f"  {name} -> {entry['path']} ({sheet.width}x{sheet.height})")
-
-    # Generate buildings as 2-frame sprite sheets (96x48: 2 cols x 1 row of 48x48)
-    print("Generating building sprite sheets...")
-    for name, draw_fn in BUILDINGS.items():
-        sheet, anims = make_sprite_sheet(48, draw_fn, frame_count=2, row_count=1)
-        entry = save_sprite(sheet, output_dir, "sprites", name, animations=anims)
-        manifest_entries.append(entry)
-        print(f"  {name} -> {entry['path']} ({sheet.width}x{sheet.height})")
-
-    # Generate terrain tiles (32x32)
-    print("Generating terrain tiles...")
-    for name, draw_fn in TILES.items():
-        img = make_pixel_image(32, draw_fn)
-        entry = save_sprite(img, output_dir, "tiles", name)
-        manifest_entries.append(entry)
-        print(f"  {name} -> {entry['path']}")
-
-    # Generate icons (16x16)
-    print("Generating icons...")
-    for name, draw_fn in ICONS.items():
-        img = make_pixel_image(16, draw_fn)
-        entry = save_sprite(img, output_dir, "icons", name)
-        manifest_entries.append(entry)
-        print(f"  {name} -> {entry['path']}")
-
-    # Write manifest
+    cache = {} if args.force else load_cache(cache_path)
+
+    # Cache entries are keyed by absolute output path so --output dirs don't collide
+    order = []
+    entries = {}
+    pending = []
+    for _label, category, sprites, size, frame_count, row_count in SPRITE_GROUPS:
+        for name, draw_fn in sprites.items():
+            path = output_dir / category / f"{name}.png"
+            cache_id = str(path.resolve())
+            key = sprite_key(draw_fn, size, frame_count, row_count)
+            order.append(cache_id)
+            cached = cache.get(cache_id)
+            if cached and cached["key"] == key and path.exists():
+                entries[cache_id] = cached["entry"]
+            else:
+                pending.append((cache_id, key, category, name, path, (draw_fn, size, frame_count, row_count)))
+
+    print(f"Rendering {len(pending)} of {len(order)} sprites ({len(order) - len(pending)} unchanged)...")
+    if len(pending) > 1 and args.jobs != 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            rendered = list(pool.map(render_sprite, *zip(*(job[5] for job in pending))))
+    else:
+        rendered = [render_sprite(*job[5]) for job in pending]
+
+    written = 0
+    for (cache_id, key, category, name, path, _), (png, width, height, anims) in zip(pending, rendered):
+        entry = manifest_entry(category, name, width, height, anims)
+        entries[cache_id] = entry
+        cache[cache_id] = {"key": key, "entry": entry}
+        changed = write_if_changed(path, png)
+        written += changed
+        print(f"  {name} -> {entry['path']} ({width}x{height}){'' if changed else ' (identical)'}")
+
+    manifest_entries = [entries[cache_id] for cache_id in order]
     manifest_path = output_dir / "texture_manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump({
-            "version": "1.0.0",
-            "generated": "procedural",
-            "textures": manifest_entries,
-        }, f, indent=2)
+    manifest_text = json.dumps({
+        "version": "1.0.0",
+        "generated": "procedural",
+        "textures": manifest_entries,
+    }, indent=2)
+    manifest_changed = write_if_changed(manifest_path, manifest_text.encode("utf-8"))
+    if pending:
+        save_cache(cache_path, cache)
 
     total = len(manifest_entries)
-    print(f"\nDone: {total} sprites generated")
-    print(f"  Enemies: {len(ENEMIES)}")
-    print(f"  Buildings: {len(BUILDINGS)}")
-    print(f"  Tiles: {len(TILES)}")
-    print(f"  Icons: {len(ICONS)}")
-    print(f"Manifest: {manifest_path}")
+    print(f"\nDone: {total} sprites ({len(pending)} rendered, {written} PNGs written)")
+    for label, _category, sprites, *_ in SPRITE_GROUPS:
+        print(f"  {label}: {len(sprites)}")
+    print(f"Manifest: {manifest_path}{'' if manifest_changed else ' (unchanged)'}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Losslessly shrink MonoGame textures by rewriting them as indexed PNGs.
+
+Most pixel-art textures use only a handful of colors but are saved as 32-bit
+RGBA. Every PNG with at most 256 distinct RGBA colors is re-encoded as a
+palette (color type 3) image with a tRNS chunk for alpha, at the smallest bit
+depth the palette allows. Several palette orders, row filters (None, Sub, Up,
+Average, Paeth, adaptive) and deflate strategies are tried and the smallest
+encoding wins. A file is only replaced when the result is smaller and decodes
+to exactly the same RGBA pixels. Images that had an alpha channel keep a tRNS
+chunk, so alpha_required checks still pass.
+
+Files are processed in parallel. A file that cannot be decoded or encoded is
+reported as skipped and the run continues. The summary reports bytes saved
+and the change in decode time (Pillow, best of several runs). Requires NumPy.
+
+Usage:
+    python tools/optimize_pngs.py
+    python tools/optimize_pngs.py --dry-run --report artifacts/summaries/png-optimize.json
+    python tools/optimize_pngs.py --textures Content/Textures/sprites --jobs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+PNG_SIG = b"\x89PNG\r\n\x1a\n"
+MAX_PALETTE = 256
+FILTER_NAMES = ("none", "sub", "up", "average", "paeth", "adaptive")
+DEFLATE_STRATEGIES = {
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "rle": zlib.Z_RLE,
+    "huffman": zlib.Z_HUFFMAN_ONLY,
+}
+DECODE_RUNS = 5
+# Raised by Pillow, zlib and the chunk packing for corrupt or unsupported files
+PNG_ERRORS = (OSError, SyntaxError, ValueError, struct.error, zlib.error, Image.DecompressionBombError)
+
+# ---------------------------------------------------------------------------
+# Palette
+# ---------------------------------------------------------------------------
+
+
+def exact_palette(rgba: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """Unique colors (n x 4), their pixel counts and the per-pixel index map.
+
+    Returns None when the image has more than MAX_PALETTE colors.
+    """
+    h, w, _ = rgba.shape
+    packed = np.ascontiguousarray(rgba).view(np.uint32).reshape(h, w)
+    colors, inverse, counts = np.unique(packed, return_inverse=True, return_counts=True)
+    if len(colors) > MAX_PALETTE:
+        return None
+    palette = colors.view(np.uint8).reshape(-1, 4)
+    return palette, counts, inverse.reshape(h, w)
+
+
+def palette_orders(palette: np.ndarray, counts: np.ndarray) -> list[np.ndarray]:
+    """Candidate palette orders; translucent entries always come first to keep tRNS short."""
+    opaque = palette[:, 3] == 255
+    by_count = np.lexsort((-counts, opaque))
+    luma = palette[:, 0].astype(np.int32) * 299 + palette[:, 1].astype(np.int32) * 587 \
+        + palette[:, 2].astype(np.int32) * 114
+    by_luma = np.lexsort((luma, opaque))
+    if np.array_equal(by_count, by_luma):
+        return [by_count]
+    return [by_count, by_luma]
+
+
+def bit_depth_for(colors: int) -> int:
+    for depth in (1, 2, 4):
+        if colors <= 1 << depth:
+            return depth
+    return 8
+
+
+def pack_rows(indices: np.ndarray, bit_depth: int) -> np.ndarray:
+    """Pack palette indices into scanline bytes (MSB first) at bit_depth."""
+    if bit_depth == 8:
+        return indices.astype(np.uint8)
+    h, w = indices.shape
+    per_byte = 8 // bit_depth
+    pad = (-w) % per_byte
+    if pad:
+        indices = np.pad(indices, ((0, 0), (0, pad)))
+    grouped = indices.astype(np.uint8).reshape(h, -1, per_byte)
+    shifts = (np.arange(per_byte - 1, -1, -1, dtype=np.uint8) * bit_depth)
+    # Bit fields never overlap, so the sum is the bitwise OR
+    return (grouped << shifts).sum(axis=2, dtype=np.uint8)
+
+
+# ---------------------------------------------------------------------------
+# Filters and PNG encoding
+# ---------------------------------------------------------------------------
+
+
+def filter_candidates(raw: np.ndarray, bpp: int) -> dict[str, np.ndarray]:
+    """Filtered scanlines (filter byte + data per row) for every filter choice.
+
+    Encoder-side filters only read unfiltered bytes, so each one is a
+    whole-image array operation.
+    """
+    a = np.zeros_like(raw)
+    a[:, bpp:] = raw[:, :-bpp]
+    b = np.zeros_like(raw)
+    b[1:] = raw[:-1]
+    c = np.zeros_like(raw)
+    c[1:, bpp:] = raw[:-1, :-bpp]
+
+    ai, bi, ci = a.astype(np.int16), b.astype(np.int16), c.astype(np.int16)
+    p = ai + bi - ci
+    pa, pb, pc = np.abs(p - ai), np.abs(p - bi), np.abs(p - ci)
+    paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+
+    filtered = [
+        raw,
+        raw - a,
+        raw - b,
+        raw - ((ai + bi) >> 1).astype(np.uint8),
+        raw - paeth,
+    ]
+    # Adaptive: per row, the filter with the smallest sum of absolute signed bytes
+    scores = np.stack([np.abs(f.view(np.int8).astype(np.int16)).sum(axis=1) for f in filtered])
+    choice = scores.argmin(axis=0)
+    adaptive = np.stack(filtered)[choice, np.arange(raw.shape[0])]
+
+    out: dict[str, np.ndarray] = {}
+    h = raw.shape[0]
+    for ftype, (name, data) in enumerate(zip(FILTER_NAMES, filtered + [adaptive])):
+        types = choice.astype(np.uint8) if name == "adaptive" else np.full(h, ftype, dtype=np.uint8)
+        out[name] = np.concatenate([types[:, None], data], axis=1)
+    return out
+
+
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def encode_indexed(width: int, height: int, bit_depth: int, palette: np.ndarray,
+                   trns: bytes | None, idat: bytes) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, bit_depth, 3, 0, 0, 0)
+    parts = [PNG_SIG, _chunk(b"IHDR", ihdr), _chunk(b"PLTE", palette[:, :3].tobytes())]
+    if trns is not None:
+        parts.append(_chunk(b"tRNS", trns))
+    parts += [_chunk(b"IDAT", idat), _chunk(b"IEND", b"")]
+    return b"".join(parts)
+
+
+def deflate(data: bytes, strategy: int) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+    return compressor.compress(data) + compressor.flush()
+
+
+def best_indexed_png(rgba: np.ndarray, keep_alpha: bool) -> tuple[bytes, dict] | None:
+    """Smallest exact indexed encoding of an RGBA image, or None if >256 colors."""
+    found = exact_palette(rgba)
+    if found is None:
+        return None
+    palette, counts, inverse = found
+    h, w, _ = rgba.shape
+    bit_depth = bit_depth_for(len(palette))
+
+    best: tuple[bytes, dict] | None = None
+    for order in palette_orders(palette, counts):
+        remap = np.empty(len(order), dtype=np.uint8)
+        remap[order] = np.arange(len(order), dtype=np.uint8)
+        ordered = palette[order]
+        translucent = int((ordered[:, 3] < 255).sum())
+        if translucent:
+            trns = ordered[:translucent, 3].tobytes()
+        else:
+            trns = b"\xff" if keep_alpha else None
+        header = encode_indexed(w, h, bit_depth, ordered, trns, b"")
+        raw = pack_rows(remap[inverse], bit_depth)
+        for filter_name, scanlines in filter_candidates(raw, 1).items():
+            data = scanlines.tobytes()
+            for strategy_name, strategy in DEFLATE_STRATEGIES.items():
+                idat = deflate(data, strategy)
+                if best is not None and len(header) + len(idat) >= len(best[0]):
+                    continue
+                png = encode_indexed(w, h, bit_depth, ordered, trns, idat)
+                best = (png, {
+                    "colors": len(palette),
+                    "bit_depth": bit_depth,
+                    "filter": filter_name,
+                    "strategy": strategy_name,
+                })
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Per-file worker
+# ---------------------------------------------------------------------------
+
+
+def decode_ms(data: bytes) -> float:
+    """Best-of-N Pillow decode time in milliseconds."""
+    best = float("inf")
+    for _ in range(DECODE_RUNS):
+        start = time.perf_counter()
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def evaluate_png(original: bytes, result: dict) -> tuple[dict, bytes | None]:
+    """Result for one file's bytes, plus the replacement PNG when it is smaller."""
+    if original[:8] != PNG_SIG or len(original) < 33:
+        return {**result, "status": "skipped", "reason": "not a PNG"}, None
+    if original[24] > 8:
+        return {**result, "status": "skipped", "reason": "16-bit samples"}, None
+
+    with Image.open(io.BytesIO(original)) as image:
+        keep_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        rgba = np.asarray(image.convert("RGBA"))
+
+    encoded = best_indexed_png(rgba, keep_alpha)
+    if encoded is None:
+        return {**result, "status": "skipped", "reason": f"more than {MAX_PALETTE} colors"}, None
+    png, info = encoded
+    result = {**result, **info}
+    if len(png) >= len(original):
+        return {**result, "status": "kept", "reason": "already smallest"}, None
+
+    with Image.open(io.BytesIO(png)) as check:
+        if not np.array_equal(np.asarray(check.convert("RGBA")), rgba):
+            return {**result, "status": "skipped", "reason": "round-trip mismatch"}, None
+
+    return {
+        **result,
+        "status": "optimized",
+        "after": len(png),
+        "decode_ms_before": decode_ms(original),
+        "decode_ms_after": decode_ms(png),
+    }, png
+
+
+def optimize_file(path_str: str, dry_run: bool) -> dict:
+    path = Path(path_str)
+    result = {"path": path_str, "before": 0, "after": 0}
+    try:
+        original = path.read_bytes()
+        result["before"] = result["after"] = len(original)
+        result, png = evaluate_png(original, result)
+    except PNG_ERRORS as e:
+        return {**result, "status": "skipped", "reason": "unreadable", "error": f"{type(e).__name__}: {e}"}
+    if png is not None and not dry_run:
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(png)
+        os.replace(tmp, path)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Rewrite pixel-art PNGs as smaller exact indexed PNGs.",
+    )
+    parser.add_argument(
+        "--textures", default=None,
+        help="Texture tree to optimize (default: Content/Textures)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None,
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Report savings without rewriting files",
+    )
+    parser.add_argument(
+        "--report", default=None,
+        help="Write per-file results and totals to this JSON path",
+    )
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        print("ERROR: NumPy is required (pip install numpy)")
+        return 1
+
+    monogame_root = Path(__file__).resolve().parent.parent
+    textures_dir = Path(args.textures).resolve() if args.textures else monogame_root / "Content" / "Textures"
+    if not textures_dir.is_dir():
+        print(f"ERROR: Texture directory not found: {textures_dir}")
+        return 1
+
+    files = sorted(str(p) for p in textures_dir.rglob("*.png"))
+    print("PNG optimizer for Keyboard Defense (MonoGame)")
+    print(f"  Textures: {textures_dir}")
+    print(f"  Files:    {len(files)}{' (dry run)' if args.dry_run else ''}")
+    print()
+
+    start = time.perf_counter()
+    if len(files) > 1 and args.jobs != 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(optimize_file, files, [args.dry_run] * len(files), chunksize=4))
+    else:
+        results = [optimize_file(f, args.dry_run) for f in files]
+
+    optimized = [r for r in results if r["status"] == "optimized"]
+    for r in optimized:
+        rel = Path(r["path"]).relative_to(textures_dir).as_posix()
+        print(f"  {rel:<48} {r['before']:>8} -> {r['after']:>8} bytes "
+              f"({r['colors']} colors, {r['bit_depth']}-bit, {r['filter']}/{r['strategy']})")
+    for r in results:
+        if "error" in r:
+            rel = Path(r["path"]).relative_to(textures_dir).as_posix()
+            print(f"  {rel:<48} skipped ({r['error']})")
+
+    before = sum(r["before"] for r in results)
+    after = sum(r["after"] for r in results)
+    decode_before = sum(r["decode_ms_before"] for r in optimized)
+    decode_after = sum(r["decode_ms_after"] for r in optimized)
+    skipped: dict[str, int] = {}
+    for r in results:
+        if r["status"] != "optimized":
+            skipped[r["reason"]] = skipped.get(r["reason"], 0) + 1
+    totals = {
+        "files": len(results),
+        "optimized": len(optimized),
+        "bytes_before": before,
+        "bytes_after": after,
+        "bytes_saved": before - after,
+        "decode_ms_before": round(decode_before, 3),
+        "decode_ms_after": round(decode_after, 3),
+        "unchanged": skipped,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+    if args.report:
+        report_path = Path(args.report)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps({"totals": totals, "files": results}, indent=2) + "\n",
+                               encoding="utf-8")
+
+    print()
+    print("=" * 60)
+    print(f"  Optimized:   {len(optimized)} of {len(results)} files")
+    for reason, count in sorted(skipped.items()):
+        print(f"  Unchanged:   {count} ({reason})")
+    saved_pct = (before - after) / before if before else 0.0
+    print(f"  Bytes saved: {before - after} ({saved_pct:.1%} of {before})")
+    print(f"  Decode time: {decode_before:.2f} ms -> {decode_after:.2f} ms (optimized files, Pillow)")
+    print(f"  Time:        {totals['seconds']:.2f}s")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
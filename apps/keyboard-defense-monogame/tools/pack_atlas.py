@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Pack MonoGame textures into per-category texture atlases.
+
+Every PNG under Content/Textures/<category>/ is split into frames (sprite
+sheets listed in texture_manifest.json are cut into one frame per clip row
+and column), identical frames are stored once, and each category is packed
+with MaxRects (no rotation) into power-of-two pages under Content/Textures/
+atlas/. The atlas manifest (texture_atlas.json, next to texture_manifest.json)
+maps every texture path to the page and pixel/UV rect of each frame.
+
+Repacking is incremental: a cache (obj/pack_atlas_cache.json) keeps each
+source file's frame hashes and each category's placements and free space.
+Unchanged frames keep their rects, new frames go into free space, and only
+pages whose contents changed are redrawn. Use --full to repack from scratch.
+
+Usage:
+    python tools/pack_atlas.py
+    python tools/pack_atlas.py --categories sprites icons --padding 2 --extrude 1
+    python tools/pack_atlas.py --max-size 1024 --full
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+ATLAS_VERSION = 1
+CACHE_VERSION = 1
+ATLAS_DIR_NAME = "atlas"
+MIN_PAGE_SIZE = 16
+
+Rect = tuple[int, int, int, int]  # x, y, w, h
+
+# ---------------------------------------------------------------------------
+# MaxRects bin
+# ---------------------------------------------------------------------------
+
+
+class MaxRectsBin:
+    """MaxRects bin packer (best short side fit, no rotation)."""
+
+    def __init__(self, width: int, height: int, free: list[Rect] | None = None):
+        self.width = width
+        self.height = height
+        self.free: list[Rect] = [tuple(r) for r in free] if free is not None else [(0, 0, width, height)]
+
+    def insert(self, w: int, h: int) -> tuple[int, int] | None:
+        """Place a w x h rect; returns its position or None if it does not fit."""
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                leftover = (min(fw - w, fh - h), max(fw - w, fh - h))
+                if best_score is None or leftover < best_score:
+                    best, best_score = (fx, fy), leftover
+        if best is not None:
+            self._split((best[0], best[1], w, h))
+        return best
+
+    def release(self, rect: Rect) -> None:
+        """Return a previously placed rect to the free space."""
+        self.free.append(tuple(rect))
+        self._prune()
+
+    def _split(self, used: Rect) -> None:
+        ux, uy, uw, uh = used
+        result = []
+        for free in self.free:
+            fx, fy, fw, fh = free
+            if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+                result.append(free)
+                continue
+            if ux > fx:
+                result.append((fx, fy, ux - fx, fh))
+            if ux + uw < fx + fw:
+                result.append((ux + uw, fy, fx + fw - ux - uw, fh))
+            if uy > fy:
+                result.append((fx, fy, fw, uy - fy))
+            if uy + uh < fy + fh:
+                result.append((fx, uy + uh, fw, fy + fh - uy - uh))
+        self.free = result
+        self._prune()
+
+    def _prune(self) -> None:
+        """Drop free rects contained in another free rect."""
+        free = sorted(set(self.free), key=lambda r: r[2] * r[3], reverse=True)
+        kept: list[Rect] = []
+        for x, y, w, h in free:
+            if not any(kx <= x and ky <= y and x + w <= kx + kw and y + h <= ky + kh
+                       for kx, ky, kw, kh in kept):
+                kept.append((x, y, w, h))
+        self.free = kept
+
+
+# ---------------------------------------------------------------------------
+# Packing
+# ---------------------------------------------------------------------------
+
+
+def page_sizes(max_size: int) -> list[tuple[int, int]]:
+    """Power-of-two page sizes up to max_size, smallest area first."""
+    sides = []
+    side = MIN_PAGE_SIZE
+    while side <= max_size:
+        sides.append(side)
+        side *= 2
+    sizes = [(w, h) for w in sides for h in sides if h <= w <= 2 * h]
+    return sorted(sizes, key=lambda s: (s[0] * s[1], s[0]))
+
+
+def slot_size(size: tuple[int, int], padding: int, extrude: int) -> tuple[int, int]:
+    """Atlas space a frame occupies: frame, extruded border and padding."""
+    return size[0] + 2 * extrude + padding, size[1] + 2 * extrude + padding
+
+
+def pack_category(frames: dict[str, tuple[int, int]], max_size: int,
+                  padding: int, extrude: int) -> tuple[list[dict], dict[str, list[int]]]:
+    """Pack unique frames (hash -> size) into as few, small pages as possible.
+
+    Returns (pages, placements): pages carry their size and free rects,
+    placements map frame hash -> [page, x, y].
+    """
+    slots = {h: slot_size(size, padding, extrude) for h, size in frames.items()}
+    remaining = sorted(slots, key=lambda h: (max(slots[h]), slots[h][0] * slots[h][1], h), reverse=True)
+    pages: list[dict] = []
+    placements: dict[str, list[int]] = {}
+    sizes = page_sizes(max_size)
+
+    while remaining:
+        area = sum(slots[h][0] * slots[h][1] for h in remaining)
+        widest = max(slots[h][0] for h in remaining)
+        tallest = max(slots[h][1] for h in remaining)
+        for width, height in sizes:
+            is_last = (width, height) == sizes[-1]
+            if (width < widest or height < tallest or width * height < area) and not is_last:
+                continue
+            bin_ = MaxRectsBin(width, height)
+            placed, left = {}, []
+            for h in remaining:
+                pos = bin_.insert(*slots[h])
+                if pos is None:
+                    left.append(h)
+                else:
+                    placed[h] = pos
+            if not left or is_last:
+                break
+        if not placed:
+            raise ValueError("frame larger than the maximum page size")
+        page = len(pages)
+        pages.append({"width": width, "height": height, "free": bin_.free})
+        for h, (x, y) in placed.items():
+            placements[h] = [page, x, y]
+        remaining = left
+    return pages, placements
+
+
+def repack_category(frames: dict[str, tuple[int, int]], previous: dict | None, max_size: int,
+                    padding: int, extrude: int) -> tuple[list[dict], dict[str, list[int]], bool]:
+    """Update a previous packing in place; returns (pages, placements, incremental).
+
+    Frames still present keep their rects, removed frames free theirs and new
+    frames go into free space. Pages left empty are dropped and the remaining
+    pages renumbered. If a new frame does not fit, the category is packed
+    from scratch.
+    """
+    if previous:
+        bins = [MaxRectsBin(p["width"], p["height"], p["free"]) for p in previous["pages"]]
+        placements = {}
+        for h, (page, x, y) in previous["placements"].items():
+            if h in frames:
+                placements[h] = [page, x, y]
+            else:
+                bins[page].release((x, y) + slot_size(previous["sizes"][h], padding, extrude))
+        added = sorted((h for h in frames if h not in placements),
+                       key=lambda h: (max(frames[h]), frames[h][0] * frames[h][1], h), reverse=True)
+        for h in added:
+            slot = slot_size(frames[h], padding, extrude)
+            for page, bin_ in enumerate(bins):
+                pos = bin_.insert(*slot)
+                if pos is not None:
+                    placements[h] = [page, pos[0], pos[1]]
+                    break
+            else:
+                break
+        else:
+            used = sorted({page for page, _, _ in placements.values()})
+            renumber = {old: new for new, old in enumerate(used)}
+            placements = {h: [renumber[page], x, y] for h, (page, x, y) in placements.items()}
+            pages = [{"width": bins[n].width, "height": bins[n].height, "free": bins[n].free} for n in used]
+            return pages, placements, True
+    pages, placements = pack_category(frames, max_size, padding, extrude)
+    return pages, placements, False
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+
+def load_texture_manifest(textures_dir: Path) -> dict[str, dict]:
+    """texture_manifest.json entries by texture path."""
+    try:
+        with open(textures_dir / "texture_manifest.json", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {t["path"]: t for t in manifest.get("textures", []) if isinstance(t, dict) and "path" in t}
+
+
+def frame_grid(entry: dict | None, width: int, height: int) -> tuple[int, int]:
+    """(columns, rows) of a sprite sheet: one row per clip, as AssetLoader reads it."""
+    animations = (entry or {}).get("animations")
+    if not isinstance(animations, dict) or not animations:
+        return 1, 1
+    rows = len(animations)
+    columns = max((int(clip.get("frames", 1)) for clip in animations.values() if isinstance(clip, dict)),
+                  default=1)
+    if columns < 1 or width % columns or height % rows:
+        return 1, 1
+    return columns, rows
+
+
+def split_frames(image: Image.Image, columns: int, rows: int) -> list[Image.Image]:
+    """Cut a sheet into frames, row by row."""
+    fw, fh = image.width // columns, image.height // rows
+    return [image.crop((c * fw, r * fh, (c + 1) * fw, (r + 1) * fh))
+            for r in range(rows) for c in range(columns)]
+
+
+def frame_hash(frame: Image.Image) -> str:
+    digest = hashlib.sha1(f"{frame.width}x{frame.height}:".encode("ascii"))
+    digest.update(frame.tobytes())
+    return digest.hexdigest()
+
+
+def scan_sources(textures_dir: Path, categories: list[str] | None, manifest: dict[str, dict],
+                 cached: dict[str, dict]) -> dict[str, dict]:
+    """Source PNGs by texture path with their frame hashes.
+
+    Files whose size, mtime and frame grid match the cache are not decoded.
+    """
+    sources = {}
+    for png in sorted(textures_dir.rglob("*.png")):
+        rel = png.relative_to(textures_dir).as_posix()
+        category = rel.split("/")[0] if "/" in rel else "misc"
+        if category == ATLAS_DIR_NAME or (categories and category not in categories):
+            continue
+        stat = png.stat()
+        entry = manifest.get(rel)
+        old = cached.get(rel)
+        if (old and old["size"] == stat.st_size and old["mtime"] == stat.st_mtime_ns
+                and old["animations"] == (entry or {}).get("animations")):
+            sources[rel] = old
+            continue
+        with Image.open(png) as img:
+            image = img.convert("RGBA")
+        columns, rows = frame_grid(entry, image.width, image.height)
+        frames = split_frames(image, columns, rows)
+        sources[rel] = {
+            "id": (entry or {}).get("id", png.stem),
+            "category": category,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "animations": (entry or {}).get("animations"),
+            "columns": columns,
+            "rows": rows,
+            "frame_size": [frames[0].width, frames[0].height],
+            "frames": [frame_hash(f) for f in frames],
+        }
+    return sources
+
+
+# ---------------------------------------------------------------------------
+# Page rendering
+# ---------------------------------------------------------------------------
+
+
+def paste_extruded(page: Image.Image, frame: Image.Image, x: int, y: int, extrude: int) -> None:
+    """Paste a frame at (x + extrude, y + extrude) and repeat its edge pixels outward."""
+    w, h = frame.size
+    page.paste(frame, (x + extrude, y + extrude))
+    if not extrude:
+        return
+    e = extrude
+    page.paste(frame.crop((0, 0, w, 1)).resize((w, e)), (x + e, y))
+    page.paste(frame.crop((0, h - 1, w, h)).resize((w, e)), (x + e, y + e + h))
+    page.paste(frame.crop((0, 0, 1, h)).resize((e, h)), (x, y + e))
+    page.paste(frame.crop((w - 1, 0, w, h)).resize((e, h)), (x + e + w, y + e))
+    for cx, cy, px, py in ((0, 0, x, y), (w - 1, 0, x + e + w, y),
+                           (0, h - 1, x, y + e + h), (w - 1, h - 1, x + e + w, y + e + h)):
+        page.paste(frame.crop((cx, cy, cx + 1, cy + 1)).resize((e, e)), (px, py))
+
+
+def page_signature(page: dict, contents: list[tuple[str, int, int]], padding: int, extrude: int) -> str:
+    """Hash of everything that determines a page's pixels."""
+    digest = hashlib.sha1(f"{page['width']}x{page['height']}:{padding}:{extrude}".encode("ascii"))
+    for h, x, y in sorted(contents):
+        digest.update(f"{h}@{x},{y};".encode("ascii"))
+    return digest.hexdigest()
+
+
+def render_page(page: dict, contents: list[tuple[str, int, int]], frame_sources: dict[str, tuple[str, int]],
+                sources: dict[str, dict], textures_dir: Path, extrude: int) -> Image.Image:
+    """Draw one atlas page from its source frames."""
+    image = Image.new("RGBA", (page["width"], page["height"]), (0, 0, 0, 0))
+    sheets: dict[str, list[Image.Image]] = {}
+    for h, x, y in contents:
+        rel, index = frame_sources[h]
+        if rel not in sheets:
+            src = sources[rel]
+            with Image.open(textures_dir / rel) as img:
+                sheets[rel] = split_frames(img.convert("RGBA"), src["columns"], src["rows"])
+        paste_extruded(image, sheets[rel][index], x, y, extrude)
+    return image
+
+
+# ---------------------------------------------------------------------------
+# Cache and manifest
+# ---------------------------------------------------------------------------
+
+
+def load_cache(path: Path, options: dict) -> dict:
+    """The packing cache, or an empty one if missing or built with other options."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        cache = {}
+    if cache.get("version") != CACHE_VERSION:
+        return {"sources": {}, "categories": {}}
+    if cache.get("options") != options:
+        cache["categories"] = {}
+    return cache
+
+
+def save_cache(path: Path, options: dict, sources: dict, categories: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "options": options,
+                   "sources": sources, "categories": categories}, f, indent=1, sort_keys=True)
+
+
+def build_atlas_manifest(sources: dict[str, dict], categories: dict[str, dict],
+                         unpacked: list[str], padding: int, extrude: int) -> dict:
+    pages = []
+    page_index: dict[tuple[str, int], int] = {}
+    for category in sorted(categories):
+        for n, page in enumerate(categories[category]["pages"]):
+            page_index[(category, n)] = len(pages)
+            pages.append({
+                "file": f"{ATLAS_DIR_NAME}/{category}_{n}.png",
+                "category": category,
+                "width": page["width"],
+                "height": page["height"],
+            })
+
+    textures = []
+    for rel, src in sources.items():
+        packed = categories.get(src["category"])
+        if packed is None or rel in unpacked:
+            continue
+        fw, fh = src["frame_size"]
+        frames = []
+        for h in src["frames"]:
+            n, x, y = packed["placements"][h]
+            page = pages[page_index[(src["category"], n)]]
+            fx, fy = x + extrude, y + extrude
+            frames.append({
+                "page": page_index[(src["category"], n)],
+                "x": fx, "y": fy, "w": fw, "h": fh,
+                "u0": round(fx / page["width"], 6),
+                "v0": round(fy / page["height"], 6),
+                "u1": round((fx + fw) / page["width"], 6),
+                "v1": round((fy + fh) / page["height"], 6),
+            })
+        entry = {
+            "id": src["id"],
+            "path": rel,
+            "category": src["category"],
+            "columns": src["columns"],
+            "rows": src["rows"],
+            "frames": frames,
+        }
+        if src["animations"]:
+            entry["animations"] = src["animations"]
+        textures.append(entry)
+
+    return {
+        "version": ATLAS_VERSION,
+        "generated": "pack_atlas",
+        "padding": padding,
+        "extrude": extrude,
+        "pages": pages,
+        "textures": textures,
+        "unpacked": unpacked,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Pack MonoGame textures into per-category atlases.",
+    )
+    parser.add_argument(
+        "--textures", default=None,
+        help="Texture root to pack (default: Content/Textures)",
+    )
+    parser.add_argument(
+        "--categories", nargs="+", default=None,
+        help="Categories (top-level texture folders) to pack (default: all)",
+    )
+    parser.add_argument(
+        "--max-size", type=int, default=2048,
+        help="Maximum page width/height, a power of two (default: 2048)",
+    )
+    parser.add_argument(
+        "--padding", type=int, default=2,
+        help="Transparent pixels between frames (default: 2)",
+    )
+    parser.add_argument(
+        "--extrude", type=int, default=1,
+        help="Pixels of edge repeated around each frame (default: 1)",
+    )
+    parser.add_argument(
+        "--cache", default=None,
+        help="Packing cache path (default: obj/pack_atlas_cache.json)",
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Ignore previous placements and repack every category.",
+    )
+    args = parser.parse_args()
+
+    if args.max_size < MIN_PAGE_SIZE or args.max_size & (args.max_size - 1):
+        print(f"ERROR: --max-size must be a power of two >= {MIN_PAGE_SIZE}")
+        return 1
+    if args.padding < 0 or args.extrude < 0:
+        print("ERROR: --padding and --extrude must not be negative")
+        return 1
+
+    monogame_root = Path(__file__).resolve().parent.parent
+    textures_dir = Path(args.textures).resolve() if args.textures else monogame_root / "Content" / "Textures"
+    cache_path = Path(args.cache).resolve() if args.cache else monogame_root / "obj" / "pack_atlas_cache.json"
+    atlas_dir = textures_dir / ATLAS_DIR_NAME
+    if not textures_dir.is_dir():
+        print(f"ERROR: Texture directory not found: {textures_dir}")
+        return 1
+
+    start = time.perf_counter()
+    options = {"max_size": args.max_size, "padding": args.padding, "extrude": args.extrude}
+    cache = load_cache(cache_path, options)
+    if args.full:
+        cache["categories"] = {}
+    manifest = load_texture_manifest(textures_dir)
+    sources = scan_sources(textures_dir, args.categories, manifest, cache["sources"])
+    if args.categories:
+        # Keep the other categories' sources so the manifest stays complete
+        for rel, src in cache["sources"].items():
+            if src["category"] not in args.categories and (textures_dir / rel).exists():
+                sources.setdefault(rel, src)
+
+    print("Texture atlas packer for Keyboard Defense (MonoGame)")
+    print(f"  Textures: {textures_dir}")
+    print(f"  Pages:    {atlas_dir}")
+    print(f"  Options:  max {args.max_size}px, padding {args.padding}, extrude {args.extrude}")
+    print()
+
+    categories: dict[str, dict] = {}
+    unpacked: list[str] = []
+    pages_written = pages_kept = 0
+    limit = args.max_size
+    by_category: dict[str, list[str]] = {}
+    for rel, src in sources.items():
+        slot = slot_size(tuple(src["frame_size"]), args.padding, args.extrude)
+        if slot[0] > limit or slot[1] > limit:
+            unpacked.append(rel)
+        else:
+            by_category.setdefault(src["category"], []).append(rel)
+
+    for category in sorted(by_category):
+        previous = cache["categories"].get(category)
+        if args.categories and category not in args.categories and previous:
+            categories[category] = previous
+            continue
+
+        # Unique frames: hash -> size, and where to read each one from
+        frames: dict[str, tuple[int, int]] = {}
+        frame_sources: dict[str, tuple[str, int]] = {}
+        total_frames = 0
+        for rel in by_category[category]:
+            src = sources[rel]
+            for index, h in enumerate(src["frames"]):
+                total_frames += 1
+                frames.setdefault(h, tuple(src["frame_size"]))
+                frame_sources.setdefault(h, (rel, index))
+
+        pages, placements, incremental = repack_category(
+            frames, previous, args.max_size, args.padding, args.extrude)
+
+        old_signatures = previous["signatures"] if previous and incremental else []
+        signatures = []
+        for n, page in enumerate(pages):
+            contents = [(h, x, y) for h, (p, x, y) in placements.items() if p == n]
+            signature = page_signature(page, contents, args.padding, args.extrude)
+            signatures.append(signature)
+            page_path = atlas_dir / f"{category}_{n}.png"
+            if n < len(old_signatures) and old_signatures[n] == signature and page_path.exists():
+                pages_kept += 1
+                continue
+            image = render_page(page, contents, frame_sources, sources, textures_dir, args.extrude)
+            atlas_dir.mkdir(parents=True, exist_ok=True)
+            image.save(page_path, "PNG", optimize=True)
+            pages_written += 1
+
+        categories[category] = {
+            "pages": pages,
+            "placements": placements,
+            "sizes": {h: list(size) for h, size in frames.items()},
+            "signatures": signatures,
+        }
+        used = sum(slot_size(s, args.padding, args.extrude)[0] * slot_size(s, args.padding, args.extrude)[1]
+                   for s in frames.values())
+        area = sum(p["width"] * p["height"] for p in pages)
+        sizes = ", ".join(f"{p['width']}x{p['height']}" for p in pages)
+        print(f"  {category:<14} {len(by_category[category]):>4} textures, {total_frames:>4} frames "
+              f"({total_frames - len(frames)} duplicate) -> {len(pages)} page(s) [{sizes}], "
+              f"{used / area:.0%} used{' (incremental)' if incremental else ''}")
+
+    # Remove pages left over from a larger previous packing or a removed category
+    expected = {f"{category}_{n}.png" for category, packed in categories.items()
+                for n in range(len(packed["pages"]))}
+    pages_removed = 0
+    if atlas_dir.is_dir():
+        for page_path in sorted(atlas_dir.glob("*_*.png")):
+            if page_path.name not in expected and page_path.stem.rpartition("_")[2].isdigit():
+                page_path.unlink()
+                pages_removed += 1
+
+    atlas_manifest = build_atlas_manifest(sources, categories, sorted(unpacked), args.padding, args.extrude)
+    manifest_path = textures_dir / "texture_atlas.json"
+    text = json.dumps(atlas_manifest, indent=2) + "\n"
+    try:
+        changed = manifest_path.read_text(encoding="utf-8") != text
+    except OSError:
+        changed = True
+    if changed:
+        manifest_path.write_text(text, encoding="utf-8")
+    save_cache(cache_path, options, sources, categories)
+
+    print()
+    print("=" * 60)
+    print(f"  Pages written:     {pages_written}")
+    print(f"  Pages unchanged:   {pages_kept}")
+    if pages_removed:
+        print(f"  Pages removed:     {pages_removed}")
+    if unpacked:
+        print(f"  Too large to pack: {len(unpacked)} ({', '.join(unpacked)})")
+    print(f"  Atlas manifest:    {manifest_path}{'' if changed else ' (unchanged)'}")
+    print(f"  Time:              {time.perf_counter() - start:.2f}s")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
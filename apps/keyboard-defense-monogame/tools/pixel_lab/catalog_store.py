@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed store for Pixel Lab catalog manifests.
+
+Assets are stored as their JSON document plus indexed columns for id,
+output.relative_path, category, source.provider and tags, so lookups and
+upserts stay cheap as the catalog grows. The JSON manifest remains the
+source of truth in git; the store imports and exports the same schema.
+
+Usage:
+    python tools/pixel_lab/catalog_store.py --db obj/pixel_lab_catalog.sqlite \
+        --import-json data/pixel_lab_manifest.catalog.json
+    python tools/pixel_lab/catalog_store.py --db obj/pixel_lab_catalog.sqlite \
+        --category sprites --tag runtime_curated
+    python tools/pixel_lab/catalog_store.py --db obj/pixel_lab_catalog.sqlite \
+        --export-json data/pixel_lab_manifest.catalog.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+SCHEMA_VERSION = 1
+# SQLite's default limit on bound parameters is 999 on older builds.
+BATCH_SIZE = 500
+
+Prefer = Callable[[dict[str, Any], dict[str, Any]], dict[str, Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assets (
+    id TEXT PRIMARY KEY,
+    relative_path TEXT,
+    category TEXT,
+    provider TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assets_relative_path ON assets(relative_path);
+CREATE INDEX IF NOT EXISTS assets_category ON assets(category);
+CREATE INDEX IF NOT EXISTS assets_provider ON assets(provider);
+CREATE TABLE IF NOT EXISTS asset_tags (
+    tag TEXT NOT NULL,
+    asset_id TEXT NOT NULL REFERENCES assets(id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, asset_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS asset_tags_asset ON asset_tags(asset_id);
+"""
+
+
+def _load_json(path: Path) -> Any:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+
+
+def _row(asset: dict[str, Any]) -> tuple[str, str | None, str | None, str | None, str]:
+    output = asset.get("output")
+    source = asset.get("source")
+    rel_path = output.get("relative_path") if isinstance(output, dict) else None
+    provider = source.get("provider") if isinstance(source, dict) else None
+    category = asset.get("category")
+    return (
+        asset["id"],
+        rel_path if isinstance(rel_path, str) else None,
+        category if isinstance(category, str) else None,
+        provider if isinstance(provider, str) else None,
+        json.dumps(asset, separators=(",", ":")),
+    )
+
+
+def _tags(asset: dict[str, Any]) -> set[str]:
+    tags = asset.get("tags")
+    if not isinstance(tags, list):
+        return set()
+    return {tag for tag in tags if isinstance(tag, str)}
+
+
+def _batches(items: list[Any]) -> Iterable[list[Any]]:
+    for start in range(0, len(items), BATCH_SIZE):
+        yield items[start:start + BATCH_SIZE]
+
+
+class CatalogStore:
+    """Catalog assets in SQLite, keyed by id with secondary indexes.
+
+    `path` may be ":memory:" for a throwaway store. Writes are committed per
+    call; use the store as a context manager to close the connection.
+    """
+
+    def __init__(self, path: Path | str = ":memory:") -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        version = self._meta("schema_version")
+        if version is None:
+            self._set_meta("schema_version", str(SCHEMA_VERSION))
+            self._conn.commit()
+        elif version != str(SCHEMA_VERSION):
+            raise ValueError(f"Unsupported catalog store schema version {version}")
+
+    @classmethod
+    def from_manifest(
+        cls,
+        manifest: dict[str, Any],
+        path: Path | str = ":memory:",
+        prefer: Prefer | None = None,
+    ) -> CatalogStore:
+        store = cls(path)
+        store.import_manifest(manifest, prefer)
+        return store
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> CatalogStore:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+
+    def __contains__(self, aid: object) -> bool:
+        return self._conn.execute("SELECT 1 FROM assets WHERE id = ?", (aid,)).fetchone() is not None
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    # -- import / export ------------------------------------------------
+
+    def import_manifest(self, manifest: dict[str, Any], prefer: Prefer | None = None) -> int:
+        """Upsert every asset of a catalog manifest; returns the number stored."""
+        assets = manifest.get("assets", [])
+        if not isinstance(assets, list):
+            raise ValueError("Catalog assets must be an array")
+        with self._conn:
+            self._set_meta("version", str(manifest.get("version", "1.0.0")))
+            return self._upsert_many(assets, prefer)
+
+    def export_manifest(self) -> dict[str, Any]:
+        """Catalog manifest with assets sorted by id, as the JSON tools write it."""
+        return {
+            "version": self._meta("version") or "1.0.0",
+            "generated_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "assets": self._docs("SELECT doc FROM assets ORDER BY id"),
+        }
+
+    # -- writes -----------------------------------------------------------
+
+    def upsert(self, asset: dict[str, Any], prefer: Prefer | None = None) -> bool:
+        """Insert or replace one asset; False when `prefer` kept the existing one.
+
+        With `prefer`, an existing asset with the same id is kept when
+        `prefer(existing, asset)` returns it.
+        """
+        aid = asset.get("id") if isinstance(asset, dict) else None
+        if not isinstance(aid, str) or not aid:
+            raise ValueError("Asset must be an object with a non-empty string id")
+        with self._conn:
+            return self._upsert_many([asset], prefer) == 1
+
+    def upsert_many(self, assets: Iterable[dict[str, Any]], prefer: Prefer | None = None) -> int:
+        """Upsert assets in one transaction; returns the number of distinct ids written."""
+        with self._conn:
+            return self._upsert_many(list(assets), prefer)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        ids = list(ids)
+        removed = 0
+        with self._conn:
+            for batch in _batches(ids):
+                marks = ",".join("?" * len(batch))
+                removed += self._conn.execute(f"DELETE FROM assets WHERE id IN ({marks})", batch).rowcount
+        return removed
+
+    def _upsert_many(self, assets: list[Any], prefer: Prefer | None) -> int:
+        incoming: dict[str, dict[str, Any]] = {}
+        for asset in assets:
+            if not isinstance(asset, dict):
+                continue
+            aid = asset.get("id")
+            if not isinstance(aid, str) or not aid:
+                continue
+            current = incoming.get(aid)
+            if current is not None and prefer is not None:
+                asset = prefer(current, asset)
+            incoming[aid] = asset
+        if not incoming:
+            return 0
+
+        if prefer is not None:
+            for aid, existing in self._get_many(list(incoming)).items():
+                winner = prefer(existing, incoming[aid])
+                if winner is existing:
+                    del incoming[aid]
+                else:
+                    incoming[aid] = winner
+
+        ids = list(incoming)
+        self._conn.executemany(
+            "INSERT INTO assets(id, relative_path, category, provider, doc) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET relative_path = excluded.relative_path, "
+            "category = excluded.category, provider = excluded.provider, doc = excluded.doc",
+            (_row(incoming[aid]) for aid in ids),
+        )
+        for batch in _batches(ids):
+            marks = ",".join("?" * len(batch))
+            self._conn.execute(f"DELETE FROM asset_tags WHERE asset_id IN ({marks})", batch)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO asset_tags(tag, asset_id) VALUES (?, ?)",
+            ((tag, aid) for aid in ids for tag in _tags(incoming[aid])),
+        )
+        return len(ids)
+
+    # -- reads ------------------------------------------------------------
+
+    def _docs(self, sql: str, params: Iterable[Any] = ()) -> list[dict[str, Any]]:
+        return [json.loads(doc) for (doc,) in self._conn.execute(sql, tuple(params))]
+
+    def _get_many(self, ids: list[str]) -> dict[str, dict[str, Any]]:
+        found: dict[str, dict[str, Any]] = {}
+        for batch in _batches(ids):
+            marks = ",".join("?" * len(batch))
+            for aid, doc in self._conn.execute(f"SELECT id, doc FROM assets WHERE id IN ({marks})", batch):
+                found[aid] = json.loads(doc)
+        return found
+
+    def get(self, aid: str) -> dict[str, Any] | None:
+        row = self._conn.execute("SELECT doc FROM assets WHERE id = ?", (aid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def ids(self) -> list[str]:
+        return [aid for (aid,) in self._conn.execute("SELECT id FROM assets ORDER BY id")]
+
+    def query(
+        self,
+        *,
+        category: str | None = None,
+        provider: str | None = None,
+        tag: str | None = None,
+        relative_path: str | None = None,
+        ids: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Assets matching every given filter, sorted by id."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in (
+            ("category", category),
+            ("provider", provider),
+            ("relative_path", relative_path),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if tag is not None:
+            clauses.append("id IN (SELECT asset_id FROM asset_tags WHERE tag = ?)")
+            params.append(tag)
+        if ids is not None:
+            # A temp table avoids the bound-parameter limit for large id sets.
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS query_ids (id TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM query_ids")
+            self._conn.executemany("INSERT OR IGNORE INTO query_ids(id) VALUES (?)", ((aid,) for aid in ids))
+            clauses.append("id IN (SELECT id FROM query_ids)")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._docs(f"SELECT doc FROM assets{where} ORDER BY id", params)
+
+    def path_conflicts(self) -> dict[str, list[str]]:
+        """relative_path -> ids (sorted) for paths claimed by more than one asset."""
+        conflicts: dict[str, list[str]] = {}
+        for rel_path, aid in self._conn.execute(
+            "SELECT relative_path, id FROM assets WHERE relative_path IN ("
+            "SELECT relative_path FROM assets WHERE relative_path IS NOT NULL AND relative_path != '' "
+            "GROUP BY relative_path HAVING COUNT(*) > 1) ORDER BY relative_path, id"
+        ):
+            conflicts.setdefault(rel_path, []).append(aid)
+        return conflicts
+
+    def counts(self, column: str) -> dict[str, int]:
+        """Asset counts grouped by "category", "provider" or "tag"."""
+        if column == "tag":
+            sql = "SELECT tag, COUNT(*) FROM asset_tags GROUP BY tag ORDER BY tag"
+        elif column in ("category", "provider"):
+            sql = f"SELECT {column}, COUNT(*) FROM assets GROUP BY {column} ORDER BY {column}"
+        else:
+            raise ValueError(f"Cannot count by {column!r}")
+        return {str(key): count for key, count in self._conn.execute(sql)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import, query and export the Pixel Lab catalog store")
+    parser.add_argument("--db", required=True, help="Path to the SQLite catalog store")
+    parser.add_argument("--import-json", default=None, help="Upsert assets from a catalog manifest")
+    parser.add_argument("--export-json", default=None, help="Write the store as a catalog manifest")
+    parser.add_argument("--category", default=None, help="Query: filter by category")
+    parser.add_argument("--provider", default=None, help="Query: filter by source.provider")
+    parser.add_argument("--tag", default=None, help="Query: filter by tag")
+    parser.add_argument("--path", default=None, help="Query: filter by output.relative_path")
+    parser.add_argument("--stats", action="store_true", help="Print counts by category, provider and tag")
+    args = parser.parse_args()
+
+    with CatalogStore(Path(args.db)) as store:
+        if args.import_json:
+            manifest = _load_json(Path(args.import_json))
+            if not isinstance(manifest, dict):
+                raise ValueError("Catalog manifest root must be an object")
+            written = store.import_manifest(manifest)
+            print(f"Imported {written} assets into {args.db} ({len(store)} total)")
+
+        if any(v is not None for v in (args.category, args.provider, args.tag, args.path)):
+            for asset in store.query(
+                category=args.category,
+                provider=args.provider,
+                tag=args.tag,
+                relative_path=args.path,
+            ):
+                output = asset.get("output")
+                rel_path = output.get("relative_path", "") if isinstance(output, dict) else ""
+                print(f"{asset['id']}\t{rel_path}")
+
+        if args.stats:
+            for column in ("category", "provider", "tag"):
+                print(f"{column}:")
+                for key, count in store.counts(column).items():
+                    print(f"  {key}: {count}")
+
+        if args.export_json:
+            manifest = store.export_manifest()
+            _write_json(Path(args.export_json), manifest)
+            print(f"Exported {len(manifest['assets'])} assets to {args.export_json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
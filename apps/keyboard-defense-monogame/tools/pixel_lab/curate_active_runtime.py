@@ -206,27 +206,17 @@ def _build_or_update_asset(
     return asset
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Curate active runtime + catalog manifests from runtime texture usage"
-    )
-    parser.add_argument("--catalog", required=True, help="Path to catalog manifest")
-    parser.add_argument("--runtime-texture-manifest", required=True, help="Path to runtime texture_manifest.json")
-    parser.add_argument("--textures-root", required=True, help="Path to Content/Textures")
-    parser.add_argument("--out-catalog", required=True, help="Output path for updated catalog manifest")
-    parser.add_argument("--out-active", required=True, help="Output path for active runtime manifest")
-    args = parser.parse_args()
-
-    catalog_path = Path(args.catalog)
-    runtime_manifest_path = Path(args.runtime_texture_manifest)
-    textures_root = Path(args.textures_root).resolve()
-
-    catalog = _load_json(catalog_path)
-    runtime_manifest = _load_json(runtime_manifest_path)
+def curate(
+    catalog: dict[str, Any],
+    runtime_manifest: dict[str, Any],
+    textures_root: Path,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return (catalog_payload, active_payload) curated from runtime texture usage."""
     if not isinstance(catalog, dict):
         raise ValueError("Catalog manifest root must be an object")
     if not isinstance(runtime_manifest, dict):
         raise ValueError("Runtime texture manifest root must be an object")
+    textures_root = textures_root.resolve()
 
     catalog_assets = catalog.get("assets", [])
     if not isinstance(catalog_assets, list):
@@ -298,12 +288,34 @@ def main() -> int:
         "assets": curated_active,
     }
 
+    return out_catalog_payload, out_active_payload
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Curate active runtime + catalog manifests from runtime texture usage"
+    )
+    parser.add_argument("--catalog", required=True, help="Path to catalog manifest")
+    parser.add_argument("--runtime-texture-manifest", required=True, help="Path to runtime texture_manifest.json")
+    parser.add_argument("--textures-root", required=True, help="Path to Content/Textures")
+    parser.add_argument("--out-catalog", required=True, help="Output path for updated catalog manifest")
+    parser.add_argument("--out-active", required=True, help="Output path for active runtime manifest")
+    args = parser.parse_args()
+
+    catalog_path = Path(args.catalog)
+    runtime_manifest_path = Path(args.runtime_texture_manifest)
+    textures_root = Path(args.textures_root)
+
+    catalog = _load_json(catalog_path)
+    runtime_manifest = _load_json(runtime_manifest_path)
+    out_catalog_payload, out_active_payload = curate(catalog, runtime_manifest, textures_root)
+
     _write_json(Path(args.out_catalog), out_catalog_payload)
     _write_json(Path(args.out_active), out_active_payload)
 
     print(
-        f"Curated runtime manifests: active={len(curated_active)} "
-        f"catalog={len(merged_catalog)}"
+        f"Curated runtime manifests: active={len(out_active_payload['assets'])} "
+        f"catalog={len(out_catalog_payload['assets'])}"
     )
     return 0
 
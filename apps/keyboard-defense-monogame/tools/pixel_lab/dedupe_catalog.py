@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
 """
 Deduplicate Pixel Lab catalog manifest by asset id and output.relative_path.
+
+With --store, the dedupe runs in a SQLite catalog store (see catalog_store.py)
+instead of in memory. The store is refreshed from the catalog, deduplicated in
+place and exported; the output is the same as without it.
+
+With --perceptual, also finds exact and near-duplicate images across all
+catalog assets (see perceptual_index.py) and reports each group with a
+suggested canonical asset. Those groups are reported, not removed.
 """
 
 from __future__ import annotations
@@ -12,6 +20,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from catalog_store import CatalogStore
+from perceptual_index import find_duplicate_groups, hash_assets, load_hash_cache, save_hash_cache
+
+DEFAULT_HASH_CACHE = Path(__file__).resolve().parents[2] / "obj" / "pixel_lab_image_hashes.json"
+
 
 def _load_json(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as f:
@@ -66,10 +79,7 @@ def dedupe(catalog: dict[str, Any]) -> tuple[dict[str, Any], int]:
         if not isinstance(aid, str) or not aid:
             continue
         existing = by_id.get(aid)
-        if existing is None:
-            by_id[aid] = copy.deepcopy(asset)
-        else:
-            by_id[aid] = copy.deepcopy(_prefer(existing, asset))
+        by_id[aid] = asset if existing is None else _prefer(existing, asset)
 
     # Resolve path collisions after ID dedupe.
     by_path: dict[str, dict[str, Any]] = {}
@@ -86,12 +96,13 @@ def dedupe(catalog: dict[str, Any]) -> tuple[dict[str, Any], int]:
             by_path[key] = asset
             continue
         existing = by_path.get(path)
-        if existing is None:
-            by_path[path] = asset
-        else:
-            by_path[path] = copy.deepcopy(_prefer(existing, asset))
+        by_path[path] = asset if existing is None else _prefer(existing, asset)
 
-    deduped_assets = sorted(by_path.values(), key=lambda a: str(a.get("id", "")))
+    # Copy survivors once so the result never aliases the input catalog.
+    deduped_assets = sorted(
+        (copy.deepcopy(asset) for asset in by_path.values()),
+        key=lambda a: str(a.get("id", "")),
+    )
     removed = len(assets) - len(deduped_assets)
 
     out = {
@@ -102,10 +113,97 @@ def dedupe(catalog: dict[str, Any]) -> tuple[dict[str, Any], int]:
     return out, removed
 
 
+def dedupe_store(store: CatalogStore) -> int:
+    """Resolve output.relative_path collisions in a catalog store; returns assets removed.
+
+    Ids are unique in the store already; import with `prefer=_prefer` to
+    resolve duplicate ids the same way `dedupe` does.
+    """
+    losers: list[str] = []
+    for ids in store.path_conflicts().values():
+        assets = store.query(ids=ids)
+        winner = assets[0]
+        for asset in assets[1:]:
+            winner = _prefer(winner, asset)
+        losers.extend(a["id"] for a in assets if a is not winner)
+    return store.delete(losers)
+
+
+def dedupe_with_store(catalog: dict[str, Any], store: CatalogStore) -> tuple[dict[str, Any], int]:
+    """`dedupe` run through a catalog store, which ends up holding the deduped catalog."""
+    assets = catalog.get("assets", [])
+    if not isinstance(assets, list):
+        raise ValueError("Catalog assets must be an array")
+    # Refresh rather than merge so assets dropped from the catalog leave the store too.
+    store.delete(store.ids())
+    store.import_manifest(catalog, prefer=_prefer)
+    dedupe_store(store)
+    out = store.export_manifest()
+    return out, len(assets) - len(out["assets"])
+
+
+def perceptual_report(
+    catalog: dict[str, Any],
+    textures_root: Path,
+    threshold: int,
+    cache_path: Path | None,
+) -> dict[str, Any]:
+    assets = [a for a in catalog.get("assets", []) if isinstance(a, dict)]
+    by_id = {a["id"]: a for a in assets if isinstance(a.get("id"), str)}
+
+    cache = load_hash_cache(cache_path)
+    cached_before = len(cache)
+    hashed, missing, invalid = hash_assets(assets, textures_root, cache)
+    if cache_path is not None and len(cache) != cached_before:
+        save_hash_cache(cache_path, cache)
+
+    def rank(aid: str) -> tuple[int, int]:
+        # Curated/provider score first, then the larger image
+        return _score(by_id[aid]), hashed[aid]["width"] * hashed[aid]["height"]
+
+    groups = find_duplicate_groups(hashed, threshold, rank)
+    return {
+        "generated_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "threshold": threshold,
+        "assets_hashed": len(hashed),
+        "newly_hashed": len(cache) - cached_before,
+        "missing_files": sorted(missing),
+        "invalid_files": invalid,
+        "groups": groups,
+    }
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Deduplicate catalog manifest")
     parser.add_argument("--catalog", required=True, help="Path to catalog manifest")
     parser.add_argument("--out", required=True, help="Output path")
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Dedupe in this SQLite catalog store, refreshed from the catalog",
+    )
+    parser.add_argument(
+        "--perceptual",
+        action="store_true",
+        help="Also report exact and near-duplicate images (dHash/pHash)",
+    )
+    parser.add_argument(
+        "--textures-root",
+        default="Content/Textures",
+        help="Texture root used with --perceptual",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=6,
+        help="Max differing bits of the 128-bit dHash+pHash for near duplicates",
+    )
+    parser.add_argument("--report", default=None, help="Write duplicate groups to this JSON path")
+    parser.add_argument(
+        "--hash-cache",
+        default=str(DEFAULT_HASH_CACHE),
+        help="Image hash cache keyed by file content hash ('' to disable)",
+    )
     args = parser.parse_args()
 
     catalog_path = Path(args.catalog)
@@ -114,13 +212,42 @@ def main() -> int:
     if not isinstance(catalog, dict):
         raise ValueError("Catalog root must be a JSON object")
 
-    deduped, removed = dedupe(catalog)
+    if args.store:
+        with CatalogStore(Path(args.store)) as store:
+            deduped, removed = dedupe_with_store(catalog, store)
+    else:
+        deduped, removed = dedupe(catalog)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", encoding="utf-8") as f:
         json.dump(deduped, f, indent=2)
         f.write("\n")
 
     print(f"Deduped catalog written: {out_path} (removed {removed} duplicate entries)")
+
+    if args.perceptual:
+        textures_root = (catalog_path.parent.parent / args.textures_root).resolve()
+        cache_path = Path(args.hash_cache) if args.hash_cache else None
+        report = perceptual_report(deduped, textures_root, args.threshold, cache_path)
+        if args.report:
+            report_path = Path(args.report)
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            with report_path.open("w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+        print(
+            f"Perceptual index: {report['assets_hashed']} images hashed "
+            f"({report['newly_hashed']} new), {len(report['missing_files'])} missing files, "
+            f"{len(report['groups'])} duplicate groups"
+        )
+        for group in report["groups"]:
+            others = [
+                f"{m['id']} ({'exact' if m['exact'] else m['distance']})"
+                for m in group["members"]
+                if m["id"] != group["canonical"]
+            ]
+            print(f"  {group['canonical']} <- {', '.join(others)}")
+        for line in report["invalid_files"]:
+            print(f"  WARN: could not decode {line}")
     return 0
 
 
@@ -0,0 +1,406 @@
+"""
+Perceptual duplicate index for Pixel Lab catalog textures.
+
+Each texture is decoded with a built-in PNG reader and reduced to a 64-bit
+dHash (gradient signs of a 9x8 luminance grid) and a 64-bit pHash (8x8 DCT
+low frequencies of a 32x32 grid, thresholded at their median). Transparent
+pixels count as black. The two hashes are concatenated into one 128-bit key
+and stored in a BK-tree, so every near-duplicate lookup is a bounded
+Hamming-distance search instead of a scan over all pairs. Luminance hashes
+cannot tell palette swaps apart, so candidates must also have a similar
+mean color.
+
+Hashes are cached by file content hash, so unchanged files are not decoded
+again on reruns.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import zlib
+from pathlib import Path
+from typing import Any, Callable
+
+PNG_SIG = b"\x89PNG\r\n\x1a\n"
+CACHE_VERSION = 1
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# Luminance-grid sizes: dHash compares 9 columns pairwise, pHash keeps the
+# low 8x8 DCT coefficients of a 32x32 grid.
+DHASH_SIZE = 8
+PHASH_SIZE = 32
+PHASH_LOW = 8
+
+# Max per-channel difference of mean (alpha-weighted) colors for near duplicates
+COLOR_TOLERANCE = 16
+
+
+# ---------------------------------------------------------------------------
+# PNG decoding
+# ---------------------------------------------------------------------------
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _unfilter(raw: bytes, height: int, stride: int, bpp: int) -> bytearray:
+    out = bytearray(height * stride)
+    prev = bytearray(stride)
+    pos = 0
+    for y in range(height):
+        ftype = raw[pos]
+        row = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += stride + 1
+        if ftype == 1:
+            for i in range(bpp, stride):
+                row[i] = (row[i] + row[i - bpp]) & 0xFF
+        elif ftype == 2:
+            for i in range(stride):
+                row[i] = (row[i] + prev[i]) & 0xFF
+        elif ftype == 3:
+            for i in range(stride):
+                left = row[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif ftype == 4:
+            for i in range(stride):
+                left = row[i - bpp] if i >= bpp else 0
+                up_left = prev[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + _paeth(left, prev[i], up_left)) & 0xFF
+        elif ftype != 0:
+            raise ValueError(f"invalid PNG filter type {ftype}")
+        out[y * stride:(y + 1) * stride] = row
+        prev = row
+    return out
+
+
+def decode_png(data: bytes) -> tuple[int, int, bytearray]:
+    """Decode a non-interlaced PNG to (width, height, RGBA bytes)."""
+    if data[:8] != PNG_SIG:
+        raise ValueError("not a PNG file")
+    pos = 8
+    idat = []
+    palette = b""
+    trns = b""
+    header = None
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], "big")
+        ctype = data[pos + 4:pos + 8]
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if ctype == b"IHDR":
+            header = body
+        elif ctype == b"PLTE":
+            palette = body
+        elif ctype == b"tRNS":
+            trns = body
+        elif ctype == b"IDAT":
+            idat.append(body)
+        elif ctype == b"IEND":
+            break
+    if header is None:
+        raise ValueError("missing IHDR chunk")
+
+    width = int.from_bytes(header[0:4], "big")
+    height = int.from_bytes(header[4:8], "big")
+    depth, color_type, interlace = header[8], header[9], header[12]
+    if interlace:
+        raise ValueError("interlaced PNGs are not supported")
+    if color_type not in CHANNELS:
+        raise ValueError(f"unsupported PNG color type {color_type}")
+    channels = CHANNELS[color_type]
+    stride = (width * channels * depth + 7) // 8
+    bpp = max(1, channels * depth // 8)
+    pixels = _unfilter(zlib.decompress(b"".join(idat)), height, stride, bpp)
+
+    # Reduce every sample to 8 bits
+    if depth == 16:
+        samples = pixels[0::2]
+    elif depth < 8:
+        per_byte = 8 // depth
+        mask = (1 << depth) - 1
+        samples = bytearray()
+        for y in range(height):
+            row = pixels[y * stride:(y + 1) * stride]
+            unpacked = [(byte >> (8 - depth * (k + 1))) & mask for byte in row for k in range(per_byte)]
+            samples.extend(unpacked[:width])
+        if color_type == 0:
+            scale = 255 // mask
+            samples = bytearray(v * scale for v in samples)
+    else:
+        samples = pixels
+
+    rgba = bytearray(width * height * 4)
+    if color_type == 6:
+        rgba[:] = samples
+    elif color_type == 2:
+        key = tuple(trns[i] for i in (1, 3, 5)) if len(trns) == 6 and depth == 8 else None
+        for i in range(width * height):
+            r, g, b = samples[i * 3:i * 3 + 3]
+            rgba[i * 4:i * 4 + 4] = bytes((r, g, b, 0 if (r, g, b) == key else 255))
+    elif color_type == 3:
+        lut = [bytes(palette[k * 3:k * 3 + 3]) + bytes((trns[k] if k < len(trns) else 255,))
+               for k in range(len(palette) // 3)]
+        for i, index in enumerate(samples):
+            rgba[i * 4:i * 4 + 4] = lut[index]
+    elif color_type == 4:
+        for i in range(width * height):
+            v, a = samples[i * 2], samples[i * 2 + 1]
+            rgba[i * 4:i * 4 + 4] = bytes((v, v, v, a))
+    else:
+        key = trns[1] if len(trns) == 2 and depth == 8 else None
+        for i, v in enumerate(samples):
+            rgba[i * 4:i * 4 + 4] = bytes((v, v, v, 0 if v == key else 255))
+    return width, height, rgba
+
+
+# ---------------------------------------------------------------------------
+# Perceptual hashes
+# ---------------------------------------------------------------------------
+
+
+def _luminance(rgba: bytearray) -> list[float]:
+    """Per-pixel luminance composited over black."""
+    return [
+        (0.299 * rgba[i] + 0.587 * rgba[i + 1] + 0.114 * rgba[i + 2]) * rgba[i + 3] / 255.0
+        for i in range(0, len(rgba), 4)
+    ]
+
+
+def _resample(values: list[float], width: int, height: int, tw: int, th: int) -> list[float]:
+    """Box-filter a grid to tw x th (nearest sample when enlarging)."""
+    out = []
+    for ty in range(th):
+        y0 = ty * height // th
+        y1 = max(y0 + 1, (ty + 1) * height // th)
+        for tx in range(tw):
+            x0 = tx * width // tw
+            x1 = max(x0 + 1, (tx + 1) * width // tw)
+            total = 0.0
+            for y in range(y0, y1):
+                row = y * width
+                total += sum(values[row + x0:row + x1])
+            out.append(total / ((y1 - y0) * (x1 - x0)))
+    return out
+
+
+def _bits(flags: list[bool]) -> int:
+    value = 0
+    for flag in flags:
+        value = (value << 1) | int(flag)
+    return value
+
+
+def dhash(luma: list[float], width: int, height: int) -> int:
+    grid = _resample(luma, width, height, DHASH_SIZE + 1, DHASH_SIZE)
+    row = DHASH_SIZE + 1
+    return _bits([grid[y * row + x] < grid[y * row + x + 1]
+                  for y in range(DHASH_SIZE) for x in range(DHASH_SIZE)])
+
+
+_DCT = [[math.cos(math.pi * (2 * x + 1) * u / (2 * PHASH_SIZE)) for x in range(PHASH_SIZE)]
+        for u in range(PHASH_LOW)]
+
+
+def phash(luma: list[float], width: int, height: int) -> int:
+    grid = _resample(luma, width, height, PHASH_SIZE, PHASH_SIZE)
+    n = PHASH_SIZE
+    # Separable 2D DCT-II, keeping only the low PHASH_LOW frequencies
+    rows = [[sum(c * v for c, v in zip(basis, grid[y * n:(y + 1) * n])) for basis in _DCT]
+            for y in range(n)]
+    coeffs = [sum(basis[y] * rows[y][u] for y in range(n)) for basis in _DCT for u in range(PHASH_LOW)]
+    median = sorted(coeffs[1:])[len(coeffs[1:]) // 2]  # DC term excluded
+    return _bits([c > median for c in coeffs])
+
+
+def _mean_color(rgba: bytearray) -> list[int]:
+    """Alpha-weighted mean RGB."""
+    alpha = rgba[3::4]
+    total = sum(alpha)
+    if not total:
+        return [0, 0, 0]
+    return [round(sum(v * a for v, a in zip(rgba[c::4], alpha)) / total) for c in range(3)]
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def image_hashes(data: bytes) -> dict[str, Any]:
+    """Hashes of one PNG file's bytes."""
+    width, height, rgba = decode_png(data)
+    luma = _luminance(rgba)
+    pixels = hashlib.sha256(f"{width}x{height}:".encode("ascii") + bytes(rgba)).hexdigest()
+    return {
+        "width": width,
+        "height": height,
+        "pixels": pixels,
+        "dhash": f"{dhash(luma, width, height):016x}",
+        "phash": f"{phash(luma, width, height):016x}",
+        "color": _mean_color(rgba),
+    }
+
+
+# ---------------------------------------------------------------------------
+# BK-tree
+# ---------------------------------------------------------------------------
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer keys with Hamming distance."""
+
+    def __init__(self) -> None:
+        self._root: list[Any] | None = None  # [key, items, {distance: child}]
+        self.size = 0
+
+    def add(self, key: int, item: Any) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = [key, [item], {}]
+            return
+        node = self._root
+        while True:
+            d = hamming(key, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [key, [item], {}]
+                return
+            node = child
+
+    def search(self, key: int, radius: int) -> list[tuple[int, Any]]:
+        """(distance, item) for every item within radius of key."""
+        found: list[tuple[int, Any]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            d = hamming(key, node[0])
+            if d <= radius:
+                found.extend((d, item) for item in node[1])
+            for child_d, child in node[2].items():
+                if d - radius <= child_d <= d + radius:
+                    stack.append(child)
+        return found
+
+
+# ---------------------------------------------------------------------------
+# Cache and grouping
+# ---------------------------------------------------------------------------
+
+
+def load_hash_cache(path: Path | None) -> dict[str, dict[str, Any]]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("entries", {})
+
+
+def save_hash_cache(path: Path, entries: dict[str, dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "entries": entries}, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def hash_assets(
+    assets: list[dict[str, Any]],
+    textures_root: Path,
+    cache: dict[str, dict[str, Any]],
+) -> tuple[dict[str, dict[str, Any]], list[str], list[str]]:
+    """Hashes by asset id, plus ids with missing and undecodable files.
+
+    `cache` (file sha256 -> hashes) is updated in place.
+    """
+    hashed: dict[str, dict[str, Any]] = {}
+    missing: list[str] = []
+    invalid: list[str] = []
+    for asset in assets:
+        aid = asset.get("id")
+        output = asset.get("output")
+        rel_path = output.get("relative_path") if isinstance(output, dict) else None
+        if not isinstance(aid, str) or not isinstance(rel_path, str):
+            continue
+        try:
+            data = (textures_root / rel_path).read_bytes()
+        except OSError:
+            missing.append(aid)
+            continue
+        key = hashlib.sha256(data).hexdigest()
+        entry = cache.get(key)
+        if entry is None:
+            try:
+                entry = image_hashes(data)
+            except (ValueError, zlib.error, IndexError) as exc:
+                invalid.append(f"{aid}: {exc}")
+                continue
+            cache[key] = entry
+        hashed[aid] = dict(entry, relative_path=rel_path)
+    return hashed, missing, invalid
+
+
+def find_duplicate_groups(
+    hashed: dict[str, dict[str, Any]],
+    threshold: int,
+    rank: Callable[[str], Any],
+) -> list[dict[str, Any]]:
+    """Group assets whose combined hashes are within `threshold` bits and
+    whose mean colors are within COLOR_TOLERANCE.
+
+    Groups are connected components of the near-duplicate graph. Each one
+    names a canonical asset (highest `rank`) and every member's distance to it.
+    """
+    tree = BKTree()
+    parent = {aid: aid for aid in hashed}
+
+    def find(aid: str) -> str:
+        while parent[aid] != aid:
+            parent[aid] = parent[parent[aid]]
+            aid = parent[aid]
+        return aid
+
+    keys = {aid: (int(h["dhash"], 16) << 64) | int(h["phash"], 16) for aid, h in hashed.items()}
+    for aid in sorted(hashed):
+        color = hashed[aid]["color"]
+        for _, other in tree.search(keys[aid], threshold):
+            if max(abs(a - b) for a, b in zip(color, hashed[other]["color"])) <= COLOR_TOLERANCE:
+                parent[find(other)] = find(aid)
+        tree.add(keys[aid], aid)
+
+    components: dict[str, list[str]] = {}
+    for aid in hashed:
+        components.setdefault(find(aid), []).append(aid)
+
+    groups = []
+    for members in components.values():
+        if len(members) < 2:
+            continue
+        canonical = max(sorted(members), key=rank)
+        base = hashed[canonical]
+        groups.append({
+            "canonical": canonical,
+            "members": [
+                {
+                    "id": aid,
+                    "relative_path": hashed[aid]["relative_path"],
+                    "distance": hamming(keys[aid], keys[canonical]),
+                    "exact": hashed[aid]["pixels"] == base["pixels"],
+                }
+                for aid in sorted(members, key=lambda a: (a != canonical, hamming(keys[a], keys[canonical]), a))
+            ],
+        })
+    groups.sort(key=lambda g: g["canonical"])
+    return groups
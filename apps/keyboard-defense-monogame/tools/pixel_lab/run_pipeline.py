@@ -11,20 +11,45 @@ Pipeline:
 6) gate active IDs are present in catalog
 7) build runtime texture manifest from active subset
 
-If a generated file only differs by top-level generated timestamp fields, this
-script restores the original file to avoid timestamp-only git drift.
+Stages run in-process and hand one in-memory catalog along. Outputs are written
+once, after every stage has passed, and only when their content differs from
+the file on disk ignoring generated/exported timestamp fields. A failed stage
+leaves every output untouched.
+
+With --store, the dedupe stage runs in a SQLite catalog store (see
+catalog_store.py). The store is a working copy refreshed from the catalog on
+every run, so it is updated even when a later stage fails.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import subprocess
-import sys
+import sqlite3
+import time
 from datetime import datetime, timezone
 from hashlib import sha256
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+from build_texture_manifest import build_runtime_manifest
+from curate_active_runtime import curate
+from catalog_store import CatalogStore
+from dedupe_catalog import dedupe, dedupe_with_store
+from migrate_legacy_assets_manifest import migrate
+from validate_manifest import DEFAULT_VERIFY_CACHE, validate
+from verify_active_in_catalog import missing_active_ids
+
+
+# Run-time stamps: curate stamps exported_utc on runtime-only entries, so a
+# difference in these keys alone never forces a rewrite.
+TIMESTAMP_KEYS = {"generated_utc", "generated", "exported_utc"}
+
+
+class StageFailed(Exception):
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__(errors[0] if errors else "stage failed")
+        self.errors = errors
 
 
 def _load_json(path: Path) -> Any:
@@ -43,7 +68,7 @@ def _normalize_for_compare(value: Any) -> Any:
     if isinstance(value, dict):
         out: dict[str, Any] = {}
         for key, child in value.items():
-            if key in {"generated_utc", "generated"}:
+            if key in TIMESTAMP_KEYS:
                 continue
             out[key] = _normalize_for_compare(child)
         return out
@@ -56,40 +81,77 @@ def _file_sha256(path: Path) -> str:
     return sha256(path.read_bytes()).hexdigest()
 
 
-def _run_python(script_path: Path, args: list[str]) -> list[str]:
-    command = [sys.executable, str(script_path), *args]
-    subprocess.run(command, check=True)
-    return command
+def _run_stage(
+    steps: list[dict[str, Any]],
+    name: str,
+    stage: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    started = time.perf_counter()
+    try:
+        result = stage(*args)
+    except StageFailed as exc:
+        errors = exc.errors
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        errors = [f"{type(exc).__name__}: {exc}"]
+    else:
+        errors = []
+    duration_ms = round((time.perf_counter() - started) * 1000.0, 3)
+    if errors:
+        steps.append({"name": name, "status": "failed", "duration_ms": duration_ms, "errors": errors})
+        raise StageFailed(errors)
+    steps.append({"name": name, "status": "ok", "duration_ms": duration_ms})
+    return result
+
+
+def _load_object(path: Path, label: str) -> dict[str, Any]:
+    payload = _load_json(path)
+    if not isinstance(payload, dict):
+        raise ValueError(f"{label} root must be an object")
+    return payload
 
 
-def _capture_original(path: Path) -> tuple[str | None, Any | None]:
-    if not path.exists():
-        return None, None
-    text = path.read_text(encoding="utf-8")
-    try:
-        payload = json.loads(text)
-    except Exception:
-        payload = None
-    return text, payload
-
-
-def _restore_when_timestamp_only(
-    path: Path,
-    original_text: str | None,
-    original_payload: Any | None,
-) -> bool:
-    if original_text is None or original_payload is None:
-        return False
-    if not path.exists():
-        return False
+def _check(errors: list[str]) -> None:
+    if errors:
+        raise StageFailed(errors)
+
+
+def _validate_stage(
+    manifest: dict[str, Any],
+    schema_path: Path,
+    textures_root: Path | None = None,
+    deep: bool = False,
+    cache_path: Path | None = None,
+) -> None:
+    _check(validate(manifest, schema_path, textures_root, deep, cache_path))
+
+
+def _dedupe_stage(catalog: dict[str, Any], store_path: Path | None) -> tuple[dict[str, Any], int]:
+    if store_path is None:
+        return dedupe(catalog)
     try:
-        generated_payload = _load_json(path)
-    except Exception:
-        return False
-    if _normalize_for_compare(original_payload) == _normalize_for_compare(generated_payload):
-        path.write_text(original_text, encoding="utf-8")
-        return True
-    return False
+        with CatalogStore(store_path) as store:
+            return dedupe_with_store(catalog, store)
+    except sqlite3.Error as exc:
+        raise StageFailed([f"Catalog store {store_path.as_posix()}: {exc}"]) from exc
+
+
+def _verify_stage(catalog: dict[str, Any], active: dict[str, Any]) -> None:
+    missing = missing_active_ids(catalog, active)
+    _check([f"Active manifest ID missing from catalog: {aid}" for aid in missing])
+
+
+def _write_if_changed(path: Path, payload: dict[str, Any]) -> bool:
+    """Write payload unless the existing file only differs by generated timestamps."""
+    if path.exists():
+        try:
+            existing = _load_json(path)
+        except (OSError, ValueError):
+            existing = None
+        if existing is not None and _normalize_for_compare(existing) == _normalize_for_compare(payload):
+            return False
+    _write_json(path, payload)
+    return True
 
 
 def _asset_count(payload: Any, key: str) -> int:
@@ -143,148 +205,117 @@ def main() -> int:
         default="artifacts/summaries/pixel-lab-pipeline.json",
         help="Path to summary report JSON",
     )
+    parser.add_argument(
+        "--deep-verify",
+        action="store_true",
+        help="CRC-check and inflate every active texture, not just its header",
+    )
+    parser.add_argument(
+        "--verify-cache",
+        default=str(DEFAULT_VERIFY_CACHE),
+        help="Texture check cache keyed by path, size and mtime ('' to disable)",
+    )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Dedupe in this SQLite catalog store, refreshed from the catalog",
+    )
     args = parser.parse_args()
 
-    tools_dir = Path(__file__).resolve().parent
     catalog_path = Path(args.catalog)
     active_path = Path(args.active)
     runtime_out_path = Path(args.runtime_out)
     report_path = Path(args.report)
+    schema_path = Path(args.schema)
+    verify_cache = Path(args.verify_cache) if args.verify_cache else None
+    store_path = Path(args.store) if args.store else None
 
-    tracked_paths = [catalog_path, active_path, runtime_out_path]
-    originals: dict[Path, tuple[str | None, Any | None]] = {
-        path: _capture_original(path) for path in tracked_paths
-    }
-
+    started = time.perf_counter()
     steps: list[dict[str, Any]] = []
     try:
-        command = _run_python(
-            tools_dir / "migrate_legacy_assets_manifest.py",
-            [
-                "--legacy-manifest",
-                args.legacy_manifest,
-                "--out",
-                args.catalog,
-            ],
+        legacy = _run_stage(steps, "load_legacy_manifest", _load_object, Path(args.legacy_manifest), "Legacy manifest")
+        runtime_manifest = _run_stage(
+            steps,
+            "load_runtime_texture_manifest",
+            _load_object,
+            Path(args.runtime_texture_manifest),
+            "Runtime texture manifest",
         )
-        steps.append({"name": "migrate_legacy_assets_manifest", "command": command, "status": "ok"})
-
-        command = _run_python(
-            tools_dir / "curate_active_runtime.py",
-            [
-                "--catalog",
-                args.catalog,
-                "--runtime-texture-manifest",
-                args.runtime_texture_manifest,
-                "--textures-root",
-                args.textures_root,
-                "--out-catalog",
-                args.catalog,
-                "--out-active",
-                args.active,
-            ],
+        catalog = _run_stage(steps, "migrate_legacy_assets_manifest", migrate, legacy)
+        catalog, active = _run_stage(
+            steps,
+            "curate_active_runtime",
+            curate,
+            catalog,
+            runtime_manifest,
+            Path(args.textures_root),
         )
-        steps.append({"name": "curate_active_runtime", "command": command, "status": "ok"})
-
-        command = _run_python(
-            tools_dir / "dedupe_catalog.py",
-            [
-                "--catalog",
-                args.catalog,
-                "--out",
-                args.catalog,
-            ],
+        catalog, removed = _run_stage(steps, "dedupe_catalog", _dedupe_stage, catalog, store_path)
+        _run_stage(steps, "validate_catalog_manifest", _validate_stage, catalog, schema_path)
+        _run_stage(
+            steps,
+            "validate_active_manifest",
+            _validate_stage,
+            active,
+            schema_path,
+            active_path.parent.parent / args.textures_root,
+            args.deep_verify,
+            verify_cache,
         )
-        steps.append({"name": "dedupe_catalog", "command": command, "status": "ok"})
-
-        command = _run_python(
-            tools_dir / "validate_manifest.py",
-            [
-                "--manifest",
-                args.catalog,
-                "--schema",
-                args.schema,
-            ],
-        )
-        steps.append({"name": "validate_catalog_manifest", "command": command, "status": "ok"})
-
-        command = _run_python(
-            tools_dir / "validate_manifest.py",
-            [
-                "--manifest",
-                args.active,
-                "--schema",
-                args.schema,
-                "--textures-root",
-                args.textures_root,
-                "--check-files",
-            ],
-        )
-        steps.append({"name": "validate_active_manifest", "command": command, "status": "ok"})
-
-        command = _run_python(
-            tools_dir / "verify_active_in_catalog.py",
-            [
-                "--catalog",
-                args.catalog,
-                "--active",
-                args.active,
-            ],
-        )
-        steps.append({"name": "verify_active_in_catalog", "command": command, "status": "ok"})
-
-        command = _run_python(
-            tools_dir / "build_texture_manifest.py",
-            [
-                "--manifest",
-                args.active,
-                "--out",
-                args.runtime_out,
-            ],
-        )
-        steps.append({"name": "build_runtime_texture_manifest", "command": command, "status": "ok"})
-    except subprocess.CalledProcessError as exc:
+        _run_stage(steps, "verify_active_in_catalog", _verify_stage, catalog, active)
+        runtime_payload = _run_stage(steps, "build_runtime_texture_manifest", build_runtime_manifest, active)
+    except StageFailed as exc:
         report = {
             "status": "failed",
             "generated_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "failed_command": exc.cmd,
-            "exit_code": exc.returncode,
+            "failed_step": steps[-1]["name"],
+            "errors": exc.errors,
             "steps": steps,
+            "total_ms": round((time.perf_counter() - started) * 1000.0, 3),
         }
         _write_json(report_path, report)
-        return exc.returncode
-
-    stabilized_files: list[str] = []
-    for path in tracked_paths:
-        original_text, original_payload = originals[path]
-        if _restore_when_timestamp_only(path, original_text, original_payload):
-            stabilized_files.append(path.as_posix())
-
-    catalog_payload = _load_json(catalog_path)
-    active_payload = _load_json(active_path)
-    runtime_payload = _load_json(runtime_out_path)
+        print(f"Pixel Lab pipeline failed at {steps[-1]['name']}; no outputs were written")
+        for err in exc.errors:
+            print(f"- {err}")
+        return 1
 
+    written_files: list[str] = []
+    unchanged_files: list[str] = []
     outputs: dict[str, Any] = {}
-    for label, path in (
-        ("catalog_manifest", catalog_path),
-        ("active_runtime_manifest", active_path),
-        ("runtime_texture_manifest", runtime_out_path),
+    write_started = time.perf_counter()
+    for label, path, payload in (
+        ("catalog_manifest", catalog_path, catalog),
+        ("active_runtime_manifest", active_path, active),
+        ("runtime_texture_manifest", runtime_out_path, runtime_payload),
     ):
+        written = _write_if_changed(path, payload)
+        (written_files if written else unchanged_files).append(path.as_posix())
         outputs[label] = {
             "path": path.as_posix(),
             "sha256": _file_sha256(path),
+            "written": written,
         }
+    steps.append(
+        {
+            "name": "write_outputs",
+            "status": "ok",
+            "duration_ms": round((time.perf_counter() - write_started) * 1000.0, 3),
+        }
+    )
 
     report = {
         "status": "ok",
         "generated_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "steps": steps,
+        "total_ms": round((time.perf_counter() - started) * 1000.0, 3),
         "counts": {
-            "catalog_assets": _asset_count(catalog_payload, "assets"),
-            "active_assets": _asset_count(active_payload, "assets"),
+            "catalog_assets": _asset_count(catalog, "assets"),
+            "active_assets": _asset_count(active, "assets"),
             "runtime_textures": _asset_count(runtime_payload, "textures"),
+            "deduped_assets": removed,
         },
-        "stabilized_timestamp_only_files": stabilized_files,
+        "written_files": written_files,
+        "unchanged_files": unchanged_files,
         "outputs": outputs,
     }
     _write_json(report_path, report)
@@ -292,7 +323,8 @@ def main() -> int:
         "Pixel Lab pipeline complete "
         f"(catalog={report['counts']['catalog_assets']}, "
         f"active={report['counts']['active_assets']}, "
-        f"runtime_textures={report['counts']['runtime_textures']})"
+        f"runtime_textures={report['counts']['runtime_textures']}, "
+        f"written={len(written_files)}, total={report['total_ms']:.0f}ms)"
     )
     return 0
 
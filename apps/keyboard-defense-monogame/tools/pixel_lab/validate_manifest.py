@@ -15,6 +15,8 @@ import math
 import os
 import re
 import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -38,6 +40,21 @@ VALID_ARTIFACT_TYPES = {
 }
 
 PNG_SIG = b"\x89PNG\r\n\x1a\n"
+CHANNELS_BY_COLOR_TYPE = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+# Adam7 passes as (x0, y0, dx, dy).
+ADAM7_PASSES = (
+    (0, 0, 8, 8),
+    (4, 0, 8, 8),
+    (0, 4, 4, 8),
+    (2, 0, 4, 4),
+    (0, 2, 2, 4),
+    (1, 0, 2, 2),
+    (0, 1, 1, 2),
+)
+READ_BLOCK = 1 << 16
+
+VERIFY_CACHE_VERSION = 2
+DEFAULT_VERIFY_CACHE = Path(__file__).resolve().parents[2] / "obj" / "pixel_lab_png_verify.json"
 
 
 def _load_json(path: Path) -> Any:
@@ -65,6 +82,168 @@ def _png_meta(path: Path) -> tuple[int, int, int]:
     return width, height, color_type
 
 
+def _expected_raw_size(width: int, height: int, bit_depth: int, color_type: int, interlace: int) -> int:
+    bits_per_pixel = CHANNELS_BY_COLOR_TYPE[color_type] * bit_depth
+
+    def scanlines(w: int, h: int) -> int:
+        if w <= 0 or h <= 0:
+            return 0
+        return h * (1 + (w * bits_per_pixel + 7) // 8)
+
+    if interlace == 0:
+        return scanlines(width, height)
+    return sum(
+        scanlines((width - x0 + dx - 1) // dx, (height - y0 + dy - 1) // dy)
+        for x0, y0, dx, dy in ADAM7_PASSES
+    )
+
+
+def _png_deep_check(path: Path) -> None:
+    """Stream every chunk, verify its CRC and inflate IDAT to the size IHDR declares.
+
+    Raises ValueError describing the first problem found.
+    """
+    with path.open("rb") as f:
+        if f.read(8) != PNG_SIG:
+            raise ValueError("bad PNG signature")
+        inflater = zlib.decompressobj()
+        expected = -1
+        inflated = 0
+        idat_state = "before"
+        first = True
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                raise ValueError("truncated before IEND")
+            length = int.from_bytes(head[:4], "big")
+            chunk_type = head[4:8]
+            if first and chunk_type != b"IHDR":
+                raise ValueError("first chunk is not IHDR")
+            first = False
+            if chunk_type == b"IDAT":
+                if idat_state == "after":
+                    raise ValueError("IDAT chunks are not consecutive")
+                idat_state = "inside"
+            elif idat_state == "inside":
+                idat_state = "after"
+
+            crc = zlib.crc32(chunk_type)
+            data = b""
+            remaining = length
+            while remaining:
+                block = f.read(min(remaining, READ_BLOCK))
+                if not block:
+                    raise ValueError(f"truncated {chunk_type.decode('latin-1')} chunk")
+                remaining -= len(block)
+                crc = zlib.crc32(block, crc)
+                if chunk_type == b"IDAT":
+                    if inflater.eof:
+                        raise ValueError("data after end of zlib stream")
+                    try:
+                        inflated += len(inflater.decompress(block, READ_BLOCK))
+                        while inflater.unconsumed_tail and inflated <= expected:
+                            inflated += len(inflater.decompress(inflater.unconsumed_tail, READ_BLOCK))
+                    except zlib.error as exc:
+                        raise ValueError(f"IDAT does not inflate: {exc}") from None
+                    if inflated > expected:
+                        raise ValueError(f"IDAT inflates past {expected} bytes")
+                elif chunk_type == b"IHDR":
+                    data += block
+            stored = f.read(4)
+            if len(stored) < 4 or int.from_bytes(stored, "big") != crc:
+                raise ValueError(f"CRC mismatch in {chunk_type.decode('latin-1')} chunk")
+
+            if chunk_type == b"IHDR":
+                if length != 13:
+                    raise ValueError("IHDR length is not 13")
+                width = int.from_bytes(data[0:4], "big")
+                height = int.from_bytes(data[4:8], "big")
+                bit_depth, color_type, _, _, interlace = data[8:13]
+                if color_type not in CHANNELS_BY_COLOR_TYPE or interlace not in (0, 1):
+                    raise ValueError(f"unsupported color_type={color_type} interlace={interlace}")
+                expected = _expected_raw_size(width, height, bit_depth, color_type, interlace)
+            elif chunk_type == b"IEND":
+                break
+
+    if idat_state == "before":
+        raise ValueError("no IDAT chunk")
+    if not inflater.eof:
+        raise ValueError("zlib stream is incomplete")
+    if inflated != expected:
+        raise ValueError(f"IDAT inflates to {inflated} bytes, expected {expected}")
+
+
+def _inspect_png(path: Path, deep: bool, cached: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Stat and check one texture; None when the file is missing.
+
+    A cached entry is reused while size and mtime match and it covers the
+    requested depth.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    if (
+        cached is not None
+        and cached.get("size") == st.st_size
+        and cached.get("mtime_ns") == st.st_mtime_ns
+        and (cached.get("deep") or not deep)
+    ):
+        return cached
+
+    entry: dict[str, Any] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "deep": deep}
+    try:
+        entry["width"], entry["height"], entry["color_type"] = _png_meta(path)
+        # Indexed PNGs carry alpha in tRNS (see tools/optimize_pngs.py).
+        entry["alpha"] = entry["color_type"] in (4, 6) or (
+            entry["color_type"] == 3 and _palette_has_trns(path)
+        )
+    except Exception as exc:
+        entry["error"] = str(exc)
+        return entry
+    if deep:
+        try:
+            _png_deep_check(path)
+        except (OSError, ValueError) as exc:
+            entry["deep_error"] = str(exc)
+    return entry
+
+
+def _load_verify_cache(path: Path | None) -> dict[str, dict[str, Any]]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        cache = _load_json(path)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != VERIFY_CACHE_VERSION:
+        return {}
+    return cache.get("entries", {})
+
+
+def _save_verify_cache(path: Path, entries: dict[str, dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump({"version": VERIFY_CACHE_VERSION, "entries": entries}, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def _palette_has_trns(path: Path) -> bool:
+    """True when an indexed PNG carries a tRNS chunk (read before IDAT)."""
+    with path.open("rb") as f:
+        f.seek(8)
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                return False
+            chunk_type = head[4:8]
+            if chunk_type == b"tRNS":
+                return True
+            if chunk_type in (b"IDAT", b"IEND"):
+                return False
+            f.seek(int.from_bytes(head[:4], "big") + 4, os.SEEK_CUR)
+
+
 def _is_safe_relative_png(path: str) -> bool:
     if path.startswith("res://"):
         return False
@@ -236,10 +415,19 @@ def _validate_manifest_struct(manifest: dict[str, Any]) -> list[str]:
     return errors
 
 
-def _validate_files(manifest: dict[str, Any], textures_root: Path) -> list[str]:
+def _validate_files(
+    manifest: dict[str, Any],
+    textures_root: Path,
+    deep: bool = False,
+    cache_path: Path | None = None,
+    jobs: int | None = None,
+) -> list[str]:
     errors: list[str] = []
     root_resolved = textures_root.resolve()
 
+    # Resolve paths up front, then stat/read the files on a thread pool.
+    # Path errors stay in place as strings so the report order is unchanged.
+    checks: list[str | tuple[str, dict[str, Any], dict[str, Any], Path]] = []
     assets = manifest.get("assets", [])
     for i, asset in enumerate(assets):
         prefix = f"assets[{i}]"
@@ -251,18 +439,49 @@ def _validate_files(manifest: dict[str, Any], textures_root: Path) -> list[str]:
 
         file_path = (textures_root / rel_path).resolve()
         if os.path.commonpath([str(root_resolved), str(file_path)]) != str(root_resolved):
-            errors.append(f"{prefix}: output path escapes textures root: {rel_path}")
+            checks.append(f"{prefix}: output path escapes textures root: {rel_path}")
             continue
+        checks.append((prefix, output, constraints, file_path))
 
-        if not file_path.exists():
+    cache = _load_verify_cache(cache_path)
+    unique_paths = list(dict.fromkeys(check[3] for check in checks if isinstance(check, tuple)))
+
+    def inspect(path: Path) -> dict[str, Any] | None:
+        return _inspect_png(path, deep, cache.get(str(path)))
+
+    if len(unique_paths) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = dict(zip(unique_paths, pool.map(inspect, unique_paths)))
+    else:
+        results = {path: inspect(path) for path in unique_paths}
+
+    if cache_path is not None:
+        updated = dict(cache)
+        for path, entry in results.items():
+            if entry is None:
+                updated.pop(str(path), None)
+            else:
+                updated[str(path)] = entry
+        if updated != cache:
+            _save_verify_cache(cache_path, updated)
+
+    for check in checks:
+        if isinstance(check, str):
+            errors.append(check)
+            continue
+        prefix, output, constraints, file_path = check
+        entry = results[file_path]
+        if entry is None:
             errors.append(f"{prefix}: missing texture file: {file_path}")
             continue
-
-        try:
-            width, height, color_type = _png_meta(file_path)
-        except Exception as exc:
-            errors.append(f"{prefix}: invalid PNG ({file_path}): {exc}")
+        if "error" in entry:
+            errors.append(f"{prefix}: invalid PNG ({file_path}): {entry['error']}")
             continue
+        if entry.get("deep_error"):
+            errors.append(f"{prefix}: corrupt PNG ({file_path}): {entry['deep_error']}")
+        width = entry["width"]
+        height = entry["height"]
+        color_type = entry["color_type"]
 
         exp_w = output.get("width")
         exp_h = output.get("height")
@@ -273,12 +492,12 @@ def _validate_files(manifest: dict[str, Any], textures_root: Path) -> list[str]:
 
         max_kb = constraints.get("max_kb")
         if isinstance(max_kb, int):
-            size_kb = math.ceil(file_path.stat().st_size / 1024.0)
+            size_kb = math.ceil(entry["size"] / 1024.0)
             if size_kb > max_kb:
                 errors.append(f"{prefix}: size {size_kb}KB exceeds max_kb={max_kb} ({file_path})")
 
         alpha_required = constraints.get("alpha_required")
-        if alpha_required is True and color_type not in (4, 6):
+        if alpha_required is True and not entry["alpha"]:
             errors.append(
                 f"{prefix}: alpha_required=true but PNG color_type={color_type} ({file_path})"
             )
@@ -286,6 +505,31 @@ def _validate_files(manifest: dict[str, Any], textures_root: Path) -> list[str]:
     return errors
 
 
+def validate(
+    manifest: dict[str, Any],
+    schema_path: Path | None = None,
+    textures_root: Path | None = None,
+    deep: bool = False,
+    cache_path: Path | None = None,
+    jobs: int | None = None,
+) -> list[str]:
+    """Return all validation errors; output files are checked when textures_root is set.
+
+    `deep` also CRC-checks every chunk and inflates IDAT. File results are
+    cached in `cache_path` keyed by (path, size, mtime).
+    """
+    errors: list[str] = []
+    errors.extend(_validate_schema_if_available(manifest, schema_path))
+    errors.extend(_validate_manifest_struct(manifest))
+    if textures_root is not None:
+        textures_root = textures_root.resolve()
+        if not textures_root.exists():
+            errors.append(f"Textures root not found: {textures_root}")
+        else:
+            errors.extend(_validate_files(manifest, textures_root, deep, cache_path, jobs))
+    return errors
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Validate Pixel Lab manifest")
     parser.add_argument(
@@ -308,6 +552,22 @@ def main() -> int:
         action="store_true",
         help="Validate output files (existence, PNG dimensions, budgets)",
     )
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="With --check-files, also verify chunk CRCs and inflate IDAT",
+    )
+    parser.add_argument(
+        "--verify-cache",
+        default=str(DEFAULT_VERIFY_CACHE),
+        help="File check cache keyed by path, size and mtime ('' to disable)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Threads used for file checks (default: executor default)",
+    )
     args = parser.parse_args()
 
     manifest_path = Path(args.manifest)
@@ -320,18 +580,12 @@ def main() -> int:
         print("ERROR: Manifest root must be a JSON object", file=sys.stderr)
         return 1
 
-    errors: list[str] = []
     schema_path = Path(args.schema) if args.schema else None
-    errors.extend(_validate_schema_if_available(manifest, schema_path))
-    errors.extend(_validate_manifest_struct(manifest))
-
+    textures_root = None
     if args.check_files:
-        manifest_dir = manifest_path.parent
-        textures_root = (manifest_dir.parent / args.textures_root).resolve()
-        if not textures_root.exists():
-            errors.append(f"Textures root not found: {textures_root}")
-        else:
-            errors.extend(_validate_files(manifest, textures_root))
+        textures_root = manifest_path.parent.parent / args.textures_root
+    cache_path = Path(args.verify_cache) if args.verify_cache else None
+    errors = validate(manifest, schema_path, textures_root, args.deep, cache_path, args.jobs)
 
     if errors:
         print("Pixel Lab manifest validation failed:", file=sys.stderr)
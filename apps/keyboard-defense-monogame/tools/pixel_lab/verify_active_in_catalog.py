@@ -17,26 +17,15 @@ def _load_json(path: Path) -> Any:
         return json.load(f)
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Verify active runtime manifest is a subset of catalog by asset id"
-    )
-    parser.add_argument("--catalog", required=True, help="Path to catalog manifest")
-    parser.add_argument("--active", required=True, help="Path to active runtime manifest")
-    args = parser.parse_args()
-
-    catalog = _load_json(Path(args.catalog))
-    active = _load_json(Path(args.active))
-
+def missing_active_ids(catalog: Any, active: Any) -> list[str]:
+    """Return sorted active asset IDs that are absent from the catalog."""
     if not isinstance(catalog, dict) or not isinstance(active, dict):
-        print("ERROR: Manifest roots must be JSON objects", file=sys.stderr)
-        return 1
+        raise ValueError("Manifest roots must be JSON objects")
 
     catalog_assets = catalog.get("assets", [])
     active_assets = active.get("assets", [])
     if not isinstance(catalog_assets, list) or not isinstance(active_assets, list):
-        print("ERROR: assets must be arrays in both manifests", file=sys.stderr)
-        return 1
+        raise ValueError("assets must be arrays in both manifests")
 
     catalog_ids = {
         a.get("id")
@@ -51,16 +40,34 @@ def main() -> int:
         aid = item.get("id")
         if isinstance(aid, str) and aid not in catalog_ids:
             missing.append(aid)
+    return sorted(set(missing))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Verify active runtime manifest is a subset of catalog by asset id"
+    )
+    parser.add_argument("--catalog", required=True, help="Path to catalog manifest")
+    parser.add_argument("--active", required=True, help="Path to active runtime manifest")
+    args = parser.parse_args()
+
+    catalog = _load_json(Path(args.catalog))
+    active = _load_json(Path(args.active))
+
+    try:
+        missing = missing_active_ids(catalog, active)
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
 
     if missing:
-        missing = sorted(set(missing))
         print("Active manifest contains IDs that are missing from catalog:", file=sys.stderr)
         for aid in missing:
             print(f"- {aid}", file=sys.stderr)
         return 1
 
     print(
-        f"Active subset gate OK: {len(active_assets)} active assets are present in catalog"
+        f"Active subset gate OK: {len(active['assets'])} active assets are present in catalog"
     )
     return 0
 